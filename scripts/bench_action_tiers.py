@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Action-extraction tier benchmark.
+
+Sends the same action-bearing requests to an LLM endpoint once per tier of
+src/backend/app/services/action_extractor.py and compares how the actions
+arrive:
+
+  A  native tool calling (`action` tool)
+  B  JSON-schema output ({"reply", "actions"} via response_format)
+  C  [ACTION: ...] tags in prose, with the auto-repair round-trip
+
+Reported per tier:
+  n             requests completed (errors are counted separately)
+  actions       mean actions delivered per reply
+  hit_%         replies that delivered the expected action verb
+  repair_%      replies that needed a repair round-trip (Tier C only)
+  p50/p95_ms    end-to-end latency: request sent → actions ready (incl. repair)
+
+A tier the endpoint does not support shows up as errors or a low hit_%.
+
+Usage (from the repo root, inside the backend container or a venv with
+src/backend/requirements.txt installed and the LLM settings in the env):
+
+	python scripts/bench_action_tiers.py
+	python scripts/bench_action_tiers.py --target local --tiers B,C --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+BACKEND_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "backend"))
+
+# (user message, expected action verb)
+CORPUS = [
+	("Remind me to call the dentist today.", "CREATE_TASK"),
+	("Add eggs, spinach and feta to the shopping list.", "APPEND_SHOPPING"),
+	("Mark the laundry card as done.", "MARK_DONE"),
+	("Move the quarterly tax card to In Progress.", "MOVE_CARD"),
+	("Create a board called Garden in the Home project.", "CREATE_BOARD"),
+	("Put 'renew passport' on the Operator Board with a note to bring two photos.", "CREATE_TASK"),
+	("Archive the old gym membership card.", "ARCHIVE_CARD"),
+	("Add a list called Phase Two to the Projects board.", "CREATE_LIST"),
+]
+
+
+async def _run_one(client, ax, endpoint, system_prompt: str, tier: str, text: str) -> tuple[list, bool, float]:
+	"""One request on *tier*; returns (actions, needed_repair, seconds)."""
+	api_url, headers, base = endpoint
+	body = {**base, "stream": False, "temperature": 0.2, "max_tokens": 600}
+	system = system_prompt
+	if tier == "A":
+		system += "\n\n" + ax.TOOL_DIRECTIVE
+		body.update(tools=[ax.action_tool_def()], tool_choice="auto")
+	elif tier == "B":
+		system += "\n\n" + ax.JSON_DIRECTIVE
+		body["response_format"] = ax.action_response_format()
+	body["messages"] = [{"role": "system", "content": system}, {"role": "user", "content": text}]
+
+	start = time.perf_counter()
+	resp = await client.post(api_url, headers=headers, json=body)
+	resp.raise_for_status()
+	message = (resp.json().get("choices") or [{}])[0].get("message") or {}
+	content = message.get("content") or ""
+	needed_repair = False
+	if tier == "A":
+		_, actions = await ax.NativeToolExtractor().extract(content, message.get("tool_calls"))
+	elif tier == "B":
+		_, actions = await ax.JsonSchemaExtractor().extract(content)
+	else:
+		needed_repair = bool(ax._OPEN_TAG_RE.search(content[:ax._MAX_SCAN]))
+		_, actions = await ax.TaggedTextExtractor(auto_repair=True).extract(content)
+	return actions, needed_repair, time.perf_counter() - start
+
+
+async def _bench(target: str, tiers: list[str], rounds: int) -> list[dict]:
+	sys.path.insert(0, BACKEND_SRC)
+	import httpx
+	from app.services import action_extractor as ax
+	from app.services.llm import ACTION_TAG_DOCS
+
+	endpoint = ax._probe_endpoint(target)
+	if endpoint is None:
+		raise SystemExit(f"{target} endpoint is not configured")
+	system_prompt = "You are Z, a personal assistant that manages the user's Planka boards.\n" + ACTION_TAG_DOCS
+
+	rows = []
+	async with httpx.AsyncClient(timeout=httpx.Timeout(120.0, connect=10.0)) as client:
+		for tier in tiers:
+			latencies, counts, hits, repairs, errors = [], [], 0, 0, 0
+			for _ in range(rounds):
+				for text, expected in CORPUS:
+					try:
+						actions, needed_repair, secs = await _run_one(client, ax, endpoint, system_prompt, tier, text)
+					except Exception as e:
+						errors += 1
+						print(f"{tier}: {text[:40]!r} failed: {e}", file=sys.stderr)
+						continue
+					latencies.append(secs * 1000)
+					counts.append(len(actions))
+					hits += any(a.action_type == expected for a in actions)
+					repairs += needed_repair
+			latencies.sort()
+			n = len(latencies)
+			rows.append({
+				"tier": tier,
+				"n": n,
+				"errors": errors,
+				"actions": round(statistics.mean(counts), 2) if counts else 0,
+				"hit_pct": round(100 * hits / n, 1) if n else 0,
+				"repair_pct": round(100 * repairs / n, 1) if n else 0,
+				"p50_ms": round(statistics.median(latencies)) if n else 0,
+				"p95_ms": round(latencies[max(0, int(n * 0.95) - 1)]) if n else 0,
+			})
+	return rows
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--target", choices=("cloud", "local"), default="cloud")
+	parser.add_argument("--tiers", default="A,B,C")
+	parser.add_argument("--rounds", type=int, default=3)
+	args = parser.parse_args()
+
+	tiers = [t.strip().upper() for t in args.tiers.split(",") if t.strip().upper() in ("A", "B", "C")]
+	rows = asyncio.run(_bench(args.target, tiers, args.rounds))
+
+	header = f"{'tier':<5} {'n':>4} {'errors':>7} {'actions':>8} {'hit_%':>6} {'repair_%':>9} {'p50_ms':>7} {'p95_ms':>7}"
+	print(f"target: {args.target}")
+	print(header)
+	print("-" * len(header))
+	for r in rows:
+		print(
+			f"{r['tier']:<5} {r['n']:>4} {r['errors']:>7} {r['actions']:>8} {r['hit_pct']:>6} "
+			f"{r['repair_pct']:>9} {r['p50_ms']:>7} {r['p95_ms']:>7}"
+		)
+	return 0 if any(r["n"] for r in rows) else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Embedder backend micro-benchmark.
+
+Compares the EMBEDDER_BACKEND options (torch, onnx, onnx-int8) on the host it
+runs on. Each backend is measured in a fresh subprocess so RSS numbers are not
+polluted by a previously loaded model.
+
+Reported per backend:
+  load_s        cold model load time
+  rss_mb        resident set size after load + warm-up
+  p50/p95_ms    single-text encode latency (the interactive path)
+  batch_tps     texts/s for batched encode (EMBED_MAX_BATCH, the batcher path)
+  min_cos       worst cosine similarity against the torch vectors (drift)
+
+Usage (from the repo root, inside the backend container or a venv with
+src/backend/requirements.txt installed):
+
+	python scripts/bench_embedder.py
+	python scripts/bench_embedder.py --backends onnx,onnx-int8 --iterations 200
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "backend"))
+
+CORPUS = [
+	"Remind me to call the dentist on Thursday morning.",
+	"I prefer oat milk in my coffee and avoid dairy.",
+	"Move the quarterly tax card to In Progress.",
+	"Was steht morgen in meinem Kalender?",
+	"My daughter starts school in September.",
+	"Summarise what the fitness crew said about my training plan last week.",
+	"The flat needs a new boiler before winter.",
+	"Add eggs, spinach and feta to the shopping list.",
+] * 8
+
+
+def _worker(backend: str, iterations: int, batch_size: int, vectors_out: str) -> None:
+	"""Measure one backend in-process and print a JSON result line."""
+	import numpy as np
+	import psutil
+
+	sys.path.insert(0, BACKEND_SRC)
+	from app.services.embeddings import load_embedder
+
+	proc = psutil.Process()
+	start = time.perf_counter()
+	model = load_embedder(backend)
+	load_s = time.perf_counter() - start
+	model.encode(CORPUS[:4], batch_size=4, show_progress_bar=False)	# warm-up
+
+	latencies = []
+	for i in range(iterations):
+		text = CORPUS[i % len(CORPUS)]
+		t0 = time.perf_counter()
+		model.encode(text, show_progress_bar=False)
+		latencies.append((time.perf_counter() - t0) * 1000)
+	latencies.sort()
+
+	t0 = time.perf_counter()
+	rounds = max(1, iterations // len(CORPUS))
+	for _ in range(rounds):
+		vectors = model.encode(CORPUS, batch_size=batch_size, show_progress_bar=False)
+	batch_tps = (rounds * len(CORPUS)) / (time.perf_counter() - t0)
+
+	np.save(vectors_out, np.asarray(vectors, dtype=np.float32))
+	print(json.dumps({
+		"backend": backend,
+		"actual": type(model).__name__,
+		"load_s": round(load_s, 2),
+		"rss_mb": round(proc.memory_info().rss / 1e6, 1),
+		"p50_ms": round(statistics.median(latencies), 2),
+		"p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+		"batch_tps": round(batch_tps, 1),
+	}))
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+	parser.add_argument("--iterations", type=int, default=100)
+	parser.add_argument("--batch-size", type=int, default=32)
+	parser.add_argument("--worker", help=argparse.SUPPRESS)
+	parser.add_argument("--vectors-out", help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.worker:
+		_worker(args.worker, args.iterations, args.batch_size, args.vectors_out)
+		return 0
+
+	import numpy as np
+
+	results = []
+	with tempfile.TemporaryDirectory() as tmp:
+		for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+			out = os.path.join(tmp, f"{backend}.npy")
+			env = {**os.environ, "EMBEDDER_BACKEND": backend}
+			proc = subprocess.run(
+				[sys.executable, __file__, "--worker", backend, "--vectors-out", out,
+				 "--iterations", str(args.iterations), "--batch-size", str(args.batch_size)],
+				capture_output=True, text=True, env=env,
+			)
+			if proc.returncode != 0:
+				print(f"{backend}: failed\n{proc.stderr.strip()[-2000:]}", file=sys.stderr)
+				continue
+			row = json.loads(proc.stdout.strip().splitlines()[-1])
+			row["_vectors"] = np.load(out)
+			results.append(row)
+
+	reference = next((r["_vectors"] for r in results if r["backend"] == "torch"), None)
+	header = f"{'backend':<10} {'class':<20} {'load_s':>7} {'rss_mb':>8} {'p50_ms':>7} {'p95_ms':>7} {'batch_tps':>10} {'min_cos':>8}"
+	print(header)
+	print("-" * len(header))
+	for r in results:
+		min_cos = "-"
+		if reference is not None:
+			v = r["_vectors"]
+			cos = np.sum(v * reference, axis=1) / (np.linalg.norm(v, axis=1) * np.linalg.norm(reference, axis=1))
+			min_cos = f"{cos.min():.4f}"
+		print(
+			f"{r['backend']:<10} {r['actual']:<20} {r['load_s']:>7} {r['rss_mb']:>8} "
+			f"{r['p50_ms']:>7} {r['p95_ms']:>7} {r['batch_tps']:>10} {min_cos:>8}"
+		)
+	return 0 if results else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Local intent gate evaluation.
+
+Replays the labelled phrases from the router test suites through the local
+embedding gate (src/backend/app/services/intent_gate.py) and reports, per gate:
+
+  n            labelled phrases evaluated for that gate
+  local_%      share answered locally (outside the INTENT_GATE_MARGIN band)
+  agree_%      agreement with the expected answer among locally answered phrases
+  p50/p95_ms   per-phrase gate latency (embedding + centroid scoring)
+
+Labelled phrases:
+  tests/test_intent_router.py  *_classifies cases  -> PLANKA_MUTATION (answer: yes)
+                               *hedge* cases        -> CONVERSATION    (answer: no)
+  tests/test_router_eval.py    crew-domain messages -> CONVERSATION    (answer: no)
+
+Phrases that also appear in the seed set are scored leave-one-out (their own
+vector is removed from the centroid first), so agreement is not inflated by
+training on the eval set.
+
+Usage (from the repo root, inside the backend container or a venv with
+src/backend/requirements.txt installed):
+
+	python scripts/eval_intent_gate.py
+	python scripts/eval_intent_gate.py --margin 0.05
+"""
+import argparse
+import ast
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_SRC = os.path.join(ROOT, "src", "backend")
+
+
+def _parametrized(path: str) -> list[tuple[str, str]]:
+	"""Return (test_function_name, first_param_string) for every parametrize case."""
+	tree = ast.parse(open(path, encoding="utf-8").read())
+	cases = []
+	for node in tree.body:
+		if not isinstance(node, ast.FunctionDef):
+			continue
+		for deco in node.decorator_list:
+			if isinstance(deco, ast.Call) and getattr(deco.func, "attr", "") == "parametrize":
+				for value in ast.literal_eval(deco.args[1]):
+					text = value if isinstance(value, str) else value[0]
+					cases.append((node.name, text))
+	return cases
+
+
+def load_eval_set() -> list[tuple[str, str]]:
+	"""Return (text, expected_label) pairs from the router test suites."""
+	samples = []
+	for name, text in _parametrized(os.path.join(ROOT, "tests", "test_intent_router.py")):
+		if "hedge" in name:
+			samples.append((text, "CONVERSATION"))
+		elif name.endswith("_classifies"):
+			samples.append((text, "PLANKA_MUTATION"))
+	for name, text in _parametrized(os.path.join(ROOT, "tests", "test_router_eval.py")):
+		if name == "test_keyword_routing_accuracy":
+			samples.append((text, "CONVERSATION"))
+	return samples
+
+
+async def _run(margin: float) -> int:
+	import numpy as np
+	sys.path.insert(0, BACKEND_SRC)
+	from app.services.embeddings import encode_many
+	from app.services.intent_gate import CentroidClassifier, positive_labels, verdict_for_margin
+	from app.services.intent_seed import SEED_EXAMPLES
+
+	seed_texts = [t for phrases in SEED_EXAMPLES.values() for t in phrases]
+	seed_labels = [lbl for lbl, phrases in SEED_EXAMPLES.items() for _ in phrases]
+	seed_vecs = np.asarray(await encode_many(seed_texts), dtype=np.float32)
+	full = CentroidClassifier.fit(seed_vecs, seed_labels)
+	seed_index = {t.lower(): i for i, t in enumerate(seed_texts)}
+
+	heads = {
+		"system_action": lambda lbl: lbl in positive_labels("system_action"),
+		"MOVE_CARD (structural)": lambda lbl: lbl in positive_labels("MOVE_CARD"),
+		"needs_agent": lambda lbl: lbl in positive_labels("needs_agent"),
+	}
+	samples = load_eval_set()
+	rows = []
+	for head, expected_fn in heads.items():
+		positive = positive_labels(head.split()[0])
+		answered = agreed = 0
+		latencies = []
+		for text, label in samples:
+			t0 = time.perf_counter()
+			vec = np.asarray((await encode_many([text]))[0], dtype=np.float32)
+			clf = full
+			i = seed_index.get(text.lower())
+			if i is not None:
+				keep = [j for j in range(len(seed_texts)) if j != i]
+				clf = CentroidClassifier.fit(seed_vecs[keep], [seed_labels[j] for j in keep])
+			verdict = verdict_for_margin(clf.margin(vec, positive), margin)
+			latencies.append((time.perf_counter() - t0) * 1000)
+			if verdict is None:
+				continue
+			answered += 1
+			agreed += verdict == expected_fn(label)
+		latencies.sort()
+		rows.append((head, len(samples), answered, agreed, latencies))
+
+	header = f"{'gate':<24} {'n':>4} {'local_%':>8} {'agree_%':>8} {'p50_ms':>7} {'p95_ms':>7}"
+	print(f"margin band: +/-{margin}")
+	print(header)
+	print("-" * len(header))
+	for head, n, answered, agreed, lat in rows:
+		local_pct = 100.0 * answered / n if n else 0.0
+		agree_pct = 100.0 * agreed / answered if answered else 0.0
+		p95 = lat[max(0, int(len(lat) * 0.95) - 1)] if lat else 0.0
+		print(
+			f"{head:<24} {n:>4} {local_pct:>8.1f} {agree_pct:>8.1f} "
+			f"{statistics.median(lat) if lat else 0.0:>7.2f} {p95:>7.2f}"
+		)
+	return 0
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--margin", type=float, default=None, help="override INTENT_GATE_MARGIN")
+	args = parser.parse_args()
+	margin = args.margin
+	if margin is None:
+		sys.path.insert(0, BACKEND_SRC)
+		from app.config import settings
+		margin = settings.INTENT_GATE_MARGIN
+	return asyncio.run(_run(margin))
+
+
+if __name__ == "__main__":
+	sys.exit(main())
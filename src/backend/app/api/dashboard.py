@@ -19,8 +19,8 @@ import re
 from fastapi import APIRouter, Depends, HTTPException, Request, Header, BackgroundTasks
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func
-from app.models.db import AsyncSessionLocal, Project, EmailRule, Briefing, LLMMetric
+from sqlalchemy import select, delete
+from app.models.db import AsyncSessionLocal, Project, EmailRule, Briefing
 from app.services.memory import semantic_search, semantic_search_raw, list_memories as list_memories_svc, delete_memory
 from app.services.planka import get_project_tree
 from app.services.operator_board import operator_service
@@ -38,7 +38,6 @@ import os
 import posixpath
 import urllib.parse
 import subprocess
-import redis
 import logging
 
 logger = logging.getLogger(__name__)
@@ -296,12 +295,18 @@ class ChatRequest(BaseModel):
 	skip_history: bool = False
 
 @router.get("/chat/history")
-async def chat_history(request: Request, limit: int = 30, _rl: None = Depends(_check_rate_limit)):
-	"""Return the last N cross-channel messages for persistent chat UI."""
+async def chat_history(request: Request, limit: int = 30, before: Optional[str] = None, _rl: None = Depends(_check_rate_limit)):
+	"""Return the last N cross-channel messages for persistent chat UI.
+
+	Pass the returned `next_cursor` as `before` to load the next older page.
+	"""
 	limit = max(1, min(limit, 100))  # cap: 1–100
-	from app.models.db import get_global_history
-	msgs = await get_global_history(limit=limit)
-	return {"messages": msgs}
+	from app.models.db import get_global_history_page
+	try:
+		msgs, next_cursor = await get_global_history_page(limit=limit, before=before)
+	except ValueError:
+		raise HTTPException(status_code=400, detail="Invalid history cursor") from None
+	return {"messages": msgs, "next_cursor": next_cursor}
 
 @router.post("/chat")
 async def dashboard_chat(req: ChatRequest, request: Request, db: AsyncSession = Depends(get_db), _rl: None = Depends(_check_chat_rate_limit)):
@@ -499,7 +504,7 @@ async def dashboard_chat(req: ChatRequest, request: Request, db: AsyncSession =
 	elif msg == "/memories":
 		from app.services.memory import get_qdrant, COLLECTION_NAME
 		client = get_qdrant()
-		results, _ = client.scroll(collection_name=COLLECTION_NAME, limit=100)
+		results, _ = await client.scroll(collection_name=COLLECTION_NAME, limit=100)
 		if not results:
 			return {"reply": "No memories stored in the vault."}
 		
@@ -509,10 +514,11 @@ async def dashboard_chat(req: ChatRequest, request: Request, db: AsyncSession =
 		return {"reply": _r}
 	elif msg.startswith("/unlearn "):
 		query = msg.replace("/unlearn", "").strip()
-		from app.services.memory import get_qdrant, COLLECTION_NAME, get_embedder
+		from app.services.memory import get_qdrant, COLLECTION_NAME
+		from app.services.embeddings import encode
 		client = get_qdrant()
-		query_vector = get_embedder().encode(query).tolist()
-		results = client.query_points(collection_name=COLLECTION_NAME, query=query_vector, limit=1)
+		query_vector = await encode(query)
+		results = await client.query_points(collection_name=COLLECTION_NAME, query=query_vector, limit=1)
 		
 		if not results.points:
 			return {"reply": "No matching knowledge found to unlearn."}
@@ -704,17 +710,21 @@ async def regression_cleanup(request: Request, db: AsyncSession = Depends(get_db
 	try:
 		from app.services.memory import get_qdrant, COLLECTION_NAME
 		client = get_qdrant()
-		points, _ = client.scroll(collection_name=COLLECTION_NAME, limit=200)
+		points, _ = await client.scroll(collection_name=COLLECTION_NAME, limit=200)
 		_REGRESSION_PAT = re.compile(r'TEST.?MEMORY.?TOKEN|TEST.?UNLEARN.?TOKEN', re.IGNORECASE)
 		regression_ids = [p.id for p in points if _REGRESSION_PAT.search(p.payload.get("text", "") if p.payload else "")]
 		if regression_ids:
 			from qdrant_client.models import PointIdsList
-			client.delete(collection_name=COLLECTION_NAME, points_selector=PointIdsList(points=regression_ids))
+			await client.delete(collection_name=COLLECTION_NAME, points_selector=PointIdsList(points=regression_ids))
 			results.append(f"🧹 Deleted {len(regression_ids)} test memory vectors")
 	except Exception as e:
 		logger.warning("Memory regression cleanup failed: %s", e)
 		results.append("⚠️ Memory cleanup failed")
 	
+	# 5. Regression turns may be gone from global_messages — rebuild rolling history
+	from app.models.history_buffer import invalidate as invalidate_history
+	invalidate_history()
+
 	if not results:
 		results.append("✅ No regression artifacts found to clean.")
 	
@@ -945,14 +955,13 @@ async def save_inference(data: dict, db: AsyncSession = Depends(get_db)):
 async def reset_routing_lessons():
 	"""Wipe all routing lessons from Qdrant (two-step — frontend sends confirmation flag)."""
 	try:
-		from qdrant_client import QdrantClient
-		from app.config import settings as s
-		client = QdrantClient(host=s.QDRANT_HOST, port=s.QDRANT_PORT, api_key=s.QDRANT_API_KEY or None)
-		collections = [c.name for c in client.get_collections().collections]
+		from app.services.memory import get_qdrant
+		client = get_qdrant()
+		collections = [c.name for c in (await client.get_collections()).collections]
 		wiped = []
 		for col in ("routing_lessons",):
 			if col in collections:
-				client.delete_collection(col)
+				await client.delete_collection(col)
 				wiped.append(col)
 		return {"status": "ok", "wiped": wiped}
 	except Exception as exc:
@@ -969,17 +978,9 @@ async def get_recent_captures():
 	confidence, channel, reasoning (diagnostic payload, no phrase text).
 	"""
 	try:
-		import redis
-		from app.config import settings as s
-		r = redis.Redis(
-			host=s.REDIS_HOST,
-			port=s.REDIS_PORT,
-			password=s.REDIS_PASSWORD or None,
-			decode_responses=True,
-			socket_timeout=2.0,
-		)
+		from app.services.redis_pool import get_redis
 		import json as _json
-		raw_items = r.lrange("ambient_capture:events", 0, 19)
+		raw_items = await get_redis().lrange("ambient_capture:events", 0, 19)
 		events = []
 		for raw in raw_items:
 			try:
@@ -1230,13 +1231,10 @@ async def debug_planka(_: None = Depends(require_auth)):
 	Resets the in-memory cache so the response always reflects the live Planka state.
 	"""
 	try:
-		from app.services.planka import get_planka_auth_token
-		import httpx as _httpx
+		from app.services.planka_common import planka_client
 		from app.config import settings as _s
 
-		token = await get_planka_auth_token()
-		async with _httpx.AsyncClient(base_url=_s.PLANKA_BASE_URL, timeout=10.0,
-									  headers={"Authorization": f"Bearer {token}"}) as client:
+		async with planka_client(timeout=10.0) as client:
 			# Force full re-resolve (bypass cache)
 			operator_service._project_id = None
 			operator_service._board_id = None
@@ -1856,6 +1854,9 @@ async def server_info() -> dict:
 	}
 	# Attach peer discovery state so the dashboard can show which node is active
 	info["llm_peers"] = get_peer_status()
+	# Per-prompt-key KV prefix reuse (llama-server cache_n vs prompt_n)
+	from app.services.prompt_prefix import get_prefix_cache_stats
+	info["prompt_cache"] = get_prefix_cache_stats()
 	physical_cores = os.cpu_count() or 0
 
 	async with httpx.AsyncClient(timeout=5.0) as client:
@@ -2793,9 +2794,10 @@ async def get_system_status(db: AsyncSession = Depends(get_db)):
     # Software Metrics: Redis
     redis_detail = "0B / 0 keys"
     try:
-        r = redis.Redis(host="redis", password=settings.REDIS_PASSWORD, decode_responses=True)
-        r_info = r.info()
-        redis_detail = f"{r_info.get('used_memory_human', '0B')} / {r.dbsize()} keys"
+        from app.services.redis_pool import get_redis
+        r = get_redis()
+        r_info = await r.info()
+        redis_detail = f"{r_info.get('used_memory_human', '0B')} / {await r.dbsize()} keys"
     except Exception as e:
         logger.debug("Failed to get Redis stats: %s", e)
 
@@ -2926,61 +2928,21 @@ async def get_crews_history():
 
 
 @router.get("/llm-metrics")
-async def get_llm_metrics():
-	"""Return LLM usage analytics: per-feature call counts, avg latency, tier distribution."""
-	try:
-		async with AsyncSessionLocal() as session:
-			# Per-feature aggregates
-			rows = await session.execute(
-				select(
-					LLMMetric.feature,
-					LLMMetric.tier,
-					LLMMetric.model,
-					func.count(LLMMetric.id).label("calls"),
-					func.avg(LLMMetric.latency_ms).label("avg_latency_ms"),
-					func.sum(LLMMetric.tokens).label("total_tokens"),
-					func.max(LLMMetric.latency_ms).label("max_latency_ms"),
-				)
-				.group_by(LLMMetric.feature, LLMMetric.tier, LLMMetric.model)
-				.order_by(func.count(LLMMetric.id).desc())
-			)
-			feature_rows = rows.all()
-
-			# Tier totals
-			tier_rows = await session.execute(
-				select(
-					LLMMetric.tier,
-					func.count(LLMMetric.id).label("calls"),
-					func.avg(LLMMetric.latency_ms).label("avg_latency_ms"),
-				)
-				.group_by(LLMMetric.tier)
-			)
-			tier_totals = {r.tier: {"calls": r.calls, "avg_latency_ms": round(r.avg_latency_ms or 0)} for r in tier_rows.all()}
-
-			# Total recorded
-			total_result = await session.execute(select(func.count(LLMMetric.id)))
-			total = total_result.scalar() or 0
+async def get_llm_metrics(days: int = 30):
+	"""Return LLM usage analytics: per-feature call counts, latency percentiles, tier distribution.
 
-		features = [
-			{
-				"feature": r.feature,
-				"tier": r.tier,
-				"model": r.model or "",
-				"calls": r.calls,
-				"avg_latency_ms": round(r.avg_latency_ms or 0),
-				"max_latency_ms": r.max_latency_ms or 0,
-				"total_tokens": r.total_tokens or 0,
-			}
-			for r in feature_rows
-		]
-		return {
-			"total_recorded": total,
-			"by_tier": tier_totals,
-			"by_feature": features,
-		}
+	Read from the hourly rollups (services/llm_metrics.py), not the raw rows.
+	"""
+	days = max(1, min(days, 366))
+	from app.services.llm_cache import get_cache_stats
+	try:
+		from app.services.llm_metrics import get_summary
+		summary = await get_summary(days)
 	except Exception as e:
 		logger.error("get_llm_metrics failed: %s", e)
-		return {"total_recorded": 0, "by_tier": {}, "by_feature": []}
+		summary = {"total_recorded": 0, "by_tier": {}, "by_feature": []}
+	summary["response_cache"] = await get_cache_stats()
+	return summary
 
 
 @router.get("/llm-active")
@@ -3005,26 +2967,20 @@ async def get_ambient_status():
 	the briefing queue depth, global rate-limit counter, and per-rule
 	cooldown expirations.
 	"""
-	import redis as _redis_lib
 	import json as _j
 	from app.config import settings as s
+	from app.services.redis_pool import get_redis
 
 	try:
-		r = _redis_lib.Redis(
-			host=s.REDIS_HOST,
-			port=s.REDIS_PORT,
-			password=s.REDIS_PASSWORD or None,
-			decode_responses=True,
-			socket_timeout=2.0,
-		)
+		r = get_redis()
 
 		enabled = getattr(s, "AMBIENT_ENABLED", False)
 
 		# Pending triggers (priority 2-3 waiting for quiet moment)
-		pending_keys = r.keys("oz:ambient:pending:*")
+		pending_keys = await r.keys("oz:ambient:pending:*")
 		pending: list[dict] = []
 		for key in pending_keys:
-			raw = r.get(key)
+			raw = await r.get(key)
 			if raw:
 				try:
 					item = _j.loads(raw)
@@ -3033,17 +2989,17 @@ async def get_ambient_status():
 				except Exception as _e:
 					logger.debug("Skipping malformed pending item: %s", _e)
 		# Briefing queue depth
-		briefing_depth = r.llen("oz:ambient:briefing_queue")
+		briefing_depth = await r.llen("oz:ambient:briefing_queue")
 
 		# Global rate limit counter
-		rate_count = int(r.get("oz:ambient:hourly_trigger_count") or 0)
+		rate_count = int(await r.get("oz:ambient:hourly_trigger_count") or 0)
 		rate_max = getattr(s, "AMBIENT_MAX_TRIGGERS_PER_HOUR", 3)
 
 		# Per-rule cooldowns
-		cooldown_keys = r.keys("oz:ambient:cooldown:*")
+		cooldown_keys = await r.keys("oz:ambient:cooldown:*")
 		cooldowns: list[dict] = []
 		for key in cooldown_keys:
-			ttl = r.ttl(key)
+			ttl = await r.ttl(key)
 			rule_id = key.split("oz:ambient:cooldown:")[-1]
 			cooldowns.append({"rule_id": rule_id, "ttl_seconds": ttl})
 
@@ -3097,17 +3053,9 @@ async def dismiss_pending_trigger(rule_id: str):
 
 	Called when the user dismisses an ambient notification from the widget.
 	"""
-	import redis as _redis_lib
-	from app.config import settings as s
+	from app.services.redis_pool import get_redis
 	try:
-		r = _redis_lib.Redis(
-			host=s.REDIS_HOST,
-			port=s.REDIS_PORT,
-			password=s.REDIS_PASSWORD or None,
-			decode_responses=True,
-			socket_timeout=2.0,
-		)
-		deleted = r.delete(f"oz:ambient:pending:{rule_id}")
+		deleted = await get_redis().delete(f"oz:ambient:pending:{rule_id}")
 		return {"dismissed": bool(deleted), "rule_id": rule_id}
 	except Exception as exc:
 		logger.warning("dismiss-pending-trigger failed", exc_info=exc)
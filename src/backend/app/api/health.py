@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 import httpx
 from sqlalchemy import text
 from app.config import settings
@@ -24,8 +25,7 @@ async def _probe_qdrant() -> str:
 	"""Call get_collections() on Qdrant to verify connectivity."""
 	try:
 		from app.services.memory import get_qdrant
-		loop = asyncio.get_running_loop()
-		await loop.run_in_executor(None, lambda: get_qdrant().get_collections())
+		await get_qdrant().get_collections()
 		return "reachable"
 	except Exception as exc:
 		logger.warning("Qdrant health probe failed: %s", exc)
@@ -76,3 +76,14 @@ async def health_check_detailed():
 		"version": "1.0.0",
 		"services": services,
 	}
+
+
+@router.get("/metrics", dependencies=[Depends(require_auth)], include_in_schema=False)
+async def prometheus_metrics():
+	"""Prometheus scrape target (text format 0.0.4) for the API process's in-memory metrics.
+
+	Same bearer token as the dashboard; point a scraper on the Tailscale network at it with
+	`authorization: {credentials: <DASHBOARD_TOKEN>}`.
+	"""
+	from app.services.metrics import render_prometheus
+	return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
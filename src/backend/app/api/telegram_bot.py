@@ -613,14 +613,11 @@ async def _send_chunked_reply(thinking_msg, html_body: str, reply_markup=None, n
 async def cmd_board(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	"""Show the exact Planka project → board → lists that Z targets, with a clickable link."""
 	try:
-		from app.services.planka import get_planka_auth_token
+		from app.services.planka_common import planka_client
 		from app.services.operator_board import operator_service
-		import httpx
 		import html as _html
 
-		token = await get_planka_auth_token()
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0,
-									  headers={"Authorization": f"Bearer {token}"}) as client:
+		async with planka_client(timeout=10.0) as client:
 			# Force full re-resolve (bypass cache to get accurate IDs)
 			operator_service._project_id = None
 			operator_service._board_id = None
@@ -658,7 +655,7 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	"""Deep status check of all integrations."""
 	try:
 		from app.services.memory import get_memory_stats
-		from app.services.planka import get_planka_auth_token
+		from app.services.planka_common import get_planka_auth_token
 		
 		# 1. Memory
 		m_stats = await get_memory_stats()
@@ -1097,10 +1094,10 @@ async def cmd_unlearn(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	client = get_qdrant()
 	
 	# Find matching points
-	from app.services.memory import get_embedder
-	query_vector = get_embedder().encode(query).tolist()
+	from app.services.embeddings import encode
+	query_vector = await encode(query)
 	
-	results = client.query_points(
+	results = await client.query_points(
 		collection_name=COLLECTION_NAME,
 		query=query_vector,
 		limit=3
@@ -1125,7 +1122,7 @@ async def cmd_memories(update: Update, context: ContextTypes.DEFAULT_TYPE):
 	from app.services.memory import get_qdrant, COLLECTION_NAME
 	client = get_qdrant()
 	# Fetch 50 instead of 100 to stay safe with message limits
-	results, _ = client.scroll(collection_name=COLLECTION_NAME, limit=50)
+	results, _ = await client.scroll(collection_name=COLLECTION_NAME, limit=50)
 	if not results:
 		await safe_reply(update, "No memories stored in the vault.")
 		return
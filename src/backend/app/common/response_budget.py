@@ -4,13 +4,18 @@ ResponseBudget is injected at the start of route_message_stream and
 propagated via a ContextVar so every downstream coroutine can:
   - Check how much time remains
   - Skip optional steps when budget is low
+  - Share the single multi-head classification call for the message
 
 Circuit breaker state is stored in Redis (key: `circuit:llm_local:open`).
 After 3 consecutive local-LLM timeouts in 5 minutes, the local model is
 marked unavailable for CIRCUIT_OPEN_TTL_S seconds. All calls route to cloud.
+Each process mirrors the state in memory (see the Circuit Breaker section), so
+the per-call check is a local read rather than a Redis round-trip.
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import time
 from contextvars import ContextVar
@@ -36,6 +41,10 @@ class ResponseBudget:
 	"""Tracks elapsed + remaining time for a single response cycle."""
 	ceiling: float = RESPONSE_CEILING_S
 	_start: float = field(default_factory=time.monotonic, init=False, repr=False)
+	# Shared multi-head classification task (services/message_classifier.py) and
+	# the message text it was started for. Every router stage awaits the same call.
+	classification: Optional[asyncio.Future] = field(default=None, init=False, repr=False)
+	classified_text: str = field(default="", init=False, repr=False)
 
 	def elapsed(self) -> float:
 		return time.monotonic() - self._start
@@ -61,49 +70,70 @@ def get_budget() -> Optional[ResponseBudget]:
 
 
 # ─── Circuit Breaker ──────────────────────────────────────────────────────────
+#
+# Every process keeps an in-process mirror of the breaker (monotonic deadline
+# until which the circuit is open). is_local_llm_open() answers from it and
+# re-reads Redis at most once per CIRCUIT_CACHE_TTL_S; opening or resetting the
+# circuit is published on CIRCUIT_CHANNEL so other processes update at once.
+
+CIRCUIT_CACHE_TTL_S: float = 5.0
+CIRCUIT_CHANNEL = "circuit:llm_local"
+_OPEN_KEY = "circuit:llm_local:open"
+_FAILURES_KEY = "circuit:llm_local:failures"
+
+_circuit_open_until: float = 0.0
+_circuit_checked_at: float = float("-inf")
+_listener_task: Optional[asyncio.Task] = None
+
+
+def _set_circuit(open_for_s: float) -> None:
+	"""Update the in-process mirror: open for *open_for_s* seconds, closed when <= 0."""
+	global _circuit_open_until, _circuit_checked_at
+	now = time.monotonic()
+	_circuit_open_until = now + open_for_s if open_for_s > 0 else 0.0
+	_circuit_checked_at = now
+
 
 async def is_local_llm_open() -> bool:
 	"""Return True when circuit is open (local LLM should be skipped)."""
+	now = time.monotonic()
+	if now - _circuit_checked_at < CIRCUIT_CACHE_TTL_S:
+		return now < _circuit_open_until
 	try:
-		from app.config import settings
-		import redis.asyncio as aioredis
-		r = aioredis.from_url(
-			f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-			password=settings.REDIS_PASSWORD or None,
-			decode_responses=True,
-		)
-		async with r:
-			val = await r.get("circuit:llm_local:open")
-			return val == "1"
+		from app.services.redis_pool import get_redis
+		pipe = get_redis().pipeline(transaction=False)
+		pipe.get(_OPEN_KEY)
+		pipe.pttl(_OPEN_KEY)
+		val, ttl_ms = await pipe.execute()
+		if val == "1":
+			_set_circuit(ttl_ms / 1000 if ttl_ms > 0 else CIRCUIT_CACHE_TTL_S)
+		else:
+			_set_circuit(0)
 	except Exception as _e:
 		logger.debug("Circuit breaker Redis check failed: %s — defaulting closed", _e)
-		return False
+		_set_circuit(0)
+	return time.monotonic() < _circuit_open_until
 
 
 async def record_local_llm_timeout() -> None:
 	"""Record a local-LLM timeout. Opens the circuit after CB_FAILURE_THRESHOLD within CB_WINDOW_S."""
 	try:
-		from app.config import settings
-		import redis.asyncio as aioredis
-		r = aioredis.from_url(
-			f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-			password=settings.REDIS_PASSWORD or None,
-			decode_responses=True,
-		)
-		async with r:
-			pipe = r.pipeline()
-			key = "circuit:llm_local:failures"
-			pipe.incr(key)
-			pipe.expire(key, CB_WINDOW_S)
-			results = await pipe.execute()
-			count = results[0]
-			if count >= CB_FAILURE_THRESHOLD:
-				await r.set("circuit:llm_local:open", "1", ex=CIRCUIT_OPEN_TTL_S)
-				logger.warning(
-					"Circuit breaker OPENED for local LLM after %d timeouts in %ds window. "
-					"All traffic routed to cloud for %ds.",
-					count, CB_WINDOW_S, CIRCUIT_OPEN_TTL_S,
-				)
+		from app.services.redis_pool import get_redis
+		r = get_redis()
+		pipe = r.pipeline()
+		pipe.incr(_FAILURES_KEY)
+		pipe.expire(_FAILURES_KEY, CB_WINDOW_S)
+		results = await pipe.execute()
+		count = results[0]
+		if count >= CB_FAILURE_THRESHOLD:
+			await r.set(_OPEN_KEY, "1", ex=CIRCUIT_OPEN_TTL_S)
+			_set_circuit(CIRCUIT_OPEN_TTL_S)
+			await r.publish(CIRCUIT_CHANNEL, str(CIRCUIT_OPEN_TTL_S))
+			logger.warning(
+				"Circuit breaker OPENED for local LLM after %d timeouts in %ds window. "
+				"All traffic routed to cloud for %ds.",
+				count, CB_WINDOW_S, CIRCUIT_OPEN_TTL_S,
+			)
 	except Exception as _e:
 		logger.debug("Circuit breaker record_timeout failed: %s", _e)
 
@@ -111,14 +141,51 @@ async def record_local_llm_timeout() -> None:
 async def reset_local_llm_circuit() -> None:
 	"""Reset the circuit breaker (call after a successful local LLM response)."""
 	try:
-		from app.config import settings
-		import redis.asyncio as aioredis
-		r = aioredis.from_url(
-			f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-			password=settings.REDIS_PASSWORD or None,
-			decode_responses=True,
-		)
-		async with r:
-			await r.delete("circuit:llm_local:failures", "circuit:llm_local:open")
+		from app.services.redis_pool import get_redis
+		r = get_redis()
+		pipe = r.pipeline()
+		pipe.delete(_FAILURES_KEY)
+		pipe.delete(_OPEN_KEY)
+		_, was_open = await pipe.execute()
+		_set_circuit(0)
+		if was_open:
+			await r.publish(CIRCUIT_CHANNEL, "0")
 	except Exception as _e:
 		logger.debug("Circuit breaker reset failed: %s", _e)
+
+
+async def _listen_for_circuit_changes() -> None:
+	"""Apply breaker changes published by other processes to the local mirror."""
+	from app.services.redis_pool import get_redis
+	while True:
+		try:
+			async with get_redis().pubsub() as ps:
+				await ps.subscribe(CIRCUIT_CHANNEL)
+				async for message in ps.listen():
+					if message.get("type") != "message":
+						continue
+					try:
+						_set_circuit(float(message["data"]))
+					except (TypeError, ValueError):
+						logger.debug("Circuit breaker: ignoring message %r", message.get("data"))
+		except asyncio.CancelledError:
+			raise
+		except Exception as _e:
+			logger.debug("Circuit breaker listener dropped: %s — retrying", _e)
+		await asyncio.sleep(5)
+
+
+def start_circuit_listener() -> None:
+	"""Start the pub/sub listener that keeps the local mirror current (FastAPI startup)."""
+	global _listener_task
+	if _listener_task is None or _listener_task.done():
+		_listener_task = asyncio.create_task(_listen_for_circuit_changes())
+
+
+async def stop_circuit_listener() -> None:
+	global _listener_task
+	task, _listener_task = _listener_task, None
+	if task is not None:
+		task.cancel()
+		with contextlib.suppress(asyncio.CancelledError, Exception):
+			await task
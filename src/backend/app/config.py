@@ -43,12 +43,29 @@ class Settings(BaseSettings):
     # llama.cpp (default port 8081) and Ollama (default port 11434).
     # Example: LLM_PEER_CANDIDATES=http://100.x.y.z:11434,http://100.a.b.c:8081
     LLM_PEER_CANDIDATES: str = ""
+    # Concurrent requests per peer before further ones queue (match llama-server
+    # --parallel). Requests go to the least-loaded capable peer.
+    LLM_PEER_MAX_CONCURRENCY: int = 2
 
     # Cloud LLM — optional OpenAI-compatible inference provider (Groq, Together, OpenRouter, …)
     # Leave LLM_CLOUD_API_KEY empty to disable cloud tier; all cloud calls fall back to local.
     LLM_CLOUD_BASE_URL: str = ""
     LLM_CLOUD_API_KEY: str = ""
     LLM_MODEL_CLOUD: str = ""
+    # Max pooled keep-alive connections per LLM endpoint (services/llm_http.py).
+    # Cloud https endpoints use HTTP/2, so one connection carries concurrent calls.
+    LLM_HTTP_POOL_SIZE: int = 10
+    # Response cache for deterministic helper calls (email summaries, calendar
+    # extraction, keyword translation, context compression) — services/llm_cache.py.
+    LLM_CACHE_ENABLED: bool = True
+    # Max cached responses per feature before least recently used are evicted.
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    # LLM usage metrics (services/llm_metrics.py): buffered rows are bulk-inserted
+    # every LLM_METRICS_FLUSH_S seconds or once LLM_METRICS_FLUSH_ROWS are waiting,
+    # and folded into hourly rollups. Raw rows are pruned after the retention window.
+    LLM_METRICS_FLUSH_S: float = 5.0
+    LLM_METRICS_FLUSH_ROWS: int = 50
+    LLM_METRICS_RAW_RETENTION_H: int = 48
 
     # Cloud routing: when True and cloud is configured, use cloud as the primary model for
     # all interactive requests; fall back to local only if cloud is unavailable.
@@ -72,10 +89,93 @@ class Settings(BaseSettings):
     QDRANT_HOST: str = "qdrant"
     QDRANT_PORT: int = 6333
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY", "")
+    # Max pooled keep-alive HTTP connections held by the shared async Qdrant client.
+    QDRANT_POOL_SIZE: int = 10
     # Minimum cosine similarity score for injecting a retrieved memory into the chat
     # context.  Results below this threshold are silently discarded so topically
     # unrelated memories do not bleed into unrelated conversations.
     MEMORY_MIN_SCORE: float = 0.72
+    # Batched memory extraction (services/learning.py). User messages are queued on a
+    # Redis stream; up to MEMORY_EXTRACT_BATCH of them, gathered for at most
+    # MEMORY_EXTRACT_LINGER_S, share one extraction prompt. At most
+    # MEMORY_EXTRACT_CONCURRENCY batches run at once, and a batch waits until no
+    # message has arrived for MEMORY_EXTRACT_IDLE_S so it never competes with chat.
+    MEMORY_EXTRACT_BATCH: int = 8
+    MEMORY_EXTRACT_LINGER_S: float = 20.0
+    MEMORY_EXTRACT_CONCURRENCY: int = 1
+    MEMORY_EXTRACT_IDLE_S: float = 15.0
+
+    # Embedding backend for all-MiniLM-L6-v2 (same 384-dim vectors for all three):
+    #   torch      — sentence-transformers on PyTorch (default)
+    #   onnx       — onnxruntime fp32; no torch import, much lower RSS and cold start
+    #   onnx-int8  — onnxruntime int8-quantised; smallest/fastest, for 8 GB / Pi 5 hosts
+    EMBEDDER_BACKEND: str = "torch"
+    # Hugging Face commit of sentence-transformers/all-MiniLM-L6-v2 the onnx backends
+    # download tokenizer.json and the onnx/ exports from. Pinned so the files cannot
+    # drift from the torch vector space; change it only together with a parity check.
+    EMBEDDER_HF_REVISION: str = "c9745ed1d9f207416be6d2e6f8de32d1f16199bf"
+
+    # Embedding micro-batcher (services/embeddings.py). Concurrent encode requests
+    # are collected for up to EMBED_BATCH_WAIT_MS and run as one batched encode().
+    EMBED_MAX_BATCH: int = 32
+    EMBED_BATCH_WAIT_MS: float = 5.0
+    # Backpressure: callers wait once this many texts are queued.
+    EMBED_MAX_PENDING: int = 256
+    # In-process LRU of text -> vector (float32, ~1.5 KB per entry at 384 dims).
+    EMBED_CACHE_SIZE: int = 4096
+    # Also persist cached vectors in Redis so they survive restarts.
+    EMBED_CACHE_REDIS: bool = False
+
+    # Local intent gate (services/intent_gate.py): nearest-centroid classifier over
+    # the MiniLM embeddings that answers YES/NO routing gates without an LLM call.
+    # The LLM is consulted only when the centroid margin is inside +/- this band.
+    # Off by default until the margin is validated: in shadow mode the gate only
+    # classifies, the LLM/shared classifier still decides, and agreement is counted
+    # in intent_gate_shadow_total{head,result}. Enable once disagreement is low.
+    INTENT_GATE_ENABLED: bool = False
+    INTENT_GATE_SHADOW: bool = True
+    INTENT_GATE_MARGIN: float = 0.08
+
+    # Start the router's independent intercept lookups (state query, structural
+    # intent, board fallback, crew routing) concurrently when a message arrives.
+    # Stage precedence is unchanged, but the board-fallback lookup is a cloud LLM
+    # call that then runs on every message, including ones an earlier stage
+    # answers. Disabled by default until the latency gain is verified against that
+    # extra cloud spend; set ROUTER_SPECULATIVE=true to enable.
+    ROUTER_SPECULATIVE: bool = False
+
+    # Routing decision cache (services/routing_cache.py): re-sent or duplicate
+    # messages reuse crew routing, structural-intent, state-query and classifier
+    # decisions for this long. Crew reloads and board changes drop it. 0 disables.
+    ROUTING_CACHE_TTL_S: float = 300.0
+    ROUTING_CACHE_SIZE: int = 512
+
+    # Crew panels (NativeCrewEngine.run_crew_panel). Parallel mode runs the
+    # secondary crews' engagement gates while the primary streams and starts each
+    # engaged crew once the primary has produced CREW_PANEL_BRIEF_CHARS of output
+    # (0 = immediately, on the user message alone); sections are still emitted in
+    # panel order. Crew generations per LLM tier are capped by the *_CONCURRENCY
+    # limits so the local peer is never oversubscribed.
+    CREW_PANEL_PARALLEL: bool = True
+    CREW_PANEL_BRIEF_CHARS: int = 600
+    CREW_PANEL_LOCAL_CONCURRENCY: int = 1
+    CREW_PANEL_CLOUD_CONCURRENCY: int = 3
+
+    # Crew diaries (services/crew_memory.py) are appended to Postgres on every crew
+    # reply. A job every CREW_DIARY_COMPACT_INTERVAL_M minutes LLM-compresses a day
+    # once its uncompressed tail exceeds CREW_DIARY_COMPACT_CHARS, and the day's
+    # Planka card is rewritten in the background once the diary has been quiet for
+    # CREW_DIARY_PLANKA_DEBOUNCE_S.
+    CREW_DIARY_COMPACT_CHARS: int = 3000
+    CREW_DIARY_COMPACT_INTERVAL_M: int = 15
+    CREW_DIARY_PLANKA_DEBOUNCE_S: float = 30.0
+
+    # Scheduled briefings (services/crew_prefetch.py) fetch the crews' shared
+    # context once per run and ask at most BRIEFING_CREW_CONCURRENCY crews at a
+    # time; crews still running after BRIEFING_CREW_TIMEOUT_S are dropped from the
+    # briefing while the ones that finished keep their insight.
+    BRIEFING_CREW_CONCURRENCY: int = 4
+    BRIEFING_CREW_TIMEOUT_S: float = 90.0
 
     # Dashboard Authentication
     DASHBOARD_TOKEN: str = ""
@@ -84,11 +184,19 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: str = ""
+    # Max connections in the shared redis.asyncio pool (services/redis_pool.py)
+    REDIS_POOL_SIZE: int = 20
 
     # Planka
     PLANKA_BASE_URL: str = "http://planka:1337"
     PLANKA_ADMIN_EMAIL: str = ""
     PLANKA_ADMIN_PASSWORD: str = ""
+    # Max pooled keep-alive HTTP connections held by the shared Planka client.
+    PLANKA_POOL_SIZE: int = 10
+    # Shared Planka mirror: how often the project/board listing is re-read, and the
+    # max age of a board's cached cards (UI edits do not bump board updatedAt).
+    PLANKA_MIRROR_TTL_S: float = 15.0
+    PLANKA_MIRROR_MAX_AGE_S: float = 120.0
 
     # WhatsApp Cloud API (optional — leave empty to disable)
     # See BUILD.md "WhatsApp" section for setup instructions.
@@ -123,6 +231,11 @@ class Settings(BaseSettings):
     # (web search, etc.) via standard function-calling on /v1/chat/completions.
     # Disabled by default until verified with the configured provider.
     CLOUD_LLM_TOOLS: bool = True
+    # How LLM replies deliver actions (services/action_extractor.py):
+    # "auto" probes each endpoint at startup — native tool calls (Tier A), then
+    # JSON-schema output (Tier B), else [ACTION: ...] tags (Tier C).
+    # "native" / "json" / "tagged" pin a tier for every endpoint.
+    LLM_TOOL_CALLING_TIER: str = "auto"
     
     
     # Scheduling
@@ -4,11 +4,18 @@ import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from sqlalchemy import text
 
 from app.config import settings
 from app.models.db import engine, Base
-from app.services.memory import ensure_collection
+from app.models.migrations import run_migrations
+from app.services.memory import ensure_collection, init_qdrant, close_qdrant
+from app.services.planka_common import close_planka_client
+from app.services.crew_memory import flush_diary_projections
+from app.services.llm_http import init_llm_clients, close_llm_clients
+from app.services.redis_pool import init_redis, close_redis
+from app.common.response_budget import start_circuit_listener, stop_circuit_listener
+from app.services.learning import start_extraction_worker, stop_extraction_worker
+from app.services.llm_metrics import start_metrics_writer, stop_metrics_writer
 from app.api.telegram_bot import start_telegram_bot, stop_telegram_bot
 from app.tasks.scheduler import start_scheduler, stop_scheduler
 
@@ -44,148 +51,15 @@ async def lifespan(app: FastAPI):
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
-            # Clean up legacy persons table if it still exists on older installs
-            await conn.execute(text("DROP TABLE IF EXISTS people CASCADE;"))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS domain_inference_runs (
-	id SERIAL PRIMARY KEY,
-	run_at TIMESTAMP DEFAULT NOW(),
-	hint TEXT,
-	result JSONB DEFAULT '{}'::jsonb,
-	confidence FLOAT DEFAULT 0.5
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS domain_signals (
-	id SERIAL PRIMARY KEY,
-	run_id INTEGER REFERENCES domain_inference_runs(id) ON DELETE CASCADE,
-	signal_kind VARCHAR(64) NOT NULL,
-	payload JSONB DEFAULT '{}'::jsonb,
-	weight FLOAT DEFAULT 1.0,
-	captured_at TIMESTAMP DEFAULT NOW()
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_nodes (
-	id SERIAL PRIMARY KEY,
-	type VARCHAR(64) NOT NULL,
-	label TEXT NOT NULL,
-	payload JSONB DEFAULT '{}'::jsonb,
-	confidence FLOAT DEFAULT 0.5,
-	created_at TIMESTAMP DEFAULT NOW(),
-	updated_at TIMESTAMP DEFAULT NOW(),
-	last_mentioned_at TIMESTAMP
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_edges (
-	id SERIAL PRIMARY KEY,
-	source_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	target_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	kind VARCHAR(64) NOT NULL,
-	weight FLOAT DEFAULT 1.0,
-	payload JSONB DEFAULT '{}'::jsonb,
-	created_at TIMESTAMP DEFAULT NOW()
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_spines (
-	id SERIAL PRIMARY KEY,
-	label TEXT NOT NULL,
-	confidence FLOAT DEFAULT 0.5,
-	payload JSONB DEFAULT '{}'::jsonb,
-	derived BOOLEAN DEFAULT true,
-	locked BOOLEAN DEFAULT false,
-	updated_at TIMESTAMP DEFAULT NOW()
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_spine_members (
-	spine_id INTEGER NOT NULL REFERENCES atlas_spines(id) ON DELETE CASCADE,
-	node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	weight FLOAT DEFAULT 1.0,
-	PRIMARY KEY (spine_id, node_id)
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_spine_summaries (
-	spine_id INTEGER NOT NULL REFERENCES atlas_spines(id) ON DELETE CASCADE,
-	generated_at TIMESTAMP DEFAULT NOW(),
-	summary_text TEXT NOT NULL,
-	source_refs JSONB DEFAULT '[]'::jsonb
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_decisions (
-	id SERIAL PRIMARY KEY,
-	node_id INTEGER REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	made_at TIMESTAMP DEFAULT NOW(),
-	rationale TEXT,
-	revisit_when TEXT,
-	status VARCHAR(32) DEFAULT 'open',
-	payload JSONB DEFAULT '{}'::jsonb
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_contradictions (
-	id SERIAL PRIMARY KEY,
-	primary_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	opposing_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	detected_at TIMESTAMP DEFAULT NOW(),
-	status VARCHAR(32) DEFAULT 'open',
-	payload JSONB DEFAULT '{}'::jsonb
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_diffs (
-	id SERIAL PRIMARY KEY,
-	node_id INTEGER REFERENCES atlas_nodes(id) ON DELETE CASCADE,
-	spine_id INTEGER REFERENCES atlas_spines(id) ON DELETE CASCADE,
-	kind VARCHAR(64) NOT NULL,
-	since TIMESTAMP,
-	until TIMESTAMP,
-	summary TEXT,
-	payload JSONB DEFAULT '{}'::jsonb
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS atlas_why_traces (
-	id SERIAL PRIMARY KEY,
-	subject_kind VARCHAR(64) NOT NULL,
-	subject_id INTEGER,
-	generated_at TIMESTAMP DEFAULT NOW(),
-	source_refs JSONB DEFAULT '[]'::jsonb,
-	confidence FLOAT DEFAULT 0.5
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS operator_identity (
-	id SERIAL PRIMARY KEY,
-	name TEXT NOT NULL,
-	payload JSONB DEFAULT '{}'::jsonb
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS walkthroughs (
-	id SERIAL PRIMARY KEY,
-	title TEXT NOT NULL,
-	created_at TIMESTAMP DEFAULT NOW(),
-	briefing_id INTEGER,
-	payload JSONB DEFAULT '{}'::jsonb
-);
-"""))
-            await conn.execute(text("""
-CREATE TABLE IF NOT EXISTS walkthrough_stops (
-	id SERIAL PRIMARY KEY,
-	walkthrough_id INTEGER NOT NULL REFERENCES walkthroughs(id) ON DELETE CASCADE,
-	stop_order INTEGER NOT NULL,
-	node_id INTEGER REFERENCES atlas_nodes(id) ON DELETE SET NULL,
-	spine_id INTEGER REFERENCES atlas_spines(id) ON DELETE SET NULL,
-	narration TEXT,
-	payload JSONB DEFAULT '{}'::jsonb
-);
-"""))
 
+        # Versioned DDL (raw-SQL tables, indexes) — app/models/migrations.py
+        applied = await run_migrations(engine)
+        if applied:
+            logging.info("✓ Schema migrations applied: %s", applied)
+
+        # Rolling-history ring buffer (bus.ingest hot path) — app/models/history_buffer.py
+        from app.models.history_buffer import hydrate as hydrate_history
+        await hydrate_history()
         logging.info("✓ Postgres tables initialized and migrated.")
     except Exception as e:
         logging.warning("⚠ Warning: Could not connect to Postgres: %s", e)
@@ -196,6 +70,7 @@ CREATE TABLE IF NOT EXISTS walkthrough_stops (
         logging.warning("⚠ QDRANT_API_KEY not set in .env. Memory retrieval might fail.")
         
     try:
+        await init_qdrant()
         await ensure_collection()
         from app.services.memory import get_memory_stats
         stats = await get_memory_stats()
@@ -203,7 +78,23 @@ CREATE TABLE IF NOT EXISTS walkthrough_stops (
     except Exception as e:
         logging.warning("⚠ Warning: Could not connect to Qdrant: %s", e)
     
-    # 3. Start background tasks & bot (Heartbeat priority)
+    # 3. Pooled LLM endpoint clients (keep-alive / HTTP/2)
+    try:
+        init_llm_clients()
+        start_metrics_writer()  # buffered llm_metrics inserts + hourly rollups
+    except Exception as e:
+        logging.warning("⚠ Warning: LLM HTTP clients not initialised: %s", e)
+
+    # Shared Redis pool + local-LLM circuit breaker mirror (pub/sub updates)
+    # + the batched memory-extraction queue worker
+    try:
+        init_redis()
+        start_circuit_listener()
+        start_extraction_worker()
+    except Exception as e:
+        logging.warning("⚠ Warning: Redis pool not initialised: %s", e)
+
+    # 4. Start background tasks & bot (Heartbeat priority)
     try:
         from app.services.timezone import refresh_user_settings
         await refresh_user_settings()
@@ -223,7 +114,7 @@ CREATE TABLE IF NOT EXISTS walkthrough_stops (
         else:
             logging.info("WhatsApp not configured — channel inactive (set WHATSAPP_* vars to enable).")
         
-        # 4. Background Startup Sequence (Non-blocking)
+        # 5. Background Startup Sequence (Non-blocking)
         async def run_delayed_init():
             try:
                 logging.info("⚡ Background: Loading crew context...")
@@ -233,6 +124,13 @@ CREATE TABLE IF NOT EXISTS walkthrough_stops (
                 # Start autonomous LLM peer discovery (Tailscale / local net nodes)
                 from app.services.llm_peers import start_discovery_loop
                 await start_discovery_loop()
+
+                # Probe how each LLM endpoint can deliver actions (tool calls / JSON / tags)
+                try:
+                    from app.services.action_extractor import probe_tiers
+                    await probe_tiers()
+                except Exception as _tier_err:
+                    logging.warning("⚠ Action tier probe warning: %s", _tier_err)
                 
                 # Load personal/agent context (LLM compression)
                 try:
@@ -251,6 +149,13 @@ CREATE TABLE IF NOT EXISTS walkthrough_stops (
                 except Exception as _mem_err:
                     logging.warning("⚠ Embedder warming warning: %s", _mem_err)
 
+                # Train the local intent gate centroids so the first message pays no setup cost
+                try:
+                    from app.services.intent_gate import get_classifier
+                    await get_classifier()
+                except Exception as _ig_err:
+                    logging.warning("⚠ Intent gate warm-up warning: %s", _ig_err)
+
                 # Pre-load person name cache for cloud PII sanitiser
                 try:
                     from app.services.llm import _ensure_person_names_loaded
@@ -301,6 +206,14 @@ CREATE TABLE IF NOT EXISTS walkthrough_stops (
         await stop_scheduler()
     except Exception as _se:
         logging.debug("Shutdown error: %s", _se)
+    await close_qdrant()
+    await flush_diary_projections()
+    await close_planka_client()
+    await stop_metrics_writer()
+    await close_llm_clients()
+    await stop_circuit_listener()
+    await stop_extraction_worker()
+    await close_redis()
 
 
 app = FastAPI(
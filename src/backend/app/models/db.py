@@ -1,12 +1,15 @@
 from typing import Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, Date, DateTime, ForeignKey, Index, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 import datetime
+import logging
 import uuid
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 class Base(DeclarativeBase):
 	pass
 engine = create_async_engine(settings.DATABASE_URL, echo=False)
@@ -85,6 +88,11 @@ class GlobalMessage(Base):
     content = Column(Text, nullable=False)
     model = Column(String, nullable=True)  # LLM tier + model used for Z responses
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Keep in sync with migration 2 (app/models/migrations.py).
+    __table_args__ = (
+        Index("ix_global_messages_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_global_messages_role_created_at", role, created_at),
+    )
 
 class LLMMetric(Base):
     __tablename__ = "llm_metrics"
@@ -96,6 +104,45 @@ class LLMMetric(Base):
     latency_ms = Column(Integer)                 # wall-clock milliseconds
     prompt_len = Column(Integer)                 # approximate input length (chars)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Keep in sync with migration 2 (app/models/migrations.py).
+    __table_args__ = (
+        Index("ix_llm_metrics_created_at", created_at),
+        Index("ix_llm_metrics_feature_tier_model", feature, tier, model),
+    )
+
+class LLMMetricRollup(Base):
+    """Hourly pre-aggregate of llm_metrics, maintained by services/llm_metrics.py on each flush."""
+    __tablename__ = "llm_metric_rollups"
+    id = Column(Integer, primary_key=True)
+    hour = Column(DateTime, nullable=False)          # UTC, truncated to the hour
+    tier = Column(String, nullable=False)
+    feature = Column(String, nullable=False)
+    model = Column(String, nullable=False, default="")
+    calls = Column(Integer, nullable=False, default=0)
+    tokens = Column(BigInteger, nullable=False, default=0)
+    latency_sum_ms = Column(BigInteger, nullable=False, default=0)
+    latency_max_ms = Column(Integer, nullable=False, default=0)
+    latency_buckets = Column(JSON, nullable=False, default=list)  # counts per llm_metrics.LATENCY_BUCKETS_MS (+ overflow)
+    __table_args__ = (
+        UniqueConstraint("hour", "tier", "feature", "model", name="uq_llm_metric_rollups_key"),
+    )
+
+class CrewDiaryEntry(Base):
+    """Append-only crew conversation diary (services/crew_memory.py).
+
+    kind="exchange" rows hold one user/crew turn; kind="summary" rows are a compressed
+    rewrite of the day's diary up to and including entry covers_until_id."""
+    __tablename__ = "crew_diary_entries"
+    id = Column(Integer, primary_key=True)
+    crew_id = Column(String, nullable=False)
+    day = Column(Date, nullable=False)               # user-local calendar day
+    kind = Column(String, nullable=False, default="exchange")
+    content = Column(Text, nullable=False)
+    covers_until_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    __table_args__ = (
+        Index("ix_crew_diary_entries_crew_day", crew_id, day, id),
+    )
 
 class LocalEvent(Base):
     __tablename__ = "local_events"
@@ -158,6 +205,53 @@ async def save_global_message(channel: str, role: str, content: str, model: Opti
         msg = GlobalMessage(channel=channel, role=role, content=content, model=model)
         session.add(msg)
         await session.commit()
+    from app.models.history_buffer import get_buffer
+    get_buffer().append(msg)
+
+def _history_cursor(m: "GlobalMessage") -> str:
+    return f"{m.created_at.isoformat()}_{m.id}"
+
+
+_INT4_MIN, _INT4_MAX = -2**31, 2**31 - 1  # GlobalMessage.id is a Postgres integer
+
+
+def _parse_history_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    """Inverse of _history_cursor(); raises ValueError on a malformed cursor.
+
+    created_at is a naive UTC column and id a 32-bit integer, so a cursor with a
+    UTC offset or an out-of-range id is malformed too (the query would fail).
+    """
+    at, _, msg_id = cursor.rpartition("_")
+    parsed_at, parsed_id = datetime.datetime.fromisoformat(at), int(msg_id)
+    if parsed_at.tzinfo is not None:
+        raise ValueError("history cursor must not carry a UTC offset")
+    if not _INT4_MIN <= parsed_id <= _INT4_MAX:
+        raise ValueError("history cursor id out of range")
+    return parsed_at, parsed_id
+
+
+async def get_global_history_page(limit: int = 30, before: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+    """One page of history, newest page first, using a keyset cursor.
+
+    Rows are ordered by (created_at, id) and the page continues strictly before
+    *before* (a cursor returned by the previous call), so each read is an index
+    range scan of `limit` rows however deep the page. Returns the page in
+    chronological order and the cursor for the next (older) page, or None.
+    """
+    from sqlalchemy import tuple_
+    stmt = select(GlobalMessage).order_by(GlobalMessage.created_at.desc(), GlobalMessage.id.desc()).limit(limit + 1)
+    if before:
+        at, msg_id = _parse_history_cursor(before)
+        stmt = stmt.where(tuple_(GlobalMessage.created_at, GlobalMessage.id) < tuple_(at, msg_id))
+    async with AsyncSessionLocal() as session:
+        messages = (await session.execute(stmt)).scalars().all()
+    next_cursor = _history_cursor(messages[limit - 1]) if len(messages) > limit else None
+    page = messages[:limit]
+    return [
+        {"id": m.id, "role": m.role, "content": m.content, "channel": m.channel, "model": m.model, "at": m.created_at.isoformat() + "Z"}
+        for m in reversed(page)
+    ], next_cursor
+
 
 async def get_global_history(limit: int = 15):
     async with AsyncSessionLocal() as session:
@@ -266,9 +360,22 @@ async def get_rolling_history(days: int = 4, limit: int = 60):
     - On a quiet week the window spans as many days back as needed.
     - Error messages, bare acks, and short proactive reminders are excluded.
 
+    Served from the write-through ring buffer (app/models/history_buffer.py),
+    which is hydrated from Postgres on first use; the SQL path below remains
+    as the fallback when hydration fails.
+
     Returns messages in chronological order (oldest first), each as:
     {role, content, channel, model, at}
     """
+    from app.models import history_buffer
+    try:
+        if not history_buffer.get_buffer().hydrated:
+            await history_buffer.hydrate()
+        if history_buffer.get_buffer().hydrated:
+            return history_buffer.get_buffer().snapshot(days, limit)
+    except Exception as e:
+        logger.debug("history_buffer unavailable, querying Postgres: %s", e)
+
     per_role_cap = limit // 2   # 30 user + 30 z by default
     system_cap = 10
     cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=days)
@@ -335,7 +442,7 @@ async def get_range_exchanges(days: int = 7):
         return [{"role": m.role, "content": m.content, "at": m.created_at.isoformat() + "Z"} for m in messages]
 
 
-from sqlalchemy import JSON, Float
+from sqlalchemy import Float
 
 class AtlasNode(Base):
 	__tablename__ = "atlas_nodes"
@@ -0,0 +1,155 @@
+"""
+Rolling-History Ring Buffer
+---------------------------
+Write-through, in-process copy of the recent quality-filtered conversation so
+get_rolling_history() — called by MessageBus.ingest() on every inbound message
+— no longer fetches and re-filters up to 300 ORM rows.
+
+- save_global_message() appends each new row (append()); non-quality rows
+  only advance the sequence counter.
+- Quality messages sit in per-role ring buffers (user, z/assistant, system),
+  each entry tagged with its sequence number so the read path reproduces the
+  SQL query exactly: only the newest _WINDOW rows are candidates, filtered by
+  the `days` cutoff, then capped per role.
+- The buffer is hydrated once (startup, or lazily on the first read) from the
+  newest _WINDOW rows, and invalidate()d by anything that deletes history
+  rows behind its back (cleanup job, regression cleanup); the next read
+  rehydrates.
+
+All writers of global_messages run in the API process (APScheduler jobs
+included), so a per-process buffer stays coherent with the table.
+"""
+
+import datetime
+import logging
+from collections import deque
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Same candidate window as the original SQL (newest 300 rows, any role).
+_WINDOW = 300
+# Per-role capacity: enough for get_rolling_history(limit=...) up to 2 × this.
+_ROLE_CAPACITY = 100
+_SYSTEM_CAPACITY = 20
+
+
+def _bucket_for(role: str) -> Optional[str]:
+	if role == "user":
+		return "user"
+	if role in ("z", "assistant"):
+		return "z"
+	if role == "system":
+		return "system"
+	return None
+
+
+class RollingHistoryBuffer:
+	def __init__(self) -> None:
+		self._buckets: dict[str, deque] = {
+			"user": deque(maxlen=_ROLE_CAPACITY),
+			"z": deque(maxlen=_ROLE_CAPACITY),
+			"system": deque(maxlen=_SYSTEM_CAPACITY),
+		}
+		self._seq = 0
+		self._hydrated = False
+		self._hydrating = False
+		self._pending: list[Any] = []
+		self._max_id = 0
+		self._generation = 0
+
+	@property
+	def hydrated(self) -> bool:
+		return self._hydrated
+
+	def _push(self, m: Any) -> None:
+		from app.models.db import _is_quality_message
+		self._seq += 1
+		self._max_id = max(self._max_id, m.id or 0)
+		bucket = _bucket_for(m.role)
+		if bucket is None or not _is_quality_message(m.role, m.content, m.model):
+			return
+		self._buckets[bucket].append((self._seq, m.created_at, {
+			"role": m.role, "content": m.content, "channel": m.channel, "model": m.model,
+			"at": m.created_at.isoformat() + "Z",
+		}))
+
+	def append(self, m: Any) -> None:
+		"""Record a row that was just committed to global_messages."""
+		if self._hydrating:
+			self._pending.append(m)
+		elif self._hydrated:
+			self._push(m)
+
+	def load(self, rows_newest_first: list[Any]) -> None:
+		"""Replace the contents with the newest rows of the table (hydration)."""
+		for bucket in self._buckets.values():
+			bucket.clear()
+		self._seq = 0
+		self._max_id = 0
+		for m in reversed(rows_newest_first):
+			self._push(m)
+		self._hydrated = True
+
+	def invalidate(self) -> None:
+		self._generation += 1
+		self._hydrated = False
+		self._pending.clear()
+
+	def snapshot(self, days: int, limit: int) -> list[dict]:
+		"""get_rolling_history() semantics over the buffered rows."""
+		cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+		oldest_seq = self._seq - _WINDOW
+		per_role_cap = limit // 2
+		caps = {"user": per_role_cap, "z": per_role_cap, "system": 10}
+		picked: list[tuple] = []
+		for bucket, entries in self._buckets.items():
+			taken = 0
+			for seq, at, entry in reversed(entries):
+				if taken >= caps[bucket] or seq <= oldest_seq or at < cutoff:
+					break
+				picked.append((at, seq, entry))
+				taken += 1
+		picked.sort(key=lambda item: (item[0], item[1]))
+		return [dict(entry) for _, _, entry in picked[-limit:]]
+
+
+_buffer = RollingHistoryBuffer()
+
+
+def get_buffer() -> RollingHistoryBuffer:
+	return _buffer
+
+
+async def hydrate() -> None:
+	"""(Re)load the buffer from the newest rows of global_messages."""
+	from sqlalchemy import select
+	from app.models.db import AsyncSessionLocal, GlobalMessage
+	if _buffer._hydrating:
+		return	# another caller is loading; this one reads Postgres directly
+	generation = _buffer._generation
+	_buffer._hydrating = True
+	try:
+		async with AsyncSessionLocal() as session:
+			result = await session.execute(
+				select(GlobalMessage)
+				.order_by(GlobalMessage.created_at.desc(), GlobalMessage.id.desc())
+				.limit(_WINDOW)
+			)
+			rows = result.scalars().all()
+		if generation != _buffer._generation:
+			return	# invalidated while loading — the next read starts over
+		_buffer.load(rows)
+		# Rows committed while the query was in flight.
+		for m in sorted(_buffer._pending, key=lambda m: m.id or 0):
+			if (m.id or 0) > _buffer._max_id:
+				_buffer._push(m)
+		logger.debug("history_buffer: hydrated from %d rows", len(rows))
+	finally:
+		_buffer._hydrating = False
+		_buffer._pending.clear()
+
+
+def invalidate() -> None:
+	"""Drop the buffered history; the next read rehydrates from Postgres."""
+	_buffer.invalidate()
@@ -0,0 +1,270 @@
+"""
+Versioned Schema Migrations
+---------------------------
+Ordered DDL steps applied once each at startup (main.lifespan, after
+Base.metadata.create_all). Applied versions are recorded in schema_migrations;
+a Postgres advisory lock serialises concurrent workers so every step runs
+exactly once, each in its own transaction.
+
+Adding a migration: append a Migration with the next version number. Never
+edit or reorder an applied one — write a new step instead. Statements should
+be idempotent (IF NOT EXISTS) because fresh installs may already have the
+objects from create_all.
+"""
+
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant shared by every process that runs migrations.
+_LOCK_KEY = 0x6F7A6D67
+
+
+def _latency_bucket_counts(bounds: tuple[int, ...]) -> str:
+	"""SQL for per-bucket counts of llm_metrics.latency_ms (upper bounds + overflow)."""
+	parts, lower = [], None
+	for bound in bounds:
+		cond = f"COALESCE(latency_ms, 0) <= {bound}" if lower is None else f"COALESCE(latency_ms, 0) > {lower} AND COALESCE(latency_ms, 0) <= {bound}"
+		parts.append(f"COUNT(*) FILTER (WHERE {cond})")
+		lower = bound
+	parts.append(f"COUNT(*) FILTER (WHERE COALESCE(latency_ms, 0) > {lower})")
+	return ", ".join(parts)
+
+
+@dataclass(frozen=True)
+class Migration:
+	version: int
+	name: str
+	statements: tuple[str, ...]
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+	# Tables previously created by inline DDL in main.lifespan (raw-SQL
+	# subsystems without ORM models) and removal of the legacy people table.
+	Migration(1, "legacy_tables", (
+		"DROP TABLE IF EXISTS people CASCADE",
+		"""
+CREATE TABLE IF NOT EXISTS domain_inference_runs (
+	id SERIAL PRIMARY KEY,
+	run_at TIMESTAMP DEFAULT NOW(),
+	hint TEXT,
+	result JSONB DEFAULT '{}'::jsonb,
+	confidence FLOAT DEFAULT 0.5
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS domain_signals (
+	id SERIAL PRIMARY KEY,
+	run_id INTEGER REFERENCES domain_inference_runs(id) ON DELETE CASCADE,
+	signal_kind VARCHAR(64) NOT NULL,
+	payload JSONB DEFAULT '{}'::jsonb,
+	weight FLOAT DEFAULT 1.0,
+	captured_at TIMESTAMP DEFAULT NOW()
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_nodes (
+	id SERIAL PRIMARY KEY,
+	type VARCHAR(64) NOT NULL,
+	label TEXT NOT NULL,
+	payload JSONB DEFAULT '{}'::jsonb,
+	confidence FLOAT DEFAULT 0.5,
+	created_at TIMESTAMP DEFAULT NOW(),
+	updated_at TIMESTAMP DEFAULT NOW(),
+	last_mentioned_at TIMESTAMP
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_edges (
+	id SERIAL PRIMARY KEY,
+	source_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	target_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	kind VARCHAR(64) NOT NULL,
+	weight FLOAT DEFAULT 1.0,
+	payload JSONB DEFAULT '{}'::jsonb,
+	created_at TIMESTAMP DEFAULT NOW()
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_spines (
+	id SERIAL PRIMARY KEY,
+	label TEXT NOT NULL,
+	confidence FLOAT DEFAULT 0.5,
+	payload JSONB DEFAULT '{}'::jsonb,
+	derived BOOLEAN DEFAULT true,
+	locked BOOLEAN DEFAULT false,
+	updated_at TIMESTAMP DEFAULT NOW()
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_spine_members (
+	spine_id INTEGER NOT NULL REFERENCES atlas_spines(id) ON DELETE CASCADE,
+	node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	weight FLOAT DEFAULT 1.0,
+	PRIMARY KEY (spine_id, node_id)
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_spine_summaries (
+	spine_id INTEGER NOT NULL REFERENCES atlas_spines(id) ON DELETE CASCADE,
+	generated_at TIMESTAMP DEFAULT NOW(),
+	summary_text TEXT NOT NULL,
+	source_refs JSONB DEFAULT '[]'::jsonb
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_decisions (
+	id SERIAL PRIMARY KEY,
+	node_id INTEGER REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	made_at TIMESTAMP DEFAULT NOW(),
+	rationale TEXT,
+	revisit_when TEXT,
+	status VARCHAR(32) DEFAULT 'open',
+	payload JSONB DEFAULT '{}'::jsonb
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_contradictions (
+	id SERIAL PRIMARY KEY,
+	primary_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	opposing_node_id INTEGER NOT NULL REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	detected_at TIMESTAMP DEFAULT NOW(),
+	status VARCHAR(32) DEFAULT 'open',
+	payload JSONB DEFAULT '{}'::jsonb
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_diffs (
+	id SERIAL PRIMARY KEY,
+	node_id INTEGER REFERENCES atlas_nodes(id) ON DELETE CASCADE,
+	spine_id INTEGER REFERENCES atlas_spines(id) ON DELETE CASCADE,
+	kind VARCHAR(64) NOT NULL,
+	since TIMESTAMP,
+	until TIMESTAMP,
+	summary TEXT,
+	payload JSONB DEFAULT '{}'::jsonb
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS atlas_why_traces (
+	id SERIAL PRIMARY KEY,
+	subject_kind VARCHAR(64) NOT NULL,
+	subject_id INTEGER,
+	generated_at TIMESTAMP DEFAULT NOW(),
+	source_refs JSONB DEFAULT '[]'::jsonb,
+	confidence FLOAT DEFAULT 0.5
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS operator_identity (
+	id SERIAL PRIMARY KEY,
+	name TEXT NOT NULL,
+	payload JSONB DEFAULT '{}'::jsonb
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS walkthroughs (
+	id SERIAL PRIMARY KEY,
+	title TEXT NOT NULL,
+	created_at TIMESTAMP DEFAULT NOW(),
+	briefing_id INTEGER,
+	payload JSONB DEFAULT '{}'::jsonb
+)
+""",
+		"""
+CREATE TABLE IF NOT EXISTS walkthrough_stops (
+	id SERIAL PRIMARY KEY,
+	walkthrough_id INTEGER NOT NULL REFERENCES walkthroughs(id) ON DELETE CASCADE,
+	stop_order INTEGER NOT NULL,
+	node_id INTEGER REFERENCES atlas_nodes(id) ON DELETE SET NULL,
+	spine_id INTEGER REFERENCES atlas_spines(id) ON DELETE SET NULL,
+	narration TEXT,
+	payload JSONB DEFAULT '{}'::jsonb
+)
+""",
+	)),
+	# Secondary indexes for the history readers (rolling history on every
+	# inbound message, day/range recall, keyset-paginated chat history, cleanup)
+	# and the LLM metrics aggregates. Also declared on the models for create_all.
+	Migration(2, "history_and_metrics_indexes", (
+		"CREATE INDEX IF NOT EXISTS ix_global_messages_created_at_id ON global_messages (created_at DESC, id DESC)",
+		"CREATE INDEX IF NOT EXISTS ix_global_messages_role_created_at ON global_messages (role, created_at)",
+		"CREATE INDEX IF NOT EXISTS ix_llm_metrics_created_at ON llm_metrics (created_at)",
+		"CREATE INDEX IF NOT EXISTS ix_llm_metrics_feature_tier_model ON llm_metrics (feature, tier, model)",
+		"ANALYZE global_messages",
+		"ANALYZE llm_metrics",
+	)),
+	# Hourly LLM metric rollups (services/llm_metrics.py), backfilled from the
+	# raw rows still present so the dashboard keeps its history.
+	Migration(3, "llm_metric_rollups", (
+		"""
+CREATE TABLE IF NOT EXISTS llm_metric_rollups (
+	id SERIAL PRIMARY KEY,
+	hour TIMESTAMP NOT NULL,
+	tier VARCHAR NOT NULL,
+	feature VARCHAR NOT NULL,
+	model VARCHAR NOT NULL DEFAULT '',
+	calls INTEGER NOT NULL DEFAULT 0,
+	tokens BIGINT NOT NULL DEFAULT 0,
+	latency_sum_ms BIGINT NOT NULL DEFAULT 0,
+	latency_max_ms INTEGER NOT NULL DEFAULT 0,
+	latency_buckets JSON NOT NULL DEFAULT '[]',
+	CONSTRAINT uq_llm_metric_rollups_key UNIQUE (hour, tier, feature, model)
+)
+""",
+		f"""
+INSERT INTO llm_metric_rollups
+	(hour, tier, feature, model, calls, tokens, latency_sum_ms, latency_max_ms, latency_buckets)
+SELECT date_trunc('hour', created_at), tier, feature, COALESCE(model, ''), COUNT(*),
+	COALESCE(SUM(tokens), 0), COALESCE(SUM(latency_ms), 0), COALESCE(MAX(latency_ms), 0),
+	json_build_array({_latency_bucket_counts((100, 250, 500, 1000, 2000, 4000, 8000, 15000, 30000, 60000))})
+FROM llm_metrics
+WHERE NOT EXISTS (SELECT 1 FROM llm_metric_rollups)
+GROUP BY 1, 2, 3, 4
+""",  # noqa: S608 — interpolates only the integer bucket bounds literal above, never input
+	)),
+	# Local crew diaries (services/crew_memory.py); Planka cards become a projection.
+	Migration(4, "crew_diary_entries", (
+		"""
+CREATE TABLE IF NOT EXISTS crew_diary_entries (
+	id SERIAL PRIMARY KEY,
+	crew_id VARCHAR NOT NULL,
+	day DATE NOT NULL,
+	kind VARCHAR NOT NULL DEFAULT 'exchange',
+	content TEXT NOT NULL,
+	covers_until_id INTEGER,
+	created_at TIMESTAMP DEFAULT NOW()
+)
+""",
+		"CREATE INDEX IF NOT EXISTS ix_crew_diary_entries_crew_day ON crew_diary_entries (crew_id, day, id)",
+	)),
+)
+
+
+async def run_migrations(engine) -> list[int]:
+	"""Apply every pending migration in version order; returns the versions applied."""
+	from sqlalchemy import text
+	async with engine.begin() as conn:
+		await conn.execute(text(
+			"CREATE TABLE IF NOT EXISTS schema_migrations ("
+			"version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TIMESTAMP DEFAULT NOW())"
+		))
+	applied: list[int] = []
+	for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+		async with engine.begin() as conn:
+			await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+			done = (await conn.execute(
+				text("SELECT 1 FROM schema_migrations WHERE version = :v"), {"v": migration.version},
+			)).scalar()
+			if done:
+				continue
+			for statement in migration.statements:
+				await conn.execute(text(statement))
+			await conn.execute(
+				text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+				{"v": migration.version, "n": migration.name},
+			)
+		applied.append(migration.version)
+		logger.info("Schema migration %d (%s) applied", migration.version, migration.name)
+	return applied
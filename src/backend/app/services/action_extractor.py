@@ -9,7 +9,21 @@ Tier B — Constrained JSON output (response_format json_schema / Ollama format)
 Tier C — Tagged text + deterministic parser + auto-repair (universal fallback)
 
 All three tiers surface the same `list[ParsedAction]` to the caller. The router
-and agent_actions.py never need to know which tier produced the result.
+and agent_actions.py never need to know which tier produced the result: when a
+request ran on Tier A or B, llm.chat_stream() / llm.chat() render the structured
+actions back into canonical tags (ParsedAction.to_tag) in the field order the
+agent_actions.py patterns expect, so parse_and_execute_actions() only ever sees
+well-formed tags and no repair round-trip is needed.
+
+Tier A/B support is probed per endpoint ("cloud" and each local peer URL) at
+startup (probe_tiers) and cached; peers discovered later are probed on first
+use. Until then, and whenever a probe fails, the endpoint stays on Tier C. The
+local peer is only picked at dispatch, so local requests use a structured tier
+only when every capable peer shares it.
+
+On streamed replies, StreamingTagParser yields Tier C tags chunk by chunk as
+each closing `]` arrives (agent_actions.EarlyActionRunner starts idempotent
+card actions from it while generation continues).
 
 Usage::
 
@@ -21,10 +35,14 @@ Usage::
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Protocol, runtime_checkable
+from typing import Any, Protocol, runtime_checkable
+
+from app.services.metrics import increment_counter
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +58,37 @@ _VALID_ACTION_TYPES: frozenset[str] = frozenset({
 	"RENAME_BOARD", "RENAME_PROJECT", "AMBIENT_CAPTURE", "AMBIENT_TEACH",
 	"ADD_CARD_TASK", "CHECK_CARD_TASK", "UNCHECK_CARD_TASK", "RENAME_CARD_TASK",
 	"DELETE_CARD_TASK", "ROUTE",
+	"CREATE_EVENT", "REMIND", "SCHEDULE_CUSTOM", "LEARN", "PROXIMITY_TRACK",
+	"RUN_CREW", "SCHEDULE_CREW", "SET_NUDGE_INTERVAL",
 })
 
+# Field order of each verb as documented in ACTION_TAG_DOCS; several
+# agent_actions.py patterns are positional, so rendered tags must follow it.
+# Verbs not listed keep the order the model produced.
+_FIELD_ORDER: dict[str, tuple[str, ...]] = {
+	"CREATE_TASK": ("BOARD", "LIST", "TITLE", "DESCRIPTION"),
+	"CREATE_PROJECT": ("NAME", "DESCRIPTION"),
+	"CREATE_BOARD": ("PROJECT", "NAME"),
+	"CREATE_LIST": ("BOARD", "NAME"),
+	"CREATE_EVENT": ("TITLE", "START", "END"),
+	"REMIND": ("MESSAGE", "INTERVAL", "DURATION"),
+	"SCHEDULE_CUSTOM": ("NAME", "MESSAGE", "TYPE", "SPEC"),
+	"LEARN": ("TEXT",),
+	"PROXIMITY_TRACK": ("TASKS", "BREAKDOWN", "END"),
+	"RUN_CREW": ("CREW", "INPUT"),
+	"SCHEDULE_CREW": ("CREW", "CRON", "INPUT"),
+	"SET_CARD_DESC": ("CARD", "DESCRIPTION"),
+	"SET_NUDGE_INTERVAL": ("TASK", "INTERVAL"),
+	"MOVE_CARD": ("CARD", "LIST", "BOARD"),
+	"MARK_DONE": ("CARD",),
+	"ARCHIVE_CARD": ("CARD", "BOARD"),
+	"DELETE_CARD": ("CARD", "BOARD"),
+	"MOVE_BOARD": ("BOARD", "TO_PROJECT"),
+	"APPEND_SHOPPING": ("ITEMS",),
+	"AMBIENT_CAPTURE": ("CONTENT", "CATEGORY"),
+	"ROUTE": ("CREW",),
+}
+
 # Regex for a well-formed tag: [ACTION: TYPE | KEY: val ...]
 # The closing ] is mandatory for a tag to be considered valid.
 _VALID_TAG_RE = re.compile(
@@ -67,6 +114,17 @@ class ParsedAction:
 	raw_tag: str = ""					# original tag text including brackets
 	repaired: bool = False				# True if auto-repair round-trip was performed
 
+	def to_tag(self) -> str:
+		"""Canonical `[ACTION: TYPE | KEY: value ...]` text for parse_and_execute_actions().
+
+		Values lose the characters that would end a field or the tag early
+		(`|` → `/`, `]` → `)`).
+		"""
+		order = _FIELD_ORDER.get(self.action_type, ())
+		keys = [k for k in order if self.params.get(k)] + [k for k in self.params if k not in order and self.params[k]]
+		fields = "".join(f" | {k}: {self.params[k].replace('|', '/').replace(']', ')').strip()}" for k in keys)
+		return f"[ACTION: {self.action_type}{fields}]"
+
 
 @runtime_checkable
 class ActionExtractor(Protocol):
@@ -85,21 +143,27 @@ class ActionExtractor(Protocol):
 
 # ── Tier C: Tagged text extractor with auto-repair ───────────────────────────
 
+def _action_from_match(m: re.Match[str]) -> ParsedAction | None:
+	"""ParsedAction for one _VALID_TAG_RE match, or None for an unknown verb."""
+	action_type = m.group(1).upper()
+	if action_type not in _VALID_ACTION_TYPES:
+		logger.debug("action_extractor: unknown action type '%s' — skipped", action_type)
+		return None
+	body = m.group(2) or ""
+	params = {
+		kv.group(1).upper(): kv.group(2).strip().strip('"\'')
+		for kv in _KV_RE.finditer(body)
+	}
+	return ParsedAction(action_type=action_type, params=params, raw_tag=m.group(0))
+
+
 def _parse_tags(text: str) -> list[ParsedAction]:
 	"""Extract all valid [ACTION: TYPE | KEY: val ...] tags from *text*."""
 	actions: list[ParsedAction] = []
 	for m in _VALID_TAG_RE.finditer(text[:_MAX_SCAN]):
-		raw_tag = m.group(0)
-		action_type = m.group(1).upper()
-		if action_type not in _VALID_ACTION_TYPES:
-			logger.debug("action_extractor: unknown action type '%s' — skipped", action_type)
-			continue
-		body = m.group(2) or ""
-		params = {
-			kv.group(1).upper(): kv.group(2).strip().strip('"\'')
-			for kv in _KV_RE.finditer(body)
-		}
-		actions.append(ParsedAction(action_type=action_type, params=params, raw_tag=raw_tag))
+		action = _action_from_match(m)
+		if action is not None:
+			actions.append(action)
 	return actions
 
 
@@ -169,6 +233,7 @@ class TaggedTextExtractor:
 			if open_m:
 				broken_tag = open_m.group(0)
 				repaired = await _attempt_repair(broken_tag)
+				increment_counter("action_repairs_total", result="ok" if repaired else "failed")
 				if repaired:
 					actions.append(repaired)
 					logger.info(
@@ -187,75 +252,393 @@ class TaggedTextExtractor:
 		return clean, actions
 
 
-# ── Tier stubs (A and B) — Not yet implemented; fall back to Tier C ──────────
+# ── Tier C, streaming: incremental tag parser ───────────────────────────────
+
+# Text that may still grow into a _VALID_TAG_RE match: a prefix of "[ACTION:",
+# or an open tag whose body has not hit the 2000-char bound yet.
+_TAG_PREFIX_RE = re.compile(
+	r'\[(?:A(?:C(?:T(?:I(?:O(?:N(?::\s*[A-Z_]*\s*(?:\|[^\]]{0,2000})?)?)?)?)?)?)?)?$',
+	re.IGNORECASE,
+)
+
+
+class StreamingTagParser:
+	"""Push-based Tier C parser for a reply that arrives in chunks.
+
+	feed() each chunk as it streams; it returns the tags whose closing `]`
+	arrived in that chunk. Only the text from the last unmatched `[` is kept
+	between calls, so each chunk is scanned once instead of the whole reply
+	being re-parsed at the end. Over a full reply the emitted actions are
+	exactly _parse_tags() of the joined text, raw_tag included.
+	"""
+
+	def __init__(self) -> None:
+		self._tail = ""		# held text, starts at an unmatched '['
+		self._offset = 0	# position of _tail in the full reply
+
+	def feed(self, chunk: str) -> list[ParsedAction]:
+		if not chunk or self._offset >= _MAX_SCAN:
+			return []
+		text = self._tail + chunk
+		actions: list[ParsedAction] = []
+		pos = 0
+		while True:
+			start = text.find("[", pos)
+			if start < 0:
+				break
+			m = _VALID_TAG_RE.match(text, start)
+			if m:
+				if self._offset + m.end() > _MAX_SCAN:
+					break
+				action = _action_from_match(m)
+				if action is not None:
+					actions.append(action)
+				pos = m.end()
+				continue
+			if _TAG_PREFIX_RE.match(text, start):
+				# Still open: keep it for the next chunk.
+				self._offset += start
+				self._tail = text[start:]
+				return actions
+			pos = start + 1
+		self._offset += len(text)
+		self._tail = ""
+		return actions
+
+	@property
+	def pending(self) -> str:
+		"""Text of a tag that has opened but not closed yet."""
+		return self._tail
+
+
+# ── Tiers A and B: structured actions ───────────────────────────────────────
+
+ACTION_TOOL_NAME = "action"
+
+_ACTION_ITEM_SCHEMA: dict[str, Any] = {
+	"type": "object",
+	"properties": {
+		"type": {"type": "string", "enum": sorted(_VALID_ACTION_TYPES)},
+		"params": {"type": "object", "additionalProperties": {"type": "string"}},
+	},
+	"required": ["type", "params"],
+}
+
+_REPLY_SCHEMA: dict[str, Any] = {
+	"type": "object",
+	"properties": {
+		"reply": {"type": "string"},
+		"actions": {"type": "array", "items": _ACTION_ITEM_SCHEMA},
+	},
+	"required": ["reply", "actions"],
+}
+
+# Appended to the system prompt of requests that carry the tool / schema.
+TOOL_DIRECTIVE = (
+	"ACTION CHANNEL: perform every action by calling the `action` tool — type is the "
+	"action verb, params are the tag fields (e.g. BOARD, LIST, TITLE) — instead of "
+	"writing [ACTION: ...] tags in your reply."
+)
+JSON_DIRECTIVE = (
+	"OUTPUT FORMAT: answer with one JSON object. \"reply\" holds your message to the "
+	"user; \"actions\" lists every action as {\"type\": verb, \"params\": {field: value}} "
+	"using the tag verbs and fields — do not write [ACTION: ...] tags inside \"reply\"."
+)
+
+
+def action_tool_def() -> dict[str, Any]:
+	"""OpenAI-compatible tool definition for Tier A (one generic action tool)."""
+	return {
+		"type": "function",
+		"function": {
+			"name": ACTION_TOOL_NAME,
+			"description": "Perform one openZero action (same verbs and fields as the action tags). Call once per action.",
+			"parameters": _ACTION_ITEM_SCHEMA,
+		},
+	}
+
+
+def action_response_format() -> dict[str, Any]:
+	"""response_format for Tier B (OpenAI json_schema; llama.cpp compiles it to a grammar)."""
+	return {"type": "json_schema", "json_schema": {"name": "reply_with_actions", "schema": _REPLY_SCHEMA}}
+
+
+def _action_from_obj(obj: Any) -> ParsedAction | None:
+	"""{"type": ..., "params": {...}} → ParsedAction, or None when it is not a known verb."""
+	if not isinstance(obj, dict):
+		return None
+	action_type = str(obj.get("type") or "").strip().upper()
+	if action_type not in _VALID_ACTION_TYPES:
+		logger.debug("action_extractor: unknown structured action type '%s' — skipped", action_type[:40])
+		return None
+	raw_params = obj.get("params") if isinstance(obj.get("params"), dict) else {}
+	params = {str(k).strip().upper(): str(v).strip() for k, v in raw_params.items() if v is not None}
+	action = ParsedAction(action_type=action_type, params=params)
+	action.raw_tag = action.to_tag()
+	return action
+
+
+def actions_from_tool_calls(tool_calls: list[dict] | None) -> list[ParsedAction]:
+	"""ParsedActions from `action` tool calls ({name, arguments} or OpenAI {function: {...}})."""
+	actions: list[ParsedAction] = []
+	for tc in tool_calls or []:
+		fn = tc.get("function") or tc
+		if fn.get("name") != ACTION_TOOL_NAME:
+			continue
+		args = fn.get("arguments") or "{}"
+		try:
+			obj = json.loads(args) if isinstance(args, str) else args
+		except json.JSONDecodeError:
+			logger.warning("action_extractor: malformed action tool arguments dropped: %s", str(args)[:120])
+			increment_counter("actions_extracted_total", tier="A", result="dropped")
+			continue
+		action = _action_from_obj(obj)
+		if action:
+			actions.append(action)
+	return actions
+
+
+# Leading "reply" string of a Tier B object cut off at max_tokens.
+_PARTIAL_REPLY_RE = re.compile(r'^\s*\{\s*"reply"\s*:\s*"((?:[^"\\]|\\.){0,20000})')
+
+
+def decode_json_reply(raw_reply: str) -> tuple[str, list[ParsedAction]] | None:
+	"""Split a Tier B reply into (reply text, actions); None if it is not one.
+
+	A truncated object still yields the reply text it got to (and no actions).
+	"""
+	try:
+		obj = json.loads(raw_reply)
+	except ValueError:
+		m = _PARTIAL_REPLY_RE.match(raw_reply[:_MAX_SCAN])
+		if not m:
+			return None
+		try:
+			return json.loads(f'"{m.group(1).rstrip(chr(92))}"'), []
+		except ValueError:
+			return None
+	if not isinstance(obj, dict) or not isinstance(obj.get("reply"), str):
+		return None
+	items = obj.get("actions") if isinstance(obj.get("actions"), list) else []
+	return obj["reply"], [a for a in map(_action_from_obj, items) if a]
+
+
+def render_reply(text: str, actions: list[ParsedAction]) -> str:
+	"""Reply text followed by one canonical tag per action (the Tier C wire format)."""
+	if not actions:
+		return text
+	tags = "\n".join(a.to_tag() for a in actions)
+	return f"{text.rstrip()}\n{tags}" if text.strip() else tags
+
 
 class NativeToolExtractor:
-	"""Tier A — Native tool/function calling (OpenAI-compatible tools=[...]).
+	"""Tier A — actions arrive as `action` tool calls next to the prose reply.
 
-	Not yet implemented. Falls back to TaggedTextExtractor at runtime.
-	Raises NotImplementedError when called directly (kept for future use).
+	Tags the model still writes into the prose are parsed as well (without
+	repair), so a partially compliant model loses nothing.
 	"""
 
-	async def extract(self, raw_reply: str) -> tuple[str, list[ParsedAction]]:  # noqa: F811
-		raise NotImplementedError("Tier A native tool extraction not yet implemented.")
+	async def extract(self, raw_reply: str, tool_calls: list[dict] | None = None) -> tuple[str, list[ParsedAction]]:
+		structured = actions_from_tool_calls(tool_calls)
+		clean, tagged = await TaggedTextExtractor(auto_repair=False).extract(raw_reply)
+		record_extracted("A", structured, tagged)
+		return clean, tagged + structured
 
 
 class JsonSchemaExtractor:
-	"""Tier B — Constrained JSON output (response_format json_schema).
+	"""Tier B — the reply is a {"reply", "actions"} JSON object (response_format json_schema).
 
-	Not yet implemented. Falls back to TaggedTextExtractor at runtime.
-	Raises NotImplementedError when called directly (kept for future use).
+	A reply that is not such an object (e.g. truncated at max_tokens) is
+	treated as tagged text, without repair.
 	"""
 
-	async def extract(self, raw_reply: str) -> tuple[str, list[ParsedAction]]:  # noqa: F811
-		raise NotImplementedError("Tier B JSON schema extraction not yet implemented.")
+	async def extract(self, raw_reply: str) -> tuple[str, list[ParsedAction]]:
+		decoded = decode_json_reply(raw_reply)
+		if decoded is None:
+			logger.debug("action_extractor: Tier B reply is not a JSON object — parsing as tagged text")
+			clean, tagged = await TaggedTextExtractor(auto_repair=False).extract(raw_reply)
+			record_extracted("B", [], tagged)
+			return clean, tagged
+		text, structured = decoded
+		clean, tagged = await TaggedTextExtractor(auto_repair=False).extract(text)
+		record_extracted("B", structured, tagged)
+		return clean, tagged + structured
+
+
+def record_extracted(tier: str, structured: list[ParsedAction], tagged: list[ParsedAction]) -> None:
+	"""Count extracted actions by tier and origin (actions_extracted_total)."""
+	if structured:
+		increment_counter("actions_extracted_total", len(structured), tier=tier, result="structured")
+	if tagged:
+		increment_counter("actions_extracted_total", len(tagged), tier=tier, result="tagged")
 
 
 # ── Capability detection ──────────────────────────────────────────────────────
 
-def detect_tier() -> str:
-	"""Return the highest action-extraction tier supported by the current provider.
+# Probe deadline per request (anti-hallucination plan, Layer 4): a provider
+# that cannot answer a one-line tool call in time stays on Tier C.
+_PROBE_TIMEOUT_S = 2.0
 
-	Returns one of "A", "B", "C".
+_TIER_CACHE: dict[str, str] = {}			# "cloud" or local peer URL → tier
+_PROBES: dict[str, asyncio.Task] = {}		# background probes of unprobed peers
 
-	Detection logic:
-	  - If LLM_TOOL_CALLING_TIER is set in config, use it directly (operator override).
-	  - Otherwise default to "C" (universal fallback) until Tier A/B are implemented.
-	  - Once Tier A/B are implemented, probe the provider at startup.
 
-	Result is cached per process. Call reset_tier_cache() in tests to clear it.
-	"""
+def _tier_override() -> str | None:
+	"""LLM_TOOL_CALLING_TIER pinned by the operator, or None for "auto"."""
 	try:
 		from app.config import settings
 		tier_cfg = getattr(settings, "LLM_TOOL_CALLING_TIER", "auto").lower()
-		if tier_cfg in ("a", "native"):
-			return "A"
-		if tier_cfg in ("b", "json"):
-			return "B"
-		# "auto" or "c" / "tagged" → always pick C until A/B are production-ready.
-		return "C"
 	except Exception:
+		return None
+	if tier_cfg in ("a", "native"):
+		return "A"
+	if tier_cfg in ("b", "json"):
+		return "B"
+	if tier_cfg in ("c", "tagged"):
 		return "C"
+	return None
 
 
-_TIER_CACHE: str | None = None
+def _probe_endpoint(target: str) -> tuple[str, dict, dict] | None:
+	"""(chat completions URL, headers, base request) for *target*, or None if not configured."""
+	from app.config import settings
+	if target == "cloud":
+		if not settings.cloud_configured:
+			return None
+		base = settings.LLM_CLOUD_BASE_URL.rstrip("/")
+		api_url = (base if base.endswith("/v1") else f"{base}/v1") + "/chat/completions"
+		headers = {"Authorization": f"Bearer {settings.LLM_CLOUD_API_KEY}"}
+		return api_url, headers, {"model": settings.LLM_MODEL_CLOUD}
+	from app.services.llm_peers import get_capable_peers
+	peer = next((p for p in get_capable_peers() if p.url == target), None)
+	if peer is None:
+		return None
+	# Ollama routes by model name; llama-server ignores it
+	model = peer.model if peer.server_type == "ollama" and peer.model else "local"
+	return f"{peer.url.rstrip('/')}/v1/chat/completions", {}, {"model": model, "thinking": False}
+
+
+async def _probe(endpoint: tuple[str, dict, dict], extra: dict) -> dict | None:
+	"""One non-streaming completion; returns the response message or None."""
+	from app.services.llm_http import llm_client
+	api_url, headers, base = endpoint
+	body = {**base, "stream": False, "temperature": 0, "max_tokens": 128, **extra}
+	try:
+		async with llm_client(api_url) as client:
+			resp = await asyncio.wait_for(client.post(api_url, headers=headers, json=body), timeout=_PROBE_TIMEOUT_S)
+		resp.raise_for_status()
+		return (resp.json().get("choices") or [{}])[0].get("message") or {}
+	except Exception as e:
+		logger.debug("action_extractor: probe against %s failed: %s", api_url, e)
+		return None
+
+
+async def _supports_tools(endpoint: tuple[str, dict, dict]) -> bool:
+	message = await _probe(endpoint, {
+		"messages": [{"role": "user", "content": "Mark the card 'Probe' as done."}],
+		"tools": [action_tool_def()],
+		"tool_choice": "required",
+	})
+	return bool(message and actions_from_tool_calls(message.get("tool_calls")))
+
+
+async def _supports_json_schema(endpoint: tuple[str, dict, dict]) -> bool:
+	message = await _probe(endpoint, {
+		"messages": [{"role": "user", "content": "Say ok. No actions."}],
+		"response_format": action_response_format(),
+	})
+	return bool(message and decode_json_reply(message.get("content") or "") is not None)
 
 
-def get_extractor(streaming: bool = False) -> TaggedTextExtractor:
-	"""Return the appropriate extractor for the runtime provider.
+async def detect_tier(target: str = "cloud") -> str:
+	"""Return the highest action-extraction tier the *target* endpoint supports.
 
-	Always returns a TaggedTextExtractor (Tier C) until Tier A/B are ready.
-	*streaming* suppresses auto-repair round-trips on the hot stream path.
+	Returns one of "A", "B", "C"; *target* is "cloud" or a local peer's base URL.
+
+	Detection logic:
+	  - If LLM_TOOL_CALLING_TIER pins a tier, use it (operator override).
+	  - Otherwise probe the endpoint: a forced `action` tool call (Tier A), then a
+	    json_schema reply (Tier B), each with a _PROBE_TIMEOUT_S deadline.
+	  - Unconfigured endpoints, errors and timeouts pin Tier C.
+
+	Result is cached per target. Call reset_tier_cache() in tests to clear it.
+	"""
+	tier = _tier_override()
+	if tier is None:
+		tier = "C"
+		try:
+			endpoint = _probe_endpoint(target)
+			if endpoint is not None:
+				if await _supports_tools(endpoint):
+					tier = "A"
+				elif await _supports_json_schema(endpoint):
+					tier = "B"
+		except Exception as e:
+			logger.debug("action_extractor: tier probe for %s failed: %s", target, e)
+	_TIER_CACHE[target] = tier
+	return tier
+
+
+async def probe_tiers() -> dict[str, str]:
+	"""Probe the cloud endpoint and every local peer (FastAPI startup, after peer discovery)."""
+	from app.config import settings
+	from app.services.llm_peers import get_capable_peers
+	targets = (["cloud"] if settings.cloud_configured else []) + [p.url for p in get_capable_peers()]
+	tiers = dict(zip(targets, await asyncio.gather(*(detect_tier(t) for t in targets))))
+	logger.info("action_extractor: action tiers %s", ", ".join(f"{t}={tier}" for t, tier in tiers.items()))
+	return tiers
+
+
+def _probe_later(target: str) -> None:
+	"""Start detect_tier(target) in the background unless it is already running."""
+	if target in _PROBES:
+		return
+	try:
+		task = asyncio.get_running_loop().create_task(detect_tier(target))
+	except RuntimeError:
+		return
+	_PROBES[target] = task
+	task.add_done_callback(lambda _t: _PROBES.pop(target, None))
+
+
+def get_tier(target: str = "cloud") -> str:
+	"""Cached tier for *target*; the operator override or "C" before the startup probe.
+
+	For "local" this is the tier every capable peer shares ("C" if they differ),
+	since the peer is only picked at dispatch. A peer without a cached tier counts
+	as "C" and is probed in the background; tiers of peers that dropped out are
+	forgotten, so a restarted peer is probed again.
+	"""
+	if target != "local":
+		return _TIER_CACHE.get(target) or _tier_override() or "C"
+	from app.services.llm_peers import get_capable_peers
+	urls = [p.url for p in get_capable_peers()]
+	for stale in [u for u in _TIER_CACHE if u != "cloud" and u not in urls]:
+		del _TIER_CACHE[stale]
+	tiers = set()
+	for url in urls:
+		tier = _TIER_CACHE.get(url) or _tier_override()
+		if tier is None:
+			_probe_later(url)
+			tier = "C"
+		tiers.add(tier)
+	return tiers.pop() if len(tiers) == 1 else "C"
+
+
+def get_extractor(streaming: bool = False, target: str = "cloud") -> ActionExtractor:
+	"""Return the extractor for the tier detected on *target*.
+
+	*streaming* suppresses auto-repair round-trips on the hot stream path (Tier C).
 	"""
-	global _TIER_CACHE
-	if _TIER_CACHE is None:
-		_TIER_CACHE = detect_tier()
-		logger.info("action_extractor: provider tier detected as '%s'", _TIER_CACHE)
-	# Tier A and B not yet implemented — fall back to C regardless of tier.
+	tier = get_tier(target)
+	if tier == "A":
+		return NativeToolExtractor()
+	if tier == "B" and not streaming:
+		return JsonSchemaExtractor()
 	return TaggedTextExtractor(auto_repair=True, streaming=streaming)
 
 
 def reset_tier_cache() -> None:
 	"""Clear the cached tier detection. Used in tests."""
-	global _TIER_CACHE
-	_TIER_CACHE = None
+	_TIER_CACHE.clear()
+	_PROBES.clear()
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 from langchain_core.tools import tool
 from typing import Optional
 
+from app.services.metrics import increment_counter
+
 logger = logging.getLogger(__name__)
 
 
@@ -225,12 +227,9 @@ SENSITIVE_ACTIONS = {"SCHEDULE_CUSTOM", "LEARN", "CREATE_PROJECT", "CREATE_BOARD
 async def execute_move_board(board_name: str, target_project: str) -> str:
 	"""Move a Planka board to a different project. Returns a result string."""
 	from app.services.planka import move_board as planka_move_board
-	from app.config import settings as _cfg
-	from app.services.planka_common import get_planka_auth_token as _gat
-	import httpx as _httpx
+	from app.services.planka_common import planka_client
 	try:
-		token = await _gat()
-		async with _httpx.AsyncClient(base_url=_cfg.PLANKA_BASE_URL, timeout=15.0, headers={"Authorization": f"Bearer {token}"}) as client:
+		async with planka_client(timeout=15.0) as client:
 			pr = await client.get("/api/projects")
 			pr.raise_for_status()
 			projects = pr.json().get("items", [])
@@ -493,11 +492,111 @@ _NEW_BOARD_ITEM_RE = re.compile(
 )
 
 
-async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = False, user_text: str = "", crew_board_hint: str | None = None):
+# ─── Early execution while a reply streams ───────────────────────────────────
+# Card moves and description updates are idempotent (re-running one leaves the
+# card where/as it is) and never need HITL, so EarlyActionRunner starts them as
+# soon as their closing ']' streams in. parse_and_execute_actions() stays the
+# single authority: it reuses a successful early result for the identical tag
+# and re-runs anything that failed, was cancelled or never started.
+STREAMING_SAFE_ACTIONS = frozenset({"MOVE_CARD", "MARK_DONE", "SET_CARD_DESC"}) - SENSITIVE_ACTIONS
+
+
+def _early_call(action_type: str, raw_tag: str):
+	"""(card, executor) for a safe tag, parsed exactly as parse_and_execute_actions does; None if incomplete."""
+	m = re.match(rf"\[?ACTION:\s*{action_type}\b([^\]]*)\]?", raw_tag, re.IGNORECASE)
+	if not m:
+		return None
+	params = {}
+	for part in m.group(1).split("|"):
+		if ":" in part:
+			k, v = part.split(":", 1)
+			params[k.strip().upper()] = v.strip().strip('"\'')
+	card_frag = params.get("CARD", "").strip()
+	if not card_frag:
+		return None
+	if action_type == "MOVE_CARD":
+		dest_list = params.get("LIST", "").strip()
+		board = params.get("BOARD", "").strip()
+		if not dest_list:
+			return None
+		return card_frag, lambda: execute_move_card(card_frag, dest_list, board)
+	if action_type == "MARK_DONE":
+		return card_frag, lambda: execute_mark_done(card_frag)
+	desc_text = params.get("DESCRIPTION", "").strip() or params.get("DESC", "").strip()
+	if not desc_text:
+		return None
+	return card_frag, lambda: execute_set_card_desc(card_frag, desc_text)
+
+
+class EarlyActionRunner:
+	"""
+	Feeds streamed reply chunks through StreamingTagParser and starts the
+	STREAMING_SAFE_ACTIONS tags while generation continues.
+
+	Usage:
+		runner = EarlyActionRunner()
+		async for token in stream:
+			runner.feed(token)
+			yield token
+		early = await runner.results()
+		await bus.commit_reply(..., early_actions=early)
+
+	Skipped (left to the final pass): tags holding '[' in their body (an
+	anonymisation token such as [PERSON_1] is only rehydrated on the full
+	reply) and a second move / description tag for a card already started
+	— the final pass then re-runs all of that card's tags in its own order.
+	"""
+
+	def __init__(self) -> None:
+		from app.services.action_extractor import StreamingTagParser
+		self._parser = StreamingTagParser()
+		self._tasks: dict[str, asyncio.Task] = {}
+		self._claimed: dict[tuple[str, str], str] = {}	# (kind, card) -> raw_tag
+		self._contended: set[str] = set()
+
+	def feed(self, chunk: str) -> None:
+		for action in self._parser.feed(chunk):
+			raw_tag = action.raw_tag
+			if action.action_type not in STREAMING_SAFE_ACTIONS or raw_tag in self._tasks or "[" in raw_tag[1:]:
+				continue
+			call = _early_call(action.action_type, raw_tag)
+			if call is None:
+				continue
+			card_frag, executor = call
+			claim = ("desc" if action.action_type == "SET_CARD_DESC" else "move", card_frag.lower())
+			if claim in self._claimed:
+				self._contended.add(self._claimed[claim])
+				continue
+			self._claimed[claim] = raw_tag
+			self._tasks[raw_tag] = asyncio.create_task(executor())
+			increment_counter("streaming_actions_started_total", action=action.action_type)
+
+	async def results(self) -> dict[str, str]:
+		"""Wait for the started actions; raw_tag → result string for those the final pass can reuse."""
+		if not self._tasks:
+			return {}
+		outcomes = await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+		reusable: dict[str, str] = {}
+		for raw_tag, res in zip(self._tasks, outcomes):
+			if isinstance(res, BaseException):
+				logger.warning("Early action failed, final pass will retry: %s (%s)", _sanitize_for_log(raw_tag), res)
+			elif raw_tag not in self._contended and isinstance(res, str) and res and not res.startswith("\u26a0"):
+				reusable[raw_tag] = res
+		return reusable
+
+	def cancel(self) -> None:
+		"""Stop started actions, e.g. when the client disconnects before commit."""
+		for task in self._tasks.values():
+			task.cancel()
+
+
+async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = False, user_text: str = "", crew_board_hint: str | None = None, early_results: dict[str, str] | None = None):
 	"""
 	Parses Semantic Action Tags from the AI reply and executes them.
 	If require_hitl is True, sensitive actions are queued for approval instead of executed.
 	user_text: the original user message — used to clamp embellished titles.
+	early_results: raw_tag → result of tags EarlyActionRunner already executed
+	while the reply streamed; those are not executed a second time.
 	Returns: (clean_reply, executed_cmds, pending_actions)
 	"""
 	from app.services.planka import create_task as planka_create_task
@@ -539,8 +638,10 @@ async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = Fa
 			})
 			return True
 		else:
-			# Execute immediately
-			res = await executor_coro()
+			# Execute immediately (or take the result of the streamed early run)
+			res = early_results.pop(raw_tag, None) if early_results else None
+			if res is None:
+				res = await executor_coro()
 			if res:
 				if isinstance(res, str):
 					executed_cmds.append(res)
@@ -577,8 +678,7 @@ async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = Fa
 			try:
 				from app.config import settings as _cfg
 				from app.services.translations import get_all_values as _gav
-				from app.services.planka_common import get_planka_auth_token as _gat
-				import httpx as _httpx
+				from app.services.planka_common import planka_client
 				# System projects (Crews in every language) must stay as root-level Planka
 				# projects because crew boards are nested directly inside them.
 				_all_crew_names = _gav("crews_project_name")
@@ -597,11 +697,7 @@ async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = Fa
 					return f"\u26a0 Failed to create project '{name}'. Check Planka connection."
 				# User-initiated project: create a board inside the parent project
 				# (default "My Projects") rather than a new root-level project.
-				_tok = await _gat()
-				async with _httpx.AsyncClient(
-					base_url=_cfg.PLANKA_BASE_URL, timeout=15.0,
-					headers={"Authorization": f"Bearer {_tok}"},
-				) as _client:
+				async with planka_client(timeout=15.0) as _client:
 					_pr = await _client.get("/api/projects")
 					_pr.raise_for_status()
 					_parent = next(
@@ -652,11 +748,8 @@ async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = Fa
 				# The project-as-board is already in newly_created_boards — skip.
 				if proj_name.lower() in newly_created_boards:
 					return f"Board '{proj_name}' already created in 'My Projects' — skipping nested board '{board_name}'."
-				from app.services.planka import get_planka_auth_token
-				import httpx
-				from app.config import settings
-				token = await get_planka_auth_token()
-				async with httpx.AsyncClient(timeout=30.0, base_url=settings.PLANKA_BASE_URL, headers={"Authorization": f"Bearer {token}"}) as client:
+				from app.services.planka_common import planka_client
+				async with planka_client(timeout=30.0) as client:
 					# Fast path: project just created in this same response
 					proj_id = newly_created_projects.get(proj_name.lower())
 					if not proj_id:
@@ -703,13 +796,10 @@ async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = Fa
 
 		async def _exec_list(board_name=board_name, list_name=list_name):
 			try:
-				from app.services.planka_common import get_planka_auth_token
-				import httpx
-				from app.config import settings
+				from app.services.planka_common import planka_client
 
 				async def _post_list_on_board(bid: str) -> str:
-					token = await get_planka_auth_token()
-					async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=15.0, headers={"Authorization": f"Bearer {token}"}) as client:
+					async with planka_client(timeout=15.0) as client:
 						# Dedup: check if list already exists on this board
 						try:
 							b_det = await client.get(f"/api/boards/{bid}", params={"included": "lists"})
@@ -756,8 +846,7 @@ async def parse_and_execute_actions(reply: str, db=None, require_hitl: bool = Fa
 							return _r1
 
 				# Fallback C2: search existing Planka projects by name
-				_tok2 = await get_planka_auth_token()
-				async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=30.0, headers={"Authorization": f"Bearer {_tok2}"}) as _c2:
+				async with planka_client(timeout=30.0) as _c2:
 					_pr = await _c2.get("/api/projects")
 					_pr.raise_for_status()
 					_live = _pr.json().get("items", [])
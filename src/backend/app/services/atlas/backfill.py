@@ -54,7 +54,7 @@ async def run_backfill():
 	
 	try:
 		# 1. Fetch points from Qdrant
-		results, _ = client.scroll(
+		results, _ = await client.scroll(
 			collection_name=COLLECTION_NAME,
 			limit=500,
 			with_payload=True,
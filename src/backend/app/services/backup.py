@@ -424,13 +424,9 @@ def _sha256(data: bytes) -> str:
 async def _export_planka() -> tuple[PlankaExportV3, list[str]]:
 	exclusions: list[str] = []
 	try:
-		from app.services.planka_common import get_planka_auth_token
-		from app.config import settings
-		import httpx
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
+		from app.services.planka_common import planka_client
 		import asyncio
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=30.0, headers=headers) as client:
+		async with planka_client(timeout=30.0) as client:
 			resp = await client.get("/api/projects")
 			resp.raise_for_status()
 			projects_raw = resp.json().get("items", [])
@@ -609,7 +605,7 @@ async def _export_memory() -> tuple[list[MemoryPointNode], list[str]]:
 		points = []
 		offset = None
 		while True:
-			batch, next_offset = client.scroll(
+			batch, next_offset = await client.scroll(
 				collection_name=COLLECTION_NAME,
 				limit=256,
 				offset=offset,
@@ -830,15 +826,10 @@ async def _export_share_contracts() -> tuple[list[ShareContractExport], list[str
 async def _export_redis() -> tuple[RedisExport, list[str]]:
 	exclusions: list[str] = []
 	try:
-		import redis as _redis
-		from app.config import settings
-		r = _redis.Redis(
-			host=settings.REDIS_HOST, port=settings.REDIS_PORT,
-			password=settings.REDIS_PASSWORD or None,
-			decode_responses=True, socket_timeout=3.0,
-		)
-		ppo = r.get("planka_privacy_override")
-		aca = r.get("ambient_capture:authorship")
+		from app.services.redis_pool import get_redis
+		r = get_redis()
+		ppo = await r.get("planka_privacy_override")
+		aca = await r.get("ambient_capture:authorship")
 		return RedisExport(planka_privacy_override=ppo, ambient_capture_authorship=aca), exclusions
 	except Exception as exc:
 		return RedisExport(), [f"redis: {exc}"]
@@ -1208,15 +1199,11 @@ async def _import_planka(planka_raw: Optional[dict], conflict: str, report: Impo
 	if not planka_raw:
 		return
 	try:
-		from app.services.planka_common import get_planka_auth_token
-		from app.config import settings
-		import httpx
+		from app.services.planka_common import planka_client
 		p = PlankaExportV3(**planka_raw)
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
 		created = skipped = 0
 
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=30.0, headers=headers) as client:
+		async with planka_client(timeout=30.0) as client:
 			# Fetch existing projects
 			resp = await client.get("/api/projects")
 			resp.raise_for_status()
@@ -1390,30 +1377,35 @@ async def _import_memory(memory_raw: Optional[list], conflict: str, report: Impo
 	if not memory_raw:
 		return
 	try:
-		from app.services.memory import get_qdrant, COLLECTION_NAME, get_embedder
-		import asyncio
+		from app.services.memory import get_qdrant, COLLECTION_NAME
+		from app.services.embeddings import encode_many
 		client = get_qdrant()
 		from qdrant_client.models import PointStruct
 
-		points, _ = client.scroll(collection_name=COLLECTION_NAME, limit=10000, with_payload=True, with_vectors=False)
+		points, _ = await client.scroll(collection_name=COLLECTION_NAME, limit=10000, with_payload=True, with_vectors=False)
 		existing_texts = {(p.payload or {}).get("text", ""): True for p in points}
 
-		created = skipped = 0
-		loop = asyncio.get_event_loop()
-
+		skipped = 0
+		to_import: list[MemoryPointNode] = []
 		for raw_pt in memory_raw:
 			pt = MemoryPointNode(**raw_pt)
 			if pt.text in existing_texts and conflict == "skip":
 				skipped += 1
 				continue
-			def _encode_text(_t: str = pt.text) -> list:  # noqa: E306
-				return get_embedder().encode(_t).tolist()  # type: ignore[return-value]
-			vec = await loop.run_in_executor(None, _encode_text)
-			payload = {**pt.payload, "text": pt.text, "imported_from_backup": True}
-			client.upsert(collection_name=COLLECTION_NAME, points=[
-				PointStruct(id=pt.id, vector=vec, payload=payload)
+			to_import.append(pt)
+
+		# Embed in batches so a large restore neither issues one encode() per point
+		# nor holds every vector in memory at once.
+		created = 0
+		_BATCH = 64
+		for i in range(0, len(to_import), _BATCH):
+			chunk = to_import[i:i + _BATCH]
+			vectors = await encode_many([pt.text for pt in chunk])
+			await client.upsert(collection_name=COLLECTION_NAME, points=[
+				PointStruct(id=pt.id, vector=vec, payload={**pt.payload, "text": pt.text, "imported_from_backup": True})
+				for pt, vec in zip(chunk, vectors)
 			])
-			created += 1
+			created += len(chunk)
 
 		report.created["memory"] = created
 		report.skipped["memory"] = skipped
@@ -1673,24 +1665,19 @@ async def _import_redis(redis_raw: Optional[dict], conflict: str, report: Import
 	if not redis_raw:
 		return
 	try:
-		import redis as _redis
-		from app.config import settings
-		r = _redis.Redis(
-			host=settings.REDIS_HOST, port=settings.REDIS_PORT,
-			password=settings.REDIS_PASSWORD or None,
-			decode_responses=True, socket_timeout=3.0,
-		)
+		from app.services.redis_pool import get_redis
+		r = get_redis()
 		redis_exp = RedisExport(**redis_raw)
 		created = 0
 		if redis_exp.planka_privacy_override:
 			key = "planka_privacy_override"
-			if not r.exists(key) or conflict != "skip":
-				r.set(key, redis_exp.planka_privacy_override + ":imported_from_backup")
+			if not await r.exists(key) or conflict != "skip":
+				await r.set(key, redis_exp.planka_privacy_override + ":imported_from_backup")
 				created += 1
 		if redis_exp.ambient_capture_authorship:
 			key = "ambient_capture:authorship"
-			if not r.exists(key) or conflict != "skip":
-				r.set(key, redis_exp.ambient_capture_authorship + ":imported_from_backup")
+			if not await r.exists(key) or conflict != "skip":
+				await r.set(key, redis_exp.ambient_capture_authorship + ":imported_from_backup")
 				created += 1
 		report.created["redis"] = created
 	except Exception as exc:
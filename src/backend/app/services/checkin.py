@@ -109,83 +109,50 @@ def close_any_session_for_channel(channel: str) -> None:
 # ─── Data helpers ─────────────────────────────────────────────────────────────
 
 async def _fetch_boards_raw() -> list[dict]:
-	"""Fetch all boards with their cards and per-card timestamps from Planka.
+	"""Collect all boards with their cards and per-card timestamps from the shared Planka mirror.
 
 	Returns a list of dicts:
 	  {"name": str, "project": str, "last_updated": datetime, "cards": [str, ...]}
 	sorted by last_updated descending (most recent first).
 	"""
-	from app.services.planka import get_planka_auth_token, _is_done_list
-	from app.config import settings
-	import httpx
+	from app.services.planka import _is_done_list
+	from app.services.planka_mirror import get_planka_mirror
 	from datetime import datetime
 
 	boards: list[dict] = []
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(
-			base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers
-		) as client:
-			resp = await client.get("/api/projects")
-			projects = resp.json().get("items", [])
-
-			# Fetch project details in parallel to get board lists
-			project_resps = await asyncio.gather(
-				*[client.get(f"/api/projects/{p['id']}") for p in projects],
-				return_exceptions=True,
-			)
-
-			# Collect board stubs
-			board_stubs: list[tuple[str, str, str]] = []  # (project_name, board_name, board_id)
-			for p, p_resp in zip(projects, project_resps):
-				if isinstance(p_resp, BaseException):
-					continue
-				p_data = p_resp.json()
-				for b in p_data.get("included", {}).get("boards", []):
-					board_stubs.append((p["name"], b["name"], b["id"]))
-
-			# Fetch board details in parallel
-			board_resps = await asyncio.gather(
-				*[client.get(f"/api/boards/{bid}", params={"included": "lists,cards"})
-				  for _, _, bid in board_stubs],
-				return_exceptions=True,
-			)
-
-			_epoch = datetime(1970, 1, 1)
-
-			for (proj_name, board_name, board_id), b_resp in zip(board_stubs, board_resps):
-				if isinstance(b_resp, BaseException):
+		mirror = await get_planka_mirror()
+		_epoch = datetime(1970, 1, 1)
+
+		for board_id, board in mirror.boards.items():
+			proj_name = (mirror.projects.get(board.get("projectId", "")) or {}).get("name", "")
+			lists = mirror.lists_of(board_id)
+			done_ids = {l["id"] for l in lists if _is_done_list(l.get("name", ""))}
+			list_map = {l["id"]: l.get("name", "?") for l in lists}
+
+			active_cards: list[tuple[datetime, str, str, str]] = []  # (ts, card_name, list_name, desc)
+			for card in mirror.cards_of(board_id):
+				if card.get("listId") in done_ids:
 					continue
-				b_data = b_resp.json()
-				lists = b_data.get("included", {}).get("lists", [])
-				cards = b_data.get("included", {}).get("cards", [])
-				done_ids = {l["id"] for l in lists if _is_done_list(l.get("name", ""))}
-				list_map = {l["id"]: l.get("name", "?") for l in lists}
-
-				active_cards: list[tuple[datetime, str, str, str]] = []  # (ts, card_name, list_name, desc)
-				for card in cards:
-					if card.get("listId") in done_ids:
-						continue
-					raw_u = card.get("updatedAt") or card.get("createdAt") or ""
-					try:
-						ts = datetime.fromisoformat(raw_u.replace("Z", "")) if raw_u else _epoch
-					except ValueError:
-						ts = _epoch
-					list_name = list_map.get(card.get("listId", ""), "?")
-					desc = card.get("description") or ""
-					if len(desc) > 100:
-						desc = desc[:97] + "..."
-					active_cards.append((ts, card.get("name") or "?", list_name, desc))
-
-				last_updated = max(card[0] for card in active_cards) if active_cards else _epoch
-				boards.append({
-					"project": proj_name,
-					"name": board_name,
-					"board_id": board_id,
-					"last_updated": last_updated,
-					"cards": active_cards,  # list of (ts, name, list_name)
-				})
+				raw_u = card.get("updatedAt") or card.get("createdAt") or ""
+				try:
+					ts = datetime.fromisoformat(raw_u.replace("Z", "")) if raw_u else _epoch
+				except ValueError:
+					ts = _epoch
+				list_name = list_map.get(card.get("listId", ""), "?")
+				desc = card.get("description") or ""
+				if len(desc) > 100:
+					desc = desc[:97] + "..."
+				active_cards.append((ts, card.get("name") or "?", list_name, desc))
+
+			last_updated = max(card[0] for card in active_cards) if active_cards else _epoch
+			boards.append({
+				"project": proj_name,
+				"name": board.get("name", ""),
+				"board_id": board_id,
+				"last_updated": last_updated,
+				"cards": active_cards,  # list of (ts, name, list_name)
+			})
 	except Exception as exc:
 		logger.warning("_fetch_boards_raw failed: %s", exc)
 
@@ -34,11 +34,10 @@ def _earning_weeks() -> int:
 		return _EARNING_WEEKS_DEFAULT
 
 
-async def _redis():
-	import redis.asyncio as aioredis
-	from app.config import settings
-	url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-	return aioredis.from_url(url, password=settings.REDIS_PASSWORD or None, decode_responses=True)
+def _redis():
+	"""Shared pooled Redis client (services/redis_pool.py) as an `async with` block."""
+	from app.services.redis_pool import redis_client
+	return redis_client()
 
 
 def _current_iso_week() -> str:
@@ -56,7 +55,7 @@ async def record_briefing_sent() -> None:
 	"""Record that the morning briefing was dispatched in the current ISO week."""
 	try:
 		week = _current_iso_week()
-		async with await _redis() as r:
+		async with _redis() as r:
 			await r.set(f"briefing_sent_week:{week}", datetime.now(timezone.utc).isoformat(), ex=8 * 24 * 3600)
 		logger.debug("coach_earning: briefing sent recorded week=%s", week)
 	except Exception as _e:
@@ -72,7 +71,7 @@ async def record_briefing_read() -> None:
 	"""
 	try:
 		week = _current_iso_week()
-		async with await _redis() as r:
+		async with _redis() as r:
 			if not await r.exists(f"briefing_sent_week:{week}"):
 				return
 			last_week = await r.get("briefing_last_week")
@@ -99,7 +98,7 @@ async def record_briefing_read() -> None:
 async def reset_earning(crew_id: str) -> None:
 	"""Reset the earning streak (called when a briefing is skipped)."""
 	try:
-		async with await _redis() as r:
+		async with _redis() as r:
 			await r.delete(f"proactive_earned:{crew_id}")
 			await r.delete("briefing_streak")
 			await r.delete("briefing_last_week")
@@ -111,7 +110,7 @@ async def reset_earning(crew_id: str) -> None:
 async def check_earning(crew_id: str) -> bool:
 	"""Return True if the crew has earned proactive messaging status."""
 	try:
-		async with await _redis() as r:
+		async with _redis() as r:
 			return await r.get(f"proactive_earned:{crew_id}") == "1"
 	except Exception as _e:
 		logger.warning("coach_earning: check_earning failed: %s", _e)
@@ -1,30 +1,46 @@
 """Crew Conversation Memory Service
 -----------------------------------
-Maintains a per-crew conversation log in Planka:
+Keeps a per-crew conversation diary: one append-only Postgres table
+(crew_diary_entries) is the source of truth, mirrored into Planka as
 
   Project:  <crews_project_name>      (i18n, default "Crews")
   Board:    <crew display name>        (e.g. "Nutrition", "Fitness")
   List:     <crew_conversation_list>   (i18n, default "Conversation") — always first
   Card:     <date_str>                 (e.g. "2026.04.04", format from user setting)
-  Description: Rolling log of today's exchange — user + crew turns, re-summarised on each append.
+  Description: the day's diary — latest compressed summary plus the exchanges since.
                Truncated to MAX_DESC_CHARS with a "[...]" prefix when it grows too long.
 
+Crew replies never wait on Planka or an LLM:
+  - append_crew_exchange() inserts one row and marks the day for projection.
+  - compact_crew_diaries() (scheduled) compresses a day with the cloud LLM only
+    once its uncompressed tail exceeds CREW_DIARY_COMPACT_CHARS, stored as a
+    kind="summary" row.
+  - A background task rewrites the day's Planka card once the diary has been
+    quiet for CREW_DIARY_PLANKA_DEBOUNCE_S (flush_diary_projections() on shutdown).
+
 Public API:
   append_crew_exchange(crew_id, user_msg, crew_response)
-      Called after every crew response. Creates/updates today's card.
+      Called after every crew response.
 
   get_crew_memory_context(crew_id) -> str
       Returns recent conversation history formatted for injection into system prompt.
+
+  get_recent_crew_outputs() -> dict[str, str]
+      Latest diary day per active crew (briefings and reviews).
+
+Crews with no local diary yet (history from before the table existed) are read
+from their Planka cards as before.
 """
+import asyncio
+import contextlib
 import logging
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 import re
 
 import httpx
 
-from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -154,14 +170,9 @@ def _crew_board_name(crew_id: str) -> str:
 
 
 async def _planka_client():
-	"""Return an authenticated httpx.AsyncClient for Planka."""
-	from app.services.planka_common import get_planka_auth_token
-	token = await get_planka_auth_token()
-	return httpx.AsyncClient(
-		base_url=settings.PLANKA_BASE_URL,
-		headers={"Authorization": f"Bearer {token}"},
-		timeout=20.0,
-	)
+	"""Return an authenticated Planka session on the shared connection pool."""
+	from app.services.planka_common import planka_client
+	return planka_client(timeout=20.0)
 
 
 async def _get_or_create_crews_project(client: httpx.AsyncClient, project_name: str) -> str | None:
@@ -375,108 +386,269 @@ async def _patch_card_description(client: httpx.AsyncClient, card_id: str, descr
 		logger.warning("crew_memory: _patch_card_description failed for %s: %s", card_id, e)
 
 
-def _build_updated_description(current: str, user_msg: str, crew_response: str, now_str: str) -> str:
-	"""Append the new exchange to the current description, truncating if needed."""
-	# Strip action tags from crew response before storing
-	import re
+def _clean_crew_response(crew_response: str) -> str:
+	"""Strip action tags from a crew response before it is stored."""
 	clean_response = re.sub(r"\[?ACTION:[^\]]+\]?", "", crew_response).strip()
-	clean_response = re.sub(r"\n{3,}", "\n\n", clean_response)
+	return re.sub(r"\n{3,}", "\n\n", clean_response)
+
 
-	new_entry = (
+def _format_exchange(user_msg: str, crew_response: str, now_str: str) -> str:
+	return (
 		f"[{now_str}] User: {user_msg.strip()}\n"
-		f"[{now_str}] Crew: {clean_response[:800]}\n"
+		f"[{now_str}] Crew: {_clean_crew_response(crew_response)[:800]}\n"
 		"---\n"
 	)
-	updated = current + new_entry if current else new_entry
 
-	if len(updated) > MAX_DESC_CHARS:
-		truncated = updated[-MAX_DESC_CHARS:]
-		# Cut to nearest newline boundary
-		nl = truncated.find("\n")
-		if nl > 0:
-			truncated = truncated[nl + 1:]
-		updated = "[...earlier conversation omitted...]\n" + truncated
 
-	return updated
+def _truncate_diary(text: str) -> str:
+	"""Cap a diary at MAX_DESC_CHARS, cutting at a line boundary."""
+	if len(text) <= MAX_DESC_CHARS:
+		return text
+	truncated = text[-MAX_DESC_CHARS:]
+	nl = truncated.find("\n")
+	if nl > 0:
+		truncated = truncated[nl + 1:]
+	return "[...earlier conversation omitted...]\n" + truncated
+
+
+def _split_day(entries: list) -> tuple:
+	"""(latest summary or None, exchanges after it) for one day's entries in id order."""
+	summary = None
+	for e in entries:
+		if e.kind == "summary":
+			summary = e
+	if summary is None:
+		return None, [e for e in entries if e.kind == "exchange"]
+	return summary, [e for e in entries if e.kind == "exchange" and e.id > (summary.covers_until_id or 0)]
+
+
+# The diary owns only the part of a conversation card between these markers;
+# anything the user writes around them is kept.
+_DIARY_START = "<!-- crew-diary -->"
+_DIARY_END = "<!-- /crew-diary -->"
+
 
+def _merge_diary_block(description: str, diary: str) -> str:
+	"""*description* with its diary block replaced by *diary*, or the block appended when absent."""
+	block = f"{_DIARY_START}\n{diary.rstrip()}\n{_DIARY_END}"
+	start = description.find(_DIARY_START)
+	end = description.find(_DIARY_END, start) if start >= 0 else -1
+	if end >= 0:
+		return description[:start] + block + description[end + len(_DIARY_END):]
+	return f"{description.rstrip()}\n\n{block}" if description.strip() else block
 
-async def _compress_daily_diary(current: str, user_msg: str, crew_response: str, now_str: str) -> str:
-	"""Update and compress the rolling log of today's exchange into a clean, dense, bulleted summary."""
+
+def _day_text(entries: list) -> str:
+	"""The diary text for one day: compressed summary (if any) followed by newer exchanges."""
+	summary, tail = _split_day(entries)
+	head = summary.content.strip() + "\n" if summary is not None else ""
+	return _truncate_diary(head + "".join(e.content for e in tail))
+
+
+async def _local_now() -> datetime:
 	try:
-		from app.services.llm import chat
-		import re
+		return datetime.now(await _get_user_timezone())
+	except Exception:
+		return datetime.now(timezone.utc)
+
+
+async def append_crew_exchange(crew_id: str, user_msg: str, crew_response: str) -> None:
+	"""Append one exchange to the crew's diary (one INSERT; Planka is updated later)."""
+	try:
+		from app.models.db import AsyncSessionLocal, CrewDiaryEntry
+		now_local = await _local_now()
+		async with AsyncSessionLocal() as session:
+			session.add(CrewDiaryEntry(
+				crew_id=crew_id,
+				day=now_local.date(),
+				kind="exchange",
+				content=_format_exchange(user_msg, crew_response, now_local.strftime("%H:%M")),
+			))
+			await session.commit()
+		_schedule_projection(crew_id, now_local.date())
+	except Exception as e:
+		logger.warning("crew_memory: append_crew_exchange failed: %s", e)
+
+
+async def _load_diary_days(crew_ids: list[str], since: Optional[date] = None) -> dict[str, dict[date, list]]:
+	"""Entries grouped as {crew_id: {day: [entries in id order]}}.
+
+	With *since* every day from then on is loaded; otherwise only each crew's latest day.
+	"""
+	from sqlalchemy import and_, func, select
+	from app.models.db import AsyncSessionLocal, CrewDiaryEntry as E
+	if not crew_ids:
+		return {}
+	query = select(E).where(E.crew_id.in_(crew_ids))
+	if since is not None:
+		query = query.where(E.day >= since)
+	else:
+		latest = (
+			select(E.crew_id, func.max(E.day).label("day"))
+			.where(E.crew_id.in_(crew_ids))
+			.group_by(E.crew_id)
+			.subquery()
+		)
+		query = query.join(latest, and_(E.crew_id == latest.c.crew_id, E.day == latest.c.day))
+	async with AsyncSessionLocal() as session:
+		rows = (await session.execute(query.order_by(E.crew_id, E.day, E.id))).scalars().all()
+	out: dict[str, dict[date, list]] = {}
+	for e in rows:
+		out.setdefault(e.crew_id, {}).setdefault(e.day, []).append(e)
+	return out
+
 
-		# Strip action tags from crew response before storing/sending
-		clean_response = re.sub(r"\[?ACTION:[^\]]+\]?", "", crew_response).strip()
-		clean_response = re.sub(r"\n{3,}", "\n\n", clean_response)
+# ─── Compaction (scheduled) ──────────────────────────────────────────────────
 
+async def _compress_daily_diary(current: str, new_exchanges: str) -> Optional[str]:
+	"""Fold *new_exchanges* into the day's summary with the cloud LLM; None on failure."""
+	try:
+		from app.services.llm import chat
 		prompt = (
 			f"You are a dense information compression engine for openZero.\n"
 			f"Update and compress the daily conversation diary log for a crew board.\n\n"
 			f"Existing diary log summary:\n\"\"\"\n{current}\n\"\"\"\n\n"
-			f"New exchange to incorporate:\n"
-			f"- Time: {now_str}\n"
-			f"- User message: {user_msg.strip()}\n"
-			f"- Crew response: {clean_response}\n\n"
+			f"New exchanges to incorporate:\n\"\"\"\n{new_exchanges}\n\"\"\"\n\n"
 			f"Output a single, unified, highly dense, bulleted summary of the entire day's conversation, "
 			f"key decisions made, actions/topics discussed, and context.\n"
 			f"CRITICAL: Do NOT use emojis. Indent using tabs. Spell the project name as openZero. "
 			f"Keep it extremely compact and token-efficient so it fits in a small context window."
 		)
-
-		# Call cloud tier LLM
 		summary = await chat(
 			user_message=prompt,
 			system_override="You are a dense, professional memory summarization utility for openZero.",
-			tier="cloud"
+			tier="cloud",
+			_feature="crew_diary_compress",
 		)
-		if summary and summary.strip():
+		if summary and summary.strip() and not summary.startswith(("I'm having trouble reaching", "Unknown LLM provider")):
 			return summary.strip()
 	except Exception as e:
-		logger.warning("crew_memory: _compress_daily_diary LLM pass failed, falling back to raw append: %s", e)
+		logger.warning("crew_memory: _compress_daily_diary LLM pass failed: %s", e)
+	return None
 
-	# Fallback to standard raw appending
-	return _build_updated_description(current, user_msg, crew_response, now_str)
 
+async def compact_crew_diaries() -> int:
+	"""Compress every recent diary day whose uncompressed tail exceeds CREW_DIARY_COMPACT_CHARS.
 
-async def append_crew_exchange(crew_id: str, user_msg: str, crew_response: str) -> None:
-	"""Create or update today's conversation card for the given crew."""
+	Only today and yesterday are considered (exchanges are only ever appended to
+	the current day). Returns the number of days compressed; a failed LLM pass
+	leaves the raw entries for the next run.
+	"""
+	from app.config import settings
+	from app.models.db import AsyncSessionLocal, CrewDiaryEntry
+	from app.services.crews import crew_registry
+	from app.services.metrics import increment_counter
+	crew_ids = [c.id for c in crew_registry.list_active()]
+	since = (await _local_now()).date() - timedelta(days=1)
+	diaries = await _load_diary_days(crew_ids, since=since)
+	compacted = 0
+	for crew_id, days in diaries.items():
+		for day, entries in sorted(days.items()):
+			summary, tail = _split_day(entries)
+			if not tail or sum(len(e.content) for e in tail) <= settings.CREW_DIARY_COMPACT_CHARS:
+				continue
+			current = summary.content if summary is not None else ""
+			compressed = await _compress_daily_diary(current, "".join(e.content for e in tail))
+			if compressed is None:
+				increment_counter("crew_diary_compactions_total", result="error")
+				continue
+			async with AsyncSessionLocal() as session:
+				session.add(CrewDiaryEntry(
+					crew_id=crew_id, day=day, kind="summary", content=compressed,
+					covers_until_id=tail[-1].id,
+				))
+				await session.commit()
+			increment_counter("crew_diary_compactions_total", result="ok")
+			_schedule_projection(crew_id, day)
+			compacted += 1
+	if compacted:
+		logger.info("crew_memory: compressed %d diary day(s)", compacted)
+	return compacted
+
+
+# ─── Planka projection (debounced, background) ───────────────────────────────
+# (crew_id, day) → (first_marked, last_marked) in monotonic seconds. A day is
+# written once it has been quiet for the debounce interval, or after five
+# intervals at the latest so a busy crew's card never lags far behind.
+_projection_due: dict[tuple[str, date], tuple[float, float]] = {}
+_projection_task: Optional[asyncio.Task] = None
+_MAX_DEBOUNCE_FACTOR = 5
+
+
+def _schedule_projection(crew_id: str, day: date) -> None:
+	global _projection_task
+	now = time.monotonic()
+	first, _ = _projection_due.get((crew_id, day), (now, now))
+	_projection_due[(crew_id, day)] = (first, now)
+	if _projection_task is None or _projection_task.done():
+		with contextlib.suppress(RuntimeError):	# no running loop: the next append retries
+			_projection_task = asyncio.get_running_loop().create_task(_run_projections())
+
+
+async def _run_projections() -> None:
+	from app.config import settings
+	debounce = max(0.0, settings.CREW_DIARY_PLANKA_DEBOUNCE_S)
+	while _projection_due:
+		now = time.monotonic()
+		waits = {
+			key: min(last + debounce, first + debounce * _MAX_DEBOUNCE_FACTOR) - now
+			for key, (first, last) in _projection_due.items()
+		}
+		due = [key for key, wait in waits.items() if wait <= 0]
+		if not due:
+			await asyncio.sleep(min(waits.values()))
+			continue
+		for key in due:
+			_projection_due.pop(key, None)
+			await _project_day(*key)
+
+
+async def _project_day(crew_id: str, day: date) -> None:
+	"""Write one diary day to its Planka conversation card."""
 	try:
+		entries = (await _load_diary_days([crew_id], since=day)).get(crew_id, {}).get(day)
+		if not entries:
+			return
 		from app.services.translations import get_translations, get_user_lang
 		lang = await get_user_lang()
 		t = get_translations(lang)
 		project_name: str = t.get("crews_project_name", "Crews")
 		list_name: str = t.get("crew_conversation_list", "Conversation")
-
-		date_fmt = await _get_user_date_format()
-		try:
-			tz = await _get_user_timezone()
-			now_local = datetime.now(tz)
-		except Exception:
-			now_local = datetime.now(timezone.utc)
-
-		date_str = now_local.strftime(date_fmt)
-		time_str = now_local.strftime("%H:%M")
-		board_name = _crew_board_name(crew_id)
+		date_str = day.strftime(await _get_user_date_format())
 
 		async with await _planka_client() as client:
 			project_id = await _get_or_create_crews_project(client, project_name)
 			if not project_id:
 				return
-			board_id = await _get_or_create_crew_board(client, project_id, board_name)
+			board_id = await _get_or_create_crew_board(client, project_id, _crew_board_name(crew_id))
 			if not board_id:
 				return
 			list_id = await _get_or_create_conversation_list(client, board_id, list_name, crew_id)
 			if not list_id:
 				return
-			card_id, current_desc = await _get_or_create_today_card(client, board_id, list_id, date_str)
+			card_id, current = await _get_or_create_today_card(client, board_id, list_id, date_str)
 			if not card_id:
 				return
-			updated_desc = await _compress_daily_diary(current_desc, user_msg, crew_response, time_str)
-			await _patch_card_description(client, card_id, updated_desc)
-			logger.info("crew_memory: updated conversation card for crew '%s' (%s)", crew_id.replace('\n', ' ').replace('\r', ' '), date_str)
+			description = _merge_diary_block(current, _day_text(entries))
+			if description == current:
+				return
+			await _patch_card_description(client, card_id, description)
+			logger.info("crew_memory: updated conversation card for crew '%s' (%s)", _sl(crew_id), date_str)
 	except Exception as e:
-		logger.warning("crew_memory: append_crew_exchange failed: %s", e)
+		logger.warning("crew_memory: Planka projection failed for crew '%s': %s", _sl(crew_id), e)
+
+
+async def flush_diary_projections() -> None:
+	"""Write every pending diary card now (FastAPI shutdown)."""
+	global _projection_task
+	task, _projection_task = _projection_task, None
+	if task is not None:
+		task.cancel()
+		with contextlib.suppress(asyncio.CancelledError, Exception):
+			await task
+	for key in list(_projection_due):
+		_projection_due.pop(key, None)
+		await _project_day(*key)
 
 
 MAX_BOARD_CONTEXT_CHARS = 2000
@@ -555,12 +727,54 @@ async def get_crew_board_work_context(crew_id: str) -> str:
 		return ""
 
 
+def _format_memory_context(days: list[tuple[str, str]]) -> str:
+	"""[(date label, diary text)] oldest first → crew prompt section, capped at MAX_CONTEXT_CHARS."""
+	parts = [f"[{label}]\n{text.strip()}" for label, text in days if text.strip()]
+	if not parts:
+		return ""
+	full = "\n\n".join(parts)
+	if len(full) > MAX_CONTEXT_CHARS:
+		full = "[...older history omitted...]\n" + full[-MAX_CONTEXT_CHARS:]
+	return f"CREW CONVERSATION HISTORY (last {CONTEXT_DAYS} days):\n{full}"
+
+
 async def get_crew_memory_context(crew_id: str) -> str:
 	"""
-	Load the last CONTEXT_DAYS days of conversation cards for this crew and
-	return a formatted string for injection into the crew system prompt.
+	Load the last CONTEXT_DAYS days of this crew's diary and return a formatted
+	string for injection into the crew system prompt.
 	Returns empty string if nothing found or on error.
 	"""
+	return (await get_crew_memory_contexts([crew_id])).get(crew_id, "")
+
+
+async def get_crew_memory_contexts(crew_ids: list[str]) -> dict[str, str]:
+	"""
+	get_crew_memory_context() for several crews with one diary query; crews
+	without local diary rows fall back to Planka concurrently.
+	Every requested crew is present in the result ("" if nothing found or on error).
+	"""
+	out = {crew_id: "" for crew_id in crew_ids}
+	try:
+		since = (await _local_now()).date() - timedelta(days=CONTEXT_DAYS - 1)
+		diaries = await _load_diary_days(list(out), since=since)
+		local = [crew_id for crew_id in out if diaries.get(crew_id)]
+		if local:
+			date_fmt = await _get_user_date_format()
+			for crew_id in local:
+				out[crew_id] = _format_memory_context(
+					[(day.strftime(date_fmt), _day_text(entries)) for day, entries in sorted(diaries[crew_id].items())]
+				)
+		missing = [crew_id for crew_id in out if not diaries.get(crew_id)]
+		if missing:
+			for crew_id, ctx in zip(missing, await asyncio.gather(*(_planka_crew_memory_context(c) for c in missing))):
+				out[crew_id] = ctx
+	except Exception as e:
+		logger.warning("crew_memory: get_crew_memory_contexts failed: %s", e)
+	return out
+
+
+async def _planka_crew_memory_context(crew_id: str) -> str:
+	"""Legacy read path: the crew's conversation cards from Planka (no local diary yet)."""
 	try:
 		from app.services.translations import get_translations, get_user_lang
 		lang = await get_user_lang()
@@ -621,42 +835,47 @@ async def get_crew_memory_context(crew_id: str) -> str:
 
 		# Sort ascending so oldest is first (most recent last)
 		matching.sort(key=lambda x: x[0])
-
-		parts = [f"[{date}]\n{desc.strip()}" for date, desc in matching]
-		full = "\n\n".join(parts)
-
-		# Cap total context to MAX_CONTEXT_CHARS
-		if len(full) > MAX_CONTEXT_CHARS:
-			full = "[...older history omitted...]\n" + full[-MAX_CONTEXT_CHARS:]
-
-		return f"CREW CONVERSATION HISTORY (last {CONTEXT_DAYS} days):\n{full}"
+		return _format_memory_context(matching)
 	except Exception as e:
-		logger.warning("crew_memory: get_crew_memory_context failed: %s", e)
+		logger.warning("crew_memory: _planka_crew_memory_context failed: %s", e)
 		return ""
 
 
 async def get_recent_crew_outputs(hours: Optional[int] = None) -> dict[str, str]:
 	"""
-	Scans the Planka boards for all active crews to find the most recent
-	conversation card.
-	Returns a dictionary mapping {crew_id: card_description}.
+	Return the most recent diary day of every active crew as {crew_id: diary text}.
 	"""
 	try:
 		from app.services.crews import crew_registry
+		crew_ids = [crew.id for crew in crew_registry.list_active()]
+		if not crew_ids:
+			return {}
+		results: dict[str, str] = {}
+		for crew_id, days in (await _load_diary_days(crew_ids)).items():
+			text = _day_text(days[max(days)]).strip()
+			if text:
+				results[crew_id] = text
+		missing = [crew_id for crew_id in crew_ids if crew_id not in results]
+		if missing:
+			results.update(await _planka_recent_crew_outputs(missing))
+		return results
+	except Exception as e:
+		logger.warning("crew_memory: get_recent_crew_outputs failed: %s", e)
+		return {}
+
+
+async def _planka_recent_crew_outputs(crew_ids: list[str]) -> dict[str, str]:
+	"""Legacy read path: the most recently updated Planka conversation card per crew."""
+	try:
 		from app.services.translations import get_translations, get_user_lang
 		lang = await get_user_lang()
 		t = get_translations(lang)
 		project_name: str = t.get("crews_project_name", "Crews")
 
-		active_crews = crew_registry.list_active()
-		if not active_crews:
-			return {}
-
 		results: dict[str, str] = {}
 
 		async with await _planka_client() as client:
-			for crew in active_crews:
-				crew_id = crew.id
+			for crew_id in crew_ids:
 				board_name = _crew_board_name(crew_id)
 				project_id, board_id = await _resolve_crew_board_ids(client, project_name, board_name)
 				if not project_id or not board_id:
@@ -709,6 +928,6 @@ async def get_recent_crew_outputs(hours: Optional[int] = None) -> dict[str, str]
 
 		return results
 	except Exception as e:
-		logger.warning("crew_memory: get_recent_crew_outputs failed: %s", e)
+		logger.warning("crew_memory: _planka_recent_crew_outputs failed: %s", e)
 		return {}
 
@@ -0,0 +1,193 @@
+"""
+Briefing Crew Prefetch
+----------------------
+Scheduled briefings (morning, weekly, monthly, quarterly, yearly) ask every
+active crew for one short insight. Each NativeCrewEngine.run_crew_stream()
+call used to fetch its inputs on its own — agent personality (Postgres), the
+crew's diary and board-work context (Planka), personal/agent context and the
+last 20 global messages — so N crews meant N copies of the shared lookups, and
+the whole fan-out sat under one wait_for() that discarded every insight if a
+single crew was slow.
+
+- gather_crew_context() fetches everything once, concurrently, into a frozen
+  CrewContextSnapshot (diaries in one query via get_crew_memory_contexts()).
+- run_briefing_crews() binds the snapshot to a context variable, which the
+  crew tasks inherit, and runs at most BRIEFING_CREW_CONCURRENCY crews at a
+  time. run_crew_stream() reads the bound snapshot instead of refetching.
+- Each crew is timed (briefing_crew_seconds{briefing,crew}); crews still
+  running at BRIEFING_CREW_TIMEOUT_S are cancelled and the others keep their
+  insight.
+"""
+
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, Optional
+
+from app.services.metrics import increment_counter, observe_histogram
+
+logger = logging.getLogger(__name__)
+
+_ACTION_STRIP_RE = re.compile(r'\[ACTION:[^\]]*\]', re.IGNORECASE)
+_CREW_SECONDS_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0)
+# Same per-fetch budget run_crew_stream() gives its own context build.
+_FETCH_TIMEOUT_S = 20.0
+
+
+@dataclass(frozen=True)
+class CrewContextSnapshot:
+	"""Read-only crew inputs shared by every crew in one briefing run."""
+	personality: str = ""
+	personal_context: str = ""
+	personal_context_no_health: str = ""
+	agent_skills: str = ""
+	history: tuple = ()
+	crew_memory: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+	board_work: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+	def covers(self, crew_id: str) -> bool:
+		return crew_id in self.crew_memory
+
+	def personal(self, include_health: bool) -> str:
+		return self.personal_context if include_health else self.personal_context_no_health
+
+	def crew_context(self, include_health: bool) -> str:
+		"""NativeCrewEngine._get_crew_context() from the snapshot."""
+		return "\n\n".join(b for b in (self.personal(include_health), self.agent_skills) if b)
+
+
+_current: contextvars.ContextVar[Optional[CrewContextSnapshot]] = contextvars.ContextVar("crew_context_snapshot", default=None)
+
+
+def current_crew_context() -> Optional[CrewContextSnapshot]:
+	"""The snapshot bound by run_briefing_crews(), if any."""
+	return _current.get()
+
+
+def _canonical(crew_id: str) -> str:
+	# run_crew_stream() resolves the same alias before reading context.
+	return "chef" if crew_id == "nutrition" else crew_id
+
+
+async def _fetch(coro, what: str, default):
+	try:
+		return await asyncio.wait_for(coro, timeout=_FETCH_TIMEOUT_S)
+	except Exception as e:
+		logger.debug("crew_prefetch: %s unavailable: %s", what, e)
+		return default
+
+
+async def _prompt_contexts() -> tuple[str, str, str]:
+	from app.services.agent_context import get_agent_skills_for_prompt, refresh_agent_context
+	from app.services.personal_context import (
+		get_personal_context_for_prompt,
+		get_personal_context_for_prompt_no_health,
+		refresh_personal_context,
+	)
+	if not get_personal_context_for_prompt():
+		await _fetch(refresh_personal_context(), "personal context", None)
+	if not get_agent_skills_for_prompt():
+		await _fetch(refresh_agent_context(), "agent context", None)
+	return get_personal_context_for_prompt(), get_personal_context_for_prompt_no_health(), get_agent_skills_for_prompt()
+
+
+async def gather_crew_context(crew_ids: Iterable[str]) -> CrewContextSnapshot:
+	"""Fetch the context every listed crew's run needs, once and concurrently."""
+	from app.models.db import get_global_history
+	from app.services.crew_memory import get_crew_board_work_context, get_crew_memory_contexts
+	from app.services.llm import get_agent_personality
+
+	ids = list(dict.fromkeys(_canonical(c) for c in crew_ids))
+	started = time.monotonic()
+	personality, contexts, history, memory, *boards = await asyncio.gather(
+		_fetch(get_agent_personality(), "agent personality", ""),
+		_prompt_contexts(),
+		_fetch(get_global_history(limit=20), "global history", []),
+		_fetch(get_crew_memory_contexts(ids), "crew memory", {}),
+		*(_fetch(get_crew_board_work_context(c), f"board work for {c}", "") for c in ids),
+	)
+	personal, personal_no_health, agent_skills = contexts
+	observe_histogram("briefing_prefetch_seconds", time.monotonic() - started, buckets=_CREW_SECONDS_BUCKETS)
+	return CrewContextSnapshot(
+		personality=personality or "",
+		personal_context=personal,
+		personal_context_no_health=personal_no_health,
+		agent_skills=agent_skills,
+		history=tuple(history or ()),
+		crew_memory=MappingProxyType({c: memory.get(c, "") for c in ids}),
+		board_work=MappingProxyType(dict(zip(ids, boards))),
+	)
+
+
+async def run_briefing_crews(
+	crews: list,
+	prompt_for: Callable[[object], str],
+	*,
+	briefing: str,
+) -> dict[str, str]:
+	"""
+	Ask every crew for its briefing insight against one shared snapshot.
+
+	prompt_for(crew_config) builds each crew's prompt. Returns {crew_id: reply}
+	with action tags stripped, for the crews that answered (non-empty) before
+	BRIEFING_CREW_TIMEOUT_S; failures and timeouts are logged and left out.
+	"""
+	if not crews:
+		return {}
+	from app.config import settings
+	from app.services.crews_native import native_crew_engine
+
+	snapshot = await gather_crew_context(c.id for c in crews)
+	slots = asyncio.Semaphore(max(1, settings.BRIEFING_CREW_CONCURRENCY))
+	timings: dict[str, float] = {}
+
+	async def _one(crew_config) -> Optional[str]:
+		async with slots:
+			started = time.monotonic()
+			result = "error"
+			try:
+				reply = await native_crew_engine.run_crew(crew_config.id, prompt_for(crew_config))
+				result = "ok"
+				return _ACTION_STRIP_RE.sub("", reply).strip() or None
+			except asyncio.CancelledError:
+				result = "timeout"
+				raise
+			except Exception as e:
+				logger.warning("Failed to get %s insight from crew %s: %s", briefing, crew_config.id, e)
+				return None
+			finally:
+				elapsed = time.monotonic() - started
+				timings[crew_config.id] = elapsed
+				observe_histogram("briefing_crew_seconds", elapsed, buckets=_CREW_SECONDS_BUCKETS, briefing=briefing, crew=crew_config.id)
+				increment_counter("briefing_crew_runs_total", briefing=briefing, result=result)
+
+	token = _current.set(snapshot)
+	try:
+		tasks = {asyncio.create_task(_one(c)): c.id for c in crews}
+	finally:
+		_current.reset(token)	# the tasks captured the context at creation
+	started = time.monotonic()
+	done, pending = await asyncio.wait(tasks, timeout=settings.BRIEFING_CREW_TIMEOUT_S)
+	for task in pending:
+		task.cancel()
+	if pending:
+		await asyncio.gather(*pending, return_exceptions=True)
+		logger.warning(
+			"%s briefing: crews timed out after %.0fs: %s",
+			briefing, settings.BRIEFING_CREW_TIMEOUT_S, ", ".join(sorted(tasks[t] for t in pending)),
+		)
+
+	insights: dict[str, str] = {}
+	for task in done:
+		if not task.cancelled() and task.exception() is None and task.result():
+			insights[tasks[task]] = task.result()
+	logger.info(
+		"%s briefing: %d/%d crew insights in %.1fs (%s)",
+		briefing, len(insights), len(crews), time.monotonic() - started,
+		", ".join(f"{cid} {secs:.1f}s" for cid, secs in sorted(timings.items(), key=lambda kv: -kv[1])),
+	)
+	return {c.id: insights[c.id] for c in crews if c.id in insights}
@@ -135,6 +135,10 @@ class CrewRegistry:
 		self._last_mtimes: Dict[Path, float] = {}
 		# Pre-embedded crew profile vectors keyed by crew_id (populated in load())
 		self._profile_vectors: dict = {}
+		# Profile text each vector was built from — hot-reloads only re-embed changed crews
+		self._profile_texts: dict[str, str] = {}
+		# Bumped on every (re)load; cached routing decisions are keyed on it
+		self.version = 0
 
 	def _get_mtime(self, path: Path) -> float:
 		"""Return mtime for path, 0.0 if not accessible."""
@@ -285,33 +289,43 @@ class CrewRegistry:
 		logger.info("Registry: Successfully loaded %d active crews.", len(self._crews))
 		await self._build_semantic_profiles()
 		self._compute_panel_candidates()
+		self.version += 1
 
 	async def _build_semantic_profiles(self) -> None:
 		"""Embed crew profile texts and cache as numpy vectors.
 
-		Called from load() after all crews are parsed.  Uses get_embedder() from
-		memory.py so no second model instance is loaded.  Routable crews only
-		(routing_disabled=True crews are excluded).
+		Called from load() after all crews are parsed.  Uses the shared embedding
+		batcher so no second model instance is loaded.  Routable crews only
+		(routing_disabled=True crews are excluded).  On hot-reload only crews whose
+		profile text changed are re-embedded; the rest keep their vectors.
 		"""
 		try:
 			import numpy as np  # noqa: PLC0415
 			from app.services.semantic_router import build_crew_profile
-			from app.services.memory import get_embedder
-			loop = asyncio.get_event_loop()
+			from app.services.embeddings import encode_many
 			routable = [c for c in self._crews.values() if not c.routing_disabled]
 			if not routable:
 				self._profile_vectors = {}
+				self._profile_texts = {}
 				logger.info("Registry: no routable crews — semantic profiles skipped")
 				return
-			profiles = [build_crew_profile(c) for c in routable]
-			def _encode_batch():
-				return get_embedder().encode(profiles, batch_size=32, show_progress_bar=False)
-			vectors = await loop.run_in_executor(None, _encode_batch)
-			self._profile_vectors = {c.id: np.array(v) for c, v in zip(routable, vectors)}
-			logger.info("Registry: built semantic profiles for %d routable crews", len(self._profile_vectors))
+			profiles = {c.id: build_crew_profile(c) for c in routable}
+			changed = [
+				cid for cid, text in profiles.items()
+				if self._profile_texts.get(cid) != text or cid not in self._profile_vectors
+			]
+			vectors = await encode_many([profiles[cid] for cid in changed]) if changed else []
+			fresh = {cid: np.array(v) for cid, v in zip(changed, vectors)}
+			self._profile_vectors = {cid: fresh.get(cid, self._profile_vectors.get(cid)) for cid in profiles}
+			self._profile_texts = profiles
+			logger.info(
+				"Registry: built semantic profiles for %d routable crews (%d re-embedded)",
+				len(self._profile_vectors), len(changed),
+			)
 		except Exception as _e:
 			logger.warning("Registry: semantic profile build failed — embedding unavailable: %s", _e)
 			self._profile_vectors = {}
+			self._profile_texts = {}
 
 	async def _precache_keywords(self) -> None:
 		"""Pre-calculate and cache keyword lists for all enabled languages.
@@ -539,6 +553,16 @@ _CREW_ATTRIBUTION_RE = re.compile(r'\(Reasoning by crew ([^)\n]{1,100})\)', re.I
 async def is_system_action_or_operational_query(text: str) -> bool:
 	"""Reasoning-based check to determine if the message is a structural Planka command
 	or an operational query, in any language."""
+	from app.services.intent_gate import local_verdict, record_decision
+	verdict = await local_verdict(text, "system_action")
+	if verdict is not None:
+		return verdict
+	from app.services.message_classifier import get_shared_classification
+	shared = await get_shared_classification(text)
+	if shared is not None:
+		if shared.ok:
+			record_decision(text, "system_action", shared.system_action)
+		return shared.system_action
 	try:
 		from app.services.llm import chat as cloud_chat
 		import asyncio
@@ -562,6 +586,7 @@ async def is_system_action_or_operational_query(text: str) -> bool:
 		)
 		decision_clean = decision.strip().upper()
 		logger.debug("is_system_action_or_operational_query: classification result for '%s': %s", _sanitize_for_log(text, 100), _sanitize_for_log(decision_clean, 20))
+		record_decision(text, "system_action", "YES" in decision_clean)
 		return "YES" in decision_clean
 	except Exception as exc:
 		logger.warning("is_system_action_or_operational_query reasoning check failed: %s. Falling back to False.", _sanitize_for_log(exc, 200))
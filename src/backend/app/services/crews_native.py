@@ -1,3 +1,4 @@
+import contextlib
 import logging
 import json
 import re
@@ -10,7 +11,9 @@ from app.services.agent_context import get_agent_skills_for_prompt, refresh_agen
 import asyncio
 from datetime import datetime, timezone
 from app.services.llm import ACTION_TAG_DOCS, get_agent_personality
+from app.services.prompt_prefix import assemble, record_prompt_timings
 from app.services.crew_memory import get_crew_memory_context, get_crew_board_work_context
+from app.services.crew_prefetch import current_crew_context
 from app.models.db import get_global_history
 
 # Bug-2 guard: ephemeral PII tokens ([ORG_1], [PERSON_2], ...) from previous
@@ -62,7 +65,7 @@ def _inject_crew_board(text: str, board_name: str) -> str:
 
 
 async def _write_crew_memory(crew_id: str, user_input: str, crew_response: str) -> None:
-	"""Fire-and-forget: append this exchange to the crew's Planka conversation card."""
+	"""Append this exchange to the crew's diary (one local INSERT; Planka is updated in the background)."""
 	try:
 		from app.services.crew_memory import append_crew_exchange
 		await append_crew_exchange(crew_id, user_input, crew_response)
@@ -147,27 +150,32 @@ class NativeCrewEngine:
 		# 1. Base Instructions and Protocol
 		now_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
-		# Parallel context retrieval
-		
-		# Define tasks for parallel execution
-		tasks = [
-			get_agent_personality(),
-			get_crew_memory_context(crew_id),
-			get_crew_board_work_context(crew_id),
-		]
+		# Parallel context retrieval — scheduled briefings prefetch the shared
+		# context once for all their crews (services/crew_prefetch.py).
+		snapshot = current_crew_context()
+		if snapshot is not None and snapshot.covers(crew_id):
+			results = [snapshot.personality, snapshot.crew_memory[crew_id], snapshot.board_work.get(crew_id, "")]
+		else:
+			snapshot = None
+			# Define tasks for parallel execution
+			tasks = [
+				get_agent_personality(),
+				get_crew_memory_context(crew_id),
+				get_crew_board_work_context(crew_id),
+			]
 
-		try:
-			results = await asyncio.wait_for(
-				asyncio.gather(*tasks, return_exceptions=True),
-				timeout=20.0,
-			)
-		except asyncio.TimeoutError:
-			_safe_id = crew_id.replace("\n", "\\n").replace("\r", "\\r")
-			logger.warning(
-				"NativeCrewEngine: context build timed out (20s) for crew '%s' — proceeding without board/memory context",
-				_safe_id,
-			)
-			results = ["", "", ""]
+			try:
+				results = await asyncio.wait_for(
+					asyncio.gather(*tasks, return_exceptions=True),
+					timeout=20.0,
+				)
+			except asyncio.TimeoutError:
+				_safe_id = crew_id.replace("\n", "\\n").replace("\r", "\\r")
+				logger.warning(
+					"NativeCrewEngine: context build timed out (20s) for crew '%s' — proceeding without board/memory context",
+					_safe_id,
+				)
+				results = ["", "", ""]
 
 		# Unpack results with safety checks
 		_r0 = results[0]
@@ -205,8 +213,11 @@ class NativeCrewEngine:
 			)
 			format_prefix = "\n\n".join(prefix_parts)
 
+		# The system message is a static per-crew prefix (template, board name,
+		# roles, action tags) followed by the volatile sections (clock, context,
+		# memory), so llama.cpp can reuse the crew's cached prefix between runs.
 		instructions = SYSTEM_TEMPLATE.format(instructions=config.instructions or "Tactical Steward.")
-		instructions = f"Current date and time: {now_str}\n\n" + instructions
+		volatile: list[str] = [f"Current date and time: {now_str}"]
 
 		# For non-agent crews (no format_prefix), still inject personality into
 		# instructions so their voice matches the configured archetype.
@@ -232,7 +243,9 @@ class NativeCrewEngine:
 		# Cloud: full personal + agent context
 		# health_context=True crews (nutrition, health, fitness) receive health.md.
 		# All other crews receive personal context with health.md stripped.
-		if is_local:
+		if snapshot is not None:
+			volatile.append(snapshot.personal(config.health_context) if is_local else snapshot.crew_context(config.health_context))
+		elif is_local:
 			_get_ctx = get_personal_context_for_prompt if config.health_context else get_personal_context_for_prompt_no_health
 			p_ctx = _get_ctx()
 			if not p_ctx:
@@ -241,27 +254,27 @@ class NativeCrewEngine:
 					p_ctx = _get_ctx()
 				except Exception as e:
 					logger.debug("Native Engine: Failed to refresh personal context: %s", e)
-			if p_ctx:
-				instructions += f"\n\n{p_ctx}"
+			volatile.append(p_ctx)
 		else:
-			context_block = await self._get_crew_context(include_health=config.health_context)
-			if context_block:
-				instructions += f"\n\n{context_block}"
+			volatile.append(await self._get_crew_context(include_health=config.health_context))
 
 		# 3b. Crew conversation memory context (already fetched in parallel)
-		if mem_ctx:
-			instructions += f"\n\n{mem_ctx}"
+		volatile.append(mem_ctx)
 
 		# 3c. Crew board work context — actual output cards from the crew's Planka board.
 		# Primary reference for "last suggestion", "what did we decide", "previous idea" queries.
-		if board_work_ctx:
-			instructions += f"\n\n{board_work_ctx}"
+		volatile.append(board_work_ctx)
 
-		# 4. Action tag vocabulary — always included (1.7B+ has 32k ctx)
+		# 4. Action tag vocabulary — always included (1.7B+ has 32k ctx); static, so
+		# it is part of the cached prefix ahead of the volatile sections.
 		instructions += f"\n\n{ACTION_TAG_DOCS}"
+		prompt_key = f"crew:{crew_id}"
+		instructions = assemble(prompt_key, instructions, *volatile).text
 
 		# 5. Recent user messages from conversation history
 		# Use pre-fetched history if provided by router to save a DB round-trip.
+		if history is None and snapshot is not None:
+			history = list(snapshot.history)
 		if history is None:
 			try:
 				history = await get_global_history(limit=20)
@@ -378,11 +391,29 @@ class NativeCrewEngine:
 		max_attempts = 3
 		for attempt in range(max_attempts):
 			try:
-				async with httpx.AsyncClient(timeout=client_timeout) as client:
-					async with client.stream("POST", f"{_effective_url}/chat/completions", headers=req_headers, json=payload) as response:
-						response.raise_for_status()
+				from app.services.llm_http import llm_client
+				async with llm_client(_effective_url) as client:
+					async with contextlib.AsyncExitStack() as _stream_stack:
+						if is_local:
+							# Local runs go through the peer scheduler so long crew
+							# missions count against the peer's load.
+							from app.services.llm import _local_peer_lines
+							from app.services.llm_peers import stream_from_peers
+							_lines = stream_from_peers(
+								lambda lease: _local_peer_lines(lease, payload, client_timeout, prompt_key),
+								first_token_timeout=read_timeout,
+								timeout_exc=httpx.ReadTimeout,
+							)
+							_stream_stack.push_async_callback(_lines.aclose)
+						else:
+							response = await _stream_stack.enter_async_context(client.stream(
+								"POST", f"{_effective_url}/chat/completions",
+								headers=req_headers, json=payload, timeout=client_timeout,
+							))
+							response.raise_for_status()
+							_lines = response.aiter_lines()
 						collected_chunks: list[str] = []
-						async for line in response.aiter_lines():
+						async for line in _lines:
 							if not line or not line.startswith("data: "):
 								continue
 
@@ -392,7 +423,9 @@ class NativeCrewEngine:
 
 							try:
 								chunk_data = json.loads(data_str)
-								delta = chunk_data.get("choices", [{}])[0].get("delta", {})
+								if is_local and chunk_data.get("timings"):
+									record_prompt_timings(prompt_key, chunk_data["timings"])
+								delta = (chunk_data.get("choices") or [{}])[0].get("delta", {})
 								content = delta.get("content", "")
 								if content:
 									collected_chunks.append(content)
@@ -459,8 +492,9 @@ class NativeCrewEngine:
 				"temperature": 0,
 				"stream": False,
 			}
-			async with httpx.AsyncClient(timeout=10) as client:
-				r = await client.post(f"{self.llm_url}/chat/completions", json=payload)
+			from app.services.llm_http import llm_client
+			async with llm_client(self.llm_url) as client:
+				r = await client.post(f"{self.llm_url}/chat/completions", json=payload, timeout=10)
 				r.raise_for_status()
 				answer = r.json()["choices"][0]["message"]["content"].strip().lower()
 				return answer.startswith("yes")
@@ -469,12 +503,16 @@ class NativeCrewEngine:
 			return False
 
 	async def run_crew_panel(self, crew_ids: list, user_input: str):
-		"""Run a panel of crews sequentially, yielding all tokens.
+		"""Run a panel of crews, yielding all tokens.
 
 		The primary crew (first in list) runs normally.  Each subsequent crew
 		first answers a fast yes/no gate — if it decides the query is outside
 		its domain it stays silent and is skipped.  If it opts in it receives
-		the accumulated output as context so it can build on rather than repeat.
+		the prior output as context so it can build on rather than repeat.
+
+		With CREW_PANEL_PARALLEL the secondary crews run alongside the primary
+		(see _run_panel_parallel); otherwise one after another, each seeing all
+		earlier sections.
 
 		Yields:
 		  - All tokens from the primary crew.
@@ -483,7 +521,11 @@ class NativeCrewEngine:
 		"""
 		if not crew_ids:
 			return
+		run = self._run_panel_parallel if settings.CREW_PANEL_PARALLEL and len(crew_ids) > 1 else self._run_panel_sequential
+		async for chunk in run(crew_ids, user_input):
+			yield chunk
 
+	async def _run_panel_sequential(self, crew_ids: list, user_input: str):
 		primary_id = crew_ids[0]
 		primary_chunks: list[str] = []
 
@@ -499,19 +541,104 @@ class NativeCrewEngine:
 				logger.debug("crew panel: '%s' opted out for this query", secondary_id)
 				continue
 			yield f"\n\n---crew:{secondary_id}---\n\n"
-			# Provide accumulated context so the secondary builds on, not repeats
-			augmented_input = (
-				f"{user_input}\n\n"
-				f"[Prior crew(s) already produced the following — "
-				f"add your domain perspective, avoid repeating what was already covered:]\n"
-				f"{primary_output}"
-			)
 			secondary_chunks: list[str] = []
-			async for chunk in self.run_crew_stream(secondary_id, augmented_input):
+			async for chunk in self.run_crew_stream(secondary_id, _panel_input(user_input, primary_output)):
 				secondary_chunks.append(chunk)
 				yield chunk
 			# Keep running concatenation so each subsequent crew sees all prior work
 			primary_output += "\n\n" + "".join(secondary_chunks)
 
+	async def _run_panel_parallel(self, crew_ids: list, user_input: str):
+		"""Primary streams live; secondaries gate and generate concurrently into queues.
+
+		Each secondary waits until the primary has produced CREW_PANEL_BRIEF_CHARS
+		(or finished), asks its engagement gate with that brief, and if engaged
+		generates from the same brief into its own queue. Queues are drained in
+		panel order, so sections arrive exactly as in sequential mode. Every crew
+		generation holds a slot of its tier's semaphore for its whole run.
+		"""
+		primary_id = crew_ids[0]
+		slots = _panel_slots("local" if not settings.cloud_configured else "cloud")
+		brief_chars = max(0, settings.CREW_PANEL_BRIEF_CHARS)
+		brief_ready = asyncio.Event()
+		if brief_chars == 0:
+			brief_ready.set()
+		primary_chunks: list[str] = []
+
+		async def _secondary(crew_id: str, out: asyncio.Queue) -> None:
+			try:
+				await brief_ready.wait()
+				brief = "".join(primary_chunks)
+				if not await self._crew_wants_to_engage(crew_id, user_input, brief):
+					logger.debug("crew panel: '%s' opted out for this query", crew_id)
+					return
+				out.put_nowait(_PANEL_ENGAGED)
+				async with slots:
+					async for chunk in self.run_crew_stream(crew_id, _panel_input(user_input, brief)):
+						out.put_nowait(chunk)
+			except Exception as e:
+				out.put_nowait(e)
+			finally:
+				out.put_nowait(_PANEL_DONE)
+
+		queues = {crew_id: asyncio.Queue() for crew_id in crew_ids[1:]}
+		# Acquire the primary's slot before the secondaries can queue for one.
+		await slots.acquire()
+		tasks = [asyncio.create_task(_secondary(crew_id, q)) for crew_id, q in queues.items()]
+		try:
+			try:
+				produced = 0
+				async for chunk in self.run_crew_stream(primary_id, user_input):
+					primary_chunks.append(chunk)
+					produced += len(chunk)
+					if produced >= brief_chars:
+						brief_ready.set()
+					yield chunk
+			finally:
+				slots.release()
+				brief_ready.set()
+
+			for crew_id, q in queues.items():
+				item = await q.get()
+				if item is _PANEL_DONE:
+					continue
+				yield f"\n\n---crew:{crew_id}---\n\n"
+				while (item := await q.get()) is not _PANEL_DONE:
+					if isinstance(item, Exception):
+						raise item
+					yield item
+		finally:
+			for task in tasks:
+				task.cancel()
+			await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _panel_input(user_input: str, prior_output: str) -> str:
+	"""The secondary crew's input: the request plus what earlier crews already said."""
+	if not prior_output.strip():
+		return user_input
+	return (
+		f"{user_input}\n\n"
+		f"[Prior crew(s) already produced the following — "
+		f"add your domain perspective, avoid repeating what was already covered:]\n"
+		f"{prior_output}"
+	)
+
+
+# Queue markers for _run_panel_parallel: the crew opted in / its section is complete.
+_PANEL_ENGAGED = object()
+_PANEL_DONE = object()
+
+# Crew generations in flight per LLM tier, shared by all panels in this process.
+_panel_tier_slots: dict[str, asyncio.Semaphore] = {}
+
+
+def _panel_slots(tier: str) -> asyncio.Semaphore:
+	sem = _panel_tier_slots.get(tier)
+	if sem is None:
+		limit = settings.CREW_PANEL_LOCAL_CONCURRENCY if tier == "local" else settings.CREW_PANEL_CLOUD_CONCURRENCY
+		sem = _panel_tier_slots[tier] = asyncio.Semaphore(max(1, limit))
+	return sem
+
 
 native_crew_engine = NativeCrewEngine()
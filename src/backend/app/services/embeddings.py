@@ -0,0 +1,395 @@
+"""Micro-batching embedding service.
+
+Concurrent callers each ask for one (or a few) vectors; the service collects
+requests for up to EMBED_BATCH_WAIT_MS, then runs a single batched
+SentenceTransformer.encode() on a dedicated thread. MiniLM on a 4-vCPU VPS is
+several times cheaper per item in a batch of 32 than in 32 single calls.
+
+Backpressure: at most EMBED_MAX_PENDING texts may be queued; further callers
+await a free slot instead of growing the queue without bound.
+
+Caching: vectors are memoised in a bounded in-process LRU (EMBED_CACHE_SIZE
+entries, float32) keyed by a SHA-256 of the whitespace/Unicode-normalised text,
+so the same string is never embedded twice while it stays hot. With
+EMBED_CACHE_REDIS=true the LRU is backed by Redis so the cache survives restarts.
+Hit/miss counts are exported as embedding_cache_{hits,misses}_total.
+
+Backends (EMBEDDER_BACKEND): "torch" runs sentence-transformers on PyTorch;
+"onnx" and "onnx-int8" run the same all-MiniLM-L6-v2 graph on onnxruntime
+(fp32 / int8-quantised) without importing torch, which saves hundreds of MB
+of RAM and most of the cold start on the Minimal / Raspberry Pi profile.
+All backends produce the same 384-dim normalised vector space.
+
+Usage::
+
+	from app.services.embeddings import encode, encode_many
+
+	vec = await encode("user message")                 # list[float], 384-dim
+	vecs = await encode_many(["fact one", "fact two"])  # one batched encode()
+
+The model instance is shared with services/memory.py via get_embedder().
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import platform
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# One thread: torch already parallelises a single encode() across cores, so a
+# second concurrent encode only contends for the same CPUs.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+_BATCH_SIZE_BUCKETS: tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+_MODEL_NAME = "all-MiniLM-L6-v2"
+_HF_REPO = f"sentence-transformers/{_MODEL_NAME}"
+_MAX_SEQ_LEN = 256	# sentence-transformers' max_seq_length for this model
+EMBEDDER_BACKENDS = ("torch", "onnx", "onnx-int8")
+_REDIS_PREFIX = "emb:v1:"
+_REDIS_TTL_S = 30 * 86400
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+	"""Canonical form used both as cache key input and as the text actually embedded."""
+	return _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def text_key(text: str) -> str:
+	"""Stable cache key for *text* (already normalised) in the current vector space."""
+	# Backend is part of the key: int8 vectors are close to, not identical with, fp32 ones.
+	tag = f"{_MODEL_NAME}/{settings.EMBEDDER_BACKEND}"
+	return hashlib.sha256(f"{tag}\x00{text}".encode("utf-8")).hexdigest()
+
+
+# ─── Embedder backends ────────────────────────────────────────────────────────
+
+def _onnx_model_file(quantized: bool) -> str:
+	"""Pick the ONNX export shipped in the model repo for this CPU."""
+	if not quantized:
+		return "onnx/model.onnx"
+	if platform.machine().lower() in ("aarch64", "arm64"):
+		return "onnx/model_qint8_arm64.onnx"	# Raspberry Pi 5, Apple silicon
+	return "onnx/model_quint8_avx2.onnx"	# any x86-64 VPS from the last decade
+
+
+def _hf_file(name: str) -> str:
+	from huggingface_hub import hf_hub_download
+	revision = settings.EMBEDDER_HF_REVISION
+	# Same policy as the torch loader: cached copy first, network only if missing.
+	try:
+		return hf_hub_download(_HF_REPO, name, revision=revision, local_files_only=True)
+	except Exception:
+		return hf_hub_download(_HF_REPO, name, revision=revision)
+
+
+class OnnxEmbedder:
+	"""all-MiniLM-L6-v2 on onnxruntime — mean pooling + L2 normalisation.
+
+	Reproduces the sentence-transformers pipeline (Transformer → Pooling →
+	Normalize) and exposes the subset of SentenceTransformer.encode() this
+	codebase uses, so it is a drop-in for get_embedder().
+	"""
+
+	def __init__(self, quantized: bool = False) -> None:
+		import onnxruntime as ort
+		from tokenizers import Tokenizer
+
+		self.backend = "onnx-int8" if quantized else "onnx"
+		self._tokenizer = Tokenizer.from_file(_hf_file("tokenizer.json"))
+		self._tokenizer.enable_truncation(max_length=_MAX_SEQ_LEN)
+		self._tokenizer.enable_padding()
+		opts = ort.SessionOptions()
+		opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+		self._session = ort.InferenceSession(
+			_hf_file(_onnx_model_file(quantized)),
+			sess_options=opts,
+			providers=["CPUExecutionProvider"],
+		)
+		self._input_names = {i.name for i in self._session.get_inputs()}
+
+	def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False, **_kwargs) -> np.ndarray:
+		single = isinstance(sentences, str)
+		texts = [sentences] if single else list(sentences)
+		step = max(1, batch_size)
+		chunks: list[np.ndarray] = []
+		for i in range(0, len(texts), step):
+			encs = self._tokenizer.encode_batch(texts[i:i + step])
+			mask = np.array([e.attention_mask for e in encs], dtype=np.int64)
+			feeds = {
+				"input_ids": np.array([e.ids for e in encs], dtype=np.int64),
+				"attention_mask": mask,
+			}
+			if "token_type_ids" in self._input_names:
+				feeds["token_type_ids"] = np.array([e.type_ids for e in encs], dtype=np.int64)
+			tokens = self._session.run(None, feeds)[0]	# (batch, seq, 384)
+			weights = mask[..., None].astype(np.float32)
+			pooled = (tokens * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+			pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+			chunks.append(pooled.astype(np.float32))
+		vectors = np.concatenate(chunks) if chunks else np.zeros((0, 384), dtype=np.float32)
+		return vectors[0] if single else vectors
+
+
+def _load_torch_embedder():
+	from sentence_transformers import SentenceTransformer
+	# local_files_only=True skips all HuggingFace network checks — model
+	# is already cached in the container. Falls back to online if not cached.
+	try:
+		return SentenceTransformer(_MODEL_NAME, local_files_only=True)
+	except Exception:
+		return SentenceTransformer(_MODEL_NAME)
+
+
+def load_embedder(backend: str):
+	"""Instantiate the embedder for *backend*; falls back to torch if ONNX is unavailable."""
+	if backend not in EMBEDDER_BACKENDS:
+		logger.warning("Unknown EMBEDDER_BACKEND=%r — using torch", backend)
+		backend = "torch"
+	if backend != "torch":
+		try:
+			model = OnnxEmbedder(quantized=backend == "onnx-int8")
+			logger.info("Embedder: %s loaded via onnxruntime (%s)", _MODEL_NAME, backend)
+			return model
+		except Exception as e:
+			logger.warning("Embedder: %s backend unavailable (%s) — falling back to torch", backend, e)
+	return _load_torch_embedder()
+
+
+class EmbeddingCache:
+	"""Bounded LRU of text-hash → float32 vector with hit/miss accounting."""
+
+	def __init__(self, max_entries: int) -> None:
+		self.max_entries = max(0, max_entries)
+		self._data: OrderedDict[str, np.ndarray] = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key: str) -> Optional[np.ndarray]:
+		vec = self._data.get(key)
+		if vec is None:
+			return None
+		self._data.move_to_end(key)
+		return vec
+
+	def put(self, key: str, vec: np.ndarray) -> None:
+		if self.max_entries == 0:
+			return
+		self._data[key] = vec
+		self._data.move_to_end(key)
+		while len(self._data) > self.max_entries:
+			self._data.popitem(last=False)
+
+	def clear(self) -> None:
+		self._data.clear()
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+
+_cache: Optional[EmbeddingCache] = None
+
+
+def _get_cache() -> EmbeddingCache:
+	global _cache
+	if _cache is None:
+		_cache = EmbeddingCache(settings.EMBED_CACHE_SIZE)
+	return _cache
+
+
+def get_cache_stats() -> dict:
+	"""Return current LRU size and hit/miss counters (for dashboards / health)."""
+	cache = _get_cache()
+	total = cache.hits + cache.misses
+	return {
+		"entries": len(cache),
+		"max_entries": cache.max_entries,
+		"hits": cache.hits,
+		"misses": cache.misses,
+		"hit_rate": round(cache.hits / total, 3) if total else 0.0,
+	}
+
+
+def _get_redis():
+	from app.services.redis_pool import get_redis
+	return get_redis(decode_responses=False)
+
+
+async def _redis_get_many(keys: list[str]) -> dict[str, np.ndarray]:
+	if not settings.EMBED_CACHE_REDIS or not keys:
+		return {}
+	try:
+		raw = await _get_redis().mget([_REDIS_PREFIX + k for k in keys])
+	except Exception as e:
+		logger.debug("Embedding cache Redis read failed: %s", e)
+		return {}
+	return {k: np.frombuffer(v, dtype=np.float32) for k, v in zip(keys, raw) if v}
+
+
+async def _redis_put_many(items: dict[str, np.ndarray]) -> None:
+	if not settings.EMBED_CACHE_REDIS or not items:
+		return
+	try:
+		pipe = _get_redis().pipeline()
+		for k, vec in items.items():
+			pipe.set(_REDIS_PREFIX + k, vec.tobytes(), ex=_REDIS_TTL_S)
+		await pipe.execute()
+	except Exception as e:
+		logger.debug("Embedding cache Redis write failed: %s", e)
+
+
+def _encode_batch_sync(texts: list[str]) -> list[list[float]]:
+	"""Run one batched encode() — executed on the dedicated embedding thread."""
+	from app.services.memory import get_embedder
+	vectors = get_embedder().encode(texts, batch_size=len(texts), show_progress_bar=False)
+	return [v.tolist() for v in vectors]
+
+
+class EmbeddingBatcher:
+	"""Collects concurrent encode requests and flushes them as one batched encode()."""
+
+	def __init__(self, max_batch: int, max_wait_ms: float, max_pending: int) -> None:
+		self.max_batch = max(1, max_batch)
+		self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+		self._queue: asyncio.Queue[tuple[str, asyncio.Future]] = asyncio.Queue(maxsize=max(1, max_pending))
+		self._worker: Optional[asyncio.Task] = None
+
+	def _ensure_worker(self) -> None:
+		if self._worker is None or self._worker.done():
+			self._worker = asyncio.create_task(self._run())
+
+	async def encode(self, text: str) -> list[float]:
+		"""Embed one text; shares a batch with any concurrent callers."""
+		return (await self.encode_many([text]))[0]
+
+	async def encode_many(self, texts: list[str]) -> list[list[float]]:
+		"""Embed several texts; order of the result matches the input."""
+		if not texts:
+			return []
+		self._ensure_worker()
+		loop = asyncio.get_running_loop()
+		futures: list[asyncio.Future] = []
+		for text in texts:
+			fut = loop.create_future()
+			await self._queue.put((text, fut))	# blocks when EMBED_MAX_PENDING is reached
+			futures.append(fut)
+		return list(await asyncio.gather(*futures))
+
+	async def _run(self) -> None:
+		loop = asyncio.get_running_loop()
+		while True:
+			batch = [await self._queue.get()]
+			deadline = loop.time() + self.max_wait_s
+			while len(batch) < self.max_batch:
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				# asyncio.timeout, not wait_for: on 3.11 wait_for can swallow a cancel that
+				# lands as get() completes, leaving the worker alive at loop shutdown.
+				try:
+					async with asyncio.timeout(remaining):
+						batch.append(await self._queue.get())
+				except TimeoutError:
+					break
+			await self._flush(batch)
+
+	async def _flush(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+		from app.services.metrics import observe_histogram
+		texts = [t for t, _ in batch]
+		start = time.perf_counter()
+		try:
+			vectors = await asyncio.get_running_loop().run_in_executor(_executor, _encode_batch_sync, texts)
+		except Exception as e:
+			logger.warning("Embedding batch of %d failed: %s", len(texts), e)
+			for _, fut in batch:
+				if not fut.done():
+					fut.set_exception(e)
+			return
+		finally:
+			observe_histogram("embedding_batch_size", len(texts), buckets=_BATCH_SIZE_BUCKETS)
+			observe_histogram("embedding_batch_seconds", time.perf_counter() - start)
+		for (_, fut), vec in zip(batch, vectors):
+			if not fut.done():
+				fut.set_result(vec)
+
+
+# One batcher per event loop: the FastAPI loop in production, plus any loop
+# created by asyncio.run() (Celery worker, CLI scripts).
+_batcher: Optional[EmbeddingBatcher] = None
+_batcher_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_batcher() -> EmbeddingBatcher:
+	global _batcher, _batcher_loop
+	loop = asyncio.get_running_loop()
+	if _batcher is None or _batcher_loop is not loop:
+		_batcher = EmbeddingBatcher(
+			max_batch=settings.EMBED_MAX_BATCH,
+			max_wait_ms=settings.EMBED_BATCH_WAIT_MS,
+			max_pending=settings.EMBED_MAX_PENDING,
+		)
+		_batcher_loop = loop
+	return _batcher
+
+
+async def encode(text: str) -> list[float]:
+	"""Embed a single text (cached, micro-batched)."""
+	return (await encode_many([text]))[0]
+
+
+async def encode_many(texts: list[str]) -> list[list[float]]:
+	"""Embed a list of texts (order preserved).
+
+	Cached vectors are served from the LRU (then Redis when enabled); only the
+	remaining distinct texts reach the micro-batcher.
+	"""
+	from app.services.metrics import increment_counter
+	cache = _get_cache()
+	normalized = [normalize_text(t) for t in texts]
+	keys = [text_key(t) for t in normalized]
+	found: dict[str, np.ndarray] = {}
+	missing: dict[str, str] = {}	# key -> normalised text, insertion-ordered, deduplicated
+	for key, text in zip(keys, normalized):
+		if key in found or key in missing:
+			continue
+		vec = cache.get(key)
+		if vec is not None:
+			found[key] = vec
+		else:
+			missing[key] = text
+
+	if missing:
+		for key, vec in (await _redis_get_many(list(missing))).items():
+			found[key] = vec
+			cache.put(key, vec)
+			del missing[key]
+
+	hits = len(texts) - len(missing)
+	cache.hits += hits
+	cache.misses += len(missing)
+	if hits:
+		increment_counter("embedding_cache_hits_total", amount=hits)
+	if missing:
+		increment_counter("embedding_cache_misses_total", amount=len(missing))
+		vectors = await get_batcher().encode_many(list(missing.values()))
+		fresh = {key: np.asarray(vec, dtype=np.float32) for key, vec in zip(missing, vectors)}
+		for key, vec in fresh.items():
+			cache.put(key, vec)
+		found.update(fresh)
+		await _redis_put_many(fresh)
+
+	return [found[key].tolist() for key in keys]
@@ -0,0 +1,187 @@
+"""
+Local Intent Gate
+-----------------
+Millisecond, network-free answers for the router's YES/NO and VALID/OVERRULE
+LLM gates: a nearest-centroid classifier over the MiniLM sentence embeddings
+the semantic router already uses.
+
+Each label in services/intent_seed.py becomes one unit-length centroid. A gate
+("head") is a set of positive labels; its margin is
+
+    best cosine to a positive centroid - best cosine to any other centroid
+
+and the gate answers locally only outside the ambiguous band:
+
+    margin >=  INTENT_GATE_MARGIN  -> True
+    margin <= -INTENT_GATE_MARGIN  -> False
+    otherwise                      -> None (caller consults the LLM as before)
+
+Centroids are built lazily on first use through the shared, cached embedding
+service. Any embedding failure also returns None, so the gate can only ever
+save a round trip, never block routing.
+
+Shadow mode (INTENT_GATE_SHADOW with INTENT_GATE_ENABLED off) still classifies
+every gated message but always returns None; the caller reports the decision it
+reached without the gate through record_decision(), which counts agreement in
+intent_gate_shadow_total{head,result}. That validates INTENT_GATE_MARGIN on real
+traffic before the gate is allowed to answer.
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Positive labels per gate. Router intercept names and structural Planka verbs
+# are heads too; any verb not listed maps to PLANKA_MUTATION.
+HEADS: dict[str, frozenset[str]] = {
+	"system_action": frozenset({"PLANKA_MUTATION", "OPERATIONAL_QUERY"}),
+	"needs_agent": frozenset({"PLANKA_MUTATION", "TOOL_ACTION"}),
+	"FAST_PATH_TRIVIAL_BYPASS": frozenset({"SMALLTALK"}),
+	"RUN_SELF_AUDIT": frozenset({"SELF_AUDIT"}),
+	"RECALL_CONVERSATION_HISTORY": frozenset({"RECALL_HISTORY"}),
+}
+_MUTATION_HEAD = frozenset({"PLANKA_MUTATION"})
+
+
+def positive_labels(head: str) -> frozenset[str]:
+	return HEADS.get(head, _MUTATION_HEAD)
+
+
+class CentroidClassifier:
+	"""Nearest-centroid classifier over L2-normalised embeddings."""
+
+	def __init__(self, labels: list[str], centroids: np.ndarray) -> None:
+		self.labels = labels
+		self.centroids = centroids	# (n_labels, dim), unit rows
+
+	@classmethod
+	def fit(cls, vectors: np.ndarray, labels: list[str]) -> "CentroidClassifier":
+		vectors = _unit(vectors)
+		names = sorted(set(labels))
+		idx = np.array([names.index(lbl) for lbl in labels])
+		centroids = np.stack([vectors[idx == i].mean(axis=0) for i in range(len(names))])
+		return cls(names, _unit(centroids))
+
+	def scores(self, vector: np.ndarray) -> dict[str, float]:
+		sims = self.centroids @ _unit(vector)
+		return dict(zip(self.labels, sims.tolist()))
+
+	def margin(self, vector: np.ndarray, positive: frozenset[str]) -> float:
+		sims = self.scores(vector)
+		pos = max((s for lbl, s in sims.items() if lbl in positive), default=-1.0)
+		neg = max((s for lbl, s in sims.items() if lbl not in positive), default=-1.0)
+		return pos - neg
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+	x = np.asarray(x, dtype=np.float32)
+	norm = np.linalg.norm(x, axis=-1, keepdims=True)
+	return x / np.maximum(norm, 1e-9)
+
+
+def verdict_for_margin(margin: float, band: float) -> Optional[bool]:
+	if margin >= band:
+		return True
+	if margin <= -band:
+		return False
+	return None
+
+
+_classifier: Optional[CentroidClassifier] = None
+_build_lock: Optional[asyncio.Lock] = None
+_build_loop: Optional[asyncio.AbstractEventLoop] = None
+_build_failed_at: float = 0.0
+# After a failed build (embedder unavailable) stay on the LLM path this long
+# instead of re-embedding every seed phrase on each message.
+_BUILD_RETRY_S = 60.0
+
+
+async def get_classifier() -> CentroidClassifier:
+	"""Return the trained classifier, embedding the seed phrases on first use."""
+	global _classifier, _build_lock, _build_loop, _build_failed_at
+	if _classifier is not None:
+		return _classifier
+	if time.monotonic() - _build_failed_at < _BUILD_RETRY_S:
+		raise RuntimeError("intent gate build failed recently")
+	loop = asyncio.get_running_loop()
+	if _build_lock is None or _build_loop is not loop:
+		_build_lock, _build_loop = asyncio.Lock(), loop
+	async with _build_lock:
+		if _classifier is None:
+			if time.monotonic() - _build_failed_at < _BUILD_RETRY_S:
+				raise RuntimeError("intent gate build failed recently")
+			from app.services.embeddings import encode_many
+			from app.services.intent_seed import SEED_EXAMPLES
+			texts = [t for phrases in SEED_EXAMPLES.values() for t in phrases]
+			labels = [lbl for lbl, phrases in SEED_EXAMPLES.items() for _ in phrases]
+			try:
+				vectors = np.asarray(await encode_many(texts), dtype=np.float32)
+			except Exception:
+				_build_failed_at = time.monotonic()
+				raise
+			_classifier = CentroidClassifier.fit(vectors, labels)
+			logger.info("intent_gate: trained %d centroids from %d seed phrases", len(_classifier.labels), len(texts))
+	return _classifier
+
+
+# Shadow verdicts awaiting the caller's own decision, keyed by (head, text);
+# bounded so lookups whose caller never decides cannot pile up.
+_shadow: collections.OrderedDict[tuple[str, str], Optional[bool]] = collections.OrderedDict()
+_SHADOW_MAX = 256
+
+
+async def local_verdict(text: str, head: str) -> Optional[bool]:
+	"""Answer gate `head` for `text` locally, or None when the LLM should decide."""
+	shadow = not settings.INTENT_GATE_ENABLED and settings.INTENT_GATE_SHADOW
+	if not (settings.INTENT_GATE_ENABLED or shadow) or not text.strip():
+		return None
+	from app.services.embeddings import encode
+	from app.services.metrics import increment_counter, observe_histogram
+
+	start = time.perf_counter()
+	try:
+		classifier = await get_classifier()
+		vector = np.asarray(await encode(text[:1000]), dtype=np.float32)
+		margin = classifier.margin(vector, positive_labels(head))
+		verdict = verdict_for_margin(margin, settings.INTENT_GATE_MARGIN)
+	except Exception as exc:
+		logger.debug("intent_gate: local classification unavailable (%s)", exc)
+		increment_counter("intent_gate_decisions_total", head=head, outcome="error")
+		return None
+	finally:
+		observe_histogram("intent_gate_seconds", time.perf_counter() - start)
+
+	outcome = "llm" if verdict is None else ("yes" if verdict else "no")
+	logger.debug("intent_gate: %s margin=%.3f -> %s%s", head, margin, outcome, " (shadow)" if shadow else "")
+	if shadow:
+		_shadow[(head, text)] = verdict
+		_shadow.move_to_end((head, text))
+		while len(_shadow) > _SHADOW_MAX:
+			_shadow.popitem(last=False)
+		return None
+	increment_counter("intent_gate_decisions_total", head=head, outcome=outcome)
+	return verdict
+
+
+def record_decision(text: str, head: str, decided: bool) -> None:
+	"""Shadow mode: compare the decision made without the gate to its verdict for (text, head)."""
+	key = (head, text)
+	if key not in _shadow:
+		return
+	verdict = _shadow.pop(key)
+	if verdict is None:
+		result = "abstain"		# inside the margin band: the LLM would have been asked anyway
+	else:
+		result = "agree" if verdict == decided else "disagree"
+	from app.services.metrics import increment_counter
+	increment_counter("intent_gate_shadow_total", head=head, result=result)
+	if result == "disagree":
+		logger.info("intent_gate shadow: %s gate said %s, classifier decided %s", head, verdict, decided)
@@ -29,9 +29,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
-import time
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -45,10 +44,6 @@ def _sanitize_for_log(text: str, max_len: int = 80) -> str:
 # Cap input length before running regex to prevent ReDoS (CWE-1333)
 _MAX_INPUT = 500
 
-# In-process cache for Planka project/board snapshot
-_CACHE_TTL_SECONDS = 30.0
-_cache: dict[str, Any] = {"ts": 0.0, "projects": []}
-
 
 @dataclass
 class StructuralIntent:
@@ -1212,46 +1207,25 @@ def _strip_filler(s: str) -> str:
 
 
 async def _get_planka_snapshot(force: bool = False) -> list[dict]:
-	"""Return the cached list of Planka projects (with their boards).
+	"""Return Planka projects with their boards, from the shared Planka mirror.
 
 	Each entry: {"id", "name", "boards": [{"id", "name"}]}.
-	Cached in-process for _CACHE_TTL_SECONDS.
+	Only the project/board listing is refreshed (no card fetches); force=True
+	re-reads it even if it is within PLANKA_MIRROR_TTL_S.
 	"""
-	now = time.monotonic()
-	if not force and (now - float(_cache["ts"])) < _CACHE_TTL_SECONDS and _cache["projects"]:
-		return _cache["projects"]  # type: ignore[return-value]
 	try:
-		from app.config import settings
-		from app.services.planka_common import get_planka_auth_token
-		import httpx
-		token = await get_planka_auth_token()
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=3.0, headers={"Authorization": f"Bearer {token}"}) as client:
-			pr = await client.get("/api/projects")
-			pr.raise_for_status()
-			projects_raw = pr.json().get("items", [])
-			# Parallelise per-project detail fetches (was N+1 sequential).
-			detail_tasks = [client.get(f"/api/projects/{p['id']}") for p in projects_raw]
-			details = await asyncio.gather(*detail_tasks, return_exceptions=True)
-			snapshot: list[dict] = []
-			for p, det in zip(projects_raw, details):
-				if isinstance(det, BaseException):
-					logger.warning("intent_router: project %s detail fetch failed: %s", p.get("id"), det)
-					continue
-				try:
-					det.raise_for_status()
-					det_json = det.json()
-				except Exception as _pe:
-					logger.warning("intent_router: project %s detail parse failed: %s", p.get("id"), _pe)
-					continue
-				boards = det_json.get("included", {}).get("boards", []) or det_json.get("boards", [])
-				snapshot.append({
-					"id": p["id"],
-					"name": p["name"],
-					"boards": [{"id": b["id"], "name": b.get("name", "")} for b in boards],
-				})
-			_cache["projects"] = snapshot
-			_cache["ts"] = now
-			return snapshot
+		from app.services.planka_mirror import planka_mirror
+		if force:
+			planka_mirror.mark_listing_stale()
+		await planka_mirror.refresh(listing_only=True)
+		return [
+			{
+				"id": pid,
+				"name": p["name"],
+				"boards": [{"id": b["id"], "name": b.get("name", "")} for b in planka_mirror.boards_of(pid)],
+			}
+			for pid, p in planka_mirror.projects.items()
+		]
 	except Exception as e:
 		logger.warning("intent_router: planka snapshot failed: %s", e)
 		return []
@@ -1818,6 +1792,22 @@ async def _classify_structural_intent_regex(text: str, lang: str) -> Optional[St
 
 async def validate_intent_with_reasoning(text: str, intent: StructuralIntent) -> StructuralIntent:
 	"""Validate a regex-proposed intent using an LLM reasoning pass."""
+	from app.services.intent_gate import local_verdict, record_decision
+	verdict = await local_verdict(text, intent.verb)
+	if verdict is not None:
+		intent.is_validated = verdict
+		intent.reasoning = "local intent gate"
+		return intent
+
+	from app.services.message_classifier import get_shared_classification
+	shared = await get_shared_classification(text)
+	if shared is not None:
+		intent.is_validated = shared.is_valid(intent.verb)
+		intent.reasoning = f"shared classification: intents={sorted(shared.intents)}" if shared.ok else "shared classification unavailable"
+		if shared.ok:
+			record_decision(text, intent.verb, intent.is_validated)
+		return intent
+
 	from app.services.llm import chat
 	
 	prompt = (
@@ -1840,6 +1830,7 @@ async def validate_intent_with_reasoning(text: str, intent: StructuralIntent) ->
 			intent.is_validated = False
 		else:
 			intent.is_validated = True
+		record_decision(text, intent.verb, intent.is_validated)
 	except Exception as e:
 		logger.warning("intent_router: validation failed: %s", e)
 		intent.is_validated = True  # fallback to trust regex if LLM fails
@@ -1903,8 +1894,6 @@ async def dispatch_structural_intent(intent: StructuralIntent, lang: str) -> str
 			board=ent["board_name"], project=ent["project_name"],
 		)
 		audit = f"[AUDIT:move_board:{ent['board_name']}|to={ent['project_name']}]"
-		# Bust the cache so a follow-up intent sees the new project assignment.
-		_cache["ts"] = 0.0
 		return f"{msg}\n{audit}"
 
 	if verb == "MOVE_CARD":
@@ -2221,14 +2210,10 @@ async def dispatch_structural_intent(intent: StructuralIntent, lang: str) -> str
 				return f"⚠ Could not find a board matching '{board_frag}'. Available boards: {_avail}."
 			return f"⚠ Could not locate board '{board_name}' in Planka."
 		try:
-			from app.services.planka import get_planka_auth_token
-			from app.config import settings
+			from app.services.planka_common import planka_client
 			from app.services.llm import chat
-			import httpx as _httpx
 			import json as _json
-			token = await get_planka_auth_token()
-			headers = {"Authorization": f"Bearer {token}"}
-			async with _httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=30.0, headers=headers) as client:
+			async with planka_client(timeout=30.0) as client:
 				resp = await client.get(f"/api/boards/{board_id}", params={"included": "lists,cards"})
 				resp.raise_for_status()
 				detail = resp.json()
@@ -2310,7 +2295,8 @@ async def dispatch_structural_intent(intent: StructuralIntent, lang: str) -> str
 					lines.append("Cards already well-grouped — no moves needed.")
 				lines.append("\nTo move a card: 'move <card> to <list>'.")
 				audit = f"[AUDIT:sort_board:{board_name}|lists={len(sorted_lists)}|moves={len(plan.get('moves', {}))}]"
-				_cache["ts"] = 0.0
+				from app.services.planka_mirror import planka_mirror
+				planka_mirror.mark_dirty(board_id)
 				return "\n".join(lines) + "\n" + audit
 		except Exception as _e:
 			logger.error("intent_router SORT_BOARD failed: %s", _e)
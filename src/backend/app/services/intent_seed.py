@@ -0,0 +1,156 @@
+"""
+Labelled seed phrases for the local intent gate (services/intent_gate.py).
+
+PLANKA_MUTATION and the hedged CONVERSATION phrases are taken from the labelled
+cases in tests/test_intent_router.py; the crew-domain CONVERSATION phrases from
+tests/test_router_eval.py. The remaining labels are drawn from the phrasings the
+router's keyword intercepts (router.py, crews.py) are written to catch.
+
+Labels:
+  PLANKA_MUTATION    change boards, lists, cards, tasks or projects
+  TOOL_ACTION        create a task/reminder/event, remember a fact, add a person
+  OPERATIONAL_QUERY  ask about the outcome of a previous action
+  SMALLTALK          greeting, thanks or acknowledgement only
+  SELF_AUDIT         ask Z to audit the actions it took
+  RECALL_HISTORY     ask Z to recall earlier conversation messages
+  CONVERSATION       questions, discussion, hedges, domain chat
+
+Keep phrases short and varied; scripts/eval_intent_gate.py reports agreement and
+latency after any change here.
+"""
+
+SEED_EXAMPLES: dict[str, tuple[str, ...]] = {
+	"PLANKA_MUTATION": (
+		"move the aquarium board to my projects",
+		"please move the aquarium board to my projects",
+		"move the garden board into operations",
+		"move the household board to inbox",
+		"can you move the aquarium board to my projects",
+		"verschiebe das aquarium board zu my projects",
+		"verschieb das aquarium board nach my projects",
+		"verschiebe das garden board zu operations",
+		"mueve el tablero aquarium a my projects",
+		"déplace le tableau aquarium vers my projects",
+		"mova o quadro aquarium para my projects",
+		"перемести доску aquarium в my projects",
+		"mark the laundry card as done",
+		"archive the laundry card",
+		"add a card buy groceries to Inbox",
+		"create task meeting prep on Work",
+		"new card dentist appointment",
+		"erstelle eine Karte Zahnarzttermin",
+		"agrega una tarjeta comprar leche en lista",
+		"ajouter une carte réunion à Inbox",
+		"create a list called Waiting on Work board",
+		"add a new list In Progress to Garden",
+		"erstelle eine Liste Wartend auf Garden board",
+		"rename the Buy Milk card to Buy Oat Milk",
+		"benenne die Karte Milch kaufen in Hafermilch um",
+		"rename the list In Progress to Doing",
+		"rename the column Backlog to Todo",
+		"set description of Buy groceries to Monthly shopping list",
+		"add task Buy milk to card Shopping",
+		"check off task Buy milk in card Shopping",
+		"uncheck task Buy milk in card Shopping",
+		"rename task Write report in card Work to Finalize report",
+		"delete card Shopping",
+		"remove column In Progress",
+		"delete task Write report from card Work",
+		"create board Finance in My Projects",
+		"rename board Finance to Investments",
+		"delete board Finance",
+		"create a project called Alpha",
+		"erstelle ein Projekt namens Alpha",
+		"rename project Alpha to Beta",
+		"lösche das Projekt Alpha",
+		"sort the aquarium board",
+		"reorganize my household board",
+		"räum das Garden board auf",
+	),
+	"TOOL_ACTION": (
+		"remind me to call the dentist on Thursday",
+		"create a reminder to pay rent on the first",
+		"add an event for lunch with Sarah tomorrow at noon",
+		"schedule a meeting with the landlord next Monday",
+		"save this as a task for next week",
+		"remember that I am allergic to peanuts",
+		"note that my daughter starts school in September",
+		"add Anna to my contacts, she is my physiotherapist",
+		"I sent the invoice, mark it as sent",
+		"erinnere mich morgen an den Zahnarzt",
+		"speichere das als Aufgabe",
+		"recuérdame llamar a mamá el domingo",
+	),
+	"OPERATIONAL_QUERY": (
+		"did it work?",
+		"did you do it?",
+		"did it save?",
+		"did that go through?",
+		"no feedback from you",
+		"any update on that?",
+		"confirm that it was created",
+		"what happened with the card I asked for?",
+		"hat es geklappt?",
+		"hast du es gemacht?",
+		"¿funcionó?",
+		"¿lo hiciste?",
+	),
+	"SMALLTALK": (
+		"hi",
+		"hello there",
+		"hey",
+		"good morning",
+		"guten morgen",
+		"thanks",
+		"thank you so much",
+		"danke",
+		"ok",
+		"okay great",
+		"perfect",
+		"got it",
+		"alles klar",
+		"cool, nice",
+	),
+	"SELF_AUDIT": (
+		"audit your actions",
+		"audit your triggered actions",
+		"look back and audit what you did today",
+		"check what you did",
+		"verify your actions",
+		"review your actions from today",
+		"überprüfe deine Aktionen",
+	),
+	"RECALL_HISTORY": (
+		"recall what I asked you yesterday",
+		"show me the messages I sent you today",
+		"what did I ask you this morning?",
+		"list the tasks I gave you two days ago",
+		"go through what I told you last week",
+		"review my messages from yesterday",
+		"was habe ich dich gestern gefragt?",
+	),
+	"CONVERSATION": (
+		"I was thinking about moving the aquarium board sometime",
+		"what does it mean to move a board",
+		"how do I move the aquarium board to my projects",
+		"should I move the aquarium board to operations",
+		"can you explain how moving boards works",
+		"vielleicht sollte ich das aquarium board zu my projects verschieben",
+		"tal vez deba mover el tablero aquarium a my projects",
+		"peut-être devrais-je déplacer le tableau aquarium vers my projects",
+		"what should I eat for dinner?",
+		"plan my workouts for next week",
+		"how is my hrv looking?",
+		"I feel so angry tonight",
+		"is this SaaS idea worth pursuing?",
+		"I have a flight to book",
+		"fix my heating system",
+		"explain quantum entanglement",
+		"my kids have a birthday party next weekend",
+		"check my password hygiene",
+		"describe the Fermi paradox in detail",
+		"what is the weather like in Berlin?",
+		"I'm exhausted and overwhelmed today",
+		"wie viel kostet ein Flug nach Lissabon?",
+	),
+}
@@ -24,6 +24,7 @@ Core Functions:
 """
 
 import base64
+import contextlib
 import httpx
 import json
 import logging
@@ -37,7 +38,7 @@ import uuid
 import asyncio
 import time
 from sqlalchemy import select
-from app.models.db import AsyncSessionLocal, LLMMetric
+from app.models.db import AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,66 @@ class _FirstTokenTimeout(Exception):
 	"""Raised when the local LLM doesn't yield a first token within the deadline."""
 
 
+# Local tier: a first token later than this (from peer dispatch) hedges the
+# request onto a second peer. It is not a failure deadline — prompt evaluation
+# of a long crew/system prompt on a CPU peer alone can take longer; the request
+# only fails after the tier's read timeout (TIER_TIMEOUTS["local"]).
+_LOCAL_HEDGE_BUDGET_S = 5.0
+
+# llm_ttft_seconds{tier} / llm_tokens_per_second{tier} buckets (chat_stream).
+_TTFT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0)
+_TOKENS_PER_S_BUCKETS = (1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0)
+
+
+async def _local_peer_lines(
+	lease: Any, request_json: dict, timeout: "httpx.Timeout", prompt_key: str = "",
+) -> AsyncGenerator[str, None]:
+	"""SSE lines from one local peer, starting at the first generated token.
+
+	Keep-alive and role-only lines before it are dropped, so the first line
+	yielded marks time-to-first-token for llm_peers.stream_from_peers.
+	llama-server peers also get prompt-cache hints: `cache_prompt`, and
+	`id_slot` for the slot that last served *prompt_key* (services/prompt_prefix.py).
+	A pooled keep-alive connection the peer already closed (RemoteProtocolError
+	before any line) is replayed once on a fresh connection.
+	"""
+	from app.services.llm_http import llm_client
+	url = f"{lease.url}/v1/chat/completions"
+	payload = dict(request_json)
+	if lease.peer.server_type == "ollama":
+		payload["model"] = lease.model	# Ollama routes by model name; llama-server ignores it
+	else:
+		payload["cache_prompt"] = True
+		slot = lease.claim_slot(prompt_key) if prompt_key else -1
+		if slot >= 0:
+			payload["id_slot"] = slot
+	started = False
+	for attempt in range(2):
+		try:
+			async with llm_client(url) as client:
+				async with client.stream("POST", url, json=payload, timeout=timeout) as response:
+					response.raise_for_status()
+					async for line in response.aiter_lines():
+						if not started:
+							if not line.startswith("data: "):
+								continue
+							data_str = line[6:].strip()
+							if data_str != "[DONE]":
+								try:
+									delta = json.loads(data_str).get("choices", [{}])[0].get("delta", {})
+								except json.JSONDecodeError:
+									continue
+								if not delta.get("content") and not delta.get("tool_calls"):
+									continue
+							started = True
+						yield line
+			return
+		except httpx.RemoteProtocolError as e:
+			if started or attempt:
+				raise
+			logger.debug("LLM local %s: stale pooled connection (%s) — retrying", lease.url, e)
+
+
 # Known model control tokens that must be stripped from user input.
 # These could trick the tokenizer into treating user text as protocol.
 _CONTROL_TOKEN_PATTERNS: list[str] = [
@@ -552,6 +613,10 @@ def get_active_rep_map() -> dict:
 	"""Return the PII replacement map built for the current streaming request."""
 	return _active_rep_map.get({})
 
+# True when the current chat_stream() asked for a Tier B JSON reply
+# (response_format), so chat() knows whether to decode the collected reply.
+_json_reply_requested: ContextVar[bool] = ContextVar("_json_reply_requested", default=False)
+
 # Active inference timestamps — updated every time a token is yielded.
 # Used by /api/dashboard/llm-active to drive the dashboard card animation.
 # Key: tier name ("local" / "cloud"), Value: time.monotonic() of last token yield.
@@ -568,20 +633,15 @@ async def record_llm_metric(
 	latency_ms: int = 0,
 	prompt_len: int = 0,
 ) -> None:
-	"""Record a single LLM invocation metric (non-blocking, never raises)."""
+	"""Record a single LLM invocation metric (non-blocking, never raises).
+
+	Buffered and bulk-written with hourly rollups by services/llm_metrics.py.
+	"""
 	try:
-		async with AsyncSessionLocal() as session:
-			session.add(LLMMetric(
-				tier=tier,
-				feature=feature,
-				model=model,
-				tokens=tokens,
-				latency_ms=latency_ms,
-				prompt_len=prompt_len,
-			))
-			await session.commit()
+		from app.services.llm_metrics import record
+		record(tier, feature, model, tokens, latency_ms, prompt_len)
 	except Exception:
-		logger.debug("record_llm_metric: write failed (non-blocking)", exc_info=True)
+		logger.debug("record_llm_metric: buffering failed (non-blocking)", exc_info=True)
 
 # ---------------------------------------------------------------------------
 # Minimal local-path keyword list (EN only, obvious triggers).
@@ -604,6 +664,10 @@ _LOCAL_PATH_KEYWORDS: list[str] = [
 # ---------------------------------------------------------------------------
 async def _classify_intent(user_message: str) -> bool:
 	"""Ask the local model whether the message requires a tool action."""
+	from app.services.intent_gate import local_verdict, record_decision
+	verdict = await local_verdict(user_message, "needs_agent")
+	if verdict is not None:
+		return verdict
 	_ci_start = time.time()
 	classifier_system = (
 		"You are an intent classifier. "
@@ -615,9 +679,11 @@ async def _classify_intent(user_message: str) -> bool:
 		"Output ONLY 'yes' or 'no'. No explanation.\n/no_think"
 	)
 	try:
-		async with httpx.AsyncClient(timeout=httpx.Timeout(8.0, connect=5.0)) as client:
+		from app.services.llm_http import llm_client
+		async with llm_client(settings.LLM_LOCAL_URL) as client:
 			resp = await client.post(
 				f"{settings.LLM_LOCAL_URL}/v1/chat/completions",
+				timeout=httpx.Timeout(8.0, connect=5.0),
 				json={
 					"messages": [
 						{"role": "system", "content": classifier_system},
@@ -633,6 +699,7 @@ async def _classify_intent(user_message: str) -> bool:
 			token = resp.json()["choices"][0]["message"]["content"].strip().lower()
 			result = token.startswith("yes")
 			logger.debug("Intent classifier: %r -> needs_agent=%s", token, result)
+			record_decision(user_message, "needs_agent", result)
 			asyncio.ensure_future(record_llm_metric(
 				tier="local", feature="intent_classify",
 				model=settings.LLM_MODEL_LOCAL, tokens=1,
@@ -1007,7 +1074,8 @@ async def build_system_prompt(user_name: str, user_profile: dict, include_agent_
 	# ── 1. Static Prefix Caching Strategy ────────────────────────────────
 	# We structure the prompt so static instructions (Rules, ACTION tags)
 	# come FIRST. Dynamic data (Time, Profile, Lang) comes LAST in a
-	# <context> block. This allows llama.cpp to cache the KV-prefix.
+	# <context> block. This allows llama.cpp to cache the KV-prefix
+	# (services/prompt_prefix.py; callers put per-request text after it).
 
 	formatted_system_prompt = SYSTEM_PROMPT_CHAT.format(
 		crew_domain_map=crew_domain_map,
@@ -1029,26 +1097,33 @@ async def build_system_prompt(user_name: str, user_profile: dict, include_agent_
 	# attention regardless of conversation history length.  Placing it at the top of
 	# the dynamic section (after the static SYSTEM_PROMPT_CHAT, preserving KV-cache)
 	# ensures the archetype is applied consistently to both initial and follow-up turns.
+	# CURRENT_TIME goes last: it changes every minute, and everything before it
+	# stays reusable from llama.cpp's prompt cache.
 	dynamic_context = (
 		" <context>\n"
 		f"{personality_directive}\n"
-		f"CURRENT_TIME: {simplified_time}\n"
 		f"USER_NAME: {user_name}\n"
 		f"{user_id_context}\n"
 		f"{lang_directive}\n"
 		f"{_operator_board_rule}\n"
 		f"{personal_block}\n"
 		f"{agent_skills_block}\n"
+		f"CURRENT_TIME: {simplified_time}\n"
 		" </context>"
 	)
 
-	formatted_system_prompt += dynamic_context
+	from app.services.prompt_prefix import assemble
+	formatted_system_prompt = assemble("chat", formatted_system_prompt, dynamic_context).text
 
 	context_header = f"Current Local Time (Raw): {format_date_full(now)}\n"
 	context_header += f"Current Formatted Time (Use This): {simplified_time}\n\n"
 	
 	return formatted_system_prompt, context_header, simplified_time, formatted_action_docs
 
+# Replies chat_stream() yields in place of a model answer — never cached.
+_FAILURE_REPLIES = ("I'm having trouble reaching", "Unknown LLM provider")
+
+
 async def chat(
 	user_message: str,
 	system_override: Optional[str] = None,
@@ -1059,8 +1134,25 @@ async def chat(
 	**kwargs: Any
 ) -> str:
 	"""Blocking chat — collects all tokens from chat_stream() into a single string.
-	Used by scheduled tasks, email summarization, calendar detection, etc."""
+	Used by scheduled tasks, email summarization, calendar detection, etc.
+	Features listed in llm_cache.FEATURE_TTLS are served from the response cache."""
 	_metric_start = time.time()
+	_feature = kwargs.get("_feature", "unknown")
+	_tier_name, _, _model_name = select_tier(user_message, tier)
+	_cache_key = None
+	if not kwargs.get("history"):
+		from app.services import llm_cache
+		if llm_cache.is_cacheable(_feature):
+			_cache_key = llm_cache.cache_key(
+				_feature, _tier_name, f"{provider or ''}/{model or _model_name}", system_override or "", user_message or "",
+			)
+			cached = await llm_cache.get_cached(_feature, _cache_key)
+			if cached is not None:
+				return cached
+
+	# The whole reply is collected, so a Tier B endpoint may answer as JSON.
+	kwargs.setdefault("json_actions", True)
+	_json_reply_requested.set(False)
 	chunks = []
 	async for chunk in chat_stream(
 		user_message,
@@ -1074,10 +1166,17 @@ async def chat(
 		chunks.append(chunk)
 	result = "".join(chunks)
 	result = rehydrate_response(result, get_active_rep_map())
+	if _json_reply_requested.get() and result.lstrip().startswith("{"):
+		from app.services import action_extractor
+		decoded = action_extractor.decode_json_reply(result)
+		if decoded is not None:
+			action_extractor.record_extracted("B", decoded[1], [])
+			result = action_extractor.render_reply(*decoded)
+
+	if _cache_key and result.strip() and not result.startswith(_FAILURE_REPLIES):
+		await llm_cache.store(_feature, _cache_key, result)
 
 	# Record metric (fire-and-forget)
-	_feature = kwargs.get("_feature", "unknown")
-	_tier_name, _, _model_name = select_tier(user_message, tier)
 	_latency = int((time.time() - _metric_start) * 1000)
 	asyncio.ensure_future(record_llm_metric(
 		tier=_tier_name,
@@ -1216,7 +1315,9 @@ async def chat_stream(
 	else:
 		_include_health = kwargs.get("include_health", True)
 		formatted_system_prompt, context_header, simplified_time, formatted_action_docs = await build_system_prompt(user_name, user_profile, include_health=_include_health)
-		system_prompt = context_header + formatted_system_prompt
+		# Clock after the prompt so the KV-cached prefix stays byte-identical
+		system_prompt = f"{formatted_system_prompt}\n\n{context_header.rstrip()}"
+		kwargs.setdefault("prompt_key", "chat")
 
 	provider = (provider or settings.LLM_PROVIDER).lower()
 
@@ -1260,6 +1361,22 @@ async def chat_stream(
 			and kwargs.get("enable_tools", True)
 		)
 
+		# Structured actions (services/action_extractor.py): when the prompt teaches
+		# action tags, a Tier A endpoint gets the `action` tool and a blocking caller
+		# (chat()) on a Tier B endpoint gets a JSON-schema reply. Both come back as
+		# canonical tags, so parse_and_execute_actions() never sees a malformed one.
+		action_mode = ""
+		if "[ACTION:" in system_prompt and kwargs.get("structured_actions", True):
+			from app.services import action_extractor
+			_action_tier = action_extractor.get_tier(tier_name)
+			if _action_tier == "A":
+				action_mode = "tools"
+				messages[0]["content"] += "\n\n" + action_extractor.TOOL_DIRECTIVE
+			elif _action_tier == "B" and kwargs.get("json_actions"):
+				action_mode = "json"
+				messages[0]["content"] += "\n\n" + action_extractor.JSON_DIRECTIVE
+		_json_reply_requested.set(action_mode == "json")
+
 		# CoT: disabled by default. Callers can override via thinking=True.
 		request_thinking = kwargs.get("thinking", False)
 
@@ -1273,7 +1390,7 @@ async def chat_stream(
 		if tier_name == "cloud" and sanitize and settings.CLOUD_LLM_SANITIZE:
 			_counters: dict = {}
 			messages[1]["content"], _m1 = sanitize_prompt(user_message, _counters)
-			messages[0]["content"], _m2 = sanitize_prompt(system_prompt, _counters, _seen_map=_m1)
+			messages[0]["content"], _m2 = sanitize_prompt(messages[0]["content"], _counters, _seen_map=_m1)
 			rep_map = {**_m1, **_m2}
 			logger.debug("cloud_sanitize[local-cloud]: %d entities replaced", len(rep_map))
 		# Expose rep_map so callers can do a final whole-response rehydration pass
@@ -1284,7 +1401,8 @@ async def chat_stream(
 		# Cloud tier uses a short timeout (external API is fast).
 		# Local tier: 120s — single tier with no fallback, wait for first token.
 		read_timeout = TIER_TIMEOUTS.get(tier_name, 180.0)
-		# Single attempt for both tiers; cloud has its own retry semantics.
+		# Single attempt for local (a stale pooled connection is replayed inside
+		# _local_peer_lines); cloud has its own retry semantics.
 		max_attempts = 1 if tier_name == "local" else 3
 
 		# Build request headers — cloud needs Bearer auth
@@ -1299,10 +1417,19 @@ async def chat_stream(
 		else:
 			api_url = f"{base_url}/v1/chat/completions"
 
+		from app.services.llm_http import llm_client
+		from app.services.metrics import observe_histogram
+		from app.services.prompt_prefix import prefix_key, record_prompt_timings
+		request_timeout = httpx.Timeout(read_timeout, connect=10.0)
+		prompt_key = kwargs.get("prompt_key") or prefix_key(system_prompt)
 		last_err = None
 		for attempt in range(max_attempts):
+			_got_content = False
+			_request_at = time.perf_counter()
+			_first_token_at = 0.0
+			_n_deltas = 0
 			try:
-				async with httpx.AsyncClient(timeout=httpx.Timeout(read_timeout, connect=10.0)) as client:
+				async with llm_client(api_url) as client:
 					_req_json: dict = {
 						"model": settings.LLM_MODEL_CLOUD if tier_name == "cloud" else "local",
 						"messages": messages,
@@ -1311,38 +1438,60 @@ async def chat_stream(
 						"top_p": 0.9,
 						"max_tokens": max_tok,
 					}
+					_tools: list[dict] = []
 					if enable_tools:
 						from app.services.web_search import WEB_SEARCH_TOOL_DEF
-						_req_json["tools"] = [WEB_SEARCH_TOOL_DEF]
+						_tools.append(WEB_SEARCH_TOOL_DEF)
+					if action_mode == "tools":
+						_tools.append(action_extractor.action_tool_def())
+					if _tools:
+						_req_json["tools"] = _tools
 						_req_json["tool_choice"] = "auto"
+					if action_mode == "json":
+						_req_json["response_format"] = action_extractor.action_response_format()
 					if tier_name == "local":
 						# Qwen3 thinking mode control (ignored by non-Qwen3 models)
 						_req_json["thinking"] = request_thinking
-					async with client.stream(
-						"POST",
-						api_url,
-						headers=request_headers,
-						json=_req_json,
-					) as response:
-						response.raise_for_status()
+					async with contextlib.AsyncExitStack() as _stream_stack:
+						if tier_name == "local":
+							# Least-loaded local peer; hedged onto a second peer when the
+							# first token is late, _FirstTokenTimeout after the read timeout.
+							from app.services.llm_peers import stream_from_peers
+							_lines = stream_from_peers(
+								lambda lease, _rj=_req_json: _local_peer_lines(lease, _rj, request_timeout, prompt_key),
+								first_token_timeout=read_timeout,
+								hedge_budget=_LOCAL_HEDGE_BUDGET_S,
+								timeout_exc=_FirstTokenTimeout,
+							)
+							_stream_stack.push_async_callback(_lines.aclose)
+						else:
+							response = await _stream_stack.enter_async_context(client.stream(
+								"POST",
+								api_url,
+								headers=request_headers,
+								json=_req_json,
+								timeout=request_timeout,
+							))
+							response.raise_for_status()
+							_lines = response.aiter_lines()
 						# Qwen3 think-block filter: buffer content to strip <think>…</think>
 						_think_buf = ""
 						_in_think = False
 						# Tool-call accumulator (streaming tool_calls arrive in deltas)
 						_tool_calls: dict[int, dict] = {}  # index → {id, name, arguments}
 						_got_content = False
-						_first_token_deadline = asyncio.get_event_loop().time() + 5.0  # 5s first-token budget (local only)
-						async for line in response.aiter_lines():
+						async for line in _lines:
 							if not line.startswith("data: "):
-								if tier_name == "local" and not _got_content and asyncio.get_event_loop().time() > _first_token_deadline:
-									raise _FirstTokenTimeout()
 								continue
 							data_str = line[6:]
 							if data_str.strip() == "[DONE]":
 								break
 							try:
 								data = json.loads(data_str)
-								choice = data.get("choices", [{}])[0]
+								if tier_name == "local" and data.get("timings"):
+									# llama-server: prompt tokens served from the KV cache vs. evaluated
+									record_prompt_timings(prompt_key, data["timings"])
+								choice = (data.get("choices") or [{}])[0]
 								delta = choice.get("delta", {})
 								# --- Tool-call accumulation ---
 								tc_deltas = delta.get("tool_calls")
@@ -1364,10 +1513,12 @@ async def chat_stream(
 									continue
 								content = delta.get("content")
 								if not content:
-									if tier_name == "local" and not _got_content and asyncio.get_event_loop().time() > _first_token_deadline:
-										raise _FirstTokenTimeout()
 									continue
+								if not _got_content:
+									_first_token_at = time.perf_counter()
+									observe_histogram("llm_ttft_seconds", _first_token_at - _request_at, buckets=_TTFT_BUCKETS, tier=tier_name)
 								_got_content = True
+								_n_deltas += 1
 								# Stamp timestamp so /api/dashboard/llm-active drives card animation
 								_tier_last_active[tier_name] = time.monotonic()
 								# Filter Qwen3 <think> blocks from the stream
@@ -1392,6 +1543,12 @@ async def chat_stream(
 							except json.JSONDecodeError:
 								continue
 
+					# Tier A: `action` tool calls are not executed here — they are
+					# rendered as canonical tags after the reply (see below).
+					_action_calls = [tc for _, tc in sorted(_tool_calls.items()) if tc["name"] == action_extractor.ACTION_TOOL_NAME] if action_mode == "tools" else []
+					if _action_calls:
+						_tool_calls = {idx: tc for idx, tc in _tool_calls.items() if tc["name"] != action_extractor.ACTION_TOOL_NAME}
+
 					# --- Tool execution loop ---
 					# If the model requested tool calls instead of content,
 					# execute them and send a follow-up request.
@@ -1458,6 +1615,7 @@ async def chat_stream(
 							api_url,
 							headers=request_headers,
 							json=_followup_json,
+							timeout=request_timeout,
 						) as fu_response:
 							fu_response.raise_for_status()
 							async for line in fu_response.aiter_lines():
@@ -1474,14 +1632,27 @@ async def chat_stream(
 										yield rehydrate_response(content, rep_map) if rep_map else content
 								except json.JSONDecodeError:
 									continue
+
+					if _action_calls:
+						_actions = action_extractor.actions_from_tool_calls(_action_calls)
+						action_extractor.record_extracted("A", _actions, [])
+						if _actions:
+							_tags = "\n" + action_extractor.render_reply("", _actions)
+							yield rehydrate_response(_tags, rep_map) if rep_map else _tags
+				# Decode rate after the first token (one SSE content delta ≈ one token)
+				_decode_s = time.perf_counter() - _first_token_at
+				if _n_deltas > 1 and _decode_s > 0:
+					observe_histogram("llm_tokens_per_second", (_n_deltas - 1) / _decode_s, buckets=_TOKENS_PER_S_BUCKETS, tier=tier_name)
 				# Successful streaming response — reset circuit breaker for local tier
 				if tier_name == "local":
 					from app.common.response_budget import reset_local_llm_circuit
 					asyncio.create_task(reset_local_llm_circuit())
 				return
 			except _FirstTokenTimeout:
+				from app.common.response_budget import record_local_llm_timeout
+				asyncio.ensure_future(record_local_llm_timeout())
 				if settings.cloud_configured and settings.SMART_CLOUD_ROUTING:
-					logger.info("LLM: local first-token timeout (>5s) — escalating to cloud")
+					logger.info("LLM: no local first token within %.0fs — escalating to cloud", read_timeout)
 					async for chunk in chat_stream(
 						user_message,
 						system_override=system_prompt,
@@ -1491,7 +1662,8 @@ async def chat_stream(
 					):
 						yield chunk
 					return
-				logger.warning("LLM: local first-token timeout but cloud not configured")
+				logger.warning("LLM: no local first token within %.0fs and cloud not configured", read_timeout)
+				last_err = "The local model did not respond in time. Please try again."
 				break
 			except httpx.ReadTimeout:
 				if tier_name == "local":
@@ -1547,6 +1719,13 @@ async def chat_stream(
 				yield "I'm having trouble reaching the model. Please try again."
 				return
 			except Exception as e:
+				if (
+					isinstance(e, httpx.RemoteProtocolError)
+					and not _got_content and attempt < max_attempts - 1
+				):
+					# Pooled keep-alive connection closed by the peer — replay on a fresh one.
+					logger.debug("LLM %s: stale pooled connection (%s) — retrying", tier_name, e)
+					continue
 				if tier_name == "cloud":
 					# Cloud connection error — fall back to local silently
 					logger.warning("Cloud LLM error (%s) — falling back to local", type(e).__name__)
@@ -1594,9 +1773,11 @@ async def chat_stream(
 			logger.debug("cloud_sanitize[groq]: %d entities replaced in outbound prompt", len(rep_map))
 		_active_rep_map.set(rep_map)
 		try:
-			async with httpx.AsyncClient(timeout=130.0) as client:
+			from app.services.llm_http import llm_client
+			async with llm_client("https://api.groq.com") as client:
 				response = await client.post(
 					"https://api.groq.com/openai/v1/chat/completions",
+					timeout=130.0,
 					headers={"Authorization": f"Bearer {settings.GROQ_API_KEY}"},
 					json={
 						"model": target_model,
@@ -1631,9 +1812,11 @@ async def chat_stream(
 			logger.debug("cloud_sanitize[openai]: %d entities replaced in outbound prompt", len(rep_map))
 		_active_rep_map.set(rep_map)
 		try:
-			async with httpx.AsyncClient(timeout=130.0) as client:
+			from app.services.llm_http import llm_client
+			async with llm_client("https://api.openai.com") as client:
 				response = await client.post(
 					"https://api.openai.com/v1/chat/completions",
+					timeout=130.0,
 					headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
 					json={
 						"model": target_model,
@@ -2182,11 +2365,10 @@ async def chat_stream_with_context(
 
 		_history_slice = history[-6:] if _is_short_msg else history
 		history_text = _build_history_text(_history_slice)
-		context_injection = "\n\n".join(filter(None, [full_prompt, history_text]))
-		system_with_context = f"{formatted_system_prompt}\n\n{context_injection}" if context_injection else formatted_system_prompt
-
-		if extra_system_context:
-			system_with_context = extra_system_context + "\n\n" + system_with_context
+		# Per-message context (router hints, memories, history) follows the cached prefix.
+		system_with_context = "\n\n".join(filter(None, [
+			formatted_system_prompt, extra_system_context, full_prompt, history_text,
+		]))
 
 		if len(user_message.strip()) < 60:
 			system_with_context += (
@@ -2206,6 +2388,7 @@ async def chat_stream_with_context(
 					sanitize=sanitize,
 					user_name=user_name,
 					user_profile=user_profile,
+					prompt_key="chat",
 				)
 				first_chunk = await asyncio.wait_for(_cloud_stream.__anext__(), timeout=10.0)
 				cleaned = _strip_emoji(first_chunk)
@@ -2229,6 +2412,7 @@ async def chat_stream_with_context(
 			sanitize=sanitize,
 			user_name=user_name,
 			user_profile=user_profile,
+			prompt_key="chat",
 		):
 			cleaned = _strip_emoji(chunk)
 			if cleaned:
@@ -0,0 +1,125 @@
+"""
+LLM Response Cache
+------------------
+Several internal helpers are pure functions of their input — email summaries,
+calendar extraction (run for every unread email on every Gmail poll), crew
+keyword translation, context-file compression — yet each call went to the
+model. llm.chat() consults this cache for the features listed in FEATURE_TTLS.
+
+- Keys are content-addressed: sha256 over feature, tier, model, system prompt
+  and prompt, so any change to the input (or a model swap) is a miss.
+- Entries live in Redis (shared pool) with the feature's TTL, which makes them
+  visible to the API process and the Celery workers alike.
+- Each feature keeps a sorted-set index scored by last use; once it holds more
+  than LLM_CACHE_MAX_ENTRIES the least recently used entries are evicted.
+- Hits and misses are counted per feature in Redis and reported by
+  /dashboard/llm-metrics (plus `llm_response_cache_total{feature,result}`).
+
+Cache failures never fail the call: a Redis error is a miss.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# feature (chat(_feature=...)) → TTL in seconds. Only these are cached.
+FEATURE_TTLS: dict[str, int] = {
+	"email_summary": 30 * 86400,
+	"calendar_detect": 86400,		# prompt embeds today's date anyway
+	"crew_kw_translate": 30 * 86400,
+	"context_compress": 7 * 86400,
+}
+
+_PREFIX = "llm_cache"
+_STATS_KEY = f"{_PREFIX}:stats"
+
+
+def is_cacheable(feature: Optional[str]) -> bool:
+	from app.config import settings
+	return bool(settings.LLM_CACHE_ENABLED) and feature in FEATURE_TTLS
+
+
+def cache_key(feature: str, tier: str, model: str, system_prompt: str, prompt: str) -> str:
+	h = hashlib.sha256()
+	for part in (feature, tier, model, system_prompt, prompt):
+		h.update(part.encode("utf-8"))
+		h.update(b"\x00")
+	return f"{_PREFIX}:{feature}:{h.hexdigest()}"
+
+
+def _index_key(feature: str) -> str:
+	return f"{_PREFIX}:idx:{feature}"
+
+
+def _count(feature: str, result: str) -> None:
+	from app.services.metrics import increment_counter
+	increment_counter("llm_response_cache_total", feature=feature, result=result)
+
+
+async def get_cached(feature: str, key: str) -> Optional[str]:
+	"""Cached response for *key*, refreshing its LRU position; None on a miss."""
+	from app.services.redis_pool import get_redis
+	try:
+		r = get_redis()
+		value = await r.get(key)
+		async with r.pipeline(transaction=False) as pipe:
+			if value is not None:
+				pipe.zadd(_index_key(feature), {key: time.time()})
+			pipe.hincrby(_STATS_KEY, f"{feature}:{'hit' if value is not None else 'miss'}", 1)
+			await pipe.execute()
+	except Exception as e:
+		logger.debug("llm_cache: lookup failed for %s: %s", feature, e)
+		return None
+	_count(feature, "hit" if value is not None else "miss")
+	return value
+
+
+async def store(feature: str, key: str, value: str) -> None:
+	"""Store *value* under *key* and evict the feature's least recently used overflow."""
+	from app.config import settings
+	from app.services.redis_pool import get_redis
+	index = _index_key(feature)
+	try:
+		r = get_redis()
+		async with r.pipeline(transaction=False) as pipe:
+			pipe.set(key, value, ex=FEATURE_TTLS[feature])
+			pipe.zadd(index, {key: time.time()})
+			pipe.zremrangebyscore(index, "-inf", time.time() - FEATURE_TTLS[feature])	# expired by TTL
+			pipe.zcard(index)
+			size = (await pipe.execute())[-1]
+		overflow = size - max(1, settings.LLM_CACHE_MAX_ENTRIES)
+		if overflow > 0:
+			evicted = [k for k, _ in await r.zpopmin(index, overflow)]
+			if evicted:
+				await r.delete(*evicted)
+				await r.hincrby(_STATS_KEY, f"{feature}:evicted", len(evicted))
+	except Exception as e:
+		logger.debug("llm_cache: store failed for %s: %s", feature, e)
+
+
+async def get_cache_stats() -> dict:
+	"""Per-feature hits, misses, hit rate, evictions and current size."""
+	from app.services.redis_pool import get_redis
+	try:
+		r = get_redis()
+		raw = await r.hgetall(_STATS_KEY)
+		sizes = {feature: await r.zcard(_index_key(feature)) for feature in FEATURE_TTLS}
+	except Exception as e:
+		logger.debug("llm_cache: stats unavailable: %s", e)
+		return {}
+	out = {}
+	for feature, ttl in FEATURE_TTLS.items():
+		hits = int(raw.get(f"{feature}:hit", 0))
+		misses = int(raw.get(f"{feature}:miss", 0))
+		out[feature] = {
+			"hits": hits,
+			"misses": misses,
+			"hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+			"evicted": int(raw.get(f"{feature}:evicted", 0)),
+			"entries": sizes[feature],
+			"ttl_s": ttl,
+		}
+	return out
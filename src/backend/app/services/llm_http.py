@@ -0,0 +1,171 @@
+"""
+LLM HTTP Client Registry
+------------------------
+One persistent httpx.AsyncClient per LLM endpoint (scheme://host:port), so chat
+turns and classifier calls reuse warm connections instead of paying DNS, TCP
+and TLS setup before every first token.
+
+- Cloud (https) endpoints negotiate HTTP/2 when the `h2` package is installed;
+  concurrent classifier and chat calls then multiplex over one connection.
+  Local llama.cpp / Ollama peers use HTTP/1.1 keep-alive.
+- Callers pass the per-request timeout they always used
+  (`client.post(..., timeout=...)`); the client's own default (local-tier read
+  timeout, 10 s connect) only bounds a call that forgets to.
+- Like the Planka and Qdrant pools, the registry is bound to the event loop
+  that created it; code under its own asyncio.run() (Celery, CLI) gets fresh
+  clients.
+- main.py creates the clients at startup and closes them on shutdown.
+  llm_peers calls retire_llm_client() when the active peer changes; the old
+  client is closed after a grace period so in-flight streams can finish.
+
+Metrics:
+  llm_http_requests_total{endpoint,connection}  connection = new | reused
+  llm_http_ttfb_seconds{endpoint}               request start → response headers
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Idle keep-alive connections are dropped after this long (cloud providers
+# close idle sockets after ~60-120 s; re-using a half-closed one costs a retry).
+_KEEPALIVE_EXPIRY_S = 60.0
+# A retired peer's client is closed this long after the switch (longest local
+# read timeout) so streams already running against it can complete.
+_RETIRE_GRACE_S = 150.0
+# Fallback for requests made without their own timeout: the local tier's read
+# timeout (llm.TIER_TIMEOUTS, the longest) and the usual 10 s connect.
+_DEFAULT_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+# Cloud endpoints not known via settings (Groq / OpenAI providers).
+_PROVIDER_URLS = ("https://api.groq.com", "https://api.openai.com")
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+_retiring: dict[asyncio.Task, httpx.AsyncClient] = {}
+
+try:
+	import h2  # noqa: F401
+	_HTTP2 = True
+except ImportError:	# httpx[http2] extra not installed — HTTP/1.1 keep-alive only
+	_HTTP2 = False
+
+
+def endpoint_key(url: str) -> str:
+	"""Registry key for *url*: scheme://host:port, path dropped."""
+	parts = urlsplit(url)
+	return f"{parts.scheme}://{parts.netloc}"
+
+
+async def _on_request(request: httpx.Request) -> None:
+	state = {"start": time.perf_counter(), "new": False}
+
+	async def _trace(event: str, info: dict) -> None:
+		if event == "connection.connect_tcp.complete":
+			state["new"] = True
+
+	request.extensions["trace"] = _trace
+	request.extensions["llm_http"] = state
+
+
+async def _on_response(response: httpx.Response) -> None:
+	from app.services.metrics import increment_counter, observe_histogram
+	state = response.request.extensions.get("llm_http")
+	if not state:
+		return
+	endpoint = response.request.url.host
+	increment_counter(
+		"llm_http_requests_total", endpoint=endpoint,
+		connection="new" if state["new"] else "reused",
+	)
+	observe_histogram("llm_http_ttfb_seconds", time.perf_counter() - state["start"], endpoint=endpoint)
+
+
+def _build_client(key: str) -> httpx.AsyncClient:
+	http2 = _HTTP2 and key.startswith("https://")
+	logger.debug("llm_http: new client for %s (http2=%s)", key, http2)
+	return httpx.AsyncClient(
+		http2=http2,
+		timeout=_DEFAULT_TIMEOUT,
+		limits=httpx.Limits(
+			max_connections=settings.LLM_HTTP_POOL_SIZE,
+			max_keepalive_connections=settings.LLM_HTTP_POOL_SIZE,
+			keepalive_expiry=_KEEPALIVE_EXPIRY_S,
+		),
+		event_hooks={"request": [_on_request], "response": [_on_response]},
+	)
+
+
+def get_llm_client(url: str) -> httpx.AsyncClient:
+	"""Return the shared keep-alive client for *url*'s endpoint on the running loop."""
+	global _clients, _clients_loop
+	try:
+		loop = asyncio.get_running_loop()
+	except RuntimeError:
+		loop = None
+	if loop is not None and loop is not _clients_loop:
+		_clients, _clients_loop = {}, loop
+	key = endpoint_key(url)
+	client = _clients.get(key)
+	if client is None or client.is_closed:
+		client = _clients[key] = _build_client(key)
+	return client
+
+
+@contextlib.asynccontextmanager
+async def llm_client(url: str) -> AsyncIterator[httpx.AsyncClient]:
+	"""`async with llm_client(url) as client:` — the pooled client; leaving the block closes nothing."""
+	yield get_llm_client(url)
+
+
+def init_llm_clients() -> None:
+	"""Create clients for the configured endpoints (FastAPI startup)."""
+	urls = [settings.LLM_LOCAL_URL]
+	if settings.cloud_configured:
+		urls.append(settings.LLM_CLOUD_BASE_URL)
+	if settings.GROQ_API_KEY:
+		urls.append(_PROVIDER_URLS[0])
+	if settings.OPENAI_API_KEY:
+		urls.append(_PROVIDER_URLS[1])
+	for url in urls:
+		if url:
+			get_llm_client(url)
+	logger.info("llm_http: %d endpoint client(s) ready (http2=%s)", len(_clients), _HTTP2)
+
+
+def retire_llm_client(url: str) -> None:
+	"""Drop *url*'s client from the registry and close it after the grace period."""
+	client = _clients.pop(endpoint_key(url), None)
+	if client is None:
+		return
+
+	async def _close_later() -> None:
+		await asyncio.sleep(_RETIRE_GRACE_S)
+		await client.aclose()
+
+	task = asyncio.ensure_future(_close_later())
+	_retiring[task] = client
+	task.add_done_callback(lambda t: _retiring.pop(t, None))
+
+
+async def close_llm_clients() -> None:
+	"""Close every pooled client, including retired ones (FastAPI shutdown)."""
+	global _clients, _clients_loop
+	clients, _clients, _clients_loop = list(_clients.values()), {}, None
+	for task, client in list(_retiring.items()):
+		task.cancel()
+		clients.append(client)
+	for client in clients:
+		try:
+			await client.aclose()
+		except Exception as e:
+			logger.debug("llm_http: client close failed: %s", e)
+
@@ -0,0 +1,233 @@
+"""
+LLM Usage Metrics Writer
+------------------------
+record_llm_metric() used to open a session and commit one llm_metrics row per
+LLM call, and /dashboard/llm-metrics ran GROUP BY over the raw table on every
+refresh. Now:
+
+- record() only appends to an in-process buffer. A background task flushes it
+  every LLM_METRICS_FLUSH_S seconds (or as soon as LLM_METRICS_FLUSH_ROWS rows
+  are waiting) with one multi-row INSERT.
+- The same transaction folds the batch into llm_metric_rollups: one row per
+  (hour, tier, feature, model) with call count, token and latency sums, max
+  latency and a latency histogram (LATENCY_BUCKETS_MS) for percentiles.
+  A Postgres advisory lock serialises concurrent flushers.
+- The dashboard reads the rollups (get_summary), so raw rows are only needed
+  for recent debugging and cleanup_llm_metrics prunes them after
+  LLM_METRICS_RAW_RETENTION_H hours.
+
+A failed flush puts its rows back (bounded by _MAX_BUFFERED); metrics are
+best-effort and never raise into the caller.
+"""
+
+import asyncio
+import contextlib
+import datetime
+import logging
+from typing import Any, Optional
+
+from app.services.metrics import set_gauge
+
+logger = logging.getLogger(__name__)
+
+# Histogram upper bounds in ms; the rollup stores one extra overflow bucket.
+LATENCY_BUCKETS_MS: tuple[int, ...] = (100, 250, 500, 1000, 2000, 4000, 8000, 15000, 30000, 60000)
+_LOCK_KEY = 0x6C6C6D6D
+_MAX_BUFFERED = 5000
+
+_buffer: list[dict] = []
+_flush_task: Optional[asyncio.Task] = None
+_writer_task: Optional[asyncio.Task] = None
+
+
+def _bucket_index(latency_ms: int) -> int:
+	for i, bound in enumerate(LATENCY_BUCKETS_MS):
+		if latency_ms <= bound:
+			return i
+	return len(LATENCY_BUCKETS_MS)
+
+
+def latency_quantile(buckets: list[int], q: float, max_ms: int) -> int:
+	"""Approximate latency quantile from histogram counts (linear within a bucket)."""
+	total = sum(buckets)
+	if not total:
+		return 0
+	rank = q * total
+	cumulative = 0
+	lower = 0
+	for i, count in enumerate(buckets):
+		upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else max_ms
+		if count and cumulative + count >= rank:
+			return min(max_ms, round(lower + (upper - lower) * (rank - cumulative) / count))
+		cumulative += count
+		lower = upper
+	return max_ms
+
+
+def record(tier: str, feature: str, model: str = "", tokens: int = 0, latency_ms: int = 0, prompt_len: int = 0) -> None:
+	"""Buffer one LLM invocation; flushed in bulk by the writer task."""
+	global _flush_task
+	from app.config import settings
+	_buffer.append({
+		"tier": tier, "feature": feature, "model": model or "", "tokens": tokens or 0,
+		"latency_ms": latency_ms or 0, "prompt_len": prompt_len or 0,
+		"created_at": datetime.datetime.utcnow(),
+	})
+	if len(_buffer) > _MAX_BUFFERED:
+		del _buffer[: len(_buffer) - _MAX_BUFFERED]
+	set_gauge("llm_metrics_buffered_rows", len(_buffer))
+	if len(_buffer) >= settings.LLM_METRICS_FLUSH_ROWS and (_flush_task is None or _flush_task.done()):
+		with contextlib.suppress(RuntimeError):	# no running loop (sync caller): the timer flushes
+			_flush_task = asyncio.get_running_loop().create_task(flush())
+
+
+def _aggregate(rows: list[dict]) -> dict[tuple, dict[str, Any]]:
+	agg: dict[tuple, dict[str, Any]] = {}
+	for r in rows:
+		hour = r["created_at"].replace(minute=0, second=0, microsecond=0)
+		key = (hour, r["tier"], r["feature"], r["model"])
+		a = agg.get(key)
+		if a is None:
+			a = agg[key] = {"calls": 0, "tokens": 0, "latency_sum_ms": 0, "latency_max_ms": 0,
+				"buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+		a["calls"] += 1
+		a["tokens"] += r["tokens"]
+		a["latency_sum_ms"] += r["latency_ms"]
+		a["latency_max_ms"] = max(a["latency_max_ms"], r["latency_ms"])
+		a["buckets"][_bucket_index(r["latency_ms"])] += 1
+	return agg
+
+
+async def _merge_rollups(session, rows: list[dict]) -> None:
+	from sqlalchemy import select, tuple_
+	from app.models.db import LLMMetricRollup as R
+	agg = _aggregate(rows)
+	existing = (await session.execute(
+		select(R).where(tuple_(R.hour, R.tier, R.feature, R.model).in_(list(agg)))
+	)).scalars().all()
+	by_key = {(r.hour, r.tier, r.feature, r.model): r for r in existing}
+	for key, a in agg.items():
+		row = by_key.get(key)
+		if row is None:
+			hour, tier, feature, model = key
+			session.add(R(hour=hour, tier=tier, feature=feature, model=model, calls=a["calls"],
+				tokens=a["tokens"], latency_sum_ms=a["latency_sum_ms"], latency_max_ms=a["latency_max_ms"],
+				latency_buckets=a["buckets"]))
+			continue
+		row.calls += a["calls"]
+		row.tokens += a["tokens"]
+		row.latency_sum_ms += a["latency_sum_ms"]
+		row.latency_max_ms = max(row.latency_max_ms, a["latency_max_ms"])
+		old = list(row.latency_buckets or [])
+		old += [0] * (len(a["buckets"]) - len(old))
+		row.latency_buckets = [x + y for x, y in zip(old, a["buckets"])]
+
+
+async def flush() -> int:
+	"""Write every buffered metric (one INSERT) and update the hourly rollups."""
+	global _buffer
+	if not _buffer:
+		return 0
+	rows, _buffer = _buffer, []
+	from sqlalchemy import insert, text
+	from app.models.db import AsyncSessionLocal, LLMMetric
+	try:
+		async with AsyncSessionLocal() as session:
+			await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+			await session.execute(insert(LLMMetric).values(rows))
+			await _merge_rollups(session, rows)
+			await session.commit()
+	except Exception:
+		logger.debug("llm_metrics: flush of %d rows failed — retrying later", len(rows), exc_info=True)
+		_buffer[:0] = rows
+		if len(_buffer) > _MAX_BUFFERED:
+			del _buffer[: len(_buffer) - _MAX_BUFFERED]
+		return 0
+	finally:
+		set_gauge("llm_metrics_buffered_rows", len(_buffer))
+	return len(rows)
+
+
+async def _flush_periodically() -> None:
+	from app.config import settings
+	while True:
+		await asyncio.sleep(settings.LLM_METRICS_FLUSH_S)
+		await flush()
+
+
+def start_metrics_writer() -> None:
+	"""Start the periodic flush (FastAPI startup)."""
+	global _writer_task
+	if _writer_task is None or _writer_task.done():
+		_writer_task = asyncio.create_task(_flush_periodically())
+
+
+async def stop_metrics_writer() -> None:
+	"""Stop the periodic flush and write whatever is still buffered (FastAPI shutdown)."""
+	global _writer_task
+	task, _writer_task = _writer_task, None
+	if task is not None:
+		task.cancel()
+		with contextlib.suppress(asyncio.CancelledError, Exception):
+			await task
+	await flush()
+
+
+async def get_summary(days: int = 30) -> dict:
+	"""Per-feature and per-tier aggregates over the last *days* days of rollups."""
+	from sqlalchemy import select
+	from app.models.db import AsyncSessionLocal, LLMMetricRollup as R
+	since = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+	async with AsyncSessionLocal() as session:
+		rows = (await session.execute(select(R).where(R.hour >= since))).scalars().all()
+
+	def _empty() -> dict[str, Any]:
+		return {"calls": 0, "tokens": 0, "latency_sum_ms": 0, "latency_max_ms": 0,
+			"buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+
+	def _add(a: dict[str, Any], r) -> None:
+		a["calls"] += r.calls
+		a["tokens"] += r.tokens
+		a["latency_sum_ms"] += r.latency_sum_ms
+		a["latency_max_ms"] = max(a["latency_max_ms"], r.latency_max_ms)
+		for i, count in enumerate(r.latency_buckets or []):
+			if i < len(a["buckets"]):
+				a["buckets"][i] += count
+
+	features: dict[tuple, dict[str, Any]] = {}
+	tiers: dict[str, dict[str, Any]] = {}
+	for r in rows:
+		_add(features.setdefault((r.feature, r.tier, r.model), _empty()), r)
+		_add(tiers.setdefault(r.tier, _empty()), r)
+
+	def _avg(a: dict[str, Any]) -> int:
+		return round(a["latency_sum_ms"] / a["calls"]) if a["calls"] else 0
+
+	by_feature = [
+		{
+			"feature": feature,
+			"tier": tier,
+			"model": model,
+			"calls": a["calls"],
+			"avg_latency_ms": _avg(a),
+			"p50_latency_ms": latency_quantile(a["buckets"], 0.5, a["latency_max_ms"]),
+			"p95_latency_ms": latency_quantile(a["buckets"], 0.95, a["latency_max_ms"]),
+			"max_latency_ms": a["latency_max_ms"],
+			"total_tokens": a["tokens"],
+		}
+		for (feature, tier, model), a in features.items()
+	]
+	by_feature.sort(key=lambda f: f["calls"], reverse=True)
+	return {
+		"total_recorded": sum(a["calls"] for a in tiers.values()),
+		"by_tier": {
+			tier: {
+				"calls": a["calls"],
+				"avg_latency_ms": _avg(a),
+				"p95_latency_ms": latency_quantile(a["buckets"], 0.95, a["latency_max_ms"]),
+			}
+			for tier, a in tiers.items()
+		},
+		"by_feature": by_feature,
+		"window_days": days,
+	}
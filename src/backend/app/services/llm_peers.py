@@ -27,14 +27,30 @@ Routing policy:
   - Automatic failover: if the active peer goes offline or its speed drops below
     the threshold, the next probe promotes the next-best candidate, no restart.
   - Falls back to settings.LLM_LOCAL_URL if every peer is unreachable.
+
+Request scheduling (stream_from_peers):
+  - The probe decides which peers are *capable* (online; externals only when
+    they clear the speed ratio above). Each request then goes to the capable
+    peer with the shortest projected wait — (in-flight + queued + 1) divided by
+    its rolling observed tok/s — so a peer busy with a long crew run no longer
+    receives every chat turn. Idle, this picks the same peer as the probe.
+  - Each peer runs at most LLM_PEER_MAX_CONCURRENCY requests; further requests
+    queue on the peer they were dispatched to.
+  - Hedging: when the first token is later than the peer's TTFT budget
+    (_HEDGE_TTFT_MULTIPLIER x its rolling TTFT), the same request is started on
+    a second peer with a free slot; the first to produce a token wins and the
+    other is cancelled.
+  - In-flight counts, queue depth and rolling TTFT / tok/s are kept per peer URL
+    (PeerLoad) and survive re-probes; get_peer_status() reports them.
 """
 
 import asyncio
+import collections
 import logging
 import os
 import time
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
 
 import httpx
 
@@ -58,6 +74,15 @@ _SPEED_PROBE_MAX_TOKENS = 10
 # Set to 0.0 to always prefer external when online regardless of speed.
 _SPEED_MIN_RATIO = 0.80
 
+# Weight of a new observation in the rolling TTFT / tok/s averages.
+_EWMA_ALPHA = 0.3
+
+# A request is hedged onto a second peer once its first token is this many
+# times later than the peer's rolling TTFT (never sooner than _HEDGE_MIN_S).
+# With no TTFT observed yet, hedging starts halfway to the first-token timeout.
+_HEDGE_TTFT_MULTIPLIER = 3.0
+_HEDGE_MIN_S = 1.5
+
 
 @dataclass
 class PeerState:
@@ -71,6 +96,22 @@ class PeerState:
 	last_error: str = ""			# last inference error message, if any
 	is_vps_local: bool = False		# True for the VPS Docker container fallback
 	hostname: str = ""				# human-readable device name for the dashboard
+	slots: int = 0					# llama-server parallel slots from /props; 0 = unknown
+
+
+@dataclass
+class PeerLoad:
+	"""Live load and rolling performance of one peer, keyed by URL (survives re-probes)."""
+	in_flight: int = 0
+	queued: int = 0
+	completed: int = 0
+	hedged: int = 0					# requests hedged away from this peer after a late first token
+	ttft_s: float = 0.0				# rolling time to first token; 0 = not yet observed
+	toks_per_sec: float = 0.0		# rolling observed decode speed; 0 = not yet observed
+	waiters: collections.deque = field(default_factory=collections.deque, repr=False)
+	# llama-server slot → prompt key it last served (least recently used first)
+	slot_keys: collections.OrderedDict = field(default_factory=collections.OrderedDict, repr=False)
+	busy_slots: set = field(default_factory=set, repr=False)
 
 # --------------------------------------------------------------------------- #
 #  Module-level mutable state                                                 #
@@ -79,6 +120,7 @@ class PeerState:
 _peers: list[PeerState] = []
 _active: Optional[PeerState] = None
 _lock = asyncio.Lock()
+_loads: dict[str, PeerLoad] = {}
 
 
 # --------------------------------------------------------------------------- #
@@ -115,8 +157,8 @@ async def _probe_ollama(
 	return None
 
 
-async def _detect_model_llamacpp(client: httpx.AsyncClient, url: str, fallback: str) -> str:
-	"""Try to read the loaded model name from llama.cpp /props."""
+async def _detect_model_llamacpp(client: httpx.AsyncClient, url: str, fallback: str) -> tuple[str, int]:
+	"""Try to read the loaded model name and slot count from llama.cpp /props."""
 	try:
 		resp = await client.get(f"{url}/props", timeout=_PROBE_TIMEOUT_S)
 		if resp.status_code == 200:
@@ -125,11 +167,11 @@ async def _detect_model_llamacpp(client: httpx.AsyncClient, url: str, fallback:
 				data.get("model_path")
 				or data.get("default_generation_settings", {}).get("model", "")
 			)
-			if mp:
-				return os.path.basename(mp)
+			slots = int(data.get("total_slots") or 0)
+			return (os.path.basename(mp) if mp else fallback), slots
 	except Exception as _e:
 		logger.debug("llama.cpp model detect failed: %s", _e)
-	return fallback
+	return fallback, 0
 
 
 async def _measure_speed(url: str, server_type: str, model: str, ollama_api: str = "generate") -> tuple[float, str, str]:
@@ -142,8 +184,11 @@ async def _measure_speed(url: str, server_type: str, model: str, ollama_api: str
 	For Ollama, the preferred endpoint is tried first; a 404 triggers a fallback to
 	the other variant so the caller can cache the working endpoint and avoid future 404s.
 	"""
+	from app.services.llm_http import llm_client
 	try:
-		async with httpx.AsyncClient(timeout=_SPEED_PROBE_TIMEOUT_S) as client:
+		# Probes go through the same pooled client the chat path uses, so the
+		# connection to each peer stays warm between requests.
+		async with llm_client(url) as client:
 			if server_type == "ollama":
 				# Build ordered list: preferred variant first, then the fallback.
 				apis_to_try = [ollama_api, "chat" if ollama_api == "generate" else "generate"]
@@ -168,7 +213,7 @@ async def _measure_speed(url: str, server_type: str, model: str, ollama_api: str
 						}
 						endpoint = f"{url}/api/chat"
 					t0 = time.monotonic()
-					resp = await client.post(endpoint, json=request_payload)
+					resp = await client.post(endpoint, json=request_payload, timeout=_SPEED_PROBE_TIMEOUT_S)
 					elapsed = time.monotonic() - t0
 					detected_api = api_variant
 					if resp.status_code != 404:
@@ -200,7 +245,7 @@ async def _measure_speed(url: str, server_type: str, model: str, ollama_api: str
 					"stream": False,
 				}
 				t0 = time.monotonic()
-				resp = await client.post(f"{url}/v1/chat/completions", json=payload)
+				resp = await client.post(f"{url}/v1/chat/completions", json=payload, timeout=_SPEED_PROBE_TIMEOUT_S)
 				elapsed = time.monotonic() - t0
 				if resp.status_code != 200:
 					return 0.0, f"HTTP {resp.status_code}", ""
@@ -238,13 +283,14 @@ async def _probe_peer(
 	# Try llama.cpp first — faster probe since it needs only /health
 	lat = await _probe_llamacpp(client, peer.url)
 	if lat is not None:
-		model = await _detect_model_llamacpp(client, peer.url, peer.model or fallback_model)
+		model, slots = await _detect_model_llamacpp(client, peer.url, peer.model or fallback_model)
 		tps, err, _ = await _measure_speed(peer.url, "llamacpp", model)
 		return PeerState(
 			url=peer.url, model=model, server_type="llamacpp",
 			online=True, latency_ms=lat,
 			toks_per_sec=tps, last_error=err,
 			is_vps_local=peer.is_vps_local, hostname=peer.hostname,
+			slots=slots,
 		)
 
 	# Try Ollama
@@ -373,6 +419,7 @@ async def _probe_all() -> None:
 				"LLM peer: active → %s  [%s | %s | %.0f ms | %.1f tok/s]",
 				best.url, best.server_type, best.model, best.latency_ms, best.toks_per_sec,
 			)
+			_rekey_clients(prev, best)
 	else:
 		if prev is not None and prev.online:
 			logger.warning(
@@ -380,6 +427,18 @@ async def _probe_all() -> None:
 			)
 
 
+def _rekey_clients(prev: Optional[PeerState], best: PeerState) -> None:
+	"""Warm the pooled client for the new active peer; retire the previous one
+	once the scheduler can no longer dispatch to it.
+
+	The VPS container keeps its client — the intent classifier always talks to it.
+	"""
+	from app.services.llm_http import get_llm_client, retire_llm_client
+	get_llm_client(best.url)
+	if prev is not None and not prev.is_vps_local and all(p.url != prev.url for p in _capable_peers()):
+		retire_llm_client(prev.url)
+
+
 def _build_peer_list() -> list[PeerState]:
 	"""Build the initial peer list from config at startup.
 
@@ -422,6 +481,217 @@ def _build_peer_list() -> list[PeerState]:
 	return peers
 
 
+# --------------------------------------------------------------------------- #
+#  Request scheduler                                                           #
+# --------------------------------------------------------------------------- #
+
+def _ewma(current: float, sample: float) -> float:
+	return sample if current <= 0 else current + _EWMA_ALPHA * (sample - current)
+
+
+def _max_concurrency() -> int:
+	from app.config import settings
+	return max(1, settings.LLM_PEER_MAX_CONCURRENCY)
+
+
+def _load_for(url: str) -> PeerLoad:
+	load = _loads.get(url)
+	if load is None:
+		load = _loads[url] = PeerLoad()
+	return load
+
+
+def _capable_peers() -> list[PeerState]:
+	"""Peers that may take requests: the online VPS plus externals that clear the speed ratio.
+
+	Before the first probe (or when every peer is down) the configured
+	LLM_LOCAL_URL is returned so requests still have somewhere to go.
+	"""
+	from app.config import settings
+	online = [p for p in _peers if p.online]
+	vps = next((p for p in online if p.is_vps_local), None)
+	ext = [p for p in online if not p.is_vps_local and p.toks_per_sec > 0]
+	if vps is not None and vps.toks_per_sec > 0:
+		threshold = vps.toks_per_sec * _SPEED_MIN_RATIO
+		ext = [p for p in ext if p.toks_per_sec >= threshold]
+	capable = ([vps] if vps is not None else []) + ext
+	if capable:
+		return capable
+	return [PeerState(
+		url=settings.LLM_LOCAL_URL.rstrip("/"), model=settings.LLM_MODEL_LOCAL,
+		online=True, is_vps_local=True, hostname="VPS",
+	)]
+
+
+def get_capable_peers() -> list[PeerState]:
+	"""Snapshot of the peers local requests may currently be dispatched to."""
+	return list(_capable_peers())
+
+
+def _projected_wait(peer: PeerState, load: PeerLoad, has_external: bool) -> float:
+	"""Relative time until a new request on *peer* would finish (lower is better)."""
+	speed = load.toks_per_sec or peer.toks_per_sec or 1.0
+	if peer.is_vps_local and has_external:
+		# Same preference as the probe: an external within _SPEED_MIN_RATIO of
+		# the VPS takes the traffic when both are idle.
+		speed *= _SPEED_MIN_RATIO
+	return (load.in_flight + load.queued + 1) / speed
+
+
+def _pick_peer(exclude: Iterable[str] = (), free_only: bool = False) -> Optional[PeerState]:
+	excluded = set(exclude)
+	limit = _max_concurrency()
+	candidates = [p for p in _capable_peers() if p.url not in excluded]
+	if free_only:
+		candidates = [p for p in candidates if _load_for(p.url).in_flight < limit]
+	if not candidates:
+		return None
+	has_external = any(not p.is_vps_local for p in candidates)
+	active_url = _active.url if _active else None
+	return min(
+		candidates,
+		key=lambda p: (_projected_wait(p, _load_for(p.url), has_external), p.url != active_url),
+	)
+
+
+class PeerLease:
+	"""One request's slot on a peer. Feeds the peer's rolling TTFT and tok/s."""
+
+	def __init__(self, peer: PeerState, load: PeerLoad) -> None:
+		self.peer = peer
+		self.load = load
+		self.started = time.monotonic()
+		self.first_token_at: Optional[float] = None
+		self.tokens = 0
+		self.slot = -1
+		self._released = False
+
+	@property
+	def url(self) -> str:
+		return self.peer.url
+
+	@property
+	def model(self) -> str:
+		from app.config import settings
+		return self.peer.model or settings.LLM_MODEL_LOCAL
+
+	def claim_slot(self, key: str) -> int:
+		"""llama-server slot to pin this request to, so *key*'s prompt prefix stays cached.
+
+		The idle slot that last served *key*, else the least recently used idle
+		slot; -1 (server's choice) when the slot count is unknown or all are busy.
+		"""
+		load = self.load
+		idle = [s for s in range(self.peer.slots) if s not in load.busy_slots]
+		if not idle:
+			return -1
+		owned = [s for s, k in load.slot_keys.items() if k == key and s in idle]
+		unused = [s for s in idle if s not in load.slot_keys]
+		if owned:
+			slot = owned[0]
+		elif unused:
+			slot = unused[0]
+		else:
+			slot = next(s for s in load.slot_keys if s in idle)
+		load.slot_keys[slot] = key
+		load.slot_keys.move_to_end(slot)
+		load.busy_slots.add(slot)
+		self.slot = slot
+		return slot
+
+	def hedge_after(self, first_token_timeout: float) -> float:
+		"""Seconds without a first token after which the request is hedged."""
+		if self.load.ttft_s <= 0:
+			return first_token_timeout / 2
+		return min(max(_HEDGE_MIN_S, self.load.ttft_s * _HEDGE_TTFT_MULTIPLIER), first_token_timeout)
+
+	def record_token(self) -> None:
+		self.tokens += 1
+		if self.first_token_at is None:
+			from app.services.metrics import observe_histogram
+			self.first_token_at = time.monotonic()
+			ttft = self.first_token_at - self.started
+			self.load.ttft_s = _ewma(self.load.ttft_s, ttft)
+			observe_histogram("llm_peer_ttft_seconds", ttft, peer=self.peer.hostname or self.peer.url)
+
+	def record_stall(self) -> None:
+		"""The first token is overdue and the request is being hedged: count the wait as TTFT."""
+		self.load.hedged += 1
+		self.load.ttft_s = _ewma(self.load.ttft_s, time.monotonic() - self.started)
+
+	def release(self) -> None:
+		if self._released:
+			return
+		self._released = True
+		load = self.load
+		load.in_flight -= 1
+		load.busy_slots.discard(self.slot)
+		if self.first_token_at is not None:
+			load.completed += 1
+			decode_s = time.monotonic() - self.first_token_at
+			if self.tokens > 1 and decode_s > 0:
+				load.toks_per_sec = _ewma(load.toks_per_sec, (self.tokens - 1) / decode_s)
+		_wake_next(load)
+
+
+def _wake_next(load: PeerLoad) -> None:
+	while load.waiters:
+		waiter = load.waiters.popleft()
+		if not waiter.done():
+			waiter.set_result(None)
+			return
+
+
+async def acquire_peer(exclude: Iterable[str] = ()) -> PeerLease:
+	"""Reserve a slot on the least-loaded capable peer, queueing on it when it is full."""
+	peer = _pick_peer(exclude) or _pick_peer()
+	load = _load_for(peer.url)
+	if load.in_flight >= _max_concurrency():
+		load.queued += 1
+		try:
+			while load.in_flight >= _max_concurrency():
+				waiter = asyncio.get_running_loop().create_future()
+				load.waiters.append(waiter)
+				try:
+					await waiter
+				except asyncio.CancelledError:
+					if waiter.done() and not waiter.cancelled():
+						_wake_next(load)	# hand the freed slot to the next waiter
+					raise
+		finally:
+			load.queued -= 1
+	load.in_flight += 1
+	return PeerLease(peer, load)
+
+
+def try_acquire_peer(exclude: Iterable[str] = ()) -> Optional[PeerLease]:
+	"""Reserve a slot on the least-loaded capable peer that has one free, else None."""
+	peer = _pick_peer(exclude, free_only=True)
+	if peer is None:
+		return None
+	load = _load_for(peer.url)
+	load.in_flight += 1
+	return PeerLease(peer, load)
+
+
+_STREAM_DONE = object()
+
+
+async def _pump(lease: PeerLease, open_stream: Callable[[PeerLease], AsyncIterator[Any]], queue: asyncio.Queue) -> None:
+	"""Run one peer's stream in its own task, forwarding items as (lease, item)."""
+	try:
+		async for item in open_stream(lease):
+			lease.record_token()
+			queue.put_nowait((lease, item))
+		queue.put_nowait((lease, _STREAM_DONE))
+	except asyncio.CancelledError:
+		raise
+	except Exception as exc:
+		queue.put_nowait((lease, exc))
+	finally:
+		lease.release()
+
+
 # --------------------------------------------------------------------------- #
 #  Public API                                                                  #
 # --------------------------------------------------------------------------- #
@@ -485,6 +755,88 @@ def get_active_local_endpoint() -> tuple[str, str]:
 	return settings.LLM_LOCAL_URL, settings.LLM_MODEL_LOCAL
 
 
+async def stream_from_peers(
+	open_stream: Callable[[PeerLease], AsyncIterator[Any]],
+	*,
+	first_token_timeout: float,
+	hedge_budget: Optional[float] = None,
+	timeout_exc: type[Exception] = TimeoutError,
+) -> AsyncIterator[Any]:
+	"""
+	Yield the items of open_stream(lease), run on the least-loaded capable peer.
+
+	open_stream must yield its first item at the first generated token (callers
+	drop keep-alive and role-only SSE lines until then). When that takes longer
+	than the peer's hedge budget (derived from hedge_budget, default
+	first_token_timeout), the request is also started on another peer with a
+	free slot; whichever produces a token first is streamed and the other is
+	cancelled. No token within first_token_timeout seconds of dispatch raises
+	timeout_exc — pass the tier's read timeout, since the wait includes prompt
+	evaluation. An error before the first token is raised once no other attempt
+	is still running; errors after it are raised as they occur.
+	"""
+	from app.services.metrics import increment_counter
+	queue: asyncio.Queue = asyncio.Queue()
+	tasks: dict[PeerLease, asyncio.Task] = {}
+
+	def _start(lease: PeerLease) -> None:
+		tasks[lease] = asyncio.create_task(_pump(lease, open_stream, queue))
+
+	primary = await acquire_peer()
+	_start(primary)
+	running = {primary}
+	deadline = primary.started + first_token_timeout
+	hedge_at = primary.started + min(primary.hedge_after(hedge_budget or first_token_timeout), first_token_timeout)
+	winner: Optional[PeerLease] = None
+	try:
+		while winner is None:
+			try:
+				source, item = await asyncio.wait_for(queue.get(), max(0.0, min(hedge_at, deadline) - time.monotonic()))
+			except asyncio.TimeoutError:
+				if time.monotonic() >= deadline:
+					raise timeout_exc(f"no first token within {first_token_timeout:.1f}s") from None
+				hedge_at = deadline
+				backup = try_acquire_peer(exclude=[primary.url])
+				if backup is not None:
+					logger.info(
+						"LLM peer: no first token from %s after %.1fs — hedging on %s",
+						primary.peer.hostname or primary.url, time.monotonic() - primary.started,
+						backup.peer.hostname or backup.url,
+					)
+					primary.record_stall()
+					running.add(backup)
+					_start(backup)
+				continue
+			if item is _STREAM_DONE or isinstance(item, Exception):
+				running.discard(source)
+				if running:
+					continue
+				if isinstance(item, Exception):
+					raise item
+				return
+			winner = source
+			if len(tasks) > 1:
+				increment_counter("llm_peer_hedges_total", outcome="primary" if winner is primary else "backup")
+			for lease, task in tasks.items():
+				if lease is not winner:
+					task.cancel()
+			yield item
+
+		while True:
+			source, item = await queue.get()
+			if source is not winner:
+				continue
+			if item is _STREAM_DONE:
+				return
+			if isinstance(item, Exception):
+				raise item
+			yield item
+	finally:
+		for task in tasks.values():
+			task.cancel()
+		await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
 def get_peer_status() -> dict:
 	"""Return a serialisable snapshot of peer states for the dashboard."""
 	return {
@@ -513,7 +865,22 @@ def get_peer_status() -> dict:
 				"last_error": p.last_error,
 				"hostname": p.hostname,
 				"is_vps_local": p.is_vps_local,
+				**_load_status(p.url),
 			}
 			for p in _peers
 		],
+		"max_concurrency": _max_concurrency(),
+	}
+
+
+def _load_status(url: str) -> dict:
+	load = _loads.get(url) or PeerLoad()
+	return {
+		"in_flight": load.in_flight,
+		"queue_depth": load.queued,
+		"utilisation": round(load.in_flight / _max_concurrency(), 2),
+		"completed": load.completed,
+		"hedged": load.hedged,
+		"ttft_ms": round(load.ttft_s * 1000, 1) if load.ttft_s else None,
+		"observed_toks_per_sec": round(load.toks_per_sec, 1),
 	}
@@ -1,12 +1,16 @@
 from typing import Optional, Any
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, models
 from app.config import settings
 import asyncio
+import inspect
 import threading
+import time
 import uuid
 import logging
 import re
 import datetime
+import math
+import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -39,46 +43,143 @@ _ADVERSARIAL_PATTERNS = re.compile(
 embedder = None
 _embedder_lock = threading.Lock()
 COLLECTION_NAME = "personal_memory"
+# Cosine score above which a new fact counts as already stored.
+_DEDUP_SCORE = 0.92
 
 def get_embedder():
+	"""Return the shared all-MiniLM-L6-v2 embedder for the configured EMBEDDER_BACKEND."""
 	global embedder
 	if embedder is None:
 		with _embedder_lock:
 			if embedder is None:
-				from sentence_transformers import SentenceTransformer
-				# local_files_only=True skips all HuggingFace network checks — model
-				# is already cached in the container. Falls back to online if not cached.
-				try:
-					embedder = SentenceTransformer("all-MiniLM-L6-v2", local_files_only=True)
-				except Exception:
-					embedder = SentenceTransformer("all-MiniLM-L6-v2")
+				from app.services.embeddings import load_embedder
+				embedder = load_embedder(settings.EMBEDDER_BACKEND)
 	return embedder
 
-def _encode_sync(text: str) -> list:
-	"""Run embedding synchronously — intended to be called via run_in_executor."""
-	return get_embedder().encode(text).tolist()
-
 async def encode_async(text: str) -> list:
-	"""Embed text without blocking the event loop."""
-	loop = asyncio.get_event_loop()
-	return await loop.run_in_executor(None, _encode_sync, text)
+	"""Embed text without blocking the event loop (micro-batched with concurrent callers)."""
+	from app.services.embeddings import encode
+	return await encode(text)
+
+async def encode_many_async(texts: list[str]) -> list[list]:
+	"""Embed several texts in one batched encode() call."""
+	from app.services.embeddings import encode_many
+	return await encode_many(texts)
+
+class _TimedQdrant:
+	"""Thin proxy over AsyncQdrantClient that records a latency histogram per operation.
+
+	Every awaited client method (query_points, upsert, scroll, ...) is observed as
+	`qdrant_op_seconds{op=<method>}`; non-coroutine attributes pass through untouched.
+	"""
+
+	__slots__ = ("_client",)
+
+	def __init__(self, client: AsyncQdrantClient) -> None:
+		self._client = client
+
+	def __getattr__(self, name: str) -> Any:
+		attr = getattr(self._client, name)
+		if name == "close" or not inspect.iscoroutinefunction(attr):
+			return attr
+
+		async def _timed(*args: Any, **kwargs: Any) -> Any:
+			start = time.perf_counter()
+			try:
+				return await attr(*args, **kwargs)
+			finally:
+				from app.services.metrics import observe_histogram
+				observe_histogram("qdrant_op_seconds", time.perf_counter() - start, op=name)
 
-def get_qdrant() -> QdrantClient:
-	return QdrantClient(
+		return _timed
+
+
+# Process-wide client. Opened in the FastAPI lifespan (init_qdrant) and reused by
+# every caller so the underlying httpx pool keeps connections alive. The owning
+# event loop is remembered: code that runs under its own asyncio.run() (Celery
+# worker, CLI backfill) transparently gets a client bound to that loop instead.
+_qdrant: Optional[_TimedQdrant] = None
+_qdrant_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _build_qdrant() -> _TimedQdrant:
+	client = AsyncQdrantClient(
 		host=settings.QDRANT_HOST,
 		port=settings.QDRANT_PORT,
-		api_key=settings.QDRANT_API_KEY,
+		api_key=settings.QDRANT_API_KEY or None,
 		https=False,
-		timeout=10.0,
+		timeout=10,
+		# qdrant-client disables keep-alive unless limits are passed explicitly.
+		limits=httpx.Limits(
+			max_connections=settings.QDRANT_POOL_SIZE,
+			max_keepalive_connections=settings.QDRANT_POOL_SIZE,
+			keepalive_expiry=60.0,
+		),
+		# Version probe is a blocking request at construction time — skip it.
+		check_compatibility=False,
 	)
+	return _TimedQdrant(client)
+
+
+def get_qdrant() -> Any:
+	"""Return the shared, keep-alive AsyncQdrantClient (all methods must be awaited)."""
+	global _qdrant, _qdrant_loop
+	try:
+		loop = asyncio.get_running_loop()
+	except RuntimeError:
+		loop = None
+	if _qdrant is None or (loop is not None and loop is not _qdrant_loop):
+		if _qdrant is not None:
+			_discard_qdrant(_qdrant, _qdrant_loop)
+		_qdrant = _build_qdrant()
+		_qdrant_loop = loop
+	return _qdrant
+
+
+# Close tasks for clients replaced on a loop change (keeps them referenced until done).
+_closing: set[asyncio.Future] = set()
+
+
+def _discard_qdrant(client: Any, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+	"""Close a client replaced after a loop change instead of leaking its pool.
+
+	Runs the close on the client's own loop while that loop is still running
+	(another thread); once it is gone the close is scheduled on the current loop.
+	"""
+	if loop is not None and loop.is_running() and not loop.is_closed():
+		fut: asyncio.Future = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_close_client(client), loop))
+	else:
+		fut = asyncio.ensure_future(_close_client(client))
+	_closing.add(fut)
+	fut.add_done_callback(_closing.discard)
+
+
+async def _close_client(client: Any) -> None:
+	try:
+		await client.close()
+	except Exception as e:
+		logger.debug("Qdrant client close failed: %s", _sanitize_for_log(e))
+
+
+async def init_qdrant() -> None:
+	"""Open the shared client on the running loop. Called once from the FastAPI lifespan."""
+	get_qdrant()
+
+
+async def close_qdrant() -> None:
+	"""Close the shared client and release pooled connections (FastAPI shutdown)."""
+	global _qdrant, _qdrant_loop
+	client, _qdrant, _qdrant_loop = _qdrant, None, None
+	if client is not None:
+		await _close_client(client)
 
 async def ensure_collection():
 	"""Create collection if it doesn't exist."""
 	client = get_qdrant()
 	try:
-		collections = [c.name for c in client.get_collections().collections]
+		collections = [c.name for c in (await client.get_collections()).collections]
 		if COLLECTION_NAME not in collections:
-			client.create_collection(
+			await client.create_collection(
 				collection_name=COLLECTION_NAME,
 				vectors_config=models.VectorParams(
 					size=384,
@@ -88,18 +189,14 @@ async def ensure_collection():
 	except Exception as e:
 		logger.warning("Error connecting to Qdrant: %s", _sanitize_for_log(e))
 
-async def store_memory(text: str, metadata: Optional[dict] = None):
-	"""
-	Embed text and store in Qdrant with Infrastructure-only guardrails.
-	
-	Guardrails:
-	1. Noise Gate: Ignore extremely short/low-entropy inputs.
-	2. Fact Distillation: Convert 'Traffic' (User talk) into 'Infrastructure' (Facts).
-	3. Semantic Deduplication: Check if fact is already stored to prevent bloat.
+def _distill_memory_text(text: str) -> Optional[str]:
+	"""Apply the noise gate and fact-distillation guardrails.
+
+	Returns the cleaned text to embed, or None when the input must not be stored.
 	"""
 	# 1. Noise Gate (Pre-filtering)
 	if not text or len(text.strip()) < 12:
-		return
+		return None
 
 	# 2. Fact Distillation (Infrastructure Pass)
 	distilled_text = text
@@ -112,7 +209,7 @@ async def store_memory(text: str, metadata: Optional[dict] = None):
 	distilled_text = distilled_text.strip()
 
 	if not distilled_text or len(distilled_text) < 5:
-		return
+		return None
 
 	# Ephemeral / system meta filter — reject phrases that describe transient
 	# system state, LLM thinking artefacts, or numbered list fragments that
@@ -182,12 +279,28 @@ async def store_memory(text: str, metadata: Optional[dict] = None):
 	)
 	if _EPHEMERAL_PATTERNS.search(distilled_text):
 		logger.debug("Memory rejected: ephemeral/system-meta pattern: %s", _sanitize_for_log(distilled_text))
-		return
+		return None
 
 	# Adversarial content filter -- reject text containing known injection
 	# phrases that could poison future prompt contexts.
 	if _ADVERSARIAL_PATTERNS.search(distilled_text):
 		logger.warning("Memory rejected: adversarial pattern detected")
+		return None
+
+	return distilled_text
+
+
+async def store_memory(text: str, metadata: Optional[dict] = None):
+	"""
+	Embed text and store in Qdrant with Infrastructure-only guardrails.
+	
+	Guardrails:
+	1. Noise Gate: Ignore extremely short/low-entropy inputs.
+	2. Fact Distillation: Convert 'Traffic' (User talk) into 'Infrastructure' (Facts).
+	3. Semantic Deduplication: Check if fact is already stored to prevent bloat.
+	"""
+	distilled_text = _distill_memory_text(text)
+	if distilled_text is None:
 		return
 
 	# 3. Semantic Deduplication
@@ -196,12 +309,12 @@ async def store_memory(text: str, metadata: Optional[dict] = None):
 	
 	try:
 		# Search for existing duplicates with extremely high threshold
-		dupes = client.query_points(
+		dupes = await client.query_points(
 			collection_name=COLLECTION_NAME,
 			query=embedding,
 			limit=1
 		)
-		if dupes.points and dupes.points[0].score > 0.92:
+		if dupes.points and dupes.points[0].score > _DEDUP_SCORE:
 			logger.info("Memory Deduplicator: Ignored existing fact (score=%.3f)", dupes.points[0].score)
 			return
 	except Exception as _e:
@@ -209,7 +322,7 @@ async def store_memory(text: str, metadata: Optional[dict] = None):
 
 	# 4. Final Upsert
 	final_metadata = {**(metadata or {}), "text": distilled_text, "stored_at": datetime.datetime.utcnow().timestamp()}
-	client.upsert(
+	await client.upsert(
 		collection_name=COLLECTION_NAME,
 		points=[
 			models.PointStruct(
@@ -222,6 +335,63 @@ async def store_memory(text: str, metadata: Optional[dict] = None):
 
 
 
+async def store_memories(texts: list[str], metadata: Optional[dict] = None) -> int:
+	"""Batch variant of store_memory() for several facts at once.
+
+	Same guardrails, but every surviving fact is embedded in a single batched
+	encode(), checked against the vault in one batched Qdrant search, and all
+	new points are written in one upsert. Facts that duplicate each other within
+	the batch (same text or cosine > 0.92) are collapsed before touching Qdrant.
+	Returns the number of points stored.
+	"""
+	distilled: list[str] = []
+	for t in texts:
+		d = _distill_memory_text(t)
+		if d is not None and d not in distilled:
+			distilled.append(d)
+	if not distilled:
+		return 0
+
+	client = get_qdrant()
+	embeddings = await encode_many_async(distilled)
+
+	# In-batch semantic dedup: keep the first of any near-identical pair.
+	kept: list[int] = []
+	for i, emb in enumerate(embeddings):
+		if all(_cosine(emb, embeddings[j]) <= _DEDUP_SCORE for j in kept):
+			kept.append(i)
+
+	try:
+		results = await client.query_batch_points(
+			collection_name=COLLECTION_NAME,
+			requests=[models.QueryRequest(query=list(embeddings[i]), limit=1) for i in kept],
+		)
+	except Exception as _e:
+		logger.debug("Memory dedup check failed: %s", _e)
+		results = [None] * len(kept)
+
+	stored_at = datetime.datetime.utcnow().timestamp()
+	points: list = []
+	for i, dupes in zip(kept, results):
+		if dupes is not None and dupes.points and dupes.points[0].score > _DEDUP_SCORE:
+			logger.info("Memory Deduplicator: Ignored existing fact (score=%.3f)", dupes.points[0].score)
+			continue
+		points.append(models.PointStruct(
+			id=str(uuid.uuid4()),
+			vector=embeddings[i],
+			payload={**(metadata or {}), "text": distilled[i], "stored_at": stored_at},
+		))
+
+	if points:
+		await client.upsert(collection_name=COLLECTION_NAME, points=points)
+	return len(points)
+
+
+def _cosine(a, b) -> float:
+	dot = sum(x * y for x, y in zip(a, b))
+	norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+	return dot / norm if norm else 0.0
+
 
 async def semantic_search(query: str, top_k: int = 5) -> str:
 	"""Search memory and return formatted results above the configured score threshold."""
@@ -230,7 +400,7 @@ async def semantic_search(query: str, top_k: int = 5) -> str:
 	try:
 		# Use modern query_points API which is more robust.
 		# score_threshold filters out low-relevance results before they reach context injection.
-		response = client.query_points(
+		response = await client.query_points(
 			collection_name=COLLECTION_NAME,
 			query=query_vector,
 			limit=top_k,
@@ -254,11 +424,11 @@ async def get_memory_stats() -> dict:
 	client = get_qdrant()
 	try:
 		# Use count() for real-time accuracy
-		count_result = client.count(
+		count_result = await client.count(
 			collection_name=COLLECTION_NAME,
 			exact=True
 		)
-		info = client.get_collection(COLLECTION_NAME)
+		info = await client.get_collection(COLLECTION_NAME)
 		return {
 			"points": count_result.count,
 			"status": str(info.status),
@@ -272,7 +442,7 @@ async def delete_memory(point_id: str):
 	"""Delete a specific point from Qdrant by ID."""
 	client = get_qdrant()
 	try:
-		client.delete(
+		await client.delete(
 			collection_name=COLLECTION_NAME,
 			points_selector=models.PointIdsList(
 				points=[point_id]
@@ -288,7 +458,7 @@ async def semantic_search_raw(query: str, top_k: int = 10) -> list[dict]:
 	client = get_qdrant()
 	query_vector = await encode_async(query)
 	try:
-		response = client.query_points(
+		response = await client.query_points(
 			collection_name=COLLECTION_NAME,
 			query=query_vector,
 			limit=top_k,
@@ -312,7 +482,7 @@ async def list_memories(offset: int = 0, limit: int = 50) -> dict:
 	"""Scroll all memories with pagination. Returns {items, total, next_offset}."""
 	client = get_qdrant()
 	try:
-		count_result = client.count(collection_name=COLLECTION_NAME, exact=True)
+		count_result = await client.count(collection_name=COLLECTION_NAME, exact=True)
 		total = count_result.count
 	except Exception:
 		total = 0
@@ -321,7 +491,7 @@ async def list_memories(offset: int = 0, limit: int = 50) -> dict:
 		# Qdrant scroll accepts a page offset as an integer offset in some versions;
 		# to reliably paginate we scroll with limit and skip using an offset index trick.
 		# The simplest correct approach: scroll from beginning, skip first `offset` points.
-		results, next_page_offset = client.scroll(
+		results, next_page_offset = await client.scroll(
 			collection_name=COLLECTION_NAME,
 			limit=limit,
 			offset=None if offset == 0 else offset,
@@ -348,7 +518,7 @@ async def wipe_collection(confirm: bool = False):
 		return False
 	client = get_qdrant()
 	try:
-		client.delete_collection(COLLECTION_NAME)
+		await client.delete_collection(COLLECTION_NAME)
 		await ensure_collection()
 		return True
 	except Exception:
@@ -361,7 +531,7 @@ async def get_recent_memories(hours: int = 24) -> list[dict]:
 		cutoff = (datetime.datetime.utcnow() - datetime.timedelta(hours=hours)).timestamp()
 		# Scroll all points and filter by stored_at
 		try:
-			results, _ = client.scroll(
+			results, _ = await client.scroll(
 				collection_name=COLLECTION_NAME,
 				scroll_filter=models.Filter(
 					must=[
@@ -375,7 +545,7 @@ async def get_recent_memories(hours: int = 24) -> list[dict]:
 			)
 		except Exception as inner_e:
 			logger.warning("Filtered scroll failed (schema mismatch?), falling back to unfiltered: %s", inner_e)
-			results, _ = client.scroll(collection_name=COLLECTION_NAME, limit=20)
+			results, _ = await client.scroll(collection_name=COLLECTION_NAME, limit=20)
 			
 		return [{"id": str(p.id), "text": p.payload.get("text", "")} for p in results]
 	except Exception as e:
@@ -11,7 +11,7 @@ Every inbound message — from any channel — flows through two calls:
 	        Returns cross-channel history ready to pass to the LLM.
 
 	2.  reply, actions, pending = await bus.commit_reply(channel, raw_llm_response, ...)
-	        Parses [ACTION:...] tags, saves Z's turn, schedules background memory
+	        Parses [ACTION:...] tags, saves Z's turn, queues background memory
 	        extraction, and returns the cleaned reply to the caller for delivery.
 
 Channel adapters own only the channel-specific parts:
@@ -165,6 +165,8 @@ class MessageBus:
 			Returns an empty list if the message is a cross-channel duplicate.
 		"""
 		from app.models.db import save_global_message, get_rolling_history
+		from app.services.learning import mark_interactive
+		mark_interactive()
 
 		# ── Dedup: skip duplicate messages arriving within the sliding window ──
 		_norm = user_text.strip().lower()
@@ -198,6 +200,7 @@ class MessageBus:
 		save: bool = True,
 		require_hitl: bool = False,
 		crew_board_hint: str | None = None,
+		early_actions: dict[str, str] | None = None,
 	) -> tuple[str, list, list]:
 		"""Parse action tags, persist Z's reply, schedule background memory.
 
@@ -212,6 +215,8 @@ class MessageBus:
 			require_hitl:     If True, destructive actions are held for human confirmation.
 			crew_board_hint:  When set, CREATE_TASK tags are forced onto this board name.
 			                  Pass the crew's Planka board name (e.g. "Life" for crew "life").
+			early_actions:    raw_tag → result from EarlyActionRunner.results() for tags
+			                  already executed while the reply streamed.
 
 		Returns:
 			(clean_reply, executed_commands, pending_actions)
@@ -228,17 +233,21 @@ class MessageBus:
 			from app.services.crews_native import _inject_crew_board
 			raw_reply = _inject_crew_board(raw_reply, crew_board_hint)
 
+		_early = {"early_results": early_actions} if early_actions else {}
 		if db is not None:
 			clean_reply, executed_cmds, pending_actions = await parse_and_execute_actions(
 				raw_reply, db=db, require_hitl=require_hitl, user_text=user_text,
-				crew_board_hint=crew_board_hint,
+				crew_board_hint=crew_board_hint, **_early,
 			)
 		else:
 			async with AsyncSessionLocal() as _db:
 				clean_reply, executed_cmds, pending_actions = await parse_and_execute_actions(
 					raw_reply, db=_db, require_hitl=require_hitl, user_text=user_text,
-					crew_board_hint=crew_board_hint,
+					crew_board_hint=crew_board_hint, **_early,
 				)
+		if early_actions:
+			# Left over: executed early, but the final pass matched no identical tag.
+			logger.warning("MessageBus: %d early action(s) not matched by the final pass (channel=%s)", len(early_actions), channel)
 
 		if save:
 			_save_reply = clean_reply
@@ -268,8 +277,8 @@ class MessageBus:
 				_schedule_reactive_audit()
 
 		if user_text:
-			from app.services.learning import extract_and_store_facts
-			asyncio.create_task(extract_and_store_facts(user_text))
+			from app.services.learning import enqueue_extraction
+			asyncio.create_task(enqueue_extraction(user_text))
 
 		# Cross-channel sync: push the conversation to all other registered
 		# channels so the user sees it regardless of which surface they're on.
@@ -0,0 +1,245 @@
+"""
+Multi-head Message Classifier
+-----------------------------
+One structured cloud call that answers every LLM routing question the router
+used to ask in series before Z could start streaming:
+
+  system_action  structural Planka command or operational query
+                 (was crews.is_system_action_or_operational_query)
+  state_query    card/board/list the user is asking the location or status of
+                 (was router._classify_state_query)
+  intents        which keyword-triggered intercepts the user genuinely requests
+                 (was router._validate_routing_intent and
+                 intent_router.validate_intent_with_reasoning)
+  crews          expert crews to consult, primary first
+                 (was the cloud crew router in semantic_router.route_semantic)
+
+route_message_stream starts the call once per message and parks the task on the
+request's ResponseBudget; each stage awaits the shared result via
+get_shared_classification(). Callers outside a routed request (no budget, or a
+different text) get None and keep using their own single-purpose call.
+Successful classifications are kept in the routing decision cache
+(services/routing_cache.py), so a re-sent message skips the call entirely.
+
+When the call fails or times out every head resolves to the fallback its old
+gate used on error: intercepts trusted, not a system action, no state query,
+crew choice left to the local embedding router.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CLASSIFY_TIMEOUT_S = 5.0
+
+# Intent labels the model may return, and the keyword-intercept names the
+# router validates against them. Every structural Planka verb maps to
+# PLANKA_MUTATION.
+_INTENT_LABELS = {
+	"FAST_PATH_TRIVIAL_BYPASS": "SMALLTALK",
+	"RUN_SELF_AUDIT": "SELF_AUDIT",
+	"RECALL_CONVERSATION_HISTORY": "RECALL_HISTORY",
+}
+_MUTATION_LABEL = "PLANKA_MUTATION"
+
+_SYSTEM_PROMPT = (
+	"You are openZero's multilingual message classifier. Analyze the user's message "
+	"(and, for references like 'it' or 'das', the conversation history) and answer all "
+	"questions at once.\n\n"
+	"Return ONLY one JSON object with exactly these keys:\n"
+	"{\n"
+	'  "system_action": true|false,\n'
+	'  "state_query": "<item name>" | null,\n'
+	'  "intents": ["<LABEL>", ...],\n'
+	'  "crews": ["<crew id>", ...]\n'
+	"}\n\n"
+	"system_action: true if the message is a structural Planka operation (create, move, "
+	"delete, rename, archive, sort or reorganize boards, lists, cards, tasks or projects, in "
+	"any language) or an operational query about the outcome of a previous action "
+	"('did it work?', 'did you do it?', '¿funcionó?', 'hat es geklappt?').\n"
+	"state_query: if the user asks about the location, list, board, status, existence of, or "
+	"searches for a card, task, list, board or document on their task boards, the exact "
+	"name/topic of that item in its original language, without articles, quotes or question "
+	"words (resolve pronouns from history). Otherwise null.\n"
+	"intents: every label below the user is genuinely requesting right now (not merely "
+	"discussing or referencing):\n"
+	"  SMALLTALK       only a greeting, thanks or acknowledgement\n"
+	"  SELF_AUDIT      asks you to audit or review the actions you took\n"
+	"  RECALL_HISTORY  asks you to recall or list earlier conversation messages\n"
+	"  PLANKA_MUTATION asks to change boards, lists, cards, tasks or projects\n"
+	"crews: IDs of the expert crews below that are highly relevant, at most 3, most "
+	"important first. Use [] for general conversation (greetings, thanks, small talk) or "
+	"when no crew domain is touched.\n\n"
+	"Do not include any explanation or text outside the JSON object."
+)
+
+
+@dataclass
+class MessageClassification:
+	"""All routing decisions for one user message."""
+	text: str
+	ok: bool = False
+	system_action: bool = False
+	state_query: Optional[str] = None
+	intents: frozenset = field(default_factory=frozenset)
+	crews: Optional[list] = None	# None = no decision; use the local crew router
+
+	def is_valid(self, expected_intent: str) -> bool:
+		"""True when the user genuinely requests expected_intent (a router intercept
+		name or a structural Planka verb). Trusts the keyword match on failure."""
+		if not self.ok:
+			return True
+		label = _INTENT_LABELS.get(expected_intent, _MUTATION_LABEL)
+		return label in self.intents
+
+
+def _same_text(a: str, b: str) -> bool:
+	return " ".join(a.split()) == " ".join(b.split())
+
+
+def _crew_manifest() -> tuple[str, set[str]]:
+	from app.services.crews import crew_registry
+	active = [c for c in crew_registry.list_active() if not getattr(c, "routing_disabled", False)]
+	lines = []
+	for crew in active:
+		kws = ", ".join(crew.keywords or [])
+		lines.append(f"- ID: {crew.id}\n  Name: {crew.name}\n  Description: {crew.description}\n  Keywords: {kws}")
+	return "\n\n".join(lines), {c.id for c in active}
+
+
+def _parse(text: str, raw: str, routable_ids: set[str]) -> MessageClassification:
+	start, end = raw.find("{"), raw.rfind("}") + 1
+	if start < 0 or end <= start:
+		raise ValueError("no JSON object in classifier reply")
+	data = json.loads(raw[start:end])
+
+	state_query = data.get("state_query")
+	if not isinstance(state_query, str) or state_query.strip().upper() in ("", "NO", "NULL", "NONE"):
+		state_query = None
+	else:
+		state_query = state_query.strip().strip('"\'')
+
+	intents = frozenset(str(i).strip().upper() for i in data.get("intents") or [] if i)
+
+	crews = data.get("crews")
+	if isinstance(crews, str):
+		crews = [] if crews.strip().upper().startswith("NO") else crews.split(",")
+	if isinstance(crews, list):
+		named = [str(c).strip().lower() for c in crews if str(c).strip()]
+		valid = [c for c in named if c in routable_ids]
+		# Only unknown IDs is no decision (local router decides); [] is an explicit "no crew".
+		crews = valid if valid or not named else None
+	else:
+		crews = None
+
+	return MessageClassification(
+		text=text,
+		ok=True,
+		system_action=bool(data.get("system_action")),
+		state_query=state_query,
+		intents=intents,
+		crews=crews,
+	)
+
+
+async def classify_message(text: str, history: Optional[list] = None) -> MessageClassification:
+	"""Run the multi-head classification call. Never raises; check `.ok`."""
+	from app.services.llm import chat as cloud_chat
+	from app.services.metrics import increment_counter, observe_histogram
+	from app.services.crews import crew_registry
+
+	loop = asyncio.get_running_loop()
+	start = loop.time()
+	try:
+		await crew_registry.reload_if_changed()
+		manifest, routable_ids = _crew_manifest()
+		history_context = ""
+		if history:
+			history_context = "\n".join(
+				f"{msg.get('role', 'user')}: {msg.get('content', '')}" for msg in history[-16:]
+			) + "\n"
+		user_message = (
+			f"Conversation history:\n{history_context}\n"
+			f"Available Expert Crews:\n{manifest or '(none)'}\n\n"
+			f"User Message: \"{text[:1000]}\""
+		)
+		raw = await asyncio.wait_for(
+			cloud_chat(
+				user_message=user_message,
+				system_override=_SYSTEM_PROMPT,
+				tier="cloud",
+				sanitize=False,
+				_feature="message_classifier",
+			),
+			timeout=CLASSIFY_TIMEOUT_S,
+		)
+		result = _parse(text, raw, routable_ids)
+		_remember(result)
+		increment_counter("message_classifier_calls_total", status="ok")
+		logger.debug(
+			"message_classifier: system_action=%s state_query=%r intents=%s crews=%s",
+			result.system_action, result.state_query, sorted(result.intents), result.crews,
+		)
+		return result
+	except Exception as exc:
+		increment_counter("message_classifier_calls_total", status="error")
+		logger.warning("message_classifier: classification failed (%s) — using per-gate fallbacks", str(exc)[:200])
+		return MessageClassification(text=text)
+	finally:
+		observe_histogram("message_classifier_seconds", loop.time() - start)
+
+
+def start_classification(text: str, history: Optional[list] = None) -> None:
+	"""Kick off classify_message for this request and share it via the ResponseBudget."""
+	from app.common.response_budget import get_budget
+	budget = get_budget()
+	if budget is None:
+		return
+	if budget.classification is not None and _same_text(budget.classified_text, text):
+		return
+	budget.classified_text = text
+	from app.services.routing_cache import get_routing_cache
+	hit, cached = get_routing_cache().get("classification", text)
+	if hit:
+		future = asyncio.get_running_loop().create_future()
+		future.set_result(replace(cached, text=text, crews=list(cached.crews) if cached.crews is not None else None))
+		budget.classification = future
+		return
+	budget.classification = asyncio.ensure_future(classify_message(text, history))
+
+
+def cancel_classification(budget=None) -> None:
+	"""Drop this request's shared classification if no stage is still going to await it."""
+	if budget is None:
+		from app.common.response_budget import get_budget
+		budget = get_budget()
+	task = budget.classification if budget is not None else None
+	if task is None:
+		return
+	if task.done():
+		if not task.cancelled():
+			task.exception()  # retrieved — no "exception never retrieved" warning
+	else:
+		task.cancel()
+
+
+def _remember(result: MessageClassification) -> None:
+	"""Cache a classification unless its state-query topic came from history."""
+	from app.services.routing_cache import get_routing_cache, normalize_message
+	topic = result.state_query
+	if topic is None or normalize_message(topic) in normalize_message(result.text):
+		get_routing_cache().put("classification", result.text, result)
+
+
+async def get_shared_classification(text: str) -> Optional[MessageClassification]:
+	"""Return this request's shared classification for `text`, or None when none was started."""
+	from app.common.response_budget import get_budget
+	budget = get_budget()
+	if budget is None or budget.classification is None or not _same_text(budget.classified_text, text):
+		return None
+	# shield: a stage's own wait_for timeout must not cancel the call for later stages.
+	return await asyncio.shield(budget.classification)
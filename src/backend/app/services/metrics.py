@@ -1,19 +1,38 @@
-"""Lightweight in-process metrics counters for openZero.
+"""Lightweight in-process metrics counters, gauges and histograms for openZero.
 
-No external Prometheus dependency required. Counters are kept in memory and can be
-read by the /health endpoint or exported as a log summary by the daily 09:00 task.
+No external Prometheus dependency required. Metrics are kept in memory, logged as a
+summary by the daily 09:00 task and rendered in the Prometheus text format by
+render_prometheus() (served at GET /metrics). Each process has its own registry, so
+/metrics reports the API process only.
+
+Recording is cheap enough for token loops: a dict lookup plus, for histograms, one
+bisect — cumulative bucket counts are only computed when read.
 
 Usage::
 
-	from app.services.metrics import increment_counter, get_all_counters
+	from app.services.metrics import increment_counter, get_all_counters, observe_histogram, get_histogram
 
 	increment_counter("phantom_confirmations_total", channel="telegram", language="de")
 	increment_counter("state_query_planka_lookups_total")
 	snapshot = get_all_counters()
+
+	observe_histogram("qdrant_op_seconds", 0.012, op="query_points")
+	hist = get_histogram("qdrant_op_seconds", op="query_points")
+	p95 = histogram_quantile("router_overhead_seconds", 0.95, mode="speculative")
+
+	inc_gauge("llm_streams_in_flight", tier="local")
+	with timed("crew_run_seconds", crew="health"):
+		...
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import math
+import re
+import time
+from bisect import bisect_left
 from collections import defaultdict
 from typing import Any
 
@@ -23,11 +42,54 @@ logger = logging.getLogger(__name__)
 # Key: (counter_name, frozenset_of_label_pairs)    Value: int
 _COUNTERS: dict[tuple[str, frozenset], int] = defaultdict(int)
 
+# Key: (gauge_name, frozenset_of_label_pairs)    Value: float
+_GAUGES: dict[tuple[str, frozenset], float] = defaultdict(float)
+
+# Default latency buckets (seconds): sub-millisecond cache hits up to slow cloud calls.
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+	"""Cumulative-bucket histogram (Prometheus semantics: each bucket counts values <= le)."""
+
+	__slots__ = ("buckets", "bins", "total", "count")
+
+	def __init__(self, buckets: tuple[float, ...]) -> None:
+		self.buckets = buckets
+		self.bins = [0] * (len(buckets) + 1)	# per-bucket counts; last slot is > the largest bound
+		self.total = 0.0
+		self.count = 0
+
+	def observe(self, value: float) -> None:
+		self.total += value
+		self.count += 1
+		self.bins[bisect_left(self.buckets, value)] += 1
 
-def increment_counter(name: str, **labels: Any) -> None:
-	"""Increment a named counter, optionally tagged with keyword-argument labels."""
+	@property
+	def counts(self) -> list[int]:
+		"""Cumulative count per bucket bound."""
+		out, running = [], 0
+		for n in self.bins[:-1]:
+			running += n
+			out.append(running)
+		return out
+
+
+# Key: (histogram_name, frozenset_of_label_pairs)    Value: _Histogram
+_HISTOGRAMS: dict[tuple[str, frozenset], _Histogram] = {}
+
+
+def _flat_key(name: str, label_pairs: frozenset) -> str:
+	if not label_pairs:
+		return name
+	label_str = ",".join(f"{k}={v}" for k, v in sorted(label_pairs))
+	return f"{name}{{{label_str}}}"
+
+
+def increment_counter(name: str, amount: int = 1, **labels: Any) -> None:
+	"""Increment a named counter by *amount*, optionally tagged with keyword-argument labels."""
 	key = (name, frozenset(labels.items()))
-	_COUNTERS[key] += 1
+	_COUNTERS[key] += amount
 
 
 def get_counter(name: str, **labels: Any) -> int:
@@ -41,14 +103,133 @@ def get_all_counters() -> dict[str, int]:
 
 	Returns an empty dict if no counters have been incremented.
 	"""
-	result: dict[str, int] = {}
-	for (name, label_pairs), count in _COUNTERS.items():
-		if label_pairs:
-			label_str = ",".join(f"{k}={v}" for k, v in sorted(label_pairs))
-			full_key = f"{name}{{{label_str}}}"
-		else:
-			full_key = name
-		result[full_key] = count
+	return {_flat_key(name, label_pairs): count for (name, label_pairs), count in _COUNTERS.items()}
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+	"""Set a gauge (a value that goes up and down, e.g. queue depth) to *value*."""
+	_GAUGES[(name, frozenset(labels.items()))] = value
+
+
+def inc_gauge(name: str, amount: float = 1.0, **labels: Any) -> None:
+	_GAUGES[(name, frozenset(labels.items()))] += amount
+
+
+def dec_gauge(name: str, amount: float = 1.0, **labels: Any) -> None:
+	_GAUGES[(name, frozenset(labels.items()))] -= amount
+
+
+def get_gauge(name: str, **labels: Any) -> float:
+	"""Return current value of a gauge (0.0 if never set)."""
+	return _GAUGES.get((name, frozenset(labels.items())), 0.0)
+
+
+def get_all_gauges() -> dict[str, float]:
+	"""Return all gauges keyed by 'name{label=value,...}' (same format as get_all_counters)."""
+	return {_flat_key(name, label_pairs): value for (name, label_pairs), value in _GAUGES.items()}
+
+
+def observe_histogram(name: str, value: float, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS, **labels: Any) -> None:
+	"""Record one observation (e.g. a latency in seconds) into a labelled histogram.
+
+	The bucket layout is fixed by the first observation for a given name+labels.
+	"""
+	key = (name, frozenset(labels.items()))
+	hist = _HISTOGRAMS.get(key)
+	if hist is None:
+		hist = _HISTOGRAMS[key] = _Histogram(buckets)
+	hist.observe(value)
+
+
+class timed:
+	"""Observe the wall time of a block or function into a histogram (seconds).
+
+	Works as a context manager (``with timed("x_seconds"):``, also inside async code)
+	and as a decorator for plain and async functions.
+	"""
+
+	__slots__ = ("name", "buckets", "labels", "_start")
+
+	def __init__(self, name: str, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS, **labels: Any) -> None:
+		self.name = name
+		self.buckets = buckets
+		self.labels = labels
+		self._start = 0.0
+
+	def __enter__(self) -> "timed":
+		self._start = time.perf_counter()
+		return self
+
+	def __exit__(self, *exc: Any) -> None:
+		observe_histogram(self.name, time.perf_counter() - self._start, self.buckets, **self.labels)
+
+	def __call__(self, fn):
+		if asyncio.iscoroutinefunction(fn):
+			@functools.wraps(fn)
+			async def _async_wrapper(*args, **kwargs):
+				start = time.perf_counter()
+				try:
+					return await fn(*args, **kwargs)
+				finally:
+					observe_histogram(self.name, time.perf_counter() - start, self.buckets, **self.labels)
+			return _async_wrapper
+
+		@functools.wraps(fn)
+		def _wrapper(*args, **kwargs):
+			start = time.perf_counter()
+			try:
+				return fn(*args, **kwargs)
+			finally:
+				observe_histogram(self.name, time.perf_counter() - start, self.buckets, **self.labels)
+		return _wrapper
+
+
+def get_histogram(name: str, **labels: Any) -> dict[str, Any]:
+	"""Return {count, sum, buckets: {le: cumulative_count}} for a histogram (zeros if unseen)."""
+	hist = _HISTOGRAMS.get((name, frozenset(labels.items())))
+	if hist is None:
+		return {"count": 0, "sum": 0.0, "buckets": {}}
+	return {
+		"count": hist.count,
+		"sum": hist.total,
+		"buckets": dict(zip(hist.buckets, hist.counts)),
+	}
+
+
+def histogram_quantile(name: str, q: float, **labels: Any) -> float | None:
+	"""Estimate the *q* quantile (0..1) of a histogram by linear interpolation within buckets.
+
+	Returns None when the histogram has no observations. Values beyond the last
+	bucket are reported as the last bucket bound (Prometheus histogram_quantile semantics).
+	"""
+	hist = _HISTOGRAMS.get((name, frozenset(labels.items())))
+	if hist is None or not hist.count:
+		return None
+	return _quantile(hist, q)
+
+
+def _quantile(hist: _Histogram, q: float) -> float:
+	rank = q * hist.count
+	lower, below = 0.0, 0
+	for le, cumulative in zip(hist.buckets, hist.counts):
+		if cumulative >= rank:
+			in_bucket = cumulative - below
+			return lower + (le - lower) * ((rank - below) / in_bucket if in_bucket else 0.0)
+		lower, below = le, cumulative
+	return hist.buckets[-1] if hist.buckets else 0.0
+
+
+def get_all_histograms() -> dict[str, dict[str, Any]]:
+	"""Return every histogram keyed by 'name{label=value,...}' (same format as get_all_counters)."""
+	result: dict[str, dict[str, Any]] = {}
+	for (name, label_pairs), hist in _HISTOGRAMS.items():
+		result[_flat_key(name, label_pairs)] = {
+			"count": hist.count,
+			"sum": hist.total,
+			"buckets": dict(zip(hist.buckets, hist.counts)),
+			"p50": _quantile(hist, 0.5) if hist.count else 0.0,
+			"p95": _quantile(hist, 0.95) if hist.count else 0.0,
+		}
 	return result
 
 
@@ -57,6 +238,78 @@ def log_daily_summary() -> None:
 	counters = get_all_counters()
 	if not counters:
 		logger.info("Metrics daily summary: no counters recorded")
-		return
-	parts = [f"{k}={v}" for k, v in sorted(counters.items())]
-	logger.info("Metrics daily summary: %s", "  ".join(parts))
+	else:
+		parts = [f"{k}={v}" for k, v in sorted(counters.items())]
+		logger.info("Metrics daily summary: %s", "  ".join(parts))
+	histograms = get_all_histograms()
+	if histograms:
+		parts = [
+			f"{k}=n:{h['count']},avg:{(h['sum'] / h['count']) * 1000:.1f}ms,"
+			f"p50:{h['p50'] * 1000:.1f}ms,p95:{h['p95'] * 1000:.1f}ms"
+			for k, h in sorted(histograms.items()) if h["count"]
+		]
+		logger.info("Metrics daily latency summary: %s", "  ".join(parts))
+	gauges = get_all_gauges()
+	if gauges:
+		logger.info("Metrics daily gauge summary: %s", "  ".join(f"{k}={v:g}" for k, v in sorted(gauges.items())))
+
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _prom_name(name: str) -> str:
+	name = _INVALID_NAME_CHARS.sub("_", name)
+	return f"_{name}" if name[:1].isdigit() else name
+
+
+def _prom_value(value: float) -> str:
+	value = float(value)
+	if math.isinf(value):
+		return "+Inf" if value > 0 else "-Inf"
+	if math.isnan(value):
+		return "NaN"
+	return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _prom_labels(label_pairs: Any, extra: tuple[str, str] | None = None) -> str:
+	pairs = [(_prom_name(str(k)), str(v)) for k, v in sorted(label_pairs)]
+	if extra:
+		pairs.append(extra)
+	if not pairs:
+		return ""
+	return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+	return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+	"""All counters, gauges and histograms in the Prometheus text exposition format (0.0.4)."""
+	families: dict[str, tuple[str, list[str]]] = {}
+
+	def _family(name: str, kind: str) -> list[str]:
+		return families.setdefault(_prom_name(name), (kind, []))[1]
+
+	def _ordered(store: dict) -> list:
+		return sorted(store.items(), key=lambda item: (item[0][0], sorted(map(str, item[0][1]))))
+
+	for (name, label_pairs), value in _ordered(_COUNTERS):
+		_family(name, "counter").append(f"{_prom_name(name)}{_prom_labels(label_pairs)} {_prom_value(value)}")
+	for (name, label_pairs), value in _ordered(_GAUGES):
+		_family(name, "gauge").append(f"{_prom_name(name)}{_prom_labels(label_pairs)} {_prom_value(value)}")
+	for (name, label_pairs), hist in _ordered(_HISTOGRAMS):
+		base = _prom_name(name)
+		lines = _family(name, "histogram")
+		for le, cumulative in zip(hist.buckets, hist.counts):
+			lines.append(f"{base}_bucket{_prom_labels(label_pairs, ('le', _prom_value(le)))} {cumulative}")
+		lines.append(f"{base}_bucket{_prom_labels(label_pairs, ('le', '+Inf'))} {hist.count}")
+		lines.append(f"{base}_sum{_prom_labels(label_pairs)} {_prom_value(hist.total)}")
+		lines.append(f"{base}_count{_prom_labels(label_pairs)} {hist.count}")
+
+	out: list[str] = []
+	for name in sorted(families):
+		kind, lines = families[name]
+		out.append(f"# TYPE {name} {kind}")
+		out.extend(lines)
+	return "\n".join(out) + "\n" if out else ""
@@ -19,8 +19,7 @@ the user every morning.
 
 import httpx
 import logging
-from typing import Optional
-from app.config import settings
+from app.services.planka_common import PlankaSession, planka_client
 from app.services.translations import (
 	get_planka_entity_names,
 	get_all_values,
@@ -32,7 +31,6 @@ class OperatorBoardService:
 	def __init__(self) -> None:
 		self._lang = "en"
 		self._apply_lang()
-		self._token: Optional[str] = None
 		# Cached IDs so we can rename without searching by name
 		self._project_id: str | None = None
 		self._board_id: str | None = None
@@ -59,22 +57,9 @@ class OperatorBoardService:
 			"list_done": names["list_done"],
 		}
 
-	async def _get_auth_token(self) -> str:
-		"""Retrieves or refreshes the authentication token using the central Planka service."""
-		from app.services.planka_common import get_planka_auth_token
-		if self._token:
-			return self._token
-		self._token = await get_planka_auth_token()
-		return self._token
-
-	async def _get_client(self) -> httpx.AsyncClient:
-		"""Returns a configured async client."""
-		token = await self._get_auth_token()
-		return httpx.AsyncClient(
-			base_url=settings.PLANKA_BASE_URL, 
-			timeout=10.0,
-			headers={"Authorization": f"Bearer {token}"}
-		)
+	async def _get_client(self) -> PlankaSession:
+		"""Returns a Planka session on the shared pool (token cached and refreshed centrally)."""
+		return planka_client(timeout=10.0)
 
 	async def _load_persisted_ids(self) -> None:
 		"""Load operator project/board IDs from the Preference table into memory."""
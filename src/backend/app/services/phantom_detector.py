@@ -68,7 +68,7 @@ async def _stage_b_score(text: str) -> float:
 	"""Return max cosine similarity between text and phantom prototypes via Qdrant."""
 	try:
 		from app.config import settings
-		from qdrant_client import AsyncQdrantClient
+		from app.services.memory import get_qdrant
 		import httpx
 
 		# Embed via the llama.cpp local server (same endpoint used for memory).
@@ -84,15 +84,13 @@ async def _stage_b_score(text: str) -> float:
 		if not vector:
 			return 0.0
 
-		qc = AsyncQdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT, api_key=settings.QDRANT_API_KEY or None)
-		hits = await qc.search(
+		resp = await get_qdrant().query_points(
 			collection_name="phantom_prototypes",
-			query_vector=vector,
+			query=vector,
 			limit=1,
 			score_threshold=0.5,
 		)
-		await qc.close()
-		return hits[0].score if hits else 0.0
+		return resp.points[0].score if resp.points else 0.0
 	except Exception as _e:
 		logger.debug("Stage B embedding/search failed: %s", _e)
 		return 0.0
@@ -12,7 +12,6 @@ Key Responsibilities:
 """
 
 import html as _html
-import httpx
 import logging
 import re
 from datetime import datetime, timedelta
@@ -21,9 +20,9 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-from app.services.planka_common import get_planka_auth_token, _tree_cache
+from app.services.planka_common import planka_client
+from app.services.planka_mirror import PlankaMirror, get_planka_mirror, planka_mirror
 import asyncio
-import time
 
 def _sanitize_for_log(text: Any) -> str:
 	"""Built-in sanitizer for CodeQL Log Injection (CWE-117)."""
@@ -48,126 +47,138 @@ def _card_title_matches(card_name: str, fragment: str) -> bool:
 		return False
 	return frag_clean in name_clean or name_clean in frag_clean
 
-async def get_project_tree(as_html: bool = True) -> str:
-	"""Recursively build a semantic text tree. Uses parallel requests and caching for speed."""
-	cache_key = f"tree_{as_html}"
-	if cache_key in _tree_cache:
-		timestamp, data = _tree_cache[cache_key]
-		if time.time() - timestamp < 60: # 1 minute TTL
-			return data
-
-	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=15.0, headers=headers) as client:
-			resp = await client.get("/api/projects")
-			resp.raise_for_status()
-			projects = resp.json().get("items", [])
-
-			if not projects:
-				return "No active projects found."
+async def _resolve_card(card_fragment: str, board_name: str = "") -> tuple[PlankaMirror, Optional[dict]]:
+	"""Look a card up in the shared mirror; on a miss, force one full refresh and retry."""
+	mirror = await get_planka_mirror()
+	card = mirror.find_card(card_fragment, board_name)
+	if card is None:
+		mirror = await get_planka_mirror(force=True)
+		card = mirror.find_card(card_fragment, board_name)
+	return mirror, card
+
+
+async def _resolve_list(list_fragment: str, board_name: str = "") -> tuple[PlankaMirror, Optional[dict]]:
+	"""Look a list up in the shared mirror; on a miss, force one full refresh and retry."""
+	mirror = await get_planka_mirror()
+	found = mirror.find_list(list_fragment, board_name)
+	if found is None:
+		mirror = await get_planka_mirror(force=True)
+		found = mirror.find_list(list_fragment, board_name)
+	return mirror, found
+
+
+async def _resolve_board(board_fragment: str) -> tuple[PlankaMirror, Optional[dict]]:
+	"""First board whose name contains board_fragment, refreshing the mirror once on a miss."""
+	frag = board_fragment.strip().strip('"\'').lower()
+
+	def _find(m: PlankaMirror) -> Optional[dict]:
+		return next((b for b in m.boards.values() if frag in (b.get("name") or "").lower()), None)
+
+	mirror = await get_planka_mirror()
+	found = _find(mirror)
+	if found is None:
+		mirror.mark_listing_stale()
+		await mirror.refresh()
+		found = _find(mirror)
+	return mirror, found
+
+
+async def _resolve_card_task(card_fragment: str, task_fragment: str, board_name: str = "") -> tuple[PlankaMirror, Optional[dict], Optional[dict]]:
+	"""Resolve (card, checklist task) from the mirror, re-reading the card's board once on a task miss."""
+	mirror, card = await _resolve_card(card_fragment, board_name)
+	if not card:
+		return mirror, None, None
+
+	def _find() -> Optional[dict]:
+		return next((t for t in mirror.tasks_of(card["id"]) if task_fragment in (t.get("name") or "").lower()), None)
+
+	task = _find()
+	if task is None:
+		mirror.mark_dirty(card["boardId"])
+		await mirror.refresh()
+		task = _find()
+	return mirror, card, task
+
+
+def _write_through(mirror: PlankaMirror, kind: str, resp: Any, board_id: str) -> None:
+	"""Raise on HTTP errors, else apply the item Planka returned to the mirror."""
+	if resp.status_code == 404:
+		mirror.mark_dirty(board_id)
+	resp.raise_for_status()
+	item = resp.json().get("item")
+	if item:
+		mirror.apply(kind, item)
+	else:
+		mirror.mark_dirty(board_id)
+
+
+def _discard_through(mirror: PlankaMirror, kind: str, item_id: str, resp: Any, board_id: str) -> None:
+	"""Raise on HTTP errors (a 404 still evicts the stale entry), else drop the item from the mirror."""
+	if resp.status_code == 404:
+		mirror.discard(kind, item_id)
+		mirror.mark_dirty(board_id)
+	resp.raise_for_status()
+	mirror.discard(kind, item_id)
 
-			# Fetch all project details in parallel
-			project_tasks = [client.get(f"/api/projects/{p['id']}") for p in projects]
-			project_resps = await asyncio.gather(*project_tasks)
-
-			tree_lines = []
-			board_tasks = []
-			board_metadata = [] # Keep track of which board task belongs to which project/name
-
-			for i, p_resp in enumerate(project_resps):
-				p_resp.raise_for_status()
-				detail = p_resp.json()
-				boards = detail.get("included", {}).get("boards", [])
-
-				project = projects[i]
-				project_id = project['id']
-
-				project_name = project['name']
-
-				# Make project names clickable
-				if as_html:
-					p_display = f"<b><a href='/api/dashboard/planka-redirect?target_project_id={project_id}' target='_blank' style='color: inherit; text-decoration: none;'>{_html.escape(project_name)}</a></b>"
-				else:
-					# Use version without underscores for Telegram Markdown
-					p_display = f"**[{project_name}]({settings.BASE_URL}/api/dashboard/planka-redirect?targetprojectid={project_id})**"
 
-				tree_lines.append((i, "project", p_display))
-
-				for board in boards:
-					# Include labels and cardLabels for class-of-service/blocker detection
-					task = client.get(f"/api/boards/{board['id']}", params={"included": "lists,cards,labels,cardLabels"})
-					board_tasks.append(task)
-					board_metadata.append({"project_idx": i, "name": board['name'], "id": board['id']})
-
-			# Fetch all board details in parallel
-			board_resps = await asyncio.gather(*board_tasks, return_exceptions=True)
-
-			# Map board responses back to their projects
-			project_boards: dict[int, list[str]] = {i: [] for i in range(len(projects))}
-			for meta, b_resp in zip(board_metadata, board_resps):
-				if isinstance(b_resp, BaseException):
-					project_boards[meta["project_idx"]].append(f"  └── {meta['name']} (Stats offline)")
-					continue
+async def get_project_tree(as_html: bool = True) -> str:
+	"""Build a semantic text tree of projects → boards (→ lists/cards) from the shared Planka mirror."""
+	try:
+		mirror = await get_planka_mirror()
+		if not mirror.projects:
+			return "No active projects found."
+
+		from app.services.translations import get_done_keywords
+		_done_kw = get_done_keywords()
+		final_lines = []
+		for project_id, project in mirror.projects.items():
+			project_name = project['name']
+
+			# Make project names clickable
+			if as_html:
+				p_display = f"<b><a href='/api/dashboard/planka-redirect?target_project_id={project_id}' target='_blank' style='color: inherit; text-decoration: none;'>{_html.escape(project_name)}</a></b>"
+			else:
+				# Use version without underscores for Telegram Markdown
+				p_display = f"**[{project_name}]({settings.BASE_URL}/api/dashboard/planka-redirect?targetprojectid={project_id})**"
+			final_lines.append(p_display)
 
-				b_detail = b_resp.json()
-				lists = b_detail.get("included", {}).get("lists", [])
-				cards = b_detail.get("included", {}).get("cards", [])
+			for board in mirror.boards_of(project_id):
+				board_id = board["id"]
+				board_name = board["name"]
+				lists = mirror.lists_of(board_id)
+				cards = mirror.cards_of(board_id)
 
 				total_cards = len(cards)
-				from app.services.translations import get_done_keywords
-				_done_kw = get_done_keywords()
 				done_list_ids = [l['id'] for l in lists if l.get('name') and l['name'].lower() in _done_kw]
 				done_cards = len([c for c in cards if c['listId'] in done_list_ids])
-
 				progress_pct = int((done_cards / total_cards) * 100) if total_cards > 0 else 0
-				board_id = meta["id"]
-				board_name = meta["name"]
 
 				if as_html:
 					progress_str = f" <span style='color: #4ade80; font-size: 0.8rem;'>({progress_pct}%)</span>" if total_cards > 0 else ""
-					line = f"  └── <a href='/api/dashboard/planka-redirect?target_board_id={board_id}' target='_blank' style='color: inherit; text-decoration: none;'>{_html.escape(board_name)}</a>{progress_str}"
-					project_boards[meta["project_idx"]].append(line)
-				else:
-					progress_str = f" ({progress_pct}%)" if total_cards > 0 else ""
-					# Use version without underscores for Telegram Markdown
-					line = f" • [{board_name}]({settings.BASE_URL}/api/dashboard/planka-redirect?targetboardid={board_id}){progress_str}"
-					project_boards[meta["project_idx"]].append(line)
-					# Add list+card detail so LLM can reason about the actual board structure
-					label_map: dict[str, str] = {}
-					for lbl in b_detail.get("included", {}).get("labels", []):
-						label_map[lbl["id"]] = lbl.get("name") or lbl.get("color", "")
-					card_labels: dict[str, list[str]] = {}
-					for cl in b_detail.get("included", {}).get("cardLabels", []):
-						cid = cl.get("cardId", "")
-						card_labels.setdefault(cid, []).append(label_map.get(cl.get("labelId", ""), ""))
-					list_cards: dict[str, list[str]] = {l["id"]: [] for l in lists}
-					for c in cards:
-						lid = c.get("listId", "")
-						if lid in list_cards:
-							cname = c.get("name", "?")
-							clbls = card_labels.get(c["id"], [])
-							tag = f" [{', '.join(lb for lb in clbls if lb)}]" if clbls else ""
-							list_cards[lid].append(f"{cname}{tag}")
-					for lst in lists:
-						if _is_done_list(lst.get("name", "")):
-							continue
-						l_cards = list_cards.get(lst["id"], [])
-						if not l_cards:
-							continue
-						visible = l_cards[:10]
-						project_boards[meta["project_idx"]].append(f"   [{lst['name']}]: {', '.join(visible)}")
-			# Assemble final tree
-			final_lines = []
-			for i, p_type, p_name in tree_lines:
-				final_lines.append(p_name)
-				final_lines.extend(project_boards[i])
-				final_lines.append("")
-
-			result = "\n".join(final_lines)
-			_tree_cache[cache_key] = (time.time(), result)
-			return result
+					final_lines.append(f"  └── <a href='/api/dashboard/planka-redirect?target_board_id={board_id}' target='_blank' style='color: inherit; text-decoration: none;'>{_html.escape(board_name)}</a>{progress_str}")
+					continue
+
+				progress_str = f" ({progress_pct}%)" if total_cards > 0 else ""
+				# Use version without underscores for Telegram Markdown
+				final_lines.append(f" • [{board_name}]({settings.BASE_URL}/api/dashboard/planka-redirect?targetboardid={board_id}){progress_str}")
+				# Add list+card detail so LLM can reason about the actual board structure
+				list_cards: dict[str, list[str]] = {l["id"]: [] for l in lists}
+				for c in cards:
+					lid = c.get("listId", "")
+					if lid in list_cards:
+						clbls = mirror.labels_of_card(c["id"])
+						tag = f" [{', '.join(lb for lb in clbls if lb)}]" if clbls else ""
+						list_cards[lid].append(f"{c.get('name', '?')}{tag}")
+				for lst in lists:
+					if _is_done_list(lst.get("name", "")):
+						continue
+					l_cards = list_cards.get(lst["id"], [])
+					if not l_cards:
+						continue
+					final_lines.append(f"   [{lst['name']}]: {', '.join(l_cards[:10])}")
+			final_lines.append("")
+
+		return "\n".join(final_lines)
 	except Exception as e:
 		logger.error("Planka project tree error: %s", _sanitize_for_log(e))
 		return "Planka connection issue."
@@ -179,9 +190,7 @@ async def get_board_full_context(board_name_fragment: str) -> str:
 	Performs a case-insensitive substring match on board name. Returns empty string on failure.
 	"""
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=15.0, headers=headers) as client:
+		async with planka_client(timeout=15.0) as client:
 			pr = await client.get("/api/projects")
 			pr.raise_for_status()
 			projects = pr.json().get("items", [])
@@ -232,9 +241,7 @@ async def board_has_lists(board_name_fragment: str) -> bool:
 	Used by the empty-board auto-setup intercept in router.py (section 9e).
 	"""
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
+		async with planka_client(timeout=10.0) as client:
 			pr = await client.get("/api/projects")
 			pr.raise_for_status()
 			projects = pr.json().get("items", [])
@@ -310,10 +317,8 @@ async def create_task(board_name: str, list_name: str, title: str, description:
 		logger.info("create_task requested -> Board: %s, List: %s, Title: %s", _sanitize_for_log(board_name), _sanitize_for_log(list_name), _sanitize_for_log(title))
 	try:
 		from app.services.operator_board import operator_service
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
 
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
+		async with planka_client(timeout=10.0) as client:
 			# 1. SPECIAL CASE: Operator Board
 			target_board = None
 			resolved_project_name = None
@@ -347,25 +352,27 @@ async def create_task(board_name: str, list_name: str, title: str, description:
 					if board_name.lower() in ("nutrition", "chef"):
 						search_board_names.update({"nutrition", "chef"})
 
-				# General Search across all projects
-				projects_resp = await client.get("/api/projects")
-				projects = projects_resp.json().get("items", [])
-				for p in projects:
-					p_det_resp = await client.get(f"/api/projects/{p['id']}")
-					p_det = p_det_resp.json()
-					# Boards might be in 'included' or 'boards' key depending on version/sideloading
-					boards = p_det.get("included", {}).get("boards", []) or p_det.get("boards", [])
-					match = next((b for b in boards if (b.get("name") or "").lower() in search_board_names), None)
-					if not match:
-						# Fuzzy fallback 1: board name contains any of the search terms (e.g. "tank" -> "Reef Tank")
-						match = next((b for b in boards if any(term in (b.get("name") or "").lower() for term in search_board_names)), None)
-					if not match:
-						# Fuzzy fallback 2: search terms contain the board name (e.g. "reef tank board" -> "Reef Tank")
-						match = next((b for b in boards if any((b.get("name") or "").lower() in term and (b.get("name") or "").strip() for term in search_board_names)), None)
-					if match:
-						target_board = match
-						resolved_project_name = p["name"]
+				# General Search across all projects (in memory, from the shared mirror)
+				mirror = await get_planka_mirror()
+				for attempt in range(2):
+					for p in mirror.projects.values():
+						boards = mirror.boards_of(p["id"])
+						match = next((b for b in boards if (b.get("name") or "").lower() in search_board_names), None)
+						if not match:
+							# Fuzzy fallback 1: board name contains any of the search terms (e.g. "tank" -> "Reef Tank")
+							match = next((b for b in boards if any(term in (b.get("name") or "").lower() for term in search_board_names)), None)
+						if not match:
+							# Fuzzy fallback 2: search terms contain the board name (e.g. "reef tank board" -> "Reef Tank")
+							match = next((b for b in boards if any((b.get("name") or "").lower() in term and (b.get("name") or "").strip() for term in search_board_names)), None)
+						if match:
+							target_board = match
+							resolved_project_name = p["name"]
+							break
+					if target_board or attempt:
 						break
+					# The board may have been created moments ago outside this module.
+					mirror.mark_listing_stale()
+					await mirror.refresh()
 
 			if not target_board:
 				logger.debug("Board %s not found. Defaulting to Operator Board.", _sanitize_for_log(board_name))
@@ -436,6 +443,8 @@ async def create_task(board_name: str, list_name: str, title: str, description:
 				card_payload["description"] = description
 			res = await client.post(f"/api/lists/{target_list['id']}/cards", json=card_payload)
 			res.raise_for_status()
+			planka_mirror.apply("lists", target_list)
+			planka_mirror.apply("cards", res.json().get("item"))
 			project_name = resolved_project_name or "Operations"
 			path = f"{project_name} → {target_board['name']} → {target_list['name']}"
 			logger.info("Card created successfully: %s", path)
@@ -449,49 +458,34 @@ async def archive_card(card_title_fragment: str, board_name: str = "") -> bool:
 	Creates the Archive list on the board if it does not already exist.
 	"""
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=15.0) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-
-			for p in projects:
-				det = await client.get(f"/api/projects/{p['id']}")
-				boards = det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					bd = await client.get(f"/api/boards/{b['id']}", params={"included": "lists,cards"})
-					bdata = bd.json()
-					cards = bdata.get("included", {}).get("cards", [])
-					lists = bdata.get("included", {}).get("lists", [])
-					card = next(
-						(c for c in cards if _card_title_matches(c.get("name") or "", card_title_fragment)),
-						None,
-					)
-					if not card:
-						continue
-					# Find or create Archive list
-					archive_list = next((l for l in lists if l.get("name", "").lower() == "archive"), None)
-					if not archive_list:
-						max_pos = max((l.get("position", 0) for l in lists), default=0)
-						r = await client.post(
-							f"/api/boards/{b['id']}/lists",
-							json={"name": "Archive", "type": "closed", "position": max_pos + 65535},
-						)
-						r.raise_for_status()
-						archive_list = r.json().get("item")
-					if not archive_list:
-						return False
-					# Move card to Archive list
-					move_resp = await client.patch(
-						f"/api/cards/{card['id']}",
-						json={"listId": archive_list["id"], "position": 65535},
-					)
-					if move_resp.status_code == 200:
-						logger.debug("archive_card: moved '%s' to Archive on board '%s'", card_title_fragment, b["name"])
-						return True
+		mirror, card = await _resolve_card(card_title_fragment, board_name)
+		if not card:
+			return False
+		board_id = card["boardId"]
+		async with planka_client(timeout=15.0) as client:
+			# Find or create Archive list
+			archive_list = mirror.list_named(board_id, "archive")
+			if not archive_list:
+				max_pos = max((l.get("position", 0) for l in mirror.lists_of(board_id)), default=0)
+				r = await client.post(
+					f"/api/boards/{board_id}/lists",
+					json={"name": "Archive", "type": "closed", "position": max_pos + 65535},
+				)
+				r.raise_for_status()
+				archive_list = r.json().get("item")
+				mirror.apply("lists", archive_list)
+			if not archive_list:
+				return False
+			# Move card to Archive list
+			move_resp = await client.patch(
+				f"/api/cards/{card['id']}",
+				json={"listId": archive_list["id"], "position": 65535},
+			)
+			if move_resp.status_code == 200:
+				mirror.apply("cards", move_resp.json().get("item"))
+				logger.debug("archive_card: moved '%s' to Archive on board '%s'", card_title_fragment, mirror.boards.get(board_id, {}).get("name"))
+				return True
+			mirror.mark_dirty(board_id)
 			return False
 	except Exception as e:
 		logger.warning("archive_card failed: %s", _sanitize_for_log(e))
@@ -500,9 +494,7 @@ async def archive_card(card_title_fragment: str, board_name: str = "") -> bool:
 
 async def create_project(name: str, description: str = "") -> dict:
 	"""Create a new project in Planka. Returns existing project if name matches (idempotent)."""
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers) as client:
+	async with planka_client() as client:
 		# Dedup: return existing project if one with the same name already exists
 		try:
 			resp = await client.get("/api/projects")
@@ -523,6 +515,7 @@ async def create_project(name: str, description: str = "") -> dict:
 			})
 			resp.raise_for_status()
 			data = resp.json()
+			planka_mirror.apply("projects", data.get("item"))
 			return data.get("item") or data
 		except Exception as e:
 			logger.debug("create_project failed with 'type', retrying with 'isPublic': %s", _sanitize_for_log(e))
@@ -534,6 +527,7 @@ async def create_project(name: str, description: str = "") -> dict:
 				})
 				resp.raise_for_status()
 				data = resp.json()
+				planka_mirror.apply("projects", data.get("item"))
 				return data.get("item") or data
 			except Exception as e2:
 				logger.debug("create_project retry also failed: %s", _sanitize_for_log(e2))
@@ -541,9 +535,7 @@ async def create_project(name: str, description: str = "") -> dict:
 
 async def delete_project(project_id: str) -> bool:
 	"""Cascade-delete a Planka project: cards → lists → boards → project."""
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=30.0) as client:
+	async with planka_client(timeout=30.0) as client:
 		try:
 			# Get project details with boards
 			det = await client.get(f"/api/projects/{project_id}")
@@ -567,6 +559,7 @@ async def delete_project(project_id: str) -> bool:
 			# Now delete the empty project
 			resp = await client.delete(f"/api/projects/{project_id}")
 			resp.raise_for_status()
+			planka_mirror.discard("projects", project_id)
 			logger.debug("Deleted Planka project %s", project_id)
 			return True
 		except Exception as e:
@@ -575,10 +568,8 @@ async def delete_project(project_id: str) -> bool:
 
 async def find_and_delete_projects_by_prefix(prefix: str) -> list:
 	"""Find and cascade-delete all Planka projects whose name starts with a given prefix."""
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
 	deleted = []
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=15.0) as client:
+	async with planka_client(timeout=15.0) as client:
 		resp = await client.get("/api/projects")
 		resp.raise_for_status()
 		projects = resp.json().get("items", [])
@@ -591,9 +582,7 @@ async def find_and_delete_projects_by_prefix(prefix: str) -> list:
 
 async def rename_project(project_fragment: str, new_name: str) -> bool:
 	"""Find a project by name fragment and rename it."""
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=15.0) as client:
+	async with planka_client(timeout=15.0) as client:
 		try:
 			resp = await client.get("/api/projects")
 			resp.raise_for_status()
@@ -604,6 +593,7 @@ async def rename_project(project_fragment: str, new_name: str) -> bool:
 				return False
 			patch = await client.patch(f"/api/projects/{match['id']}", json={"name": new_name})
 			patch.raise_for_status()
+			planka_mirror.apply("projects", patch.json().get("item"))
 			logger.debug("Renamed Planka project %s -> %s", _sanitize_for_log(match["name"]), _sanitize_for_log(new_name))
 			return True
 		except Exception as e:
@@ -612,9 +602,7 @@ async def rename_project(project_fragment: str, new_name: str) -> bool:
 
 async def delete_project_by_name(project_fragment: str) -> bool:
 	"""Find a project by name fragment and cascade-delete it."""
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=15.0) as client:
+	async with planka_client(timeout=15.0) as client:
 		try:
 			resp = await client.get("/api/projects")
 			resp.raise_for_status()
@@ -630,9 +618,7 @@ async def delete_project_by_name(project_fragment: str) -> bool:
 
 async def create_board(project_id: str, name: str) -> dict:
 	"""Create a new board in a project. Returns existing board if name matches (idempotent)."""
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers) as client:
+	async with planka_client() as client:
 		# Dedup: return existing board if one with the same name already exists
 		try:
 			det = await client.get(f"/api/projects/{project_id}")
@@ -652,6 +638,8 @@ async def create_board(project_id: str, name: str) -> dict:
 			resp.raise_for_status()
 			data = resp.json()
 			board = data.get("item") or data
+			planka_mirror.apply("boards", data.get("item"))
+			planka_mirror.mark_listing_stale()
 		except Exception as e:
 			logger.debug("create_board failed for project %s: %s", _sanitize_for_log(project_id), _sanitize_for_log(e))
 			return None
@@ -705,9 +693,7 @@ async def move_board(board_id: str, new_project_id: str) -> bool:
 	confirming via re-GET that the PATCH was ignored.
 	"""
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=30.0) as client:
+		async with planka_client(timeout=30.0) as client:
 			# Step 1: PATCH (will be silently ignored for projectId on Planka v2).
 			try:
 				resp = await client.patch(f"/api/boards/{board_id}", json={"projectId": new_project_id})
@@ -724,6 +710,7 @@ async def move_board(board_id: str, new_project_id: str) -> bool:
 			actual_project_id = str(verify_item.get("projectId", ""))
 			if actual_project_id == str(new_project_id):
 				logger.info("move_board: confirmed via API — board %s is now in project %s", _sanitize_for_log(board_id), _sanitize_for_log(new_project_id))
+				planka_mirror.mark_listing_stale()
 				return True
 
 			logger.info(
@@ -738,7 +725,7 @@ async def move_board(board_id: str, new_project_id: str) -> bool:
 
 		# Step 4: re-GET once more to confirm Planka's API now reports the new project.
 		try:
-			async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers, timeout=10.0) as client:
+			async with planka_client(timeout=10.0) as client:
 				await asyncio.sleep(0.3)
 				verify_resp = await client.get(f"/api/boards/{board_id}")
 				verify_resp.raise_for_status()
@@ -746,6 +733,7 @@ async def move_board(board_id: str, new_project_id: str) -> bool:
 				actual_project_id = str(verify_item.get("projectId", ""))
 				if actual_project_id == str(new_project_id):
 					logger.info("move_board: confirmed via DB fallback — board %s is now in project %s", _sanitize_for_log(board_id), _sanitize_for_log(new_project_id))
+					planka_mirror.mark_listing_stale()
 					return True
 				logger.warning(
 					"move_board: DB UPDATE succeeded but API still reports projectId=%s (expected %s) — change persisted; client may need refresh",
@@ -753,6 +741,7 @@ async def move_board(board_id: str, new_project_id: str) -> bool:
 				)
 		except Exception as ge:
 			logger.warning("move_board: post-DB verify GET failed: %s — DB UPDATE already committed, treating as success", _sanitize_for_log(ge))
+		planka_mirror.mark_listing_stale()
 		return True
 	except Exception as e:
 		logger.error("move_board failed: %s", _sanitize_for_log(e))
@@ -768,52 +757,21 @@ async def move_card(card_title_fragment: str, destination_list: str, board_name:
 	board_name = board_name.strip().strip('"\'')
 	logger.debug("move_card: fragment=%s, dest=%s, board=%s", _sanitize_for_log(card_title_fragment), _sanitize_for_log(destination_list), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-
-			found_card = None
-			dest_list_id = None
-
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "lists,cards"})
-					b_data = b_det.json()
-					lists = b_data.get("included", {}).get("lists", [])
-					cards = b_data.get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_title_fragment):
-							found_card = c
-							dest_list = next(
-								(l for l in lists if (l.get("name") or "").lower() == destination_list.lower()), None
-							)
-							if dest_list:
-								dest_list_id = dest_list["id"]
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-
-			if not found_card:
-				logger.debug("move_card: no card matching %r found", card_title_fragment)
-				return False
-			if not dest_list_id:
-				logger.debug("move_card: list %r not found on the card's board", destination_list)
-				return False
+		mirror, found_card = await _resolve_card(card_title_fragment, board_name)
+		if not found_card:
+			logger.debug("move_card: no card matching %r found", card_title_fragment)
+			return False
+		dest_list = mirror.list_named(found_card["boardId"], destination_list)
+		if not dest_list:
+			logger.debug("move_card: list %r not found on the card's board", destination_list)
+			return False
 
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/cards/{found_card['id']}", json={
-				"listId": dest_list_id,
+				"listId": dest_list["id"],
 				"position": 65535
 			})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "cards", patch_resp, found_card["boardId"])
 			logger.debug("move_card: %r moved to %r", found_card["name"], destination_list)
 			return True
 	except Exception as e:
@@ -830,37 +788,14 @@ async def rename_card(card_title_fragment: str, new_name: str, board_name: str =
 		return False
 	logger.debug("rename_card: fragment=%s, new_name=%s, board=%s", _sanitize_for_log(card_title_fragment), _sanitize_for_log(new_name), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-
-			found_card = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_title_fragment):
-							found_card = c
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-
-			if not found_card:
-				logger.debug("rename_card: no card matching %r found", card_title_fragment)
-				return False
+		mirror, found_card = await _resolve_card(card_title_fragment, board_name)
+		if not found_card:
+			logger.debug("rename_card: no card matching %r found", card_title_fragment)
+			return False
 
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/cards/{found_card['id']}", json={"name": new_name})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "cards", patch_resp, found_card["boardId"])
 			logger.debug("rename_card: %r renamed to %r", found_card["name"], new_name)
 			return True
 	except Exception as e:
@@ -877,37 +812,14 @@ async def rename_list(list_name_fragment: str, new_name: str, board_name: str =
 		return False
 	logger.debug("rename_list: fragment=%s, new_name=%s, board=%s", _sanitize_for_log(list_name_fragment), _sanitize_for_log(new_name), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-
-			found_list = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "lists"})
-					lists = b_det.json().get("included", {}).get("lists", [])
-					for lst in lists:
-						if list_name_fragment in lst["name"].lower():
-							found_list = lst
-							break
-					if found_list:
-						break
-				if found_list:
-					break
-
-			if not found_list:
-				logger.debug("rename_list: no list matching %r found", list_name_fragment)
-				return False
+		mirror, found_list = await _resolve_list(list_name_fragment, board_name)
+		if not found_list:
+			logger.debug("rename_list: no list matching %r found", list_name_fragment)
+			return False
 
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/lists/{found_list['id']}", json={"name": new_name})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "lists", patch_resp, found_list["boardId"])
 			logger.debug("rename_list: %r renamed to %r", found_list["name"], new_name)
 			return True
 	except Exception as e:
@@ -921,34 +833,13 @@ async def set_card_description(card_fragment: str, description: str, board_name:
 	board_name = board_name.strip().strip('"\'')
 	logger.debug("set_card_description: fragment=%s, board=%s", _sanitize_for_log(card_fragment), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_card = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_fragment):
-							found_card = c
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-			if not found_card:
-				logger.debug("set_card_description: no card matching %r found", card_fragment)
-				return False
+		mirror, found_card = await _resolve_card(card_fragment, board_name)
+		if not found_card:
+			logger.debug("set_card_description: no card matching %r found", card_fragment)
+			return False
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/cards/{found_card['id']}", json={"description": new_description})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "cards", patch_resp, found_card["boardId"])
 			logger.debug("set_card_description: description updated on %r", found_card["name"])
 			return True
 	except Exception as e:
@@ -966,34 +857,13 @@ async def add_card_task(card_fragment: str, task_name: str, board_name: str = ""
 		return False
 	logger.debug("add_card_task: fragment=%s, task=%s, board=%s", _sanitize_for_log(card_fragment), _sanitize_for_log(task_name), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_card = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_fragment):
-							found_card = c
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-			if not found_card:
-				logger.debug("add_card_task: no card matching %r found", card_fragment)
-				return False
+		mirror, found_card = await _resolve_card(card_fragment, board_name)
+		if not found_card:
+			logger.debug("add_card_task: no card matching %r found", card_fragment)
+			return False
+		async with planka_client(timeout=10.0) as client:
 			post_resp = await client.post(f"/api/cards/{found_card['id']}/tasks", json={"name": task_name, "isCompleted": False, "position": 65535})
-			post_resp.raise_for_status()
+			_write_through(mirror, "tasks", post_resp, found_card["boardId"])
 			logger.debug("add_card_task: task %r added to card %r", task_name, found_card["name"])
 			return True
 	except Exception as e:
@@ -1008,43 +878,16 @@ async def check_card_task(card_fragment: str, task_fragment: str, board_name: st
 	board_name = board_name.strip().strip('"\'')
 	logger.debug("check_card_task: card=%s, task=%s, completed=%s", _sanitize_for_log(card_fragment), _sanitize_for_log(task_fragment), is_completed)
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_card = None
-			found_board_id = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_fragment):
-							found_card = c
-							found_board_id = b["id"]
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-			if not found_card:
-				logger.debug("check_card_task: no card matching %r found", card_fragment)
-				return False
-			b_full = await client.get(f"/api/boards/{found_board_id}")
-			all_tasks = b_full.json().get("included", {}).get("tasks", [])
-			tasks = [t for t in all_tasks if t.get("cardId") == found_card["id"]]
-			found_task = next((t for t in tasks if task_fragment in t["name"].lower()), None)
-			if not found_task:
-				logger.debug("check_card_task: no task matching %r in card %r", task_fragment, found_card["name"])
-				return False
+		mirror, found_card, found_task = await _resolve_card_task(card_fragment, task_fragment, board_name)
+		if not found_card:
+			logger.debug("check_card_task: no card matching %r found", card_fragment)
+			return False
+		if not found_task:
+			logger.debug("check_card_task: no task matching %r in card %r", task_fragment, found_card["name"])
+			return False
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/tasks/{found_task['id']}", json={"isCompleted": is_completed})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "tasks", patch_resp, found_card["boardId"])
 			logger.debug("check_card_task: task %r set to isCompleted=%s", found_task["name"], is_completed)
 			return True
 	except Exception as e:
@@ -1063,43 +906,16 @@ async def rename_card_task(card_fragment: str, task_fragment: str, new_name: str
 		return False
 	logger.debug("rename_card_task: card=%s, task=%s, new=%s", _sanitize_for_log(card_fragment), _sanitize_for_log(task_fragment), _sanitize_for_log(new_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_card = None
-			found_board_id = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_fragment):
-							found_card = c
-							found_board_id = b["id"]
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-			if not found_card:
-				logger.debug("rename_card_task: no card matching %r found", card_fragment)
-				return False
-			b_full = await client.get(f"/api/boards/{found_board_id}")
-			all_tasks = b_full.json().get("included", {}).get("tasks", [])
-			tasks = [t for t in all_tasks if t.get("cardId") == found_card["id"]]
-			found_task = next((t for t in tasks if task_fragment in t["name"].lower()), None)
-			if not found_task:
-				logger.debug("rename_card_task: no task matching %r in card %r", task_fragment, found_card["name"])
-				return False
+		mirror, found_card, found_task = await _resolve_card_task(card_fragment, task_fragment, board_name)
+		if not found_card:
+			logger.debug("rename_card_task: no card matching %r found", card_fragment)
+			return False
+		if not found_task:
+			logger.debug("rename_card_task: no task matching %r in card %r", task_fragment, found_card["name"])
+			return False
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/tasks/{found_task['id']}", json={"name": new_name})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "tasks", patch_resp, found_card["boardId"])
 			logger.debug("rename_card_task: task %r renamed to %r in card %r", found_task["name"], new_name, found_card["name"])
 			return True
 	except Exception as e:
@@ -1113,34 +929,13 @@ async def delete_card(card_fragment: str, board_name: str = "") -> bool:
 	board_name = board_name.strip().strip('"\'')
 	logger.debug("delete_card: fragment=%s, board=%s", _sanitize_for_log(card_fragment), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_card = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_fragment):
-							found_card = c
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-			if not found_card:
-				logger.debug("delete_card: no card matching %r found", card_fragment)
-				return False
+		mirror, found_card = await _resolve_card(card_fragment, board_name)
+		if not found_card:
+			logger.debug("delete_card: no card matching %r found", card_fragment)
+			return False
+		async with planka_client(timeout=10.0) as client:
 			del_resp = await client.delete(f"/api/cards/{found_card['id']}")
-			del_resp.raise_for_status()
+			_discard_through(mirror, "cards", found_card["id"], del_resp, found_card["boardId"])
 			logger.debug("delete_card: deleted card %r", found_card["name"])
 			return True
 	except Exception as e:
@@ -1154,34 +949,13 @@ async def delete_list(list_fragment: str, board_name: str = "") -> bool:
 	board_name = board_name.strip().strip('"\'')
 	logger.debug("delete_list: fragment=%s, board=%s", _sanitize_for_log(list_fragment), _sanitize_for_log(board_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_list = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "lists"})
-					lists = b_det.json().get("included", {}).get("lists", [])
-					for lst in lists:
-						if list_fragment in lst["name"].lower():
-							found_list = lst
-							break
-					if found_list:
-						break
-				if found_list:
-					break
-			if not found_list:
-				logger.debug("delete_list: no list matching %r found", list_fragment)
-				return False
+		mirror, found_list = await _resolve_list(list_fragment, board_name)
+		if not found_list:
+			logger.debug("delete_list: no list matching %r found", list_fragment)
+			return False
+		async with planka_client(timeout=10.0) as client:
 			del_resp = await client.delete(f"/api/lists/{found_list['id']}")
-			del_resp.raise_for_status()
+			_discard_through(mirror, "lists", found_list["id"], del_resp, found_list["boardId"])
 			logger.debug("delete_list: deleted list %r", found_list["name"])
 			return True
 	except Exception as e:
@@ -1196,43 +970,16 @@ async def delete_card_task(card_fragment: str, task_fragment: str, board_name: s
 	board_name = board_name.strip().strip('"\'')
 	logger.debug("delete_card_task: card=%s, task=%s", _sanitize_for_log(card_fragment), _sanitize_for_log(task_fragment))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_card = None
-			found_board_id = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_name and b["name"].lower() != board_name.lower():
-						continue
-					b_det = await client.get(f"/api/boards/{b['id']}", params={"included": "cards"})
-					cards = b_det.json().get("included", {}).get("cards", [])
-					for c in cards:
-						if _card_title_matches(c.get("name") or "", card_fragment):
-							found_card = c
-							found_board_id = b["id"]
-							break
-					if found_card:
-						break
-				if found_card:
-					break
-			if not found_card:
-				logger.debug("delete_card_task: no card matching %r found", card_fragment)
-				return False
-			b_full = await client.get(f"/api/boards/{found_board_id}")
-			all_tasks = b_full.json().get("included", {}).get("tasks", [])
-			tasks = [t for t in all_tasks if t.get("cardId") == found_card["id"]]
-			found_task = next((t for t in tasks if task_fragment in t["name"].lower()), None)
-			if not found_task:
-				logger.debug("delete_card_task: no task matching %r in card %r", task_fragment, found_card["name"])
-				return False
+		mirror, found_card, found_task = await _resolve_card_task(card_fragment, task_fragment, board_name)
+		if not found_card:
+			logger.debug("delete_card_task: no card matching %r found", card_fragment)
+			return False
+		if not found_task:
+			logger.debug("delete_card_task: no task matching %r in card %r", task_fragment, found_card["name"])
+			return False
+		async with planka_client(timeout=10.0) as client:
 			del_resp = await client.delete(f"/api/tasks/{found_task['id']}")
-			del_resp.raise_for_status()
+			_discard_through(mirror, "tasks", found_task["id"], del_resp, found_card["boardId"])
 			logger.debug("delete_card_task: deleted task %r from card %r", found_task["name"], found_card["name"])
 			return True
 	except Exception as e:
@@ -1252,9 +999,7 @@ async def create_board_in_project(board_name: str, project_fragment: str = "") -
 		project_fragment = settings.AUDIT_MY_PROJECTS_PARENT.lower()
 	logger.debug("create_board_in_project: board=%s, project=%s", _sanitize_for_log(board_name), _sanitize_for_log(project_fragment))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
+		async with planka_client(timeout=10.0) as client:
 			projects_resp = await client.get("/api/projects")
 			projects_resp.raise_for_status()
 			projects = projects_resp.json().get("items", [])
@@ -1281,27 +1026,13 @@ async def rename_board(board_fragment: str, new_name: str) -> bool:
 		return False
 	logger.debug("rename_board: fragment=%s, new_name=%s", _sanitize_for_log(board_fragment), _sanitize_for_log(new_name))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_board = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_fragment in (b.get("name") or "").lower():
-						found_board = b
-						break
-				if found_board:
-					break
-			if not found_board:
-				logger.debug("rename_board: no board matching %r found", board_fragment)
-				return False
+		mirror, found_board = await _resolve_board(board_fragment)
+		if not found_board:
+			logger.debug("rename_board: no board matching %r found", board_fragment)
+			return False
+		async with planka_client(timeout=10.0) as client:
 			patch_resp = await client.patch(f"/api/boards/{found_board['id']}", json={"name": new_name})
-			patch_resp.raise_for_status()
+			_write_through(mirror, "boards", patch_resp, found_board["id"])
 			logger.debug("rename_board: board %r renamed to %r", found_board["name"], new_name)
 			return True
 	except Exception as e:
@@ -1314,27 +1045,13 @@ async def delete_board(board_fragment: str) -> bool:
 	board_fragment = board_fragment.strip().strip('"\'').lower()
 	logger.debug("delete_board: fragment=%s", _sanitize_for_log(board_fragment))
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
-			projects_resp = await client.get("/api/projects")
-			projects_resp.raise_for_status()
-			projects = projects_resp.json().get("items", [])
-			found_board = None
-			for p in projects:
-				p_det = await client.get(f"/api/projects/{p['id']}")
-				boards = p_det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if board_fragment in (b.get("name") or "").lower():
-						found_board = b
-						break
-				if found_board:
-					break
-			if not found_board:
-				logger.debug("delete_board: no board matching %r found", board_fragment)
-				return False
+		mirror, found_board = await _resolve_board(board_fragment)
+		if not found_board:
+			logger.debug("delete_board: no board matching %r found", board_fragment)
+			return False
+		async with planka_client(timeout=10.0) as client:
 			del_resp = await client.delete(f"/api/boards/{found_board['id']}")
-			del_resp.raise_for_status()
+			_discard_through(mirror, "boards", found_board["id"], del_resp, found_board["id"])
 			logger.debug("delete_board: deleted board %r", found_board["name"])
 			return True
 	except Exception as e:
@@ -1346,13 +1063,9 @@ async def create_list(board_name: str, list_name: str, project_name: Optional[st
 	if not list_name or not list_name.strip():
 		logger.warning("create_list: refusing to create list with empty name on board '%s'", _sanitize_for_log(board_name))
 		return None
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, headers=headers) as client:
-		# Find board by name
-		resp = await client.get("/api/projects", headers=headers)
-		resp.raise_for_status()
-		projects = resp.json().get("items", [])
+	async with planka_client() as client:
+		# Find board by name (in memory, from the shared mirror)
+		mirror = await get_planka_mirror()
 
 		# Normalize board name with overrides/synonyms dynamically (mirrors create_task)
 		search_board_names = {board_name.lower()}
@@ -1373,28 +1086,22 @@ async def create_list(board_name: str, list_name: str, project_name: Optional[st
 			if board_name.lower() in ("nutrition", "chef", "recipe"):
 				search_board_names.update({"nutrition", "chef", "recipe"})
 
-		board_id = None
+		def _find_board_id() -> Optional[str]:
+			for proj in mirror.projects.values():
+				if project_name and proj["name"].lower() != project_name.lower():
+					continue
+				for b in mirror.boards_of(proj["id"]):
+					if (b.get("name") or "").lower() in search_board_names:
+						return b["id"]
+			return None
+
 		existing_lists = []
-		for proj in projects:
-			if project_name and proj["name"].lower() != project_name.lower():
-				continue
-			det = await client.get(f"/api/projects/{proj['id']}")
-			det.raise_for_status()
-			det_data = det.json()
-			# Boards might be in 'included' or 'boards' key depending on version/sideloading
-			_included = det_data.get("included")
-			if isinstance(_included, dict):
-				boards = _included.get("boards", [])
-			else:
-				boards = det_data.get("boards", [])
-			if not boards:
-				boards = []
-			for b in boards:
-				if (b.get("name") or "").lower() in search_board_names:
-					board_id = b["id"]
-					break
-			if board_id:
-				break
+		board_id = _find_board_id()
+		if not board_id:
+			# The board may have been created moments ago outside this module.
+			mirror.mark_listing_stale()
+			await mirror.refresh()
+			board_id = _find_board_id()
 
 		if not board_id:
 			logger.debug("create_list - board '%s' not found (searched: %s)", _sanitize_for_log(board_name), search_board_names)
@@ -1423,6 +1130,7 @@ async def create_list(board_name: str, list_name: str, project_name: Optional[st
 			})
 			resp.raise_for_status()
 			data = resp.json()
+			mirror.apply("lists", data.get("item"))
 			return data.get("item") or data
 		except Exception as e:
 			logger.debug("create_list failed: %s", _sanitize_for_log(e))
@@ -1432,12 +1140,8 @@ async def get_board_summary(board_name: str = "Operator Board") -> str:
 	"""Fetches a structured text summary of all active cards and lists on a specific board.
 	Used to inject live operational context into tactical Dify crews.
 	"""
-	# get_planka_auth_token imported from planka_common at module level
-	token = await get_planka_auth_token()
-	headers = {"Authorization": f"Bearer {token}"}
-	
 	try:
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=10.0, headers=headers) as client:
+		async with planka_client(timeout=10.0) as client:
 			# 1. Resolve Board ID
 			projects_resp = await client.get("/api/projects")
 			projects = projects_resp.json().get("items", [])
@@ -1484,46 +1188,23 @@ async def find_item_in_planka(title_fragment: str) -> bool:
 	or as a card name on the Operator Board.  Used by the recall-history intercept to
 	provide ground-truth verification instead of trusting Z's reply text.
 
-	Strategy (fast — 3 round-trips):
-	  1. GET /api/projects
-	  2. GET /api/projects/{id} in parallel → board names
-	  3. GET /api/boards/{operator_board_id} with cards included → card names
+	Answered from the shared Planka mirror (no per-call board walk).
 	"""
 	if not title_fragment or len(title_fragment.strip()) < 3:
 		return False
 	fragment = title_fragment.lower().strip()
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=12.0, headers=headers) as client:
-			proj_resp = await client.get("/api/projects")
-			projects = proj_resp.json().get("items", [])
-			if not projects:
-				return False
-
-			proj_details = await asyncio.gather(
-				*[client.get(f"/api/projects/{p['id']}") for p in projects],
-				return_exceptions=True,
-			)
+		mirror = await get_planka_mirror()
+		operator_board_id: Optional[str] = None
+		for b in mirror.boards.values():
+			if fragment in b["name"].lower():
+				return True
+			if b["name"].lower() == "operator board" and operator_board_id is None:
+				operator_board_id = b["id"]
 
-			operator_board_id: Optional[str] = None
-			for det in proj_details:
-				if isinstance(det, BaseException):
-					continue
-				boards = det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					if fragment in b["name"].lower():
-						return True
-					if b["name"].lower() == "operator board" and operator_board_id is None:
-						operator_board_id = b["id"]
-
-			if operator_board_id:
-				ob_resp = await client.get(
-					f"/api/boards/{operator_board_id}", params={"included": "cards"}
-				)
-				cards = ob_resp.json().get("included", {}).get("cards", [])
-				if any(fragment in c["name"].lower() for c in cards):
-					return True
+		if operator_board_id:
+			if any(fragment in c["name"].lower() for c in mirror.cards_of(operator_board_id)):
+				return True
 	except Exception as e:
 		logger.warning("find_item_in_planka: %s", _sanitize_for_log(e))
 	return False
@@ -1536,68 +1217,22 @@ async def search_cards_in_planka(title_fragment: str, limit: int = 10) -> list[d
 	Used by the state-question intercept (router step 0.45) to answer
 	"wo sind X?" / "where is X?" from Planka ground truth.
 
-	Strategy (O(boards) round-trips, cached auth, parallel board fetches):
-	  1. GET /api/projects → board list
-	  2. GET /api/boards/{id} for each board in parallel (includes lists + cards)
-	  3. Scan for fragment matches, return location tuples
+	Scans the shared Planka mirror in memory (refreshed incrementally).
 	"""
 	if not title_fragment or len(title_fragment.strip()) < 2:
 		return []
 	fragment = title_fragment.lower().strip()
 	results: list[dict] = []
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=12.0, headers=headers) as client:
-			proj_resp = await client.get("/api/projects")
-			projects = proj_resp.json().get("items", [])
-			if not projects:
-				return []
-
-			proj_details = await asyncio.gather(
-				*[client.get(f"/api/projects/{p['id']}") for p in projects],
-				return_exceptions=True,
-			)
-
-			all_board_ids: list[str] = []
-			all_board_names: dict[str, str] = {}
-			for det in proj_details:
-				if isinstance(det, BaseException):
-					continue
-				boards = det.json().get("included", {}).get("boards", [])
-				for b in boards:
-					bid = b.get("id", "")
-					if bid:
-						all_board_ids.append(bid)
-						all_board_names[bid] = b.get("name", "")
-
-			if not all_board_ids:
-				return []
-
-			board_details = await asyncio.gather(
-				*[client.get(f"/api/boards/{bid}") for bid in all_board_ids],
-				return_exceptions=True,
-			)
-
-			for bd in board_details:
-				if isinstance(bd, BaseException):
-					continue
-				bd_data = bd.json()
-				included = bd_data.get("included", {})
-				board_id = (bd_data.get("item") or {}).get("id", "")
-				board_name = all_board_names.get(board_id, "")
-				lists_by_id: dict[str, str] = {
-					lst["id"]: lst["name"]
-					for lst in included.get("lists", [])
-					if lst.get("id")
-				}
-				for card in included.get("cards", []):
-					card_name = card.get("name", "")
-					if fragment in card_name.lower():
-						list_name = lists_by_id.get(card.get("listId", ""), "")
-						results.append({"board": board_name, "list": list_name, "card": card_name})
-						if len(results) >= limit:
-							return results
+		mirror = await get_planka_mirror()
+		for board_id, board in mirror.boards.items():
+			for card in mirror.cards_of(board_id):
+				card_name = card.get("name", "")
+				if fragment in card_name.lower():
+					list_name = (mirror.lists.get(card.get("listId", "")) or {}).get("name", "")
+					results.append({"board": board.get("name", ""), "list": list_name, "card": card_name})
+					if len(results) >= limit:
+						return results
 	except Exception as e:
 		logger.warning("search_cards_in_planka: %s", _sanitize_for_log(e))
 	return results
@@ -1610,10 +1245,7 @@ async def get_activity_report(days: int = 30) -> str:
 	cutoff = datetime.now() - timedelta(days=days)
 
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+		async with planka_client(timeout=20.0) as client:
 			resp = await client.get("/api/projects")
 			projects = resp.json().get("items", [])
 			if not projects:
@@ -1741,9 +1373,7 @@ async def get_recent_activity(hours: int = 48) -> str:
 	"""Returns a formatted text block of non-done cards created or updated within the last `hours` hours."""
 	cutoff = datetime.now() - timedelta(hours=hours)
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+		async with planka_client(timeout=20.0) as client:
 			resp = await client.get("/api/projects")
 			projects = resp.json().get("items", [])
 			if not projects:
@@ -1806,9 +1436,7 @@ async def get_stale_cards(min_days: int = 5) -> str:
 	"""Returns a formatted text block of non-done cards with no update for `min_days` or more, grouped by board."""
 	threshold = datetime.now() - timedelta(days=min_days)
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+		async with planka_client(timeout=20.0) as client:
 			resp = await client.get("/api/projects")
 			projects = resp.json().get("items", [])
 			if not projects:
@@ -1874,9 +1502,7 @@ async def get_stale_cards_raw(min_hours: int = 48) -> list[dict]:
 	"""
 	threshold = datetime.now() - timedelta(hours=min_hours)
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+		async with planka_client(timeout=20.0) as client:
 			resp = await client.get("/api/projects")
 			projects = resp.json().get("items", [])
 			if not projects:
@@ -1957,9 +1583,7 @@ BOARD_NAME_ALIASES: dict[str, str] = {
 async def get_crew_board_snapshot() -> str:
 	"""Returns a formatted block showing top 2 active (non-done) cards per crew-named board."""
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+		async with planka_client(timeout=20.0) as client:
 			resp = await client.get("/api/projects")
 			projects = resp.json().get("items", [])
 			if not projects:
@@ -2021,9 +1645,7 @@ async def get_board_walkthrough(min_stale_days: int = 5) -> str:
 	"""
 	stale_threshold = datetime.now() - timedelta(days=min_stale_days)
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+		async with planka_client(timeout=20.0) as client:
 			resp = await client.get("/api/projects")
 			projects = resp.json().get("items", [])
 			if not projects:
@@ -1,49 +1,230 @@
+import asyncio
+import base64
+import json
+import re
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
 import httpx
 import logging
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-_tree_cache: dict[str, tuple[float, str]] = {} # cache_key -> (timestamp, data)
+# Process-wide Planka connection pool + access token. The token is reused until
+# shortly before its JWT `exp` (or until Planka answers 401), so a single card
+# move is one keep-alive round trip instead of login + TCP handshake + request.
+# Like the shared Qdrant client, the pool is bound to the event loop that created
+# it; code running under its own asyncio.run() (Celery, CLI) gets a fresh one.
+_http: Optional[httpx.AsyncClient] = None
+_http_loop: Optional[asyncio.AbstractEventLoop] = None
+_token_lock: Optional[asyncio.Lock] = None
+_token: Optional[str] = None
+_token_expires_at: float = 0.0
+
+# Refresh this many seconds before the JWT expiry; tokens without a readable
+# `exp` claim are re-validated after the fallback TTL (or on the first 401).
+_TOKEN_EXPIRY_MARGIN_S = 60.0
+_TOKEN_FALLBACK_TTL_S = 6 * 3600.0
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def _build_http() -> httpx.AsyncClient:
+	return httpx.AsyncClient(
+		base_url=settings.PLANKA_BASE_URL,
+		timeout=10.0,
+		limits=httpx.Limits(
+			max_connections=settings.PLANKA_POOL_SIZE,
+			max_keepalive_connections=settings.PLANKA_POOL_SIZE,
+			keepalive_expiry=60.0,
+		),
+	)
+
+
+def _get_http() -> httpx.AsyncClient:
+	"""Return the shared keep-alive client for the running loop."""
+	global _http, _http_loop, _token_lock
+	try:
+		loop = asyncio.get_running_loop()
+	except RuntimeError:
+		loop = None
+	if _http is None or (loop is not None and loop is not _http_loop):
+		_http = _build_http()
+		_http_loop = loop
+		_token_lock = asyncio.Lock()
+	return _http
+
+
+def _token_expiry(token: str) -> float:
+	"""Return the epoch second at which the cached token should be refreshed."""
+	try:
+		payload = token.split(".")[1]
+		payload += "=" * (-len(payload) % 4)
+		exp = float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+		return exp - _TOKEN_EXPIRY_MARGIN_S
+	except Exception:
+		return time.time() + _TOKEN_FALLBACK_TTL_S
+
 
-async def get_planka_auth_token() -> str:
+async def _login() -> str:
 	"""Authenticates with Planka and returns an access token. Handles ToS acceptance."""
-	login_url = f"{settings.PLANKA_BASE_URL}/api/access-tokens"
+	login_url = "/api/access-tokens"
 	payload = {
 		"emailOrUsername": settings.PLANKA_ADMIN_EMAIL,
 		"password": settings.PLANKA_ADMIN_PASSWORD
 	}
-	logger.debug("Attempting Planka auth at %s", login_url)
-	async with httpx.AsyncClient(timeout=10.0) as client:
-		try:
-			resp = await client.post(login_url, json=payload)
-			
-			# Handle pending ToS acceptance (common on first login)
-			if resp.status_code == 403:
-				data = resp.json()
-				pending_token = data.get("pendingToken")
-				if pending_token:
-					logger.debug("Planka requires ToS acceptance (pendingToken found). Accepting...")
-					accept_url = f"{settings.PLANKA_BASE_URL}/api/access-tokens/{pending_token}/actions/accept"
-					accept_resp = await client.post(accept_url)
-					accept_resp.raise_for_status()
-					# After accepting, retry the login to get the real token
-					resp = await client.post(login_url, json=payload)
-				else:
-					resp.raise_for_status()  # 403 without pendingToken is a real error
-
-			resp.raise_for_status()
-			token = resp.json().get("item")
-			if token:
-				logger.debug("Planka auth successful.")
+	logger.debug("Attempting Planka auth at %s%s", settings.PLANKA_BASE_URL, login_url)
+	client = _get_http()
+	try:
+		resp = await client.post(login_url, json=payload)
+
+		# Handle pending ToS acceptance (common on first login)
+		if resp.status_code == 403:
+			data = resp.json()
+			pending_token = data.get("pendingToken")
+			if pending_token:
+				logger.debug("Planka requires ToS acceptance (pendingToken found). Accepting...")
+				accept_url = f"/api/access-tokens/{pending_token}/actions/accept"
+				accept_resp = await client.post(accept_url)
+				accept_resp.raise_for_status()
+				# After accepting, retry the login to get the real token
+				resp = await client.post(login_url, json=payload)
 			else:
-				raise ValueError("Auth token is empty — check Planka credentials.")
-			return token
+				resp.raise_for_status()  # 403 without pendingToken is a real error
+
+		resp.raise_for_status()
+		token = resp.json().get("item")
+		if token:
+			logger.debug("Planka auth successful.")
+		else:
+			raise ValueError("Auth token is empty — check Planka credentials.")
+		from app.services.metrics import increment_counter
+		increment_counter("planka_logins_total")
+		return token
+	except Exception as e:
+		logger.debug("Planka auth exception: %s", e)
+		raise
+
+
+async def get_planka_auth_token(force_refresh: bool = False) -> str:
+	"""Return a valid Planka access token, logging in only when the cached one is stale."""
+	global _token, _token_expires_at
+	if not force_refresh and _token and time.time() < _token_expires_at:
+		return _token
+	_get_http()
+	stale = _token
+	async with _token_lock:
+		# Another caller may have refreshed while we waited for the lock.
+		if _token and time.time() < _token_expires_at and (not force_refresh or _token != stale):
+			return _token
+		token = await _login()
+		_token, _token_expires_at = token, _token_expiry(token)
+		return token
+
+
+def invalidate_planka_token() -> None:
+	"""Drop the cached token so the next request logs in again."""
+	global _token, _token_expires_at
+	_token, _token_expires_at = None, 0.0
+
+
+def _endpoint_label(url: str) -> str:
+	"""Collapse a request path into a low-cardinality metric label (/api/cards/{id})."""
+	path = urlsplit(url).path or "/"
+	return _ID_SEGMENT.sub("/{id}", path)
+
+
+class PlankaSession:
+	"""httpx.AsyncClient look-alike bound to the shared pool and cached token.
+
+	Used as `async with planka_client(timeout=15.0) as client:`; leaving the block
+	does not close anything — the pooled connections outlive the session. A 401
+	triggers one re-login and retry, as does a dropped keep-alive connection on a
+	GET. Every call is recorded as `planka_requests_total{method,endpoint,status}`
+	and `planka_request_seconds{method,endpoint}`; retries as `planka_retries_total`.
+	"""
+
+	def __init__(self, timeout: Optional[float] = 10.0) -> None:
+		self.timeout = timeout
+
+	async def __aenter__(self) -> "PlankaSession":
+		return self
+
+	async def __aexit__(self, *exc: Any) -> None:
+		return None
+
+	async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+		from app.services.metrics import increment_counter, observe_histogram
+
+		method = method.upper()
+		endpoint = _endpoint_label(url)
+		kwargs.setdefault("timeout", self.timeout)
+		extra_headers = kwargs.pop("headers", None) or {}
+		force_refresh = False
+		for attempt in range(2):
+			token = await get_planka_auth_token(force_refresh=force_refresh)
+			headers = {**extra_headers, "Authorization": f"Bearer {token}"}
+			start = time.perf_counter()
+			status = "error"
+			try:
+				resp = await _get_http().request(method, url, headers=headers, **kwargs)
+				status = str(resp.status_code)
+			except (httpx.RemoteProtocolError, httpx.ConnectError) as e:
+				# Stale pooled connection — safe to replay only for reads.
+				if attempt == 0 and method == "GET":
+					logger.debug("Planka %s %s: %s — retrying on a fresh connection", method, endpoint, e)
+					increment_counter("planka_retries_total", method=method, endpoint=endpoint, reason="connection")
+					continue
+				raise
+			finally:
+				increment_counter("planka_requests_total", method=method, endpoint=endpoint, status=status)
+				observe_histogram("planka_request_seconds", time.perf_counter() - start, method=method, endpoint=endpoint)
+			if resp.status_code == 401 and attempt == 0:
+				logger.debug("Planka %s %s returned 401 — refreshing token", method, endpoint)
+				increment_counter("planka_retries_total", method=method, endpoint=endpoint, reason="auth")
+				invalidate_planka_token()
+				force_refresh = True
+				continue
+			return resp
+		return resp
+
+	async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+		return await self.request("GET", url, **kwargs)
+
+	async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+		return await self.request("POST", url, **kwargs)
+
+	async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+		return await self.request("PATCH", url, **kwargs)
+
+	async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+		return await self.request("PUT", url, **kwargs)
+
+	async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+		return await self.request("DELETE", url, **kwargs)
+
+
+def planka_client(timeout: Optional[float] = 10.0) -> PlankaSession:
+	"""Return an authenticated Planka session on the shared connection pool."""
+	return PlankaSession(timeout=timeout)
+
+
+async def close_planka_client() -> None:
+	"""Close the shared pool and forget the cached token (FastAPI shutdown)."""
+	global _http, _http_loop
+	client, _http, _http_loop = _http, None, None
+	invalidate_planka_token()
+	if client is not None:
+		try:
+			await client.aclose()
 		except Exception as e:
-			logger.debug("Planka auth exception: %s", e)
-			raise
+			logger.debug("Planka client close failed: %s", e)
+
 
 def clear_tree_cache():
-	"""Invalidate the project tree cache."""
-	_tree_cache.clear()
+	"""Invalidate the shared Planka mirror (project tree) after out-of-band renames."""
+	from app.services.planka_mirror import planka_mirror
+	planka_mirror.mark_dirty()
 	logger.debug("Planka tree cache cleared")
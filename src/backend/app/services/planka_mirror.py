@@ -0,0 +1,339 @@
+"""
+Planka State Mirror
+-------------------
+One in-process copy of the Planka workspace (projects, boards, lists, cards,
+tasks, labels) shared by every read path and card mutator.
+
+Refresh is incremental:
+- The project/board listing is re-read at most every PLANKA_MIRROR_TTL_S.
+- A board's lists/cards/tasks are re-fetched only when its `updatedAt` changed,
+  when one of our own writes marked it dirty, or when the copy is older than
+  PLANKA_MIRROR_MAX_AGE_S. Planka does not bump a board's `updatedAt` for card
+  edits made in the web UI, so the max age bounds how stale those can get.
+- Stale boards are fetched in parallel on the shared Planka connection pool.
+
+Mutators write through: the item Planka returns from a PATCH/POST is applied to
+the mirror directly, so the next lookup sees it without another round trip.
+
+A normalized card-name index (casefolded, whitespace-collapsed) lets fragment
+lookups run in memory: resolving "the dentist card" is a dict probe plus a scan
+over distinct names instead of walking every project and board over HTTP.
+
+`version` increases whenever the content changes — a sync that saw different
+projects, boards, lists or cards, or one of our own writes — so consumers
+(e.g. the routing decision cache) can tell the workspace moved on.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from app.config import settings
+from app.services.planka_common import planka_client
+
+logger = logging.getLogger(__name__)
+
+def normalize_name(name: str) -> str:
+	"""Casefold and collapse whitespace; strips the quotes LLMs like to add."""
+	return " ".join((name or "").strip().strip('"\'').casefold().split())
+
+
+class PlankaMirror:
+	"""Shared, incrementally refreshed snapshot of the Planka workspace."""
+
+	def __init__(self) -> None:
+		self.projects: dict[str, dict] = {}
+		self.boards: dict[str, dict] = {}
+		self.lists: dict[str, dict] = {}
+		self.cards: dict[str, dict] = {}
+		self.labels: dict[str, dict] = {}
+		self.card_labels: dict[str, dict] = {}
+		self.tasks: dict[str, dict] = {}
+		self._card_index: dict[str, set[str]] = {}
+		self._board_stamp: dict[str, str] = {}
+		self._board_synced: dict[str, float] = {}
+		self._dirty: set[str] = set()
+		self._listed_at: float = 0.0
+		self._listing_sig: int = 0
+		self._board_sig: dict[str, int] = {}
+		self.version = 0
+		self._lock: Optional[asyncio.Lock] = None
+		self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+	# ------------------------------------------------------------------
+	# Refresh
+	# ------------------------------------------------------------------
+
+	def _get_lock(self) -> asyncio.Lock:
+		loop = asyncio.get_running_loop()
+		if self._lock is None or self._lock_loop is not loop:
+			self._lock, self._lock_loop = asyncio.Lock(), loop
+		return self._lock
+
+	async def refresh(self, force: bool = False, listing_only: bool = False) -> None:
+		"""Bring the mirror up to date. force=True re-reads every board;
+		listing_only=True stops after projects/boards (no list or card fetches)."""
+		async with self._get_lock():
+			now = time.monotonic()
+			async with planka_client(timeout=15.0) as client:
+				if force or not self._listed_at or now - self._listed_at >= settings.PLANKA_MIRROR_TTL_S:
+					await self._sync_listing(client)
+					self._listed_at = now
+				if listing_only:
+					return
+				max_age = settings.PLANKA_MIRROR_MAX_AGE_S
+				stale = [
+					bid for bid in self.boards
+					if force or bid in self._dirty or now - self._board_synced.get(bid, 0.0) >= max_age
+				]
+				if not stale:
+					return
+				results = await asyncio.gather(*(self._sync_board(client, bid) for bid in stale), return_exceptions=True)
+				for bid, res in zip(stale, results):
+					if isinstance(res, BaseException):
+						self._dirty.add(bid)
+						logger.warning("planka_mirror: board %s refresh failed: %s", bid, res)
+			from app.services.metrics import increment_counter
+			increment_counter("planka_mirror_board_syncs_total", amount=len(stale))
+
+	async def _sync_listing(self, client: Any) -> None:
+		resp = await client.get("/api/projects")
+		resp.raise_for_status()
+		data = resp.json()
+		projects = data.get("items", [])
+		included = data.get("included") or {}
+		if "boards" in included:
+			boards = included["boards"]
+		else:
+			# Older Planka builds only sideload boards on the project detail route.
+			details = await asyncio.gather(*(client.get(f"/api/projects/{p['id']}") for p in projects))
+			boards = []
+			for p, det in zip(projects, details):
+				det.raise_for_status()
+				det_json = det.json()
+				for b in det_json.get("included", {}).get("boards", []) or det_json.get("boards", []):
+					b.setdefault("projectId", p["id"])
+					boards.append(b)
+
+		self.projects = {p["id"]: p for p in projects}
+		new_boards = {b["id"]: b for b in boards}
+		for bid in set(self.boards) - set(new_boards):
+			self._drop_board_content(bid)
+			self._board_stamp.pop(bid, None)
+			self._board_synced.pop(bid, None)
+			self._board_sig.pop(bid, None)
+			self._dirty.discard(bid)
+		for bid, b in new_boards.items():
+			if bid not in self._board_synced or b.get("updatedAt") != self._board_stamp.get(bid):
+				self._dirty.add(bid)
+		self.boards = new_boards
+		sig = hash((
+			frozenset((p["id"], p.get("name")) for p in projects),
+			frozenset((b["id"], b.get("name"), b.get("projectId")) for b in boards),
+		))
+		if sig != self._listing_sig:
+			self._listing_sig = sig
+			self.version += 1
+
+	async def _sync_board(self, client: Any, board_id: str) -> None:
+		self._dirty.discard(board_id)
+		resp = await client.get(f"/api/boards/{board_id}")
+		resp.raise_for_status()
+		data = resp.json()
+		included = data.get("included", {})
+		self._drop_board_content(board_id)
+		for lst in included.get("lists", []):
+			self.lists[lst["id"]] = lst
+		for card in included.get("cards", []):
+			self._put_card(card)
+		for lbl in included.get("labels", []):
+			self.labels[lbl["id"]] = lbl
+		for cl in included.get("cardLabels", []):
+			self.card_labels[cl["id"]] = cl
+		for task in included.get("tasks", []):
+			self.tasks[task["id"]] = task
+		item = data.get("item") or {}
+		if board_id in self.boards and item:
+			self.boards[board_id] = {**self.boards[board_id], **item}
+		self._board_stamp[board_id] = (self.boards.get(board_id) or item).get("updatedAt")
+		self._board_synced[board_id] = time.monotonic()
+		sig = hash((
+			frozenset((lst["id"], lst.get("name")) for lst in included.get("lists", [])),
+			frozenset((c["id"], c.get("name"), c.get("listId")) for c in included.get("cards", [])),
+		))
+		if sig != self._board_sig.get(board_id):
+			self._board_sig[board_id] = sig
+			self.version += 1
+
+	def _drop_board_content(self, board_id: str) -> None:
+		for cid in [cid for cid, c in self.cards.items() if c.get("boardId") == board_id]:
+			self._pop_card(cid)
+		for store in (self.lists, self.labels):
+			for key in [k for k, v in store.items() if v.get("boardId") == board_id]:
+				del store[key]
+
+	# ------------------------------------------------------------------
+	# Write-through
+	# ------------------------------------------------------------------
+
+	def apply(self, kind: str, item: Optional[dict]) -> None:
+		"""Upsert an item Planka returned from one of our mutations.
+
+		kind is the Planka collection name: projects, boards, lists, cards, tasks.
+		"""
+		if not item or "id" not in item:
+			return
+		self.version += 1
+		if kind == "cards":
+			self._put_card(item)
+		elif kind == "projects":
+			self.projects[item["id"]] = item
+		elif kind == "boards":
+			self.boards[item["id"]] = {**self.boards.get(item["id"], {}), **item}
+			self._board_stamp[item["id"]] = self.boards[item["id"]].get("updatedAt")
+			self._board_synced.setdefault(item["id"], time.monotonic())
+		elif kind in ("lists", "tasks"):
+			getattr(self, kind)[item["id"]] = item
+
+	def discard(self, kind: str, item_id: str) -> None:
+		"""Forget an item we just deleted in Planka."""
+		self.version += 1
+		if kind == "cards":
+			self._pop_card(item_id)
+		elif kind == "lists":
+			self.lists.pop(item_id, None)
+			for cid in [cid for cid, c in self.cards.items() if c.get("listId") == item_id]:
+				self._pop_card(cid)
+		elif kind == "boards":
+			self._drop_board_content(item_id)
+			self.boards.pop(item_id, None)
+		elif kind == "projects":
+			self.projects.pop(item_id, None)
+			for bid in [bid for bid, b in self.boards.items() if b.get("projectId") == item_id]:
+				self.discard("boards", bid)
+		elif kind == "tasks":
+			self.tasks.pop(item_id, None)
+
+	def mark_dirty(self, board_id: Optional[str] = None) -> None:
+		"""Re-fetch one board (or the listing plus every board) on next refresh."""
+		if board_id:
+			self._dirty.add(board_id)
+		else:
+			self._listed_at = 0.0
+			self._dirty.update(self.boards)
+
+	def mark_listing_stale(self) -> None:
+		"""Re-read the project/board listing on next refresh (new, moved or renamed boards)."""
+		self._listed_at = 0.0
+
+	def _put_card(self, card: dict) -> None:
+		old = self.cards.get(card["id"])
+		if old is not None:
+			self._unindex(old)
+		self.cards[card["id"]] = card
+		self._card_index.setdefault(normalize_name(card.get("name") or ""), set()).add(card["id"])
+
+	def _pop_card(self, card_id: str) -> None:
+		card = self.cards.pop(card_id, None)
+		if card is None:
+			return
+		self._unindex(card)
+		for tid in [tid for tid, t in self.tasks.items() if t.get("cardId") == card_id]:
+			del self.tasks[tid]
+		for clid in [k for k, cl in self.card_labels.items() if cl.get("cardId") == card_id]:
+			del self.card_labels[clid]
+
+	def _unindex(self, card: dict) -> None:
+		key = normalize_name(card.get("name") or "")
+		ids = self._card_index.get(key)
+		if ids is not None:
+			ids.discard(card["id"])
+			if not ids:
+				del self._card_index[key]
+
+	# ------------------------------------------------------------------
+	# Lookups (in memory)
+	# ------------------------------------------------------------------
+
+	def board_ids_named(self, board_name: str) -> set[str]:
+		target = normalize_name(board_name)
+		return {bid for bid, b in self.boards.items() if normalize_name(b.get("name") or "") == target}
+
+	def boards_of(self, project_id: str) -> list[dict]:
+		return [b for b in self.boards.values() if b.get("projectId") == project_id]
+
+	def lists_of(self, board_id: str) -> list[dict]:
+		return sorted(
+			(lst for lst in self.lists.values() if lst.get("boardId") == board_id),
+			key=lambda lst: lst.get("position") or 0,
+		)
+
+	def cards_of(self, board_id: str) -> list[dict]:
+		return sorted(
+			(c for c in self.cards.values() if c.get("boardId") == board_id),
+			key=lambda c: c.get("position") or 0,
+		)
+
+	def tasks_of(self, card_id: str) -> list[dict]:
+		return sorted(
+			(t for t in self.tasks.values() if t.get("cardId") == card_id),
+			key=lambda t: t.get("position") or 0,
+		)
+
+	def labels_of_card(self, card_id: str) -> list[str]:
+		names = []
+		for cl in self.card_labels.values():
+			if cl.get("cardId") == card_id:
+				lbl = self.labels.get(cl.get("labelId", ""))
+				if lbl:
+					names.append(lbl.get("name") or lbl.get("color", ""))
+		return names
+
+	def find_cards(self, fragment: str, board_name: str = "") -> list[dict]:
+		"""Cards whose normalized name matches fragment: exact hits first, then
+		bidirectional substring matches (same rule as planka._card_title_matches)."""
+		frag = normalize_name(fragment)
+		if not frag:
+			return []
+		allowed = self.board_ids_named(board_name) if board_name else None
+		ids = list(self._card_index.get(frag, ()))
+		ids += [
+			cid
+			for key, cids in self._card_index.items()
+			if key and key != frag and (frag in key or key in frag)
+			for cid in cids
+		]
+		cards = [self.cards[cid] for cid in ids]
+		if allowed is not None:
+			cards = [c for c in cards if c.get("boardId") in allowed]
+		return cards
+
+	def find_card(self, fragment: str, board_name: str = "") -> Optional[dict]:
+		matches = self.find_cards(fragment, board_name)
+		return matches[0] if matches else None
+
+	def find_list(self, fragment: str, board_name: str = "") -> Optional[dict]:
+		"""First list whose lower-cased name contains fragment."""
+		frag = (fragment or "").strip().strip('"\'').lower()
+		allowed = self.board_ids_named(board_name) if board_name else None
+		for bid in self.boards:
+			if allowed is not None and bid not in allowed:
+				continue
+			for lst in self.lists_of(bid):
+				if frag in (lst.get("name") or "").lower():
+					return lst
+		return None
+
+	def list_named(self, board_id: str, name: str) -> Optional[dict]:
+		target = (name or "").lower()
+		return next((lst for lst in self.lists_of(board_id) if (lst.get("name") or "").lower() == target), None)
+
+
+planka_mirror = PlankaMirror()
+
+
+async def get_planka_mirror(force: bool = False) -> PlankaMirror:
+	"""Return the shared mirror after an incremental (or forced full) refresh."""
+	await planka_mirror.refresh(force=force)
+	return planka_mirror
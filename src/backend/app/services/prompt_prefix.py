@@ -0,0 +1,105 @@
+"""
+Prefix-Stable Prompt Assembly
+-----------------------------
+llama-server re-uses a slot's KV cache for the longest prompt prefix it has
+already evaluated there. That only pays off when the leading bytes of the
+system prompt are identical from one request to the next, so prompts are
+assembled as
+
+    static prefix (persona / crew rules, action-tag docs)  +  volatile tail
+
+where everything that changes per request (clock, profile, memories, history,
+router hints) lives in the tail. assemble() keeps one interned static prefix
+per key ("chat", "crew:<id>", ...) and counts how often a key's prefix had to
+change (`llm_prompt_prefix_changes_total{key}`) — a steadily rising count means
+something volatile leaked into the prefix.
+
+For llama.cpp peers the key also selects a slot (llm_peers.PeerLease.claim_slot)
+and the request carries `cache_prompt` / `id_slot`, so each crew and the main
+chat persona keep a warm slot. record_prompt_timings() reads the `timings`
+block llama-server attaches to the last stream chunk:
+
+  llm_prompt_tokens_total{key,source}   source = cached | evaluated
+  llm_prompt_eval_saved_ms_total{key}   cached tokens x measured ms per prompt token
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+_prefixes: dict[str, str] = {}
+_stats: dict[str, dict[str, float]] = {}
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PromptParts:
+	key: str
+	static: str
+	volatile: str
+
+	@property
+	def text(self) -> str:
+		if not self.volatile:
+			return self.static
+		return f"{self.static}\n\n{self.volatile}"
+
+
+def assemble(key: str, static: str, *volatile: str) -> PromptParts:
+	"""Static prefix for *key* followed by the non-empty *volatile* sections."""
+	from app.services.metrics import increment_counter
+	with _lock:
+		previous = _prefixes.get(key)
+		if previous != static:
+			if previous is not None:
+				increment_counter("llm_prompt_prefix_changes_total", key=key)
+				logger.debug("prompt_prefix: static prefix for %s changed (%d → %d chars)", key, len(previous), len(static))
+			_prefixes[key] = static
+		static = _prefixes[key]
+	return PromptParts(key, static, "\n\n".join(part for part in volatile if part))
+
+
+def prefix_key(system_prompt: str) -> str:
+	"""Fallback key for prompts not built through assemble(): a hash of their opening."""
+	return "p:" + hashlib.sha256(system_prompt[:512].encode("utf-8")).hexdigest()[:10]
+
+
+def record_prompt_timings(key: str, timings: dict) -> None:
+	"""Account one llama-server response's prompt-cache reuse against *key*."""
+	from app.services.metrics import increment_counter
+	try:
+		cached = int(timings.get("cache_n") or 0)
+		evaluated = int(timings.get("prompt_n") or 0)
+		prompt_ms = float(timings.get("prompt_ms") or 0.0)
+	except (TypeError, ValueError):
+		return
+	saved_ms = cached * prompt_ms / evaluated if evaluated else 0.0
+	increment_counter("llm_prompt_tokens_total", cached, key=key, source="cached")
+	increment_counter("llm_prompt_tokens_total", evaluated, key=key, source="evaluated")
+	increment_counter("llm_prompt_eval_saved_ms_total", int(saved_ms), key=key)
+	with _lock:
+		s = _stats.setdefault(key, {"requests": 0, "cached": 0, "evaluated": 0, "prompt_ms": 0.0, "saved_ms": 0.0})
+		s["requests"] += 1
+		s["cached"] += cached
+		s["evaluated"] += evaluated
+		s["prompt_ms"] += prompt_ms
+		s["saved_ms"] += saved_ms
+
+
+def get_prefix_cache_stats() -> dict:
+	"""Per-key prefix-hit rate and prompt-processing time saved (dashboard)."""
+	with _lock:
+		out = {}
+		for key, s in _stats.items():
+			total = s["cached"] + s["evaluated"]
+			out[key] = {
+				"requests": int(s["requests"]),
+				"prefix_hit_rate": round(s["cached"] / total, 3) if total else 0.0,
+				"prompt_eval_ms": round(s["prompt_ms"], 1),
+				"saved_ms": round(s["saved_ms"], 1),
+				"prefix_chars": len(_prefixes.get(key, "")),
+			}
+		return out
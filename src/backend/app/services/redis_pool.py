@@ -0,0 +1,83 @@
+"""
+Shared Redis Client
+-------------------
+One pooled redis.asyncio client per process instead of a fresh client and TCP
+connection for every call site (circuit breaker, coach earning, nudges,
+reminders, dashboard widgets, embedding cache).
+
+- Two clients share the configuration: decode_responses=True (str values, the
+  default) and decode_responses=False for binary payloads (embedding vectors).
+- Like the LLM and Planka pools, the clients are bound to the event loop that
+  created them; code under its own asyncio.run() (Celery, CLI) gets fresh ones.
+- main.py creates the clients at startup and closes them on shutdown.
+
+Usage:
+    async with redis_client() as r:      # leaving the block closes nothing
+        await r.get("key")
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+	from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+_clients: dict[bool, "Redis"] = {}
+_clients_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _build_client(decode_responses: bool) -> "Redis":
+	import redis.asyncio as aioredis
+	return aioredis.Redis(
+		host=settings.REDIS_HOST,
+		port=settings.REDIS_PORT,
+		password=settings.REDIS_PASSWORD or None,
+		decode_responses=decode_responses,
+		max_connections=settings.REDIS_POOL_SIZE,
+		socket_connect_timeout=3.0,
+		health_check_interval=30,
+	)
+
+
+def get_redis(decode_responses: bool = True) -> "Redis":
+	"""Return the shared pooled client for the running loop."""
+	global _clients, _clients_loop
+	try:
+		loop = asyncio.get_running_loop()
+	except RuntimeError:
+		loop = None
+	if loop is not None and loop is not _clients_loop:
+		_clients, _clients_loop = {}, loop
+	client = _clients.get(decode_responses)
+	if client is None:
+		client = _clients[decode_responses] = _build_client(decode_responses)
+	return client
+
+
+@contextlib.asynccontextmanager
+async def redis_client(decode_responses: bool = True) -> AsyncIterator["Redis"]:
+	"""`async with redis_client() as r:` — the pooled client; leaving the block closes nothing."""
+	yield get_redis(decode_responses)
+
+
+def init_redis() -> None:
+	"""Create the shared client (FastAPI startup). Connections open lazily."""
+	get_redis()
+	logger.info("redis_pool: shared client ready (max_connections=%d)", settings.REDIS_POOL_SIZE)
+
+
+async def close_redis() -> None:
+	"""Close the shared clients and their pools (FastAPI shutdown)."""
+	global _clients, _clients_loop
+	clients, _clients, _clients_loop = list(_clients.values()), {}, None
+	for client in clients:
+		try:
+			await client.aclose()
+		except Exception as e:
+			logger.debug("redis_pool: client close failed: %s", e)
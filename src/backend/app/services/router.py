@@ -22,7 +22,7 @@ import re
 import asyncio
 import time as _time
 from dataclasses import dataclass, field
-from typing import AsyncIterator, Callable, Awaitable, Optional
+from typing import Any, AsyncIterator, Callable, Awaitable, Optional
 
 from app.common.phantom import PHANTOM_RE as _PHANTOM_RE  # noqa: E402
 from app.services.z_core import build_z_core_context, _EMOTIONAL_MARKER_RE
@@ -212,6 +212,23 @@ _REORGANIZE_BOARD_RE = re.compile(
 	re.IGNORECASE,
 )
 
+# Sort/board phrases whose structural classification may include a fast-model
+# call to resolve colloquial board names — they get a longer classifier budget.
+_SORT_RE_QUICK = re.compile(
+	# English
+	r'\b(?:sort|reorgani[sz]|restructur|clean\s+up|tidy\s+up|reorder|rearrang'
+	# German
+	r'|sortier|reorganisier|aufr[äa]um|umstrukturieren|neu\s+anordnen'
+	# Spanish / Portuguese
+	r'|reorganiza|reestructura|reestrutura|reordena|arruma'
+	# French
+	r'|r[ée]organise|restructure|r[ée]ordonne'
+	# Russian
+	r'|\u043e\u0442\u0441\u043e\u0440\u0442\u0438\u0440|\u0441\u043e\u0440\u0442\u0438\u0440|\u0440\u0435\u043e\u0440\u0433\u0430\u043d\u0438\u0437|\u0443\u043f\u043e\u0440\u044f\u0434\u043e\u0447|\u0440\u0430\u0437\u043b\u043e\u0436\u0438'
+	r')',
+	re.IGNORECASE,
+)
+
 
 @dataclass
 class RouterResult:
@@ -225,6 +242,17 @@ class RouterResult:
 
 async def _validate_routing_intent(text: str, expected_intent: str) -> bool:
 	"""Call LLM reasoning to verify if the user text actually expresses the expected routing intent."""
+	from app.services.intent_gate import local_verdict, record_decision
+	verdict = await local_verdict(text, expected_intent)
+	if verdict is not None:
+		return verdict
+	from app.services.message_classifier import get_shared_classification
+	shared = await get_shared_classification(text)
+	if shared is not None:
+		valid = shared.is_valid(expected_intent)
+		if shared.ok:
+			record_decision(text, expected_intent, valid)
+		return valid
 	from app.services.llm import chat
 	prompt = (
 		f"The user said: '{text}'.\n"
@@ -240,7 +268,9 @@ async def _validate_routing_intent(text: str, expected_intent: str) -> bool:
 			system_override="You are a strict intent routing classifier. You must output VALID or OVERRULE at the very end of your response.",
 			_feature="router_validation"
 		)
-		return "OVERRULE" not in response.upper()
+		valid = "OVERRULE" not in response.upper()
+		record_decision(text, expected_intent, valid)
+		return valid
 	except Exception as e:
 		logger.warning("Router validation failed for %s: %s", expected_intent, e)
 		return True  # Fallback to trusting the keyword match on LLM error
@@ -251,6 +281,16 @@ async def _classify_state_query(text: str, history: list) -> Optional[str]:
 
 	Returns the extracted search fragment (topic) if it is a state query, or None.
 	"""
+	from app.services.routing_cache import get_routing_cache
+	hit, topic = get_routing_cache().get("state_query", text)
+	if hit:
+		return topic
+	from app.services.message_classifier import get_shared_classification
+	shared = await get_shared_classification(text)
+	if shared is not None:
+		if shared.ok:
+			_remember_state_query(text, shared.state_query)
+		return shared.state_query
 	try:
 		from app.services.llm import chat as cloud_chat
 		system_override = (
@@ -281,13 +321,142 @@ async def _classify_state_query(text: str, history: list) -> Optional[str]:
 		)
 		decision_clean = decision.strip()
 		if decision_clean.upper() == "NO" or decision_clean.upper().startswith("'NO"):
-			return None
+			decision_clean = None
+		_remember_state_query(text, decision_clean)
 		return decision_clean
 	except Exception as exc:
 		logger.warning("_classify_state_query failed: %s", exc)
 		return None
 
 
+def _remember_state_query(text: str, topic: Optional[str]) -> None:
+	"""Cache a state-query decision unless its topic was resolved from history."""
+	from app.services.routing_cache import get_routing_cache, normalize_message
+	if topic is None or normalize_message(topic) in normalize_message(text):
+		get_routing_cache().put("state_query", text, topic)
+
+
+
+async def _state_query_lookup(text: str, history: list) -> tuple[Optional[str], Any]:
+	"""Stage 0.45 I/O: classify the state query, then search Planka for its topic.
+
+	Returns (topic, outcome) where outcome is the search results, the exception
+	the search raised (timeouts included) or None when no search was needed.
+	"""
+	topic = await _classify_state_query(text, history)
+	if not topic or len(topic) < 2:
+		return topic, None
+	try:
+		from app.services.planka import search_cards_in_planka
+		return topic, await asyncio.wait_for(search_cards_in_planka(topic, limit=10), timeout=6.0)
+	except Exception as exc:
+		return topic, exc
+
+
+def _structural_timeout(text: str) -> float:
+	# SORT_BOARD classification can include a fast-model call to resolve colloquial
+	# board names (e.g. "aquarium" → "reef tank"). Budget 25s for that path;
+	# keep 3s for all other intents so normal latency is unaffected.
+	return 25.0 if _SORT_RE_QUICK.search(text[:200]) else 3.0
+
+
+async def _structural_lookup(text: str, lang: str) -> Any:
+	"""Stage 0.5 I/O: structural-intent classification under its latency budget."""
+	import copy
+	from app.services.intent_router import classify_structural_intent
+	from app.services.routing_cache import get_routing_cache
+	cache = get_routing_cache()
+	hit, intent = cache.get("structural", text, lang)
+	if not hit:
+		intent = await asyncio.wait_for(
+			classify_structural_intent(text, lang), timeout=_structural_timeout(text),
+		)
+		cache.put("structural", text, intent, lang)
+	# Dispatch may adjust entities — never hand out the cached instance.
+	return copy.deepcopy(intent)
+
+
+async def _board_fallback_lookup(text: str) -> tuple[str, list]:
+	"""Stage 0.52 I/O: ask the cloud model whether the message asks to sort a board.
+
+	Returns (reply, all_boards); dispatch on the reply stays with the caller.
+	"""
+	from app.services.llm import chat as _fast_chat
+	from app.services.intent_router import _get_planka_snapshot
+	# Fetch board list so the fast model has board names to choose from.
+	_projects = await _get_planka_snapshot()
+	_all_boards = [b for p in (_projects or []) for b in p["boards"]]
+	_board_names_hint = ", ".join((b.get("name") or "") for b in _all_boards) or "none"
+	_sem_prompt = (
+		f"Available Planka boards: {_board_names_hint}\n"
+		"Does the user EXPLICITLY ask to sort, reorganise, tidy, clean up, reorder, or restructure one of those boards?\n"
+		"IMPORTANT: The message must contain a clear intent to REARRANGE or REORGANISE board content.\n"
+		"Talking ABOUT a topic (e.g. fitness, work, cooking) does NOT count — only explicit board manipulation commands count.\n"
+		f"Message: \"{text[:300]}\"\n"
+		"If YES (explicit sort/reorganise request): reply SORT_BOARD:<exact board name from the list above>\n"
+		"If NO (conversational message, question, or anything other than explicit board reorganisation): reply NO"
+	)
+	# Use tier="cloud" — "auto" is not a valid tier value and falls to local silently.
+	# The classify prompt is tiny (~100 tokens). Cloud response < 500 ms.
+	# Pass system_override to bypass loading massive personal context files.
+	_sem = await asyncio.wait_for(
+		_fast_chat(
+			_sem_prompt,
+			tier="cloud",
+			system_override="You are a precise board-management intent classifier. Analyze the message and reply strictly in the requested format."
+		),
+		timeout=8.0
+	)
+	return _sem.strip(), _all_boards
+
+
+class _StageRunner:
+	"""Runs the I/O behind the router's intercept stages, serially or speculatively.
+
+	Serial mode awaits each lookup when its stage is reached, exactly as before.
+	Speculative mode (ROUTER_SPECULATIVE) starts every side-effect-free lookup as
+	a task as soon as the message arrives; stages still consume the results in
+	their original order, so precedence and outcomes are identical to serial
+	mode. Lookups no stage consumes (an earlier stage answered, or the stage was
+	skipped) are cancelled.
+
+	take() records router_stage_seconds{stage,mode}: the time the stage actually
+	waited, i.e. the routing latency that stage still adds.
+	"""
+
+	def __init__(self, speculative: bool) -> None:
+		self.speculative = speculative
+		self.mode = "speculative" if speculative else "serial"
+		self._tasks: dict[str, asyncio.Task] = {}
+
+	def start(self, stage: str, factory: Callable[[], Awaitable[Any]]) -> None:
+		if self.speculative and stage not in self._tasks:
+			self._tasks[stage] = asyncio.ensure_future(factory())
+
+	async def take(self, stage: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+		"""Return the stage's result: the speculative task's, or a fresh serial run."""
+		from app.services.metrics import observe_histogram
+		task = self._tasks.pop(stage, None)
+		start = _time.perf_counter()
+		try:
+			return await (task if task is not None else factory())
+		finally:
+			observe_histogram("router_stage_seconds", _time.perf_counter() - start, stage=stage, mode=self.mode)
+
+	def discard(self, stage: str) -> None:
+		task = self._tasks.pop(stage, None)
+		if task is None:
+			return
+		if task.done():
+			if not task.cancelled():
+				task.exception()  # retrieved — no "exception never retrieved" warning
+		else:
+			task.cancel()
+
+	def cancel_all(self) -> None:
+		for stage in list(self._tasks):
+			self.discard(stage)
+
 
 async def route_message_stream(
 	user_text: str,
@@ -515,6 +684,16 @@ async def route_message_stream(
 				))
 				return
 
+		# ── Shared multi-head classification ─────────────────────────────────
+		# One cloud call answers every LLM gate below (intercept validation, state
+		# query, structural-intent validation, system-action guard, crew routing).
+		# Started after the trivial fast path, which never needs it, so it overlaps
+		# the deterministic intercepts; each stage awaits the same task through the
+		# ResponseBudget. Cancelled once the request has its result.
+		from app.services.message_classifier import cancel_classification, start_classification
+		start_classification(user_text, history)
+		result_future.add_done_callback(lambda _f: cancel_classification(_budget))
+
 		# ── -1. Manual audit intercept ───────────────────────────────────────
 		# Explicit self-audit requests ("audit your actions", "look back and audit",
 		# etc.) are handled deterministically here — no LLM call, no crew routing.
@@ -697,6 +876,27 @@ async def route_message_stream(
 			))
 			return
 
+		# ── Speculative intercept lookups ────────────────────────────────────
+		# The I/O behind stages 0.45 (state query + Planka search), 0.5 (structural
+		# intent), 0.52 (semantic board fallback) and 1 (crew routing) does not
+		# depend on earlier stages, so with ROUTER_SPECULATIVE it all starts here
+		# at once. Stages below still take their results in the original order —
+		# routing outcomes match the serial path; unconsumed lookups are cancelled.
+		from app.config import settings
+		from app.services.semantic_router import route_semantic
+		_think_mode = user_text.strip().lower().startswith("/think")
+		_stages = _StageRunner(settings.ROUTER_SPECULATIVE)
+		_route_start = _time.perf_counter()
+		result_future.add_done_callback(lambda _f: _stages.cancel_all())
+		_stages.start("state_query", lambda: _state_query_lookup(user_text, history))
+		_stages.start("structural", lambda: _structural_lookup(user_text, lang))
+		_stages.start("board_fallback", lambda: _board_fallback_lookup(user_text))
+		if not _REORGANIZE_BOARD_RE.search(user_text[:_MAX_RE_INPUT]):
+			# Board-reorganise requests route on injected board context (0.55).
+			_stages.start("crews", lambda: route_semantic(
+				user_text, history, channel, think_mode=_think_mode, lang=lang,
+			))
+
 		# ── 0.4 Save-follow-up context injector ──────────────────────────────
 		# Detects two trigger patterns:
 		#   A. "Speicher die Rezepte" — explicit save request where the content
@@ -812,15 +1012,17 @@ async def route_message_stream(
 		# Merge save-follow-up context injection from step 0.4 (if any)
 		if _save_ctx_inject:
 			_sq_extra_ctx.append(_save_ctx_inject)
-		_sq_topic = await _classify_state_query(user_text, history)
+		_sq_topic, _sq_results = await _stages.take(
+			"state_query", lambda: _state_query_lookup(user_text, history),
+		)
 		if _sq_topic:
-			# If we got a reasonable fragment, look it up in Planka live
+			# If we got a reasonable fragment, it was looked up in Planka live
 			if len(_sq_topic) >= 2:
-				try:
-					from app.services.planka import search_cards_in_planka
-					_sq_results = await asyncio.wait_for(
-						search_cards_in_planka(_sq_topic, limit=10), timeout=6.0,
-					)
+				if isinstance(_sq_results, asyncio.TimeoutError):
+					logger.warning("Router 0.45: Planka state query timed out for '%s'", _sanitize_for_log(_sq_topic))
+				elif isinstance(_sq_results, Exception):
+					logger.warning("Router 0.45 Planka query failed: %s", _sq_results)
+				else:
 					if _sq_results:
 						_sq_lines = [
 							f"  - \"{r['card']}\" on board \"{r['board']}\" in list \"{r['list']}\""
@@ -850,10 +1052,6 @@ async def route_message_stream(
 						increment_counter("state_query_planka_lookups_total")
 					except Exception:
 						pass
-				except asyncio.TimeoutError:
-					logger.warning("Router 0.45: Planka state query timed out for '%s'", _sanitize_for_log(_sq_topic))
-				except Exception as _sq_err:
-					logger.warning("Router 0.45 Planka query failed: %s", _sq_err)
 			# Whether or not the lookup succeeded, fall through to normal LLM path below
 
 		# ── L11 Parallel board-context prefetch ──────────────────────────────
@@ -883,32 +1081,10 @@ async def route_message_stream(
 		# mark-done). Bypasses the chat LLM entirely so verbs that the cloud
 		# model occasionally describes in prose without emitting an ACTION tag
 		# still execute. Falls through to crew/LLM when no intent matches.
-		_clf_timeout = 3.0  # default; overridden below for sort/board phrases
+		_clf_timeout = _structural_timeout(user_text)
 		try:
-			from app.services.intent_router import (
-				classify_structural_intent, dispatch_structural_intent,
-			)
-			# SORT_BOARD classification can include a fast-model call to resolve colloquial
-			# board names (e.g. "aquarium" → "reef tank"). Budget 12s for that path;
-			# keep 3s for all other intents so normal latency is unaffected.
-			_SORT_RE_QUICK = re.compile(
-				# English
-				r'\b(?:sort|reorgani[sz]|restructur|clean\s+up|tidy\s+up|reorder|rearrang'
-				# German
-				r'|sortier|reorganisier|aufr[äa]um|umstrukturieren|neu\s+anordnen'
-				# Spanish / Portuguese
-				r'|reorganiza|reestructura|reestrutura|reordena|arruma'
-				# French
-				r'|r[ée]organise|restructure|r[ée]ordonne'
-				# Russian
-				r'|\u043e\u0442\u0441\u043e\u0440\u0442\u0438\u0440|\u0441\u043e\u0440\u0442\u0438\u0440|\u0440\u0435\u043e\u0440\u0433\u0430\u043d\u0438\u0437|\u0443\u043f\u043e\u0440\u044f\u0434\u043e\u0447|\u0440\u0430\u0437\u043b\u043e\u0436\u0438'
-				r')',
-				re.IGNORECASE,
-			)
-			_clf_timeout = 25.0 if _SORT_RE_QUICK.search(user_text[:200]) else 3.0
-			intent = await asyncio.wait_for(
-				classify_structural_intent(user_text, lang), timeout=_clf_timeout,
-			)
+			from app.services.intent_router import dispatch_structural_intent
+			intent = await _stages.take("structural", lambda: _structural_lookup(user_text, lang))
 		except asyncio.TimeoutError:
 			intent = None
 			logger.warning("Router: intent classifier timeout (>%.0fs) — falling through to LLM", _clf_timeout)
@@ -986,33 +1162,8 @@ async def route_message_stream(
 		# Skip entirely when _force_cloud is already set (bulk save, board reorg).
 		if intent is None and not _force_cloud:
 			try:
-				from app.services.llm import chat as _fast_chat
-				from app.services.intent_router import StructuralIntent, dispatch_structural_intent, _get_planka_snapshot
-				# Fetch board list so the fast model has board names to choose from.
-				_projects = await _get_planka_snapshot()
-				_all_boards = [b for p in (_projects or []) for b in p["boards"]]
-				_board_names_hint = ", ".join((b.get("name") or "") for b in _all_boards) or "none"
-				_sem_prompt = (
-					f"Available Planka boards: {_board_names_hint}\n"
-					"Does the user EXPLICITLY ask to sort, reorganise, tidy, clean up, reorder, or restructure one of those boards?\n"
-					"IMPORTANT: The message must contain a clear intent to REARRANGE or REORGANISE board content.\n"
-					"Talking ABOUT a topic (e.g. fitness, work, cooking) does NOT count — only explicit board manipulation commands count.\n"
-					f"Message: \"{user_text[:300]}\"\n"
-					"If YES (explicit sort/reorganise request): reply SORT_BOARD:<exact board name from the list above>\n"
-					"If NO (conversational message, question, or anything other than explicit board reorganisation): reply NO"
-				)
-				# Use tier="cloud" — "auto" is not a valid tier value and falls to local silently.
-				# The classify prompt is tiny (~100 tokens). Cloud response < 500 ms.
-				# Pass system_override to bypass loading massive personal context files.
-				_sem = await asyncio.wait_for(
-					_fast_chat(
-						_sem_prompt,
-						tier="cloud",
-						system_override="You are a precise board-management intent classifier. Analyze the message and reply strictly in the requested format."
-					),
-					timeout=8.0
-				)
-				_sem = _sem.strip()
+				from app.services.intent_router import StructuralIntent, dispatch_structural_intent
+				_sem, _all_boards = await _stages.take("board_fallback", lambda: _board_fallback_lookup(user_text))
 				if _sem.upper().startswith("SORT_BOARD:"):
 					_board_frag = _sem.split(":", 1)[1].strip().rstrip(".,;!?")
 					if _board_frag:
@@ -1080,6 +1231,8 @@ async def route_message_stream(
 				logger.warning("Router 0.52: semantic fallback timed out — falling through")
 			except Exception as _sf:
 				logger.warning("Router 0.52: semantic fallback failed: %s — falling through", _sf)
+		else:
+			_stages.discard("board_fallback")
 
 		# ── 1. Keyword-based crew routing ────────────────────────────────────
 		# ── 0.55 Board-reorganisation context injection ────────────────────────
@@ -1183,20 +1336,25 @@ async def route_message_stream(
 				logger.warning("Router: board context fetch failed: %s", _sanitize_for_log(_bce))
 
 		# ── 1. Semantic crew routing ─────────────────────────────────────────
-		from app.services.semantic_router import route_semantic
-		_think_mode = user_text.strip().lower().startswith("/think")
 		# If it's a state query, we completely bypass semantic crew routing
 		if _sq_topic:
 			logger.info("Router: bypassing semantic crew routing because state query was detected for topic: '%s'", _sq_topic)
 			routed_crews = []
 		else:
-			routed_crews = await route_semantic(
+			if _ctx_history is not history:
+				# Context was injected above — the speculative run saw plain history.
+				_stages.discard("crews")
+			routed_crews = await _stages.take("crews", lambda: route_semantic(
 				user_text, _ctx_history, channel, think_mode=_think_mode, lang=lang,
-			)
+			))
+		_stages.cancel_all()
+		from app.services.metrics import observe_histogram as _observe_route
+		_observe_route("router_overhead_seconds", _time.perf_counter() - _route_start, mode=_stages.mode)
 		
 		# Reset response budget after semantic routing (which may block while embedding model loads on cold start)
 		# This ensures we always have a full 20s budget for the actual LLM call, preventing false-positive timeouts.
-		_budget = ResponseBudget()
+		_prev_budget, _budget = _budget, ResponseBudget()
+		_budget.classification, _budget.classified_text = _prev_budget.classification, _prev_budget.classified_text
 		_budget_token = budget_ctx.set(_budget)
 
 
@@ -1599,14 +1757,10 @@ async def route_message_stream(
 					# Check cosine similarity to decide labelling (on the rebuttals)
 					import numpy as np
 					from app.services.semantic_router import _cosine as _vec_cosine
-					from app.services.memory import get_embedder
-					_loop = asyncio.get_event_loop()
+					from app.services.embeddings import encode_many
 					_disagree = False
 					try:
-						_vecs = []
-						for _, _draft in _r2_contributions:
-							_vec = await _loop.run_in_executor(None, lambda d=_draft: np.array(get_embedder().encode(d[:500])))
-							_vecs.append(_vec)
+						_vecs = [np.array(v) for v in await encode_many([_draft[:500] for _, _draft in _r2_contributions])]
 						_sims = []
 						for i in range(len(_vecs)):
 							for j in range(i+1, len(_vecs)):
@@ -1738,18 +1892,27 @@ async def route_message_stream(
 			else:
 				await _status(_t.get("status_routing_crew", "Routing to {crew}...").format(crew=crew_id))
 			chunks: list[str] = []
-			async for token in native_crew_engine.run_crew_stream(crew_id, _crew_prompt, history=_ctx_history, force_cloud=True):
-				chunks.append(token)
-				yield token
-			full = rehydrate_response("".join(chunks), get_active_rep_map())
-			# Include attribution in raw_reply so it is stored in DB and
-			# _last_attributed_crew can detect this crew for follow-up continuation.
-			attribution = f"\n\n_(Reasoning by crew {crew_id})_"
-			yield attribution
+			# Idempotent card moves start as their tags close, not after the crew finishes.
+			from app.services.agent_actions import EarlyActionRunner
+			early_runner = EarlyActionRunner()
+			try:
+				async for token in native_crew_engine.run_crew_stream(crew_id, _crew_prompt, history=_ctx_history, force_cloud=True):
+					chunks.append(token)
+					early_runner.feed(token)
+					yield token
+				full = rehydrate_response("".join(chunks), get_active_rep_map())
+				# Include attribution in raw_reply so it is stored in DB and
+				# _last_attributed_crew can detect this crew for follow-up continuation.
+				attribution = f"\n\n_(Reasoning by crew {crew_id})_"
+				yield attribution
+			except (Exception, GeneratorExit, asyncio.CancelledError):
+				early_runner.cancel()
+				raise
 
 			clean, cmds, pending = await bus.commit_reply(
 				channel=channel, raw_reply=full + attribution,
 				model=f"crew:{crew_id}", user_text=user_text, save=save_history,
+				early_actions=await early_runner.results(),
 			)
 			cmds = [c for c in cmds if not c.startswith("__CREW_RUN__:")]
 			if not cmds and _PHANTOM_RE.search(clean[:_MAX_RE_REPLY]):
@@ -1856,9 +2019,16 @@ async def route_message_stream(
 			crew_id = m.group(1).strip().lower()
 			logger.info("Router: Z self-routed '%s...' → crew '%s'", _sanitize_for_log(user_text), _sanitize_for_log(crew_id))
 			r_chunks: list[str] = []
-			async for token in native_crew_engine.run_crew_stream(crew_id, _crew_prompt, history=_ctx_history, force_cloud=True):
-				r_chunks.append(token)
-				yield token
+			from app.services.agent_actions import EarlyActionRunner
+			r_early = EarlyActionRunner()
+			try:
+				async for token in native_crew_engine.run_crew_stream(crew_id, _crew_prompt, history=_ctx_history, force_cloud=True):
+					r_chunks.append(token)
+					r_early.feed(token)
+					yield token
+			except (Exception, GeneratorExit, asyncio.CancelledError):
+				r_early.cancel()
+				raise
 			r_full = rehydrate_response("".join(r_chunks), get_active_rep_map())
 			# Include attribution in raw_reply so it is stored in DB and
 			# _last_attributed_crew can detect this crew for follow-up continuation.
@@ -1866,6 +2036,7 @@ async def route_message_stream(
 			r_clean, r_cmds, r_pending = await bus.commit_reply(
 				channel=channel, raw_reply=r_full + r_attribution,
 				model=f"crew:{crew_id}", user_text=user_text, save=save_history,
+				early_actions=await r_early.results(),
 			)
 			r_cmds = [c for c in r_cmds if not c.startswith("__CREW_RUN__:")]
 			if not r_cmds and _PHANTOM_RE.search(r_clean[:_MAX_RE_REPLY]):
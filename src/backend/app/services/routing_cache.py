@@ -0,0 +1,118 @@
+"""
+Routing Decision Cache
+----------------------
+Short-lived memo of the router's classifier decisions so a re-sent message
+(Telegram coalescing, client retries, the same text on another channel) does
+not pay for every routing LLM call again.
+
+Entries are keyed by decision kind plus a hash of the normalized message
+(NFKC, casefolded, whitespace-collapsed, trailing punctuation dropped) and any
+extra key parts the caller passes (language, think mode). Every entry also
+belongs to a generation:
+
+    (crew_registry.version, planka_mirror.version)
+
+The registry version moves when reload_if_changed() re-loads the crew YAML;
+the mirror version moves when board content changes (a sync that saw
+different lists/cards, or one of our own writes). A new generation drops the
+whole cache, so a decision never outlives the crews or boards it was made
+against. ROUTING_CACHE_TTL_S bounds everything else.
+
+Callers cache only decisions that depend on the message alone — follow-ups
+and answers resolved from conversation history are left to the classifiers.
+"""
+
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WS_RE = re.compile(r"\s+")
+_TRAILING_RE = re.compile(r"[\s.!?…,;:]+$")
+
+
+def normalize_message(text: str) -> str:
+	"""Canonical form under which near-identical messages share a cache entry."""
+	folded = unicodedata.normalize("NFKC", text or "").casefold()
+	return _TRAILING_RE.sub("", _WS_RE.sub(" ", folded).strip())
+
+
+def _generation() -> Optional[tuple[int, int]]:
+	"""Current (registry, mirror) versions; None while crew YAML edits await a reload."""
+	from app.services.crews import crew_registry
+	from app.services.planka_mirror import planka_mirror
+	if crew_registry._mtimes_changed():
+		return None
+	return crew_registry.version, planka_mirror.version
+
+
+class RoutingCache:
+	"""Bounded TTL + LRU map of (kind, message hash, extra) → decision."""
+
+	def __init__(self, max_entries: int) -> None:
+		self.max_entries = max(0, max_entries)
+		self._data: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+		self._generation: tuple[int, int] | None = None
+
+	@staticmethod
+	def _key(kind: str, text: str, extra: tuple[Hashable, ...]) -> tuple:
+		digest = hashlib.sha256(normalize_message(text).encode("utf-8")).hexdigest()
+		return (kind, digest, extra)
+
+	def _sync_generation(self) -> bool:
+		"""Drop every entry when the generation moved; False while a reload is pending."""
+		generation = _generation()
+		if generation != self._generation:
+			if self._data:
+				logger.debug("routing_cache: generation %s → %s, dropping %d entries", self._generation, generation, len(self._data))
+			self._data.clear()
+			self._generation = generation
+		return generation is not None
+
+	def get(self, kind: str, text: str, *extra: Hashable) -> tuple[bool, Any]:
+		"""Return (hit, decision). A cached None is a hit."""
+		from app.services.metrics import increment_counter
+		if settings.ROUTING_CACHE_TTL_S <= 0:
+			return False, None
+		key = self._key(kind, text, extra)
+		entry = self._data.get(key) if self._sync_generation() else None
+		if entry is not None and time.monotonic() - entry[0] < settings.ROUTING_CACHE_TTL_S:
+			self._data.move_to_end(key)
+			increment_counter("routing_cache_lookups_total", kind=kind, outcome="hit")
+			return True, entry[1]
+		if entry is not None:
+			del self._data[key]
+		increment_counter("routing_cache_lookups_total", kind=kind, outcome="miss")
+		return False, None
+
+	def put(self, kind: str, text: str, decision: Any, *extra: Hashable) -> None:
+		if settings.ROUTING_CACHE_TTL_S <= 0 or self.max_entries == 0 or not self._sync_generation():
+			return
+		key = self._key(kind, text, extra)
+		self._data[key] = (time.monotonic(), decision)
+		self._data.move_to_end(key)
+		while len(self._data) > self.max_entries:
+			self._data.popitem(last=False)
+
+	def clear(self) -> None:
+		self._data.clear()
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+
+_cache: Optional[RoutingCache] = None
+
+
+def get_routing_cache() -> RoutingCache:
+	global _cache
+	if _cache is None:
+		_cache = RoutingCache(settings.ROUTING_CACHE_SIZE)
+	return _cache
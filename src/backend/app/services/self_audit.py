@@ -123,8 +123,10 @@ async def extract_audit_claims(hours: int | None = None) -> list[dict[str, Any]]
 # Planka snapshot (lightweight, parallel)
 # ---------------------------------------------------------------------------
 
-async def _get_planka_snapshot() -> dict[str, Any]:
-	"""Fetch a snapshot of all projects, boards, lists, and cards from Planka.
+async def _get_planka_snapshot(force: bool = False) -> dict[str, Any]:
+	"""Build a snapshot of all projects, boards, lists, and cards from the shared Planka mirror.
+
+	force=True re-reads every board first (used before destructive checks).
 
 	Returns:
 	  {
@@ -134,77 +136,39 @@ async def _get_planka_snapshot() -> dict[str, Any]:
 	    "cards":    [{"id", "name", "list_id", "board_name"}],
 	  }
 	"""
-	from app.services.planka_common import get_planka_auth_token
+	from app.services.planka_mirror import get_planka_mirror
 
 	snapshot: dict[str, Any] = {"projects": [], "boards": [], "lists": [], "cards": []}
 	try:
-		token = await get_planka_auth_token()
-		headers = {"Authorization": f"Bearer {token}"}
-		async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
-			resp = await client.get("/api/projects")
-			resp.raise_for_status()
-			projects = resp.json().get("items", [])
-			snapshot["projects"] = [{"id": p["id"], "name": p.get("name", "")} for p in projects]
-
-			if not projects:
-				return snapshot
-
-			proj_details = await asyncio.gather(
-				*[client.get(f"/api/projects/{p['id']}") for p in projects],
-				return_exceptions=True,
-			)
-
-			all_boards: list[dict[str, Any]] = []
-			for proj, det in zip(projects, proj_details):
-				if isinstance(det, BaseException):
-					logger.debug("self_audit snapshot: project %s detail failed: %s", proj["id"], det)
-					continue
-				for b in det.json().get("included", {}).get("boards", []):
-					all_boards.append({
-						"id": b["id"],
-						"name": b.get("name", ""),
-						"project_id": proj["id"],
-						"project_name": proj.get("name", ""),
-					})
-			snapshot["boards"] = all_boards
-
-			if not all_boards:
-				return snapshot
-
-			board_details = await asyncio.gather(
-				*[client.get(f"/api/boards/{b['id']}", params={"included": "lists,cards"}) for b in all_boards],
-				return_exceptions=True,
-			)
-
-			for b_meta, b_det in zip(all_boards, board_details):
-				if isinstance(b_det, BaseException):
-					continue
-				b_data = b_det.json()
-				for lst in b_data.get("included", {}).get("lists", []):
-					snapshot["lists"].append({
-						"id": lst["id"],
-						"name": lst.get("name", ""),
-						"board_id": b_meta["id"],
-						"board_name": b_meta["name"],
-					})
-				# Build per-card task count from included tasks (present when Planka returns them).
-				tasks_in_board = b_data.get("included", {}).get("tasks", [])
-				task_count_by_card: dict[str, int] = defaultdict(int)
-				for t in tasks_in_board:
-					cid = t.get("cardId", "")
-					if cid:
-						task_count_by_card[cid] += 1
-
-				for card in b_data.get("included", {}).get("cards", []):
-					snapshot["cards"].append({
-						"id": card["id"],
-						"name": card.get("name", ""),
-						"description": card.get("description") or "",
-						"has_tasks": task_count_by_card.get(card["id"], 0) > 0,
-						"list_id": card.get("listId", ""),
-						"board_name": b_meta["name"],
-						"created_at": card.get("createdAt", ""),
-					})
+		mirror = await get_planka_mirror(force=force)
+		snapshot["projects"] = [{"id": pid, "name": p.get("name", "")} for pid, p in mirror.projects.items()]
+		for pid, proj in mirror.projects.items():
+			for b in mirror.boards_of(pid):
+				snapshot["boards"].append({
+					"id": b["id"],
+					"name": b.get("name", ""),
+					"project_id": pid,
+					"project_name": proj.get("name", ""),
+				})
+
+		for b_meta in snapshot["boards"]:
+			for lst in mirror.lists_of(b_meta["id"]):
+				snapshot["lists"].append({
+					"id": lst["id"],
+					"name": lst.get("name", ""),
+					"board_id": b_meta["id"],
+					"board_name": b_meta["name"],
+				})
+			for card in mirror.cards_of(b_meta["id"]):
+				snapshot["cards"].append({
+					"id": card["id"],
+					"name": card.get("name", ""),
+					"description": card.get("description") or "",
+					"has_tasks": bool(mirror.tasks_of(card["id"])),
+					"list_id": card.get("listId", ""),
+					"board_name": b_meta["name"],
+					"created_at": card.get("createdAt", ""),
+				})
 	except Exception as e:
 		logger.warning("self_audit: _get_planka_snapshot failed: %s", _sanitize_for_log(e))
 	return snapshot
@@ -402,6 +366,8 @@ async def _delete_planka_card(client: httpx.AsyncClient, card_id: str) -> bool:
 	try:
 		resp = await client.delete(f"/api/cards/{card_id}")
 		resp.raise_for_status()
+		from app.services.planka_mirror import planka_mirror
+		planka_mirror.discard("cards", card_id)
 		return True
 	except Exception as e:
 		logger.error("self_audit: failed to delete card %s: %s", _sanitize_for_log(card_id), _sanitize_for_log(e))
@@ -418,9 +384,10 @@ async def run_redundancy_check() -> list[str]:
 
 	Returns a list of result strings describing what was removed or could not be removed.
 	"""
-	from app.services.planka_common import get_planka_auth_token
+	from app.services.planka_common import planka_client
 
-	snapshot = await _get_planka_snapshot()
+	# Destructive check: read every board fresh rather than trusting the mirror's age window.
+	snapshot = await _get_planka_snapshot(force=True)
 	flags: list[str] = []
 
 	# 3a. Duplicate card names on the same board — auto-delete extras
@@ -448,9 +415,7 @@ async def run_redundancy_check() -> list[str]:
 
 	if deletions:
 		try:
-			token = await get_planka_auth_token()
-			headers = {"Authorization": f"Bearer {token}"}
-			async with httpx.AsyncClient(base_url=settings.PLANKA_BASE_URL, timeout=20.0, headers=headers) as client:
+			async with planka_client(timeout=20.0) as client:
 				for board_name, canonical_name, dupes in deletions:
 					removed: list[str] = []
 					failed: list[str] = []
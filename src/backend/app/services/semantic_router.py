@@ -1,7 +1,7 @@
 """Semantic crew router — cosine similarity over all-MiniLM-L6-v2 profile vectors.
 
-Replaces keyword-Jaccard crew selection.  The embedder is shared with
-services/memory.py via get_embedder() — no second model instance is loaded.
+Replaces keyword-Jaccard crew selection.  Embeddings go through the shared
+micro-batcher in services/embeddings.py — no second model instance is loaded.
 """
 import asyncio
 import logging
@@ -169,6 +169,31 @@ async def route_semantic(
 		lang:       User's configured locale — accepted for API compat, unused
 		            for routing (embeddings are language-agnostic).
 	"""
+	from app.services.crews import crew_registry
+	from app.services.routing_cache import get_routing_cache
+
+	await crew_registry.reload_if_changed()
+	# Follow-ups lean on the active crew session and history — never cached.
+	cacheable = not _has_followup_signal(message)
+	cache = get_routing_cache()
+	if cacheable:
+		hit, cached = cache.get("crews", message, think_mode)
+		if hit:
+			logger.debug("semantic_router: routing cache hit → %s", cached)
+			return list(cached)
+	crews = await _route_semantic(message, history, channel, think_mode=think_mode)
+	if cacheable:
+		cache.put("crews", message, tuple(crews), think_mode)
+	return crews
+
+
+async def _route_semantic(
+	message: str,
+	history: list,
+	channel: Optional[str],
+	*,
+	think_mode: bool = False,
+) -> list[str]:
 	# Detect /think prefix — overrides think_mode if present.
 	_msg = message
 	if _msg.strip().lower().startswith("/think"):
@@ -184,8 +209,6 @@ async def route_semantic(
 		is_system_action_or_operational_query,
 	)
 
-	await crew_registry.reload_if_changed()
-
 	# ── Guard bypasses ──────────────────────────────────────────────────────
 	if _SYSTEM_ACTION_RE.search(message[:500]):
 		logger.debug("semantic_router: system action — Z-direct")
@@ -193,6 +216,8 @@ async def route_semantic(
 	if _OPERATIONAL_QUERY_RE.search(message[:2000]):
 		logger.debug("semantic_router: operational query — Z-direct")
 		return []
+	from app.services.message_classifier import get_shared_classification
+	shared = await get_shared_classification(message)
 	if await is_system_action_or_operational_query(message):
 		logger.debug("semantic_router: system action or operational query detected (reasoning) — Z-direct")
 		return []
@@ -216,69 +241,77 @@ async def route_semantic(
 	routable_ids = {c.id for c in active_crews}
 
 	# ── L2: Primary Cloud LLM Routing ────────────────────────────────────────
-	logger.info("semantic_router: evaluating user intent using primary Cloud LLM router")
-	try:
-		from app.services.llm import chat as cloud_chat
+	# Inside a routed request the crew choice comes from the shared multi-head
+	# classification; a failed classification goes straight to the local fallback.
+	if shared is not None:
+		if shared.crews:
+			logger.info("semantic_router: shared classification → %s", shared.crews)
+			return shared.crews
+		if shared.crews is not None:
+			logger.info("semantic_router: shared classification chose no crew (Z-direct)")
+			return []
+		logger.info("semantic_router: no crew decision in shared classification — local fallback")
+	else:
+		logger.info("semantic_router: evaluating user intent using primary Cloud LLM router")
+		try:
+			from app.services.llm import chat as cloud_chat
 		
-		# Build a detailed, clean crew manifest
-		crew_manifest = []
-		for crew in active_crews:
-			kws = ", ".join(crew.keywords or [])
-			crew_manifest.append(f"- ID: {crew.id}\n  Name: {crew.name}\n  Description: {crew.description}\n  Keywords: {kws}")
+			# Build a detailed, clean crew manifest
+			crew_manifest = []
+			for crew in active_crews:
+				kws = ", ".join(crew.keywords or [])
+				crew_manifest.append(f"- ID: {crew.id}\n  Name: {crew.name}\n  Description: {crew.description}\n  Keywords: {kws}")
 		
-		crews_list_str = "\n\n".join(crew_manifest)
+			crews_list_str = "\n\n".join(crew_manifest)
 		
-		routing_prompt = (
-			f"User Message: \"{_msg[:1000]}\"\n\n"
-			f"Available Expert Crews:\n{crews_list_str}\n\n"
-			"Your task is to determine if this message should be handled by one or more specialized expert crews. "
-			"Reply with a comma-separated list of the expert crew IDs that are highly relevant to answering the user's message. "
-			"Choose at most 3 crews. Order them with the most important crew first. "
-			"If the message is purely general conversation (greetings, simple thanks, small talk) and does not touch any of the specialized crew domains, reply with 'NO'."
-		)
+			routing_prompt = (
+				f"User Message: \"{_msg[:1000]}\"\n\n"
+				f"Available Expert Crews:\n{crews_list_str}\n\n"
+				"Your task is to determine if this message should be handled by one or more specialized expert crews. "
+				"Reply with a comma-separated list of the expert crew IDs that are highly relevant to answering the user's message. "
+				"Choose at most 3 crews. Order them with the most important crew first. "
+				"If the message is purely general conversation (greetings, simple thanks, small talk) and does not touch any of the specialized crew domains, reply with 'NO'."
+			)
 		
-		# Execute the routing decision on cloud LLM with a 5.0 second timeout
-		decision = await asyncio.wait_for(
-			cloud_chat(
-				routing_prompt,
-				tier="cloud",
-				system_override="You are openZero's master router. Analyze the user's query and return a comma-separated list of relevant crew IDs, or 'NO'."
-			),
-			timeout=5.0
-		)
+			# Execute the routing decision on cloud LLM with a 5.0 second timeout
+			decision = await asyncio.wait_for(
+				cloud_chat(
+					routing_prompt,
+					tier="cloud",
+					system_override="You are openZero's master router. Analyze the user's query and return a comma-separated list of relevant crew IDs, or 'NO'."
+				),
+				timeout=5.0
+			)
 		
-		decision = decision.strip()
-		logger.info("semantic_router: cloud routing moderator returned '%s'", decision[:50])
+			decision = decision.strip()
+			logger.info("semantic_router: cloud routing moderator returned '%s'", decision[:50])
 		
-		if not (decision.upper().startswith("NO") or decision.upper().startswith("'NO")):
-			raw_list = re.split(r'[,|]', decision)
-			selected = [re.sub(r'[^a-z0-9_]', '', c.strip().lower()) for c in raw_list]
-			selected = [c for c in selected if c]
-			valid_selected = [c for c in selected if c in routable_ids]
+			if not (decision.upper().startswith("NO") or decision.upper().startswith("'NO")):
+				raw_list = re.split(r'[,|]', decision)
+				selected = [re.sub(r'[^a-z0-9_]', '', c.strip().lower()) for c in raw_list]
+				selected = [c for c in selected if c]
+				valid_selected = [c for c in selected if c in routable_ids]
 			
-			if valid_selected:
-				logger.info("semantic_router: cloud routing success → %s", valid_selected)
-				return valid_selected
-		else:
-			logger.info("semantic_router: cloud router decided 'NO' (Z-direct)")
-			return []
+				if valid_selected:
+					logger.info("semantic_router: cloud routing success → %s", valid_selected)
+					return valid_selected
+			else:
+				logger.info("semantic_router: cloud router decided 'NO' (Z-direct)")
+				return []
 			
-	except Exception as _e:
-		logger.warning("semantic_router: primary cloud router failed/timed out (%s) — falling back to local similarity check", _e)
+		except Exception as _e:
+			logger.warning("semantic_router: primary cloud router failed/timed out (%s) — falling back to local similarity check", _e)
 
 	# ── L3: Local Embedding Fallback ──────────────────────────────────────────
 	logger.info("semantic_router: executing local embedding fallback check")
-	from app.services.memory import get_embedder
+	from app.services.embeddings import encode
 	profile_vectors: dict[str, np.ndarray] = getattr(crew_registry, "_profile_vectors", {})
 	if not profile_vectors:
 		logger.warning("semantic_router: no profile vectors — skipping local embedding check")
 		scores = []
 	else:
-		loop = asyncio.get_event_loop()
 		try:
-			q_vec: np.ndarray = await loop.run_in_executor(
-				None, lambda: np.array(get_embedder().encode(_msg[:1000]))
-			)
+			q_vec: np.ndarray = np.array(await encode(_msg[:1000]))
 			scores = [
 				(cid, _cosine(q_vec, vec))
 				for cid, vec in profile_vectors.items()
@@ -22,7 +22,6 @@ from datetime import datetime, timedelta, timezone
 
 import httpx
 
-from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -57,13 +56,8 @@ def _week_card_name(now: datetime) -> str:
 
 
 async def _planka_client():
-	from app.services.planka_common import get_planka_auth_token
-	token = await get_planka_auth_token()
-	return httpx.AsyncClient(
-		base_url=settings.PLANKA_BASE_URL,
-		headers={"Authorization": f"Bearer {token}"},
-		timeout=20.0,
-	)
+	from app.services.planka_common import planka_client
+	return planka_client(timeout=20.0)
 
 
 async def _find_nutrition_board(client: httpx.AsyncClient) -> tuple[str | None, str | None]:
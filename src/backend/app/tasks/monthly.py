@@ -27,33 +27,20 @@ async def monthly_review():
 			await crew_registry.load()
 			active_crews = crew_registry.list_active()
 			if active_crews:
-				from app.services.crews_native import native_crew_engine
-				import re
-				_ACTION_STRIP_RE = re.compile(r'\[ACTION:[^\]]*\]', re.IGNORECASE)
+				from app.services.crew_prefetch import run_briefing_crews
 
-				async def _get_crew_insight(crew_config):
-					try:
-						crew_prompt = (
-							f"You are the {crew_config.name} crew. We are preparing the monthly review for the operator.\n"
-							f"Here is the month's raw data:\n\n"
-							f"ACTIVITY:\n{activity_block}\n\n"
-							f"PROJECTS:\n{tree_block}\n\n"
-							f"Based on your specialized domain, review this data and generate a single short paragraph (under 40 words) with your top insight, recommendation, or warning for this month. "
-							f"Be extremely concise. Write only the paragraph. Do not introduce yourself."
-						)
-						res = await native_crew_engine.run_crew(crew_config.id, crew_prompt)
-						res_clean = _ACTION_STRIP_RE.sub("", res).strip()
-						if res_clean:
-							return f"**{crew_config.name}**: {res_clean}"
-					except Exception as ex:
-						logger.warning("Failed to get monthly insight from crew %s: %s", crew_config.id, ex)
-					return None
+				def _crew_prompt(crew_config):
+					return (
+						f"You are the {crew_config.name} crew. We are preparing the monthly review for the operator.\n"
+						f"Here is the month's raw data:\n\n"
+						f"ACTIVITY:\n{activity_block}\n\n"
+						f"PROJECTS:\n{tree_block}\n\n"
+						f"Based on your specialized domain, review this data and generate a single short paragraph (under 40 words) with your top insight, recommendation, or warning for this month. "
+						f"Be extremely concise. Write only the paragraph. Do not introduce yourself."
+					)
 
-				insights_results = await asyncio.wait_for(
-					asyncio.gather(*[_get_crew_insight(c) for c in active_crews]),
-					timeout=90.0
-				)
-				crew_insights = [ins for ins in insights_results if ins]
+				insights = await run_briefing_crews(active_crews, _crew_prompt, briefing="monthly")
+				crew_insights = [f"**{c.name}**: {insights[c.id]}" for c in active_crews if c.id in insights]
 		except Exception as e:
 			logger.warning("Gathering active crew insights for monthly review failed: %s", e)
 
@@ -253,37 +253,21 @@ async def morning_briefing():
 		# Coordinate active crews to check in and generate domain-specific insights
 		dynamic_insights = {}
 		if active_crews:
-			from app.services.crews_native import native_crew_engine
-			import re
-			_ACTION_STRIP_RE = re.compile(r'\[ACTION:[^\]]*\]', re.IGNORECASE)
-
-			async def _get_crew_insight(crew_config):
-				try:
-					crew_prompt = (
-						f"You are the {crew_config.name} crew. We are preparing the daily morning briefing for the operator.\n"
-						f"Here is the day's raw data:\n\n{skeleton}\n\n"
-						f"Based on your specialized domain, review this data and generate a single short paragraph (under 40 words) with your top insight, recommendation, or warning for today. "
-						f"STRICT: Do NOT invent background details, hypothetical scenarios, or context not present in the raw data (e.g. do not invent status notes or user habits like cooking rice). "
-						f"Be extremely concise. Write only the paragraph. Do not introduce yourself, and do not say 'Here is my insight'."
-					)
-					res = await native_crew_engine.run_crew(crew_config.id, crew_prompt)
-					res_clean = _ACTION_STRIP_RE.sub("", res).strip()
-					if res_clean:
-						return crew_config.id, res_clean
-				except Exception as ex:
-					logger.warning("Failed to get briefing insight from crew %s: %s", crew_config.id, ex)
-				return crew_config.id, None
+			from app.services.crew_prefetch import run_briefing_crews
+
+			def _crew_prompt(crew_config):
+				return (
+					f"You are the {crew_config.name} crew. We are preparing the daily morning briefing for the operator.\n"
+					f"Here is the day's raw data:\n\n{skeleton}\n\n"
+					f"Based on your specialized domain, review this data and generate a single short paragraph (under 40 words) with your top insight, recommendation, or warning for today. "
+					f"STRICT: Do NOT invent background details, hypothetical scenarios, or context not present in the raw data (e.g. do not invent status notes or user habits like cooking rice). "
+					f"Be extremely concise. Write only the paragraph. Do not introduce yourself, and do not say 'Here is my insight'."
+				)
 
 			try:
-				insights_results = await asyncio.wait_for(
-					asyncio.gather(*[_get_crew_insight(c) for c in active_crews]),
-					timeout=90.0
-				)
-				for cid, ins in insights_results:
-					if ins:
-						dynamic_insights[cid] = ins
+				dynamic_insights = await run_briefing_crews(active_crews, _crew_prompt, briefing="morning")
 			except Exception as e:
-				logger.warning("Gathering active crew insights for morning briefing failed/timed out: %s", e)
+				logger.warning("Gathering active crew insights for morning briefing failed: %s", e)
 
 		# Build unified Crew Reasoning block
 		crew_blocks = []
@@ -66,11 +66,10 @@ def _nudge_config() -> dict:
 		return {}
 
 
-async def _redis():
-	import redis.asyncio as aioredis
-	from app.config import settings
-	url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-	return aioredis.from_url(url, password=settings.REDIS_PASSWORD or None, decode_responses=True)
+def _redis():
+	"""Shared pooled Redis client (services/redis_pool.py) as an `async with` block."""
+	from app.services.redis_pool import redis_client
+	return redis_client()
 
 
 async def _last_used_channel() -> str:
@@ -185,7 +184,7 @@ async def check_nudges() -> None:
 
 	try:
 		from app.services.coach_earning import check_earning
-		async with await _redis() as r:
+		async with _redis() as r:
 			for crew_id in ("recipe", "fitness"):
 				earned = await check_earning(crew_id)
 				if not earned:
@@ -278,7 +277,7 @@ async def check_stale_cards() -> None:
 	channel = await _last_used_channel()
 
 	try:
-		async with await _redis() as r:
+		async with _redis() as r:
 			for card in priority_cards[:5]:  # cap at 5 nudges per run
 				card_id = card.get("id", "")
 				if not card_id:
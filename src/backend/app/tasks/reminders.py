@@ -20,10 +20,9 @@ async def check_reminders() -> None:
 	try:
 		from datetime import datetime
 		from sqlalchemy import select
-		import redis.asyncio as aioredis
 
-		from app.config import settings
 		from app.models.db import AsyncSessionLocal, RecurringReminder
+		from app.services.redis_pool import redis_client
 		from app.services.timezone import get_current_timezone
 
 		tz_str = await get_current_timezone()
@@ -46,8 +45,7 @@ async def check_reminders() -> None:
 		if not reminders:
 			return
 
-		redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-		async with aioredis.from_url(redis_url, password=settings.REDIS_PASSWORD or None, decode_responses=True) as r:
+		async with redis_client() as r:
 			for reminder in reminders:
 				if reminder.hour != current_hour or reminder.minute != current_minute:
 					continue
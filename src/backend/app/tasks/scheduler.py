@@ -7,6 +7,7 @@ import pytz
 import logging
 import re
 import subprocess
+import time as _time
 import httpx
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,45 @@ def _log_metrics_summary() -> None:
 	except Exception as _e:
 		logger.warning("_log_metrics_summary: failed: %s", _e)
 
+# ---------------------------------------------------------------------------
+# Job duration metrics
+# ---------------------------------------------------------------------------
+# scheduler_job_seconds{job} / scheduler_job_runs_total{job,result} for every job,
+# including crews and custom tasks added at runtime: timed from submission to the
+# executed/error event, so coroutine jobs are measured until they finish.
+_JOB_SECONDS_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+_job_started: dict[str, list[float]] = {}
+_job_metrics_registered = False
+
+
+def _on_job_event(event) -> None:
+	from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+	from app.services.metrics import dec_gauge, inc_gauge, increment_counter, observe_histogram
+	job = event.job_id
+	if event.code == EVENT_JOB_SUBMITTED:
+		_job_started.setdefault(job, []).append(_time.perf_counter())
+		inc_gauge("scheduler_jobs_running")
+		return
+	if event.code == EVENT_JOB_MISSED:
+		increment_counter("scheduler_job_runs_total", job=job, result="missed")
+		return
+	increment_counter("scheduler_job_runs_total", job=job, result="error" if event.code == EVENT_JOB_ERROR else "ok")
+	started = _job_started.get(job)
+	if started:
+		observe_histogram("scheduler_job_seconds", _time.perf_counter() - started.pop(0), buckets=_JOB_SECONDS_BUCKETS, job=job)
+		if not started:
+			del _job_started[job]
+		dec_gauge("scheduler_jobs_running")
+
+
+def _register_job_metrics() -> None:
+	global _job_metrics_registered
+	if _job_metrics_registered:
+		return
+	from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+	scheduler.add_listener(_on_job_event, EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+	_job_metrics_registered = True
+
 # ---------------------------------------------------------------------------
 # Subprocess security allowlist
 # ---------------------------------------------------------------------------
@@ -263,14 +303,23 @@ async def start_scheduler():
 		replace_existing=True,
 	)
 
-	# LLM Metrics Cleanup — Keep only last 2000 rows (every 24 hours)
+	# LLM Metrics Cleanup — prune raw rows (rollups keep the history) every 6 hours
 	scheduler.add_job(
 		cleanup_llm_metrics,
-		IntervalTrigger(hours=24),
+		IntervalTrigger(hours=6),
 		id="cleanup_llm_metrics",
 		replace_existing=True,
 	)
 
+	# Crew Diary Compaction — LLM-compress diary days whose raw log passed the threshold
+	from app.services.crew_memory import compact_crew_diaries
+	scheduler.add_job(
+		compact_crew_diaries,
+		IntervalTrigger(minutes=max(1, settings.CREW_DIARY_COMPACT_INTERVAL_M)),
+		id="crew_diary_compact",
+		replace_existing=True,
+	)
+
 	# DNS Watchdog — test Pi-hole DNS every 5 minutes, alert + auto-fix on failure
 	scheduler.add_job(
 		check_pihole_dns,
@@ -423,6 +472,7 @@ async def start_scheduler():
 				replace_existing=True,
 			)
 
+	_register_job_metrics()
 	scheduler.start()
 	logger.info("Z: Missions scheduled. Morning Briefing set to %02d:%02d %s", brief_hour, brief_min, user_tz_str)
 
@@ -451,34 +501,38 @@ async def cleanup_global_messages():
 		async with AsyncSessionLocal() as session:
 			await session.execute(text("""
 				DELETE FROM global_messages
-				WHERE id NOT IN (
-					SELECT id FROM global_messages
-					ORDER BY created_at DESC
-					LIMIT 500
+				WHERE (created_at, id) < (
+					SELECT created_at, id FROM global_messages
+					ORDER BY created_at DESC, id DESC
+					OFFSET 499 LIMIT 1
 				)
 			"""))
 			await session.commit()
-			logger.info("Cleanup: trimmed GlobalMessage table to 500 rows.")
+		from app.models.history_buffer import invalidate
+		invalidate()
+		logger.info("Cleanup: trimmed GlobalMessage table to 500 rows.")
 	except Exception as e:
 		logger.error("cleanup_global_messages failed: %s", e)
 
 
 async def cleanup_llm_metrics():
-	"""Keep only the most recent 2000 LLMMetric rows."""
-	from app.models.db import AsyncSessionLocal
-	from sqlalchemy import text
+	"""Prune raw llm_metrics rows past LLM_METRICS_RAW_RETENTION_H and rollups older than a year.
+
+	The dashboard reads the hourly rollups (services/llm_metrics.py), so raw rows
+	are only kept for recent debugging.
+	"""
+	from app.models.db import AsyncSessionLocal, LLMMetric, LLMMetricRollup
+	from sqlalchemy import delete as sa_delete
+	import datetime
+	now = datetime.datetime.utcnow()
 	try:
 		async with AsyncSessionLocal() as session:
-			await session.execute(text("""
-				DELETE FROM llm_metrics
-				WHERE id NOT IN (
-					SELECT id FROM llm_metrics
-					ORDER BY created_at DESC
-					LIMIT 2000
-				)
-			"""))
+			raw = await session.execute(
+				sa_delete(LLMMetric).where(LLMMetric.created_at < now - datetime.timedelta(hours=settings.LLM_METRICS_RAW_RETENTION_H))
+			)
+			await session.execute(sa_delete(LLMMetricRollup).where(LLMMetricRollup.hour < now - datetime.timedelta(days=366)))
 			await session.commit()
-			logger.info("Cleanup: trimmed llm_metrics table to 2000 rows.")
+			logger.info("Cleanup: deleted %d raw llm_metrics rows.", raw.rowcount)
 	except Exception as e:
 		logger.error("cleanup_llm_metrics failed: %s", e)
 
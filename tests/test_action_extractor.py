@@ -0,0 +1,149 @@
+"""
+Tests for the action extractor tiers (services/action_extractor.py): Tier A tool
+calls and Tier B JSON replies are rendered back into canonical tags, neither
+tier triggers a repair round-trip, and detect_tier() probes endpoints A → B → C.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+import pytest
+
+from app.services import action_extractor as ax
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+	ax.reset_tier_cache()
+
+	async def _no_repair(raw_tag):
+		raise AssertionError("structured tiers must not repair")
+
+	cfg = types.SimpleNamespace(LLM_TOOL_CALLING_TIER="auto", cloud_configured=True)
+	with patch.object(ax, "_attempt_repair", _no_repair), patch.dict(sys.modules, {"app.config": types.SimpleNamespace(settings=cfg)}):
+		yield cfg
+	ax.reset_tier_cache()
+
+
+def _call(name, args):
+	return {"id": "c1", "function": {"name": name, "arguments": args if isinstance(args, str) else json.dumps(args)}}
+
+
+def test_to_tag_uses_documented_field_order():
+	action = ax.ParsedAction("CREATE_TASK", {"TITLE": "Buy milk | oat", "DESCRIPTION": "2 l [organic]", "EXTRA": "x", "BOARD": "Shopping", "LIST": ""})
+	assert action.to_tag() == "[ACTION: CREATE_TASK | BOARD: Shopping | TITLE: Buy milk / oat | DESCRIPTION: 2 l [organic) | EXTRA: x]"
+	assert ax.ParsedAction("MARK_DONE", {"CARD": "Probe"}).to_tag() == "[ACTION: MARK_DONE | CARD: Probe]"
+
+
+def test_native_tool_extractor():
+	calls = [
+		_call("action", {"type": "create_task", "params": {"title": "Call dentist", "board": "Operator Board"}}),
+		_call("action", {"type": "LAUNCH_ROCKET", "params": {}}),
+		_call("action", "{not json"),
+		_call("web_search", {"query": "x"}),
+	]
+	reply = "Adding it now.\n[ACTION: MARK_DONE | CARD: Laundry]"
+	clean, actions = asyncio.run(ax.NativeToolExtractor().extract(reply, calls))
+	assert clean == "Adding it now."
+	assert [a.action_type for a in actions] == ["MARK_DONE", "CREATE_TASK"]
+	assert actions[1].raw_tag == "[ACTION: CREATE_TASK | BOARD: Operator Board | TITLE: Call dentist]"
+	assert ax.render_reply(clean, actions[1:]) == "Adding it now.\n[ACTION: CREATE_TASK | BOARD: Operator Board | TITLE: Call dentist]"
+
+
+def test_json_schema_extractor():
+	payload = json.dumps({"reply": "On it.", "actions": [{"type": "ROUTE", "params": {"CREW": "chef"}}, {"type": "??", "params": {}}]})
+	clean, actions = asyncio.run(ax.JsonSchemaExtractor().extract(payload))
+	assert clean == "On it." and [a.raw_tag for a in actions] == ["[ACTION: ROUTE | CREW: chef]"]
+
+	# Cut off at max_tokens: the reply text so far survives, without actions.
+	assert ax.decode_json_reply('{"reply": "Here is \\"the\\" plan, step') == ('Here is "the" plan, step', [])
+
+	# Not JSON at all: plain tag parsing, still no repair.
+	clean, actions = asyncio.run(ax.JsonSchemaExtractor().extract("Sure.\n[ACTION: ROUTE | CREW: legal]\n[ACTION: MARK_DONE | CARD"))
+	assert clean.startswith("Sure.") and [a.action_type for a in actions] == ["ROUTE"]
+
+
+def _local_peers(*urls):
+	return patch("app.services.llm_peers.get_capable_peers", lambda: [types.SimpleNamespace(url=u) for u in urls])
+
+
+def test_detect_tier_probes_in_order(_clean_state):
+	results = {"cloud": {"tools": True}, "http://vps:8081": {"tools": False, "json": True}}
+	probed = []
+
+	async def _tools(endpoint):
+		probed.append((endpoint, "tools"))
+		return results[endpoint]["tools"]
+
+	async def _json(endpoint):
+		probed.append((endpoint, "json"))
+		return results[endpoint]["json"]
+
+	with (
+		patch.object(ax, "_probe_endpoint", lambda target: target),
+		patch.object(ax, "_supports_tools", _tools),
+		patch.object(ax, "_supports_json_schema", _json),
+		_local_peers("http://vps:8081"),
+	):
+		assert ax.get_tier("cloud") == "C"	# before the startup probe
+		assert asyncio.run(ax.probe_tiers()) == {"cloud": "A", "http://vps:8081": "B"}
+		assert probed.count(("cloud", "json")) == 0
+		assert isinstance(ax.get_extractor(target="cloud"), ax.NativeToolExtractor)
+		assert isinstance(ax.get_extractor(target="local"), ax.JsonSchemaExtractor)
+		assert isinstance(ax.get_extractor(streaming=True, target="local"), ax.TaggedTextExtractor)
+
+	ax.reset_tier_cache()
+	_clean_state.LLM_TOOL_CALLING_TIER = "tagged"
+	assert asyncio.run(ax.detect_tier("cloud")) == "C"
+
+
+def test_local_tier_needs_every_peer_probed_and_agreeing():
+	tiers = {"http://vps:8081": "A", "http://mac:11434": "A", "http://ollama:11434": "C"}
+	probed = []
+
+	async def _detect(target):
+		probed.append(target)
+		ax._TIER_CACHE[target] = tiers[target]
+		return tiers[target]
+
+	async def _main():
+		first = ax.get_tier("local")		# mac not probed yet: Tier C, probe started
+		await asyncio.sleep(0.01)
+		return first, ax.get_tier("local")
+
+	ax._TIER_CACHE["http://vps:8081"] = "A"
+	with patch.object(ax, "detect_tier", _detect):
+		with _local_peers("http://vps:8081", "http://mac:11434"):
+			assert asyncio.run(_main()) == ("C", "A")
+		assert probed == ["http://mac:11434"]
+		# A later-discovered peer without tool calling drops local back to tags.
+		with _local_peers("http://vps:8081", "http://mac:11434", "http://ollama:11434"):
+			assert asyncio.run(_main()) == ("C", "C")
+		# Once it leaves, its tier is forgotten so a restart is probed again.
+		with _local_peers("http://vps:8081"):
+			assert ax.get_tier("local") == "A"
+	assert "http://ollama:11434" not in ax._TIER_CACHE and "http://mac:11434" not in ax._TIER_CACHE
+
+
+def test_probe_timeout_pins_tier_c():
+	class _Client:
+		async def post(self, url, headers=None, json=None):
+			await asyncio.sleep(1)
+
+	@contextlib.asynccontextmanager
+	async def _llm_client(url):
+		yield _Client()
+
+	with (
+		patch.dict(sys.modules, {"app.services.llm_http": types.SimpleNamespace(llm_client=_llm_client)}),
+		patch.object(ax, "_probe_endpoint", lambda target: ("http://llm/v1/chat/completions", {}, {"model": "m"})),
+		patch.object(ax, "_PROBE_TIMEOUT_S", 0.01),
+	):
+		assert asyncio.run(ax.detect_tier("cloud")) == "C"
@@ -0,0 +1,125 @@
+"""
+Tests for the briefing crew prefetch (services/crew_prefetch.py): shared crew
+context is fetched once per run, the crews run under the concurrency limit
+with the snapshot bound, and a slow crew only loses its own insight.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+import pytest
+
+from app.services import crew_prefetch, metrics
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry():
+	with (
+		patch.object(metrics, "_COUNTERS", metrics.defaultdict(int)),
+		patch.object(metrics, "_HISTOGRAMS", {}),
+	):
+		yield
+
+
+def _crew(crew_id):
+	return types.SimpleNamespace(id=crew_id, name=crew_id.title())
+
+
+def test_gather_fetches_shared_context_once():
+	calls: list = []
+
+	async def _personality():
+		calls.append("personality")
+		return "You are Z."
+
+	async def _history(limit):
+		calls.append(("history", limit))
+		return [{"role": "user", "content": "hi"}]
+
+	async def _memory(crew_ids):
+		calls.append(("memory", tuple(crew_ids)))
+		return {c: f"diary {c}" for c in crew_ids}
+
+	async def _board(crew_id):
+		calls.append(("board", crew_id))
+		if crew_id == "scrum":
+			raise RuntimeError("planka down")
+		return f"board {crew_id}"
+
+	async def _refresh():
+		calls.append("refresh")
+
+	stubs = {
+		"app.models.db": types.SimpleNamespace(get_global_history=_history),
+		"app.services.crew_memory": types.SimpleNamespace(get_crew_board_work_context=_board, get_crew_memory_contexts=_memory),
+		"app.services.llm": types.SimpleNamespace(get_agent_personality=_personality),
+		"app.services.personal_context": types.SimpleNamespace(
+			get_personal_context_for_prompt=lambda: "ME+HEALTH",
+			get_personal_context_for_prompt_no_health=lambda: "ME",
+			refresh_personal_context=_refresh,
+		),
+		"app.services.agent_context": types.SimpleNamespace(get_agent_skills_for_prompt=lambda: "SKILLS", refresh_agent_context=_refresh),
+	}
+	with patch.dict(sys.modules, stubs):
+		snapshot = asyncio.run(crew_prefetch.gather_crew_context(["focus", "nutrition", "scrum", "focus"]))
+
+	assert sorted(map(str, calls)) == sorted(map(str, [
+		"personality", ("history", 20), ("memory", ("focus", "chef", "scrum")),
+		("board", "focus"), ("board", "chef"), ("board", "scrum"),
+	]))
+	assert snapshot.covers("chef") and not snapshot.covers("nutrition")
+	assert dict(snapshot.board_work) == {"focus": "board focus", "chef": "board chef", "scrum": ""}
+	assert snapshot.crew_context(True) == "ME+HEALTH\n\nSKILLS" and snapshot.personal(False) == "ME"
+	assert snapshot.history == ({"role": "user", "content": "hi"},)
+	with pytest.raises(TypeError):
+		snapshot.crew_memory["focus"] = "changed"
+
+
+def test_run_briefing_crews_limits_concurrency_and_keeps_finished_insights():
+	snapshot = crew_prefetch.CrewContextSnapshot(personality="P")
+	seen: list = []
+	state = {"active": 0, "max": 0}
+
+	class _Engine:
+		async def run_crew(self, crew_id, prompt):
+			seen.append((crew_id, prompt, crew_prefetch.current_crew_context()))
+			state["active"] += 1
+			state["max"] = max(state["max"], state["active"])
+			try:
+				if crew_id == "slow":
+					await asyncio.sleep(10)
+				if crew_id == "broken":
+					raise RuntimeError("llm down")
+				await asyncio.sleep(0.01)
+				return "" if crew_id == "quiet" else f"Insight {crew_id} [ACTION: CREATE_TASK | NAME: x]"
+			finally:
+				state["active"] -= 1
+
+	async def _gather(crew_ids):
+		assert list(crew_ids) == ["health", "slow", "broken", "quiet", "focus"]
+		return snapshot
+
+	cfg = types.SimpleNamespace(BRIEFING_CREW_CONCURRENCY=2, BRIEFING_CREW_TIMEOUT_S=0.2)
+	crews = [_crew(c) for c in ("health", "slow", "broken", "quiet", "focus")]
+	with (
+		patch.dict(sys.modules, {
+			"app.config": types.SimpleNamespace(settings=cfg),
+			"app.services.crews_native": types.SimpleNamespace(native_crew_engine=_Engine()),
+		}),
+		patch.object(crew_prefetch, "gather_crew_context", _gather),
+	):
+		insights = asyncio.run(crew_prefetch.run_briefing_crews(crews, lambda c: f"brief {c.id}", briefing="morning"))
+
+	assert insights == {"health": "Insight health", "focus": "Insight focus"}
+	assert state["max"] == 2
+	assert all(s is snapshot for _, _, s in seen) and ("focus", "brief focus", snapshot) in seen
+	assert crew_prefetch.current_crew_context() is None
+	assert metrics.get_counter("briefing_crew_runs_total", briefing="morning", result="ok") == 3
+	assert metrics.get_counter("briefing_crew_runs_total", briefing="morning", result="error") == 1
+	assert metrics.get_counter("briefing_crew_runs_total", briefing="morning", result="timeout") == 1
+	assert metrics.get_histogram("briefing_crew_seconds", briefing="morning", crew="slow")["count"] == 1
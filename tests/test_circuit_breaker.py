@@ -0,0 +1,146 @@
+"""
+Tests for the local-LLM circuit breaker's in-process mirror
+(common/response_budget.py) on top of the shared Redis client.
+
+Redis is replaced by a small in-memory fake; only round-trips are counted.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.common import response_budget
+from app.services import redis_pool
+
+
+class _FakePipeline:
+	def __init__(self, redis):
+		self.redis = redis
+		self.ops = []
+
+	def __getattr__(self, name):
+		return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+	async def execute(self):
+		self.redis.round_trips += 1
+		return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class _FakePubSub:
+	def __init__(self, messages):
+		self.messages = messages
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		return False
+
+	async def subscribe(self, channel):
+		pass
+
+	async def listen(self):
+		for message in self.messages:
+			yield message
+		await asyncio.Event().wait()
+
+
+class _FakeRedis:
+	def __init__(self, messages=()):
+		self.data: dict = {}
+		self.ttls: dict = {}
+		self.published: list = []
+		self.round_trips = 0
+		self.messages = list(messages)
+
+	def pipeline(self, transaction=True):
+		return _FakePipeline(self)
+
+	def pubsub(self):
+		return _FakePubSub(self.messages)
+
+	async def get(self, key):
+		return self.data.get(key)
+
+	async def pttl(self, key):
+		return self.ttls.get(key, -1) * 1000 if key in self.data else -2
+
+	async def incr(self, key):
+		self.data[key] = int(self.data.get(key, 0)) + 1
+		return self.data[key]
+
+	async def expire(self, key, seconds):
+		self.ttls[key] = seconds
+		return True
+
+	async def set(self, key, value, ex=None):
+		self.round_trips += 1
+		self.data[key], self.ttls[key] = value, ex
+		return True
+
+	async def delete(self, *keys):
+		return sum(self.data.pop(key, None) is not None for key in keys)
+
+	async def publish(self, channel, message):
+		self.round_trips += 1
+		self.published.append((channel, message))
+		return 1
+
+
+def _run(fake, coro_fn):
+	with (
+		patch.object(redis_pool, "get_redis", lambda decode_responses=True: fake),
+		patch.object(response_budget, "_circuit_open_until", 0.0),
+		patch.object(response_budget, "_circuit_checked_at", float("-inf")),
+	):
+		return asyncio.run(coro_fn())
+
+
+def test_open_check_reads_redis_once_per_ttl():
+	fake = _FakeRedis()
+	fake.data["circuit:llm_local:open"], fake.ttls["circuit:llm_local:open"] = "1", 120
+
+	async def _main():
+		return [await response_budget.is_local_llm_open() for _ in range(50)]
+
+	assert _run(fake, _main) == [True] * 50
+	assert fake.round_trips == 1
+
+
+def test_timeouts_open_and_success_resets_across_processes():
+	fake = _FakeRedis()
+
+	async def _main():
+		states = []
+		for _ in range(response_budget.CB_FAILURE_THRESHOLD):
+			await response_budget.record_local_llm_timeout()
+			states.append(await response_budget.is_local_llm_open())
+		await response_budget.reset_local_llm_circuit()
+		states.append(await response_budget.is_local_llm_open())
+		await response_budget.reset_local_llm_circuit()
+		return states
+
+	assert _run(fake, _main) == [False, False, True, False]
+	# One publish for the open, one for the reset that closed it — none for a no-op reset.
+	assert fake.published == [
+		(response_budget.CIRCUIT_CHANNEL, str(response_budget.CIRCUIT_OPEN_TTL_S)),
+		(response_budget.CIRCUIT_CHANNEL, "0"),
+	]
+
+
+def test_listener_applies_published_state():
+	fake = _FakeRedis(messages=[{"type": "subscribe", "data": 1}, {"type": "message", "data": "600"}])
+
+	async def _main():
+		response_budget._set_circuit(0)
+		response_budget.start_circuit_listener()
+		await asyncio.sleep(0.01)
+		is_open = await response_budget.is_local_llm_open()
+		await response_budget.stop_circuit_listener()
+		return is_open
+
+	assert _run(fake, _main) is True
+	assert fake.round_trips == 0
@@ -0,0 +1,178 @@
+"""
+Tests for the local crew diary (services/crew_memory.py): day assembly from
+summary + exchange rows, threshold-gated compaction and the debounced Planka
+projection. Postgres, Planka and the LLM are replaced by in-memory fakes.
+"""
+
+import asyncio
+import datetime
+import importlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+import pytest
+
+DAY = datetime.date(2026, 10, 17)
+
+
+@pytest.fixture
+def crew_memory():
+	# Other test modules stub httpx / sqlalchemy / app.models at collection time.
+	with patch.dict(sys.modules):
+		for name in [
+			k for k in sys.modules
+			if k.split(".")[0] in ("sqlalchemy", "httpx") or k.startswith(("app.models", "app.config", "app.services.crew_memory"))
+		]:
+			del sys.modules[name]
+		importlib.import_module("app.models.db")
+		module = importlib.import_module("app.services.crew_memory")
+		with patch.object(module, "_projection_due", {}), patch.object(module, "_projection_task", None):
+			yield module
+
+
+def _entry(id, kind="exchange", content="", covers_until_id=None, crew_id="focus", day=DAY):
+	return types.SimpleNamespace(id=id, kind=kind, content=content, covers_until_id=covers_until_id, crew_id=crew_id, day=day)
+
+
+def test_exchange_format_strips_action_tags(crew_memory):
+	text = crew_memory._format_exchange(" hi ", "Done [ACTION: CREATE_TASK | NAME: x]\n\n\n\nBye", "09:15")
+	assert text == "[09:15] User: hi\n[09:15] Crew: Done \n\nBye\n---\n"
+
+
+def test_day_text_uses_latest_summary_and_newer_exchanges(crew_memory):
+	entries = [
+		_entry(1, content="a\n"),
+		_entry(2, content="b\n"),
+		_entry(3, "summary", "- a and b", covers_until_id=2),
+		_entry(4, content="c\n"),
+	]
+	assert crew_memory._day_text(entries) == "- a and b\nc\n"
+	assert crew_memory._day_text(entries[:2]) == "a\nb\n"
+
+	long_entries = [_entry(i, content=f"line {i}\n") for i in range(1, 800)]
+	text = crew_memory._day_text(long_entries)
+	assert text.startswith("[...earlier conversation omitted...]\n") and text.endswith("line 799\n")
+	assert len(text) <= crew_memory.MAX_DESC_CHARS + len("[...earlier conversation omitted...]\n")
+
+
+def test_diary_block_merges_into_existing_description(crew_memory):
+	merge = crew_memory._merge_diary_block
+	assert merge("", "a\n") == "<!-- crew-diary -->\na\n<!-- /crew-diary -->"
+	notes = "My notes\n"
+	first = merge(notes, "a\n")
+	assert first == "My notes\n\n<!-- crew-diary -->\na\n<!-- /crew-diary -->"
+	edited = first + "\nAdded later"
+	assert merge(edited, "a\nb\n") == "My notes\n\n<!-- crew-diary -->\na\nb\n<!-- /crew-diary -->\nAdded later"
+	assert merge(first, "a\n") == first
+
+
+def test_compaction_only_past_threshold(crew_memory):
+	diaries = {
+		"focus": {DAY: [_entry(1, content="x" * 40), _entry(2, content="y" * 40)]},
+		"scrum": {DAY: [
+			_entry(5, content="old" * 30, crew_id="scrum"),
+			_entry(6, "summary", "S", covers_until_id=5, crew_id="scrum"),
+			_entry(7, content="new\n", crew_id="scrum"),
+		]},
+	}
+	added, prompts = [], []
+
+	class _Session:
+		async def __aenter__(self):
+			return self
+
+		async def __aexit__(self, *exc):
+			return False
+
+		def add(self, row):
+			added.append(row)
+
+		async def commit(self):
+			pass
+
+	async def _load(crew_ids, since=None):
+		return diaries
+
+	async def _compress(current, new_exchanges):
+		prompts.append((current, new_exchanges))
+		return "- summary"
+
+	async def _now():
+		return datetime.datetime(2026, 10, 17, 12, 0)
+
+	registry = types.SimpleNamespace(list_active=lambda: [types.SimpleNamespace(id="focus"), types.SimpleNamespace(id="scrum")])
+	with (
+		patch("app.config.settings", types.SimpleNamespace(CREW_DIARY_COMPACT_CHARS=50)),
+		patch("app.models.db.AsyncSessionLocal", _Session),
+		patch("app.services.crews.crew_registry", registry),
+		patch.object(crew_memory, "_load_diary_days", _load),
+		patch.object(crew_memory, "_compress_daily_diary", _compress),
+		patch.object(crew_memory, "_local_now", _now),
+		patch.object(crew_memory, "_schedule_projection") as schedule,
+	):
+		assert asyncio.run(crew_memory.compact_crew_diaries()) == 1
+
+	assert prompts == [("", "x" * 40 + "y" * 40)]	# scrum's 4-char tail is under the threshold
+	assert len(added) == 1
+	assert (added[0].crew_id, added[0].kind, added[0].content, added[0].covers_until_id) == ("focus", "summary", "- summary", 2)
+	schedule.assert_called_once_with("focus", DAY)
+
+
+def test_projection_is_debounced_per_day(crew_memory):
+	projected = []
+
+	async def _project(crew_id, day):
+		projected.append((crew_id, day, asyncio.get_running_loop().time()))
+
+	async def _main():
+		start = asyncio.get_running_loop().time()
+		for _ in range(3):
+			crew_memory._schedule_projection("focus", DAY)
+			await asyncio.sleep(0.02)
+		crew_memory._schedule_projection("scrum", DAY)
+		await crew_memory._projection_task
+		return start
+
+	with (
+		patch("app.config.settings", types.SimpleNamespace(CREW_DIARY_PLANKA_DEBOUNCE_S=0.05)),
+		patch.object(crew_memory, "_project_day", _project),
+	):
+		start = asyncio.run(_main())
+
+	assert sorted((c, d) for c, d, _ in projected) == [("focus", DAY), ("scrum", DAY)]
+	focus_at = next(t for c, _, t in projected if c == "focus")
+	assert focus_at - start >= 0.04 + 0.05 - 0.01	# quiet for the debounce after the last append
+	assert crew_memory._projection_due == {}
+
+
+def test_memory_contexts_batch_local_and_planka_fallback(crew_memory):
+	loads = []
+
+	async def _load(crew_ids, since=None):
+		loads.append((tuple(crew_ids), since))
+		return {"focus": {DAY: [_entry(1, content="[09:00] User: hi\n")]}}
+
+	async def _planka(crew_id):
+		return f"planka {crew_id}"
+
+	async def _now():
+		return datetime.datetime(2026, 10, 17, 12, 0)
+
+	async def _fmt():
+		return "%Y-%m-%d"
+
+	with (
+		patch.object(crew_memory, "_load_diary_days", _load),
+		patch.object(crew_memory, "_planka_crew_memory_context", _planka),
+		patch.object(crew_memory, "_local_now", _now),
+		patch.object(crew_memory, "_get_user_date_format", _fmt),
+	):
+		out = asyncio.run(crew_memory.get_crew_memory_contexts(["focus", "scrum"]))
+
+	assert len(loads) == 1 and loads[0][0] == ("focus", "scrum")
+	assert out["scrum"] == "planka scrum"
+	assert out["focus"].startswith("CREW CONVERSATION HISTORY") and "[2026-10-17]\n[09:00] User: hi" in out["focus"]
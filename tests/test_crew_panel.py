@@ -0,0 +1,119 @@
+"""
+Tests for crew panel execution (NativeCrewEngine.run_crew_panel): the parallel
+mode must emit exactly the sections the sequential mode would, in panel order,
+while running secondary crews concurrently within the per-tier limits.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+import pytest
+
+
+@pytest.fixture
+def crews_native():
+	# app.services.llm needs the full LLM stack; the panel only uses run_crew_stream.
+	# Other test modules stub sqlalchemy / httpx / app.models at collection time, so
+	# the app modules are re-imported against the real packages.
+	llm_stub = types.SimpleNamespace(ACTION_TAG_DOCS="", get_agent_personality=None)
+	with patch.dict(sys.modules):
+		for name in [
+			k for k in sys.modules
+			if k.split(".")[0] in ("sqlalchemy", "httpx", "pytz") or (k.startswith("app.") and k != "app.services")
+		]:
+			del sys.modules[name]
+		sys.modules["app.services.llm"] = llm_stub
+		yield importlib.import_module("app.services.crews_native")
+
+
+def _engine(crews_native, replies: dict, engaged: set, log: list):
+	class _Engine(crews_native.NativeCrewEngine):
+		def __init__(self):
+			self.llm_url = "http://llm/v1"
+			self.active = 0
+			self.max_active = 0
+
+		async def run_crew_stream(self, crew_id, user_input, **kwargs):
+			self.active += 1
+			self.max_active = max(self.max_active, self.active)
+			log.append(("start", crew_id, user_input))
+			try:
+				for token in replies[crew_id]:
+					await asyncio.sleep(0.01)
+					yield token
+			finally:
+				self.active -= 1
+
+		async def _crew_wants_to_engage(self, crew_id, user_input, primary_output):
+			log.append(("gate", crew_id, primary_output))
+			await asyncio.sleep(0.005)
+			return crew_id in engaged
+
+	return _Engine()
+
+
+def _settings(**overrides):
+	values = dict(
+		CREW_PANEL_PARALLEL=True, CREW_PANEL_BRIEF_CHARS=0,
+		CREW_PANEL_LOCAL_CONCURRENCY=1, CREW_PANEL_CLOUD_CONCURRENCY=3, cloud_configured=True,
+	)
+	values.update(overrides)
+	return types.SimpleNamespace(**values)
+
+
+def _collect(crews_native, engine, crew_ids, cfg):
+	async def _main():
+		return [chunk async for chunk in engine.run_crew_panel(crew_ids, "plan my week")]
+
+	with patch.object(crews_native, "settings", cfg), patch.object(crews_native, "_panel_tier_slots", {}):
+		return asyncio.run(_main())
+
+
+REPLIES = {"a": ["A1 ", "A2"], "b": ["B1 ", "B2 ", "B3"], "c": ["C1"], "d": ["D1 ", "D2"]}
+
+
+def test_parallel_sections_stay_in_panel_order(crews_native):
+	log: list = []
+	engine = _engine(crews_native, REPLIES, {"b", "d"}, log)
+	out = _collect(crews_native, engine, ["a", "b", "c", "d"], _settings())
+	assert out == ["A1 ", "A2", "\n\n---crew:b---\n\n", "B1 ", "B2 ", "B3", "\n\n---crew:d---\n\n", "D1 ", "D2"]
+	assert engine.max_active == 3	# a, b and d overlapped (cloud limit 3)
+	# Gates ran with the shared brief (no primary output yet) before the primary finished.
+	assert [entry for entry in log if entry[0] == "gate"] == [("gate", c, "") for c in "bcd"]
+
+
+def test_brief_threshold_and_local_limit(crews_native):
+	log: list = []
+	engine = _engine(crews_native, REPLIES, {"b", "c"}, log)
+	cfg = _settings(CREW_PANEL_BRIEF_CHARS=3, cloud_configured=False)
+	out = _collect(crews_native, engine, ["a", "b", "c"], cfg)
+	assert out == ["A1 ", "A2", "\n\n---crew:b---\n\n", "B1 ", "B2 ", "B3", "\n\n---crew:c---\n\n", "C1"]
+	assert engine.max_active == 1	# local tier: one generation at a time
+	gates = [entry for entry in log if entry[0] == "gate"]
+	assert gates == [("gate", "b", "A1 "), ("gate", "c", "A1 ")]
+	starts = {crew_id: text for kind, crew_id, text in log if kind == "start"}
+	assert starts["a"] == "plan my week"
+	assert starts["b"].startswith("plan my week") and starts["b"].endswith("A1 ")
+
+
+def test_sequential_mode_chains_prior_sections(crews_native):
+	log: list = []
+	engine = _engine(crews_native, REPLIES, {"b", "c"}, log)
+	out = _collect(crews_native, engine, ["a", "b", "c"], _settings(CREW_PANEL_PARALLEL=False))
+	assert out == ["A1 ", "A2", "\n\n---crew:b---\n\n", "B1 ", "B2 ", "B3", "\n\n---crew:c---\n\n", "C1"]
+	assert engine.max_active == 1
+	starts = {crew_id: text for kind, crew_id, text in log if kind == "start"}
+	assert starts["c"].endswith("A1 A2\n\nB1 B2 B3")
+
+
+def test_secondary_failure_surfaces_in_order(crews_native):
+	log: list = []
+	engine = _engine(crews_native, {**REPLIES, "b": None}, {"b"}, log)
+	with pytest.raises(TypeError):
+		_collect(crews_native, engine, ["a", "b"], _settings())
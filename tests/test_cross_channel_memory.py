@@ -157,10 +157,10 @@ class _CollectionsResponse:
 
 
 class _InMemoryQdrant:
-	"""Drop-in replacement for ``qdrant_client.QdrantClient`` using a plain dict.
+	"""Drop-in replacement for ``qdrant_client.AsyncQdrantClient`` using a plain dict.
 
-	All methods are synchronous (QdrantClient uses blocking I/O), matching the
-	production code's usage pattern.
+	Client methods are coroutines, matching the shared async client returned by
+	``get_qdrant()`` in production.
 	"""
 
 	def __init__(self) -> None:
@@ -168,16 +168,16 @@ class _InMemoryQdrant:
 
 	# ---- Collection management (no-ops; always treat collection as existing) ---
 
-	def get_collections(self) -> _CollectionsResponse:
+	async def get_collections(self) -> _CollectionsResponse:
 		names = list({p["collection"] for p in self._points.values()})
 		return _CollectionsResponse(names)
 
-	def create_collection(self, collection_name: str, **_kwargs: Any) -> None:
+	async def create_collection(self, collection_name: str, **_kwargs: Any) -> None:
 		pass  # collection is auto-created on first upsert
 
 	# ---- Write ---------------------------------------------------------------
 
-	def upsert(self, collection_name: str, points: list) -> None:
+	async def upsert(self, collection_name: str, points: list) -> None:
 		for pt in points:
 			self._points[str(pt.id)] = {
 				"collection": collection_name,
@@ -185,17 +185,19 @@ class _InMemoryQdrant:
 				"payload": dict(pt.payload),
 			}
 
-	def delete(self, collection_name: str, points_selector: Any) -> None:
+	async def delete(self, collection_name: str, points_selector: Any) -> None:
 		for pid in points_selector.points:
 			self._points.pop(str(pid), None)
 
 	# ---- Read ----------------------------------------------------------------
 
-	def count(self, collection_name: str, exact: bool = True) -> _CountResult:
-		n = sum(1 for p in self._points.values() if p["collection"] == collection_name)
-		return _CountResult(n)
+	def _count(self, collection_name: str) -> int:
+		return sum(1 for p in self._points.values() if p["collection"] == collection_name)
 
-	def query_points(
+	async def count(self, collection_name: str, exact: bool = True) -> _CountResult:
+		return _CountResult(self._count(collection_name))
+
+	async def query_points(
 		self,
 		collection_name: str,
 		query: list[float],
@@ -215,7 +217,7 @@ class _InMemoryQdrant:
 	# ---- Introspection (test helpers) ----------------------------------------
 
 	def point_count(self, collection_name: str = "personal_memory") -> int:
-		return self.count(collection_name).count
+		return self._count(collection_name)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,154 @@
+"""
+Tests for the micro-batching embedding service and its LRU cache
+(services/embeddings.py).
+
+The SentenceTransformer call is replaced with a deterministic stub that
+records every batch it receives, so no model download is required.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import embeddings
+from app.services.embeddings import EmbeddingBatcher, EmbeddingCache
+
+
+_SETTINGS = types.SimpleNamespace(
+	EMBED_MAX_BATCH=32, EMBED_BATCH_WAIT_MS=5.0, EMBED_MAX_PENDING=64,
+	EMBED_CACHE_SIZE=16, EMBED_CACHE_REDIS=False, EMBEDDER_BACKEND="torch",
+)
+
+
+def _fake_encode(calls: list):
+	def _encode(texts: list[str]) -> list[list[float]]:
+		calls.append(list(texts))
+		return [[float(len(t)), float(i)] for i, t in enumerate(texts)]
+	return _encode
+
+
+def test_concurrent_requests_share_one_batch():
+	calls: list = []
+
+	async def _run():
+		batcher = EmbeddingBatcher(max_batch=32, max_wait_ms=20, max_pending=64)
+		return await asyncio.gather(*(batcher.encode("x" * n) for n in range(1, 6)))
+
+	with patch.object(embeddings, "_encode_batch_sync", _fake_encode(calls)):
+		vectors = asyncio.run(_run())
+
+	assert len(calls) == 1, f"expected one batched encode, got {calls!r}"
+	assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_encode_many_preserves_order_and_respects_max_batch():
+	calls: list = []
+	texts = [f"text-{i:02d}" for i in range(10)]
+
+	async def _run():
+		batcher = EmbeddingBatcher(max_batch=4, max_wait_ms=5, max_pending=3)
+		return await batcher.encode_many(texts)
+
+	with patch.object(embeddings, "_encode_batch_sync", _fake_encode(calls)):
+		vectors = asyncio.run(_run())
+
+	assert len(vectors) == len(texts)
+	assert all(len(batch) <= 4 for batch in calls)
+	assert [t for batch in calls for t in batch] == texts
+
+
+def test_encode_failure_propagates_to_every_caller():
+	def _boom(texts):
+		raise RuntimeError("model unavailable")
+
+	async def _run():
+		batcher = EmbeddingBatcher(max_batch=8, max_wait_ms=5, max_pending=8)
+		return await asyncio.gather(batcher.encode("a"), batcher.encode("b"), return_exceptions=True)
+
+	with patch.object(embeddings, "_encode_batch_sync", _boom):
+		results = asyncio.run(_run())
+
+	assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_lru_cache_evicts_least_recently_used():
+	cache = EmbeddingCache(max_entries=2)
+	cache.put("a", np.zeros(2, dtype=np.float32))
+	cache.put("b", np.ones(2, dtype=np.float32))
+	assert cache.get("a") is not None	# "a" becomes most recently used
+	cache.put("c", np.ones(2, dtype=np.float32))
+	assert cache.get("b") is None
+	assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_encode_many_serves_repeats_from_cache():
+	calls: list = []
+
+	async def _run():
+		first = await embeddings.encode_many(["hello   world", "other text", "hello world"])
+		second = await embeddings.encode("  hello world ")
+		return first, second
+
+	with (
+		patch.object(embeddings, "_encode_batch_sync", _fake_encode(calls)),
+		patch.object(embeddings, "settings", _SETTINGS),
+		patch.object(embeddings, "_batcher", None),
+		patch.object(embeddings, "_cache", EmbeddingCache(max_entries=16)),
+		patch.object(embeddings, "_redis_get_many", AsyncMock(return_value={})),
+		patch.object(embeddings, "_redis_put_many", AsyncMock()),
+	):
+		first, second = asyncio.run(_run())
+		stats = embeddings.get_cache_stats()
+
+	# Whitespace variants normalise to one key: only two distinct texts are embedded, once.
+	assert calls == [["hello world", "other text"]]
+	assert first[0] == first[2] == second
+	assert stats["misses"] == 2 and stats["hits"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Backend parity — ONNX vectors must stay in the torch model's vector space.
+# Skipped when onnxruntime / sentence-transformers / the model files are absent.
+# ---------------------------------------------------------------------------
+
+_PARITY_TEXTS = [
+	"I am allergic to peanuts and avoid them in every recipe.",
+	"Move the invoice card to Done on the finance board.",
+	"Ich trainiere dreimal pro Woche für den Halbmarathon im Oktober.",
+	"What is on my calendar tomorrow afternoon?",
+	"short",
+	"A considerably longer passage that keeps going " * 40,
+]
+
+
+@pytest.fixture(scope="module")
+def torch_reference():
+	pytest.importorskip("sentence_transformers")
+	try:
+		model = embeddings._load_torch_embedder()
+	except Exception as exc:
+		pytest.skip(f"torch embedder unavailable: {exc}")
+	return np.asarray(model.encode(_PARITY_TEXTS, show_progress_bar=False), dtype=np.float32)
+
+
+@pytest.mark.parametrize("quantized,min_cosine", [(False, 0.999), (True, 0.98)])
+def test_onnx_backend_parity_with_torch(torch_reference, quantized, min_cosine):
+	pytest.importorskip("onnxruntime")
+	try:
+		model = embeddings.OnnxEmbedder(quantized=quantized)
+	except Exception as exc:
+		pytest.skip(f"ONNX model files unavailable: {exc}")
+	vectors = model.encode(_PARITY_TEXTS)
+
+	assert vectors.shape == torch_reference.shape == (len(_PARITY_TEXTS), 384)
+	cosines = np.sum(vectors * torch_reference, axis=1) / (
+		np.linalg.norm(vectors, axis=1) * np.linalg.norm(torch_reference, axis=1)
+	)
+	assert cosines.min() >= min_cosine, f"cosine drift too large: {cosines.round(4).tolist()}"
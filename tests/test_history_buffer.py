@@ -0,0 +1,81 @@
+"""
+Tests for the write-through rolling-history ring buffer
+(models/history_buffer.py): it must answer exactly like the SQL path of
+get_rolling_history().
+"""
+
+import datetime
+import importlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+
+@pytest.fixture
+def hb():
+	"""Real app.models even when another test module stubbed sqlalchemy at collection."""
+	with patch.dict(sys.modules):
+		for name in [k for k in sys.modules if k.split(".")[0] == "sqlalchemy" or k.startswith(("app.models", "app.config"))]:
+			del sys.modules[name]
+		yield importlib.import_module("app.models.history_buffer")
+
+
+_NOW = datetime.datetime.utcnow()
+
+
+def _row(i, role, content, minutes_ago, model=None):
+	return types.SimpleNamespace(
+		id=i, role=role, content=content, channel="telegram", model=model,
+		created_at=_NOW - datetime.timedelta(minutes=minutes_ago),
+	)
+
+
+def _reference(rows_newest_first, days, limit):
+	"""The SQL path of get_rolling_history(), over in-memory rows."""
+	from app.models.db import _is_quality_message
+	cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+	candidates = [m for m in rows_newest_first if m.created_at >= cutoff][:300]
+	cap = limit // 2
+	buckets = {"user": [], "z": [], "system": []}
+	caps = {"user": cap, "z": cap, "system": 10}
+	for m in candidates:
+		if not _is_quality_message(m.role, m.content, m.model):
+			continue
+		key = "z" if m.role in ("z", "assistant") else m.role
+		if key in buckets and len(buckets[key]) < caps[key]:
+			buckets[key].append(m)
+	combined = sorted(sum(buckets.values(), []), key=lambda m: m.created_at)[-limit:]
+	return [m.content for m in combined]
+
+
+def test_snapshot_matches_sql_semantics(hb):
+	rows = []
+	for i in range(400):
+		role = ("user", "z", "z", "system", "z")[i % 5]
+		content = f"message {i}" if i % 7 else "request timed out, try again later"
+		rows.append(_row(i + 1, role, content, minutes_ago=(400 - i) * 30, model="recall" if i % 11 == 0 else None))
+	newest_first = list(reversed(rows))
+
+	buf = hb.RollingHistoryBuffer()
+	buf.load(newest_first[150:])	# rows 1-250
+	for m in rows[250:]:
+		buf.append(m)	# write-through after hydration
+	for days, limit in ((4, 60), (1, 20), (30, 60), (30, 200)):
+		got = [m["content"] for m in buf.snapshot(days, limit)]
+		assert got == _reference(newest_first, days, limit), (days, limit)
+
+
+def test_appends_ignored_until_hydrated_and_invalidate(hb):
+	buf = hb.RollingHistoryBuffer()
+	buf.append(_row(1, "user", "hello there", 1))
+	assert not buf.hydrated
+	buf.load([_row(1, "user", "hello there", 1)])
+	buf.append(_row(2, "z", "hi, how can I help?", 0))
+	assert [m["role"] for m in buf.snapshot(4, 60)] == ["user", "z"]
+	buf.invalidate()
+	assert not buf.hydrated
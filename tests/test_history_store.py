@@ -0,0 +1,116 @@
+"""
+Tests for the versioned schema migrations (models/migrations.py) and the
+keyset-paginated history reader in models/db.py.
+"""
+
+import asyncio
+import datetime
+import importlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+
+@pytest.fixture
+def real():
+	"""Real sqlalchemy + app.models even when another test module stubbed them at collection."""
+	with patch.dict(sys.modules):
+		for name in [k for k in sys.modules if k.split(".")[0] == "sqlalchemy" or k.startswith(("app.models", "app.config"))]:
+			del sys.modules[name]
+		yield types.SimpleNamespace(
+			db=importlib.import_module("app.models.db"),
+			migrations=importlib.import_module("app.models.migrations"),
+			postgresql=importlib.import_module("sqlalchemy.dialects.postgresql"),
+		)
+
+
+class _FakeConn:
+	def __init__(self, engine):
+		self.engine = engine
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		return False
+
+	async def execute(self, statement, params=None):
+		sql = str(statement)
+		self.engine.sql.append(sql)
+		if sql.startswith("INSERT INTO schema_migrations"):
+			self.engine.applied.add(params["v"])
+		done = sql.startswith("SELECT 1 FROM schema_migrations") and params["v"] in self.engine.applied
+		return types.SimpleNamespace(scalar=lambda: 1 if done else None)
+
+
+class _FakeEngine:
+	def __init__(self, applied=()):
+		self.applied = set(applied)
+		self.sql: list[str] = []
+
+	def begin(self):
+		return _FakeConn(self)
+
+
+def test_migrations_apply_once_in_order(real):
+	migrations = real.migrations
+	versions = [m.version for m in migrations.MIGRATIONS]
+	assert versions == sorted(set(versions))
+
+	engine = _FakeEngine(applied={1})
+	assert asyncio.run(migrations.run_migrations(engine)) == [v for v in versions if v != 1]
+	assert not any("domain_inference_runs" in sql for sql in engine.sql)
+	assert any("ix_global_messages_created_at_id" in sql for sql in engine.sql)
+	assert asyncio.run(migrations.run_migrations(engine)) == []
+
+
+def test_model_indexes_match_migration(real):
+	db, migrations = real.db, real.migrations
+	declared = {ix.name for table in (db.GlobalMessage.__table__, db.LLMMetric.__table__) for ix in table.indexes}
+	migrated = " ".join(next(m for m in migrations.MIGRATIONS if m.version == 2).statements)
+	assert declared and all(name in migrated for name in declared)
+
+
+class _Session:
+	def __init__(self, rows):
+		self.rows = rows
+		self.statements = []
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		return False
+
+	async def execute(self, stmt):
+		self.statements.append(stmt)
+		return types.SimpleNamespace(scalars=lambda: types.SimpleNamespace(all=lambda: self.rows))
+
+
+def test_history_page_uses_keyset_cursor(real):
+	db = real.db
+	base = datetime.datetime(2026, 1, 1, 12, 0, 0)
+	rows = [
+		types.SimpleNamespace(id=10 - i, role="user", content=f"m{10 - i}", channel="dashboard", model=None,
+			created_at=base - datetime.timedelta(minutes=i))
+		for i in range(3)
+	]
+	session = _Session(rows)
+	with patch.object(db, "AsyncSessionLocal", lambda: session):
+		page, cursor = asyncio.run(db.get_global_history_page(limit=2))
+		assert [m["content"] for m in page] == ["m9", "m10"]
+		assert cursor == db._history_cursor(rows[1])
+
+		asyncio.run(db.get_global_history_page(limit=2, before=cursor))
+	sql = str(session.statements[-1].compile(dialect=real.postgresql.dialect()))
+	assert "(global_messages.created_at, global_messages.id) < (" in sql
+	assert "OFFSET" not in sql
+	assert db._parse_history_cursor(cursor) == (rows[1].created_at, 9)
+	for bad in ("2026-01-01T10:00:00+00:00_5", "2026-01-01T10:00:00_99999999999999999999", "2026-01-01T10:00:00_x", "nope"):
+		with pytest.raises(ValueError):
+			db._parse_history_cursor(bad)
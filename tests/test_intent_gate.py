@@ -0,0 +1,117 @@
+"""
+Tests for the local embedding intent gate (services/intent_gate.py).
+
+Embeddings are replaced by a bag-of-words hash so centroids are deterministic
+and no model download is required.
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import embeddings, intent_gate
+from app.services.intent_gate import CentroidClassifier, verdict_for_margin
+
+
+_SETTINGS = types.SimpleNamespace(INTENT_GATE_ENABLED=True, INTENT_GATE_SHADOW=False, INTENT_GATE_MARGIN=0.05)
+
+_SEED = {
+	"PLANKA_MUTATION": ("move the garden board to inbox", "delete card shopping", "rename the list backlog"),
+	"SMALLTALK": ("hi there", "thanks a lot", "good morning"),
+	"CONVERSATION": ("explain quantum entanglement", "what should i eat for dinner", "how do boards work"),
+}
+
+
+def _bow(text: str) -> list[float]:
+	vec = np.zeros(64, dtype=np.float32)
+	for word in text.lower().split():
+		vec[int(hashlib.sha256(word.encode()).hexdigest(), 16) % 64] += 1.0
+	return vec.tolist()
+
+
+async def _fake_encode_many(texts):
+	return [_bow(t) for t in texts]
+
+
+async def _fake_encode(text):
+	return _bow(text)
+
+
+def _verdicts(*queries, settings=_SETTINGS):
+	async def _main():
+		return [await intent_gate.local_verdict(text, head) for text, head in queries]
+
+	with (
+		patch.object(intent_gate, "settings", settings),
+		patch.object(intent_gate, "_classifier", None),
+		patch.object(intent_gate, "_build_failed_at", 0.0),
+		patch.dict("app.services.intent_seed.SEED_EXAMPLES", _SEED, clear=True),
+		patch.object(embeddings, "encode_many", _fake_encode_many),
+		patch.object(embeddings, "encode", _fake_encode),
+	):
+		return asyncio.run(_main())
+
+
+def test_margin_band_defers_to_llm():
+	assert verdict_for_margin(0.2, 0.1) is True
+	assert verdict_for_margin(-0.2, 0.1) is False
+	assert verdict_for_margin(0.05, 0.1) is None
+
+
+def test_centroids_answer_confident_heads_locally():
+	results = _verdicts(
+		("delete card shopping list", "DELETE_CARD"),
+		("hi there", "FAST_PATH_TRIVIAL_BYPASS"),
+		("explain quantum entanglement please", "system_action"),
+	)
+	assert results == [True, True, False]
+
+
+def test_shadow_mode_defers_and_counts_agreement():
+	shadow = types.SimpleNamespace(**{**vars(_SETTINGS), "INTENT_GATE_ENABLED": False, "INTENT_GATE_SHADOW": True})
+	with patch.object(intent_gate, "_shadow", intent_gate.collections.OrderedDict()):
+		assert _verdicts(
+			("delete card shopping list", "DELETE_CARD"),
+			("explain quantum entanglement please", "system_action"),
+			settings=shadow,
+		) == [None, None]
+		with patch("app.services.metrics.increment_counter") as counter:
+			intent_gate.record_decision("delete card shopping list", "DELETE_CARD", True)
+			intent_gate.record_decision("explain quantum entanglement please", "system_action", True)
+			intent_gate.record_decision("never gated", "system_action", True)
+		assert not intent_gate._shadow
+	assert [c.kwargs for c in counter.call_args_list] == [
+		{"head": "DELETE_CARD", "result": "agree"},
+		{"head": "system_action", "result": "disagree"},
+	]
+	assert all(c.args == ("intent_gate_shadow_total",) for c in counter.call_args_list)
+
+
+def test_embedding_failure_falls_back_to_llm():
+	async def _boom(texts):
+		raise RuntimeError("embedder unavailable")
+
+	with (
+		patch.object(intent_gate, "settings", _SETTINGS),
+		patch.object(intent_gate, "_classifier", None),
+		patch.object(intent_gate, "_build_failed_at", 0.0),
+		patch.object(embeddings, "encode_many", _boom),
+	):
+		assert asyncio.run(intent_gate.local_verdict("delete card shopping", "system_action")) is None
+		# Second call inside the retry window skips the rebuild entirely.
+		assert asyncio.run(intent_gate.local_verdict("delete card shopping", "system_action")) is None
+
+
+def test_fit_produces_unit_centroids():
+	vectors = np.array([[1.0, 0.0], [0.8, 0.2], [0.0, 1.0]], dtype=np.float32)
+	clf = CentroidClassifier.fit(vectors, ["A", "A", "B"])
+	assert clf.labels == ["A", "B"]
+	assert np.allclose(np.linalg.norm(clf.centroids, axis=1), 1.0)
+	assert clf.margin(np.array([1.0, 0.1]), frozenset({"A"})) > 0
@@ -58,9 +58,6 @@ def _patch_snapshot(monkeypatch):
 		return _SNAPSHOT
 
 	monkeypatch.setattr(ir, "_get_planka_snapshot", _fake)
-	# Reset cache between tests so monkeypatched function runs.
-	ir._cache["ts"] = 0.0
-	ir._cache["projects"] = []
 	yield
 
 
@@ -224,8 +221,6 @@ def test_move_board_project_name_fallback(text, lang, proj_name, monkeypatch):
 	async def _fake() -> list[dict]:
 		return snapshot
 	monkeypatch.setattr(ir, "_get_planka_snapshot", _fake)
-	ir._cache["ts"] = 0.0
-	ir._cache["projects"] = []
 	intent = asyncio.get_event_loop().run_until_complete(
 		ir.classify_structural_intent(text, lang)
 	)
@@ -0,0 +1,133 @@
+"""
+Tests for the content-addressed LLM response cache (services/llm_cache.py).
+
+Redis is replaced by a small in-memory fake covering the commands the cache uses.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import llm_cache
+
+
+class _FakePipeline:
+	def __init__(self, redis):
+		self.redis = redis
+		self.ops = []
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		return False
+
+	def __getattr__(self, name):
+		return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+	async def execute(self):
+		return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class _FakeRedis:
+	def __init__(self):
+		self.data: dict = {}
+		self.zsets: dict = {}
+		self.hashes: dict = {}
+
+	def pipeline(self, transaction=True):
+		return _FakePipeline(self)
+
+	async def get(self, key):
+		return self.data.get(key)
+
+	async def set(self, key, value, ex=None):
+		self.data[key] = value
+
+	async def delete(self, *keys):
+		for key in keys:
+			self.data.pop(key, None)
+
+	async def zadd(self, key, mapping):
+		self.zsets.setdefault(key, {}).update(mapping)
+
+	async def zremrangebyscore(self, key, low, high):
+		zset = self.zsets.get(key, {})
+		for member in [m for m, score in zset.items() if score <= high]:
+			del zset[member]
+
+	async def zcard(self, key):
+		return len(self.zsets.get(key, {}))
+
+	async def zpopmin(self, key, count):
+		zset = self.zsets.get(key, {})
+		popped = sorted(zset.items(), key=lambda item: item[1])[:count]
+		for member, _ in popped:
+			del zset[member]
+		return popped
+
+	async def hincrby(self, key, field, amount):
+		h = self.hashes.setdefault(key, {})
+		h[field] = h.get(field, 0) + amount
+
+	async def hgetall(self, key):
+		return dict(self.hashes.get(key, {}))
+
+
+def _run(coro_fn, max_entries=2):
+	redis = _FakeRedis()
+	cfg = types.SimpleNamespace(LLM_CACHE_ENABLED=True, LLM_CACHE_MAX_ENTRIES=max_entries)
+	with (
+		patch("app.config.settings", cfg),
+		patch("app.services.redis_pool.get_redis", lambda decode_responses=True: redis),
+		patch("app.services.metrics.increment_counter"),
+	):
+		return asyncio.run(coro_fn()), redis
+
+
+def test_key_covers_every_input():
+	base = ("email_summary", "local", "m", "sys", "prompt")
+	keys = {llm_cache.cache_key(*base)}
+	for i in range(len(base)):
+		changed = list(base)
+		changed[i] += "x"
+		keys.add(llm_cache.cache_key(*changed))
+	assert len(keys) == len(base) + 1
+	assert llm_cache.cache_key(*base) == llm_cache.cache_key(*base)
+
+
+def test_hit_miss_and_lru_eviction():
+	feature = "email_summary"
+	keys = [llm_cache.cache_key(feature, "local", "m", "s", f"p{i}") for i in range(3)]
+
+	async def _main():
+		assert await llm_cache.get_cached(feature, keys[0]) is None
+		await llm_cache.store(feature, keys[0], "one")
+		await asyncio.sleep(0.01)
+		await llm_cache.store(feature, keys[1], "two")
+		await asyncio.sleep(0.01)
+		assert await llm_cache.get_cached(feature, keys[0]) == "one"	# now most recent
+		await asyncio.sleep(0.01)
+		await llm_cache.store(feature, keys[2], "three")
+		return (
+			[await llm_cache.get_cached(feature, k) for k in keys],
+			await llm_cache.get_cache_stats(),
+		)
+
+	(values, stats), _ = _run(_main)
+	assert values == ["one", None, "three"]
+	assert stats[feature]["hits"] == 3 and stats[feature]["misses"] == 2
+	assert stats[feature]["hit_rate"] == 0.6
+	assert stats[feature]["evicted"] == 1 and stats[feature]["entries"] == 2
+
+
+def test_only_listed_features_are_cacheable():
+	with patch("app.config.settings", types.SimpleNamespace(LLM_CACHE_ENABLED=True)):
+		assert llm_cache.is_cacheable("calendar_detect")
+		assert not llm_cache.is_cacheable("chat")
+	with patch("app.config.settings", types.SimpleNamespace(LLM_CACHE_ENABLED=False)):
+		assert not llm_cache.is_cacheable("calendar_detect")
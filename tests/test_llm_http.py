@@ -0,0 +1,175 @@
+"""
+Tests for the pooled LLM HTTP client registry (services/llm_http.py) and the
+stale-connection replay on the local peer path (llm._local_peer_lines).
+
+A throwaway HTTP/1.1 server on localhost stands in for a llama.cpp peer, so the
+connection-reuse counter sees real TCP connects.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import types
+import contextlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import llm_http, metrics
+
+
+class _Handler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def do_GET(self):
+		self.send_response(200)
+		self.send_header("Content-Length", "2")
+		self.end_headers()
+		self.wfile.write(b"ok")
+
+	def log_message(self, *args):
+		pass
+
+
+def _server():
+	srv = HTTPServer(("127.0.0.1", 0), _Handler)
+	threading.Thread(target=srv.serve_forever, daemon=True).start()
+	return srv
+
+
+_SETTINGS = types.SimpleNamespace(LLM_HTTP_POOL_SIZE=4)
+
+
+def _real_httpx():
+	"""The real httpx, even when another test module left a stub in sys.modules."""
+	with patch.dict(sys.modules):
+		for name in [m for m in sys.modules if m == "httpx" or m.startswith("httpx.")]:
+			del sys.modules[name]
+		return importlib.import_module("httpx")
+
+
+def _registry():
+	return (
+		patch.object(llm_http, "settings", _SETTINGS),
+		patch.object(llm_http, "httpx", _real_httpx()),
+	)
+
+
+def test_requests_reuse_one_connection_per_endpoint():
+	srv = _server()
+	url = f"http://127.0.0.1:{srv.server_port}"
+
+	async def _main():
+		first = llm_http.get_llm_client(url + "/v1")
+		for _ in range(3):
+			async with llm_http.llm_client(url) as client:
+				assert client is first
+				assert (await client.get(f"{url}/health", timeout=5.0)).text == "ok"
+		await llm_http.close_llm_clients()
+		return first
+
+	before_new = metrics.get_counter("llm_http_requests_total", endpoint="127.0.0.1", connection="new")
+	before_reused = metrics.get_counter("llm_http_requests_total", endpoint="127.0.0.1", connection="reused")
+	p1, p2 = _registry()
+	with p1, p2:
+		client = asyncio.run(_main())
+	srv.shutdown()
+
+	assert client.is_closed
+	assert metrics.get_counter("llm_http_requests_total", endpoint="127.0.0.1", connection="new") - before_new == 1
+	assert metrics.get_counter("llm_http_requests_total", endpoint="127.0.0.1", connection="reused") - before_reused == 2
+	assert metrics.get_histogram("llm_http_ttfb_seconds", endpoint="127.0.0.1")["count"] >= 3
+
+
+def test_retired_peer_client_is_replaced_and_closed_on_shutdown():
+	async def _main():
+		old = llm_http.get_llm_client("http://100.64.0.2:8081")
+		llm_http.retire_llm_client("http://100.64.0.2:8081")
+		new = llm_http.get_llm_client("http://100.64.0.2:8081/v1/chat/completions")
+		assert new is not old and not old.is_closed	# grace period: in-flight streams finish
+		await llm_http.close_llm_clients()
+		return old, new
+
+	p1, p2 = _registry()
+	with p1, p2:
+		old, new = asyncio.run(_main())
+	assert old.is_closed and new.is_closed
+
+
+def test_cloud_endpoints_negotiate_http2():
+	p1, p2 = _registry()
+	with p1, p2:
+		assert llm_http.endpoint_key("https://api.groq.com/openai/v1/chat/completions") == "https://api.groq.com"
+		cloud = llm_http._build_client("https://api.groq.com")
+		local = llm_http._build_client("http://llm-local:8081")
+	assert cloud._transport._pool._http2 is llm_http._HTTP2
+	assert local._transport._pool._http2 is False
+
+
+def _llm_module():
+	"""app.services.llm with its agent-framework imports stubbed and the real httpx."""
+	stubs = {n: MagicMock() for n in ("langchain_openai", "langchain_core", "langchain_core.messages", "langgraph", "langgraph.prebuilt")}
+	with patch.dict(sys.modules, stubs):
+		sys.modules.pop("app.services.llm", None)
+		module = importlib.import_module("app.services.llm")
+	return module
+
+
+def test_local_stream_replays_a_stale_pooled_connection():
+	llm = _llm_module()
+	httpx = _real_httpx()
+	posts = []
+
+	class _Response:
+		def raise_for_status(self):
+			pass
+
+		async def aiter_lines(self):
+			for line in (": keep-alive", 'data: {"choices": [{"delta": {"content": "hi"}}]}', "data: [DONE]"):
+				yield line
+
+	class _Client:
+		@contextlib.asynccontextmanager
+		async def stream(self, method, url, json=None, timeout=None):
+			posts.append(url)
+			if len(posts) == 1:
+				raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+			yield _Response()
+
+	@contextlib.asynccontextmanager
+	async def _llm_client(url):
+		yield _Client()
+
+	lease = types.SimpleNamespace(url="http://mac:8081", peer=types.SimpleNamespace(server_type="llamacpp"))
+
+	async def _main():
+		return [line async for line in llm._local_peer_lines(lease, {"messages": []}, None)]
+
+	with patch.object(llm, "httpx", httpx), patch.object(llm_http, "llm_client", _llm_client):
+		lines = asyncio.run(_main())
+	assert posts == ["http://mac:8081/v1/chat/completions"] * 2
+	assert lines == ['data: {"choices": [{"delta": {"content": "hi"}}]}', "data: [DONE]"]
+
+	# A second stale connection in a row is not hidden.
+	posts.clear()
+
+	class _Dead(_Client):
+		@contextlib.asynccontextmanager
+		async def stream(self, method, url, json=None, timeout=None):
+			posts.append(url)
+			raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+			yield
+
+	@contextlib.asynccontextmanager
+	async def _dead_client(url):
+		yield _Dead()
+
+	with patch.object(llm, "httpx", httpx), patch.object(llm_http, "llm_client", _dead_client):
+		with pytest.raises(httpx.RemoteProtocolError):
+			asyncio.run(_main())
+	assert len(posts) == 2
@@ -0,0 +1,95 @@
+"""
+Tests for the buffered LLM metrics writer and hourly rollups
+(services/llm_metrics.py).
+"""
+
+import asyncio
+import datetime
+import importlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+
+@pytest.fixture
+def lm():
+	"""Real sqlalchemy + app.models even when another test module stubbed them at collection."""
+	with patch.dict(sys.modules):
+		for name in [k for k in sys.modules if k.split(".")[0] == "sqlalchemy" or k.startswith(("app.models", "app.config", "app.services.llm_metrics"))]:
+			del sys.modules[name]
+		module = importlib.import_module("app.services.llm_metrics")
+		with patch.object(module, "_buffer", []):
+			yield module
+
+
+class _Session:
+	def __init__(self, existing=(), fail=False):
+		self.existing = list(existing)
+		self.fail = fail
+		self.statements = []
+		self.added = []
+		self.committed = False
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc):
+		return False
+
+	async def execute(self, stmt, params=None):
+		self.statements.append(stmt)
+		if self.fail and type(stmt).__name__ == "Insert":
+			raise ConnectionError("db down")
+		return types.SimpleNamespace(scalars=lambda: types.SimpleNamespace(all=lambda: self.existing))
+
+	def add(self, obj):
+		self.added.append(obj)
+
+	async def commit(self):
+		self.committed = True
+
+
+def _record(lm, latencies, hour):
+	settings = types.SimpleNamespace(LLM_METRICS_FLUSH_ROWS=1000)
+	with patch("app.config.settings", settings):
+		for ms in latencies:
+			lm.record("local", "user_chat", "m", tokens=10, latency_ms=ms)
+	for row in lm._buffer:
+		row["created_at"] = hour + datetime.timedelta(minutes=5)
+
+
+def test_flush_inserts_once_and_merges_rollups(lm):
+	from app.models.db import LLMMetricRollup
+	hour = datetime.datetime(2026, 5, 1, 9)
+	existing = LLMMetricRollup(hour=hour, tier="local", feature="user_chat", model="m", calls=2, tokens=20,
+		latency_sum_ms=600, latency_max_ms=400, latency_buckets=[0, 0, 2] + [0] * 8)
+	_record(lm, [90, 1500, 70000], hour)
+	session = _Session(existing=[existing])
+	with patch("app.models.db.AsyncSessionLocal", lambda: session):
+		assert asyncio.run(lm.flush()) == 3
+	inserts = [s for s in session.statements if type(s).__name__ == "Insert"]
+	assert len(inserts) == 1 and session.committed and not lm._buffer
+	assert session.added == []
+	assert existing.calls == 5 and existing.tokens == 50 and existing.latency_max_ms == 70000
+	assert existing.latency_buckets == [1, 0, 2, 0, 1, 0, 0, 0, 0, 0, 1]
+
+
+def test_failed_flush_keeps_rows(lm):
+	_record(lm, [100, 200], datetime.datetime(2026, 5, 1, 9))
+	with patch("app.models.db.AsyncSessionLocal", lambda: _Session(fail=True)):
+		assert asyncio.run(lm.flush()) == 0
+	assert len(lm._buffer) == 2
+
+
+def test_latency_quantile(lm):
+	buckets = [0] * 11
+	buckets[lm._bucket_index(300)] = 50	# 250-500 ms
+	buckets[lm._bucket_index(5000)] = 50	# 4000-8000 ms
+	assert lm.latency_quantile(buckets, 0.5, 6000) == 500
+	assert 4000 < lm.latency_quantile(buckets, 0.95, 6000) <= 6000
+	assert lm.latency_quantile([0] * 11, 0.5, 0) == 0
@@ -0,0 +1,151 @@
+"""
+Tests for the queued, batched memory-extraction pipeline (services/learning.py)
+and the batched duplicate check in memory.store_memories().
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import learning, memory
+
+
+class _FakeStreamRedis:
+	def __init__(self, fail=False):
+		self.fail = fail
+		self.added: list[dict] = []
+		self.acked: list[str] = []
+		self.deleted: list[str] = []
+
+	async def xadd(self, stream, fields, maxlen=None, approximate=True):
+		if self.fail:
+			raise ConnectionError("redis down")
+		self.added.append(fields)
+		return f"{len(self.added)}-0"
+
+	async def xack(self, stream, group, *ids):
+		self.acked.extend(ids)
+
+	async def xdel(self, stream, *ids):
+		self.deleted.extend(ids)
+
+
+def test_enqueue_skips_trivial_and_falls_back_inline():
+	redis = _FakeStreamRedis()
+	with (
+		patch("app.services.redis_pool.get_redis", lambda decode_responses=True: redis),
+		patch("app.services.metrics.increment_counter"),
+	):
+		asyncio.run(learning.enqueue_extraction("ok"))
+		asyncio.run(learning.enqueue_extraction("[Follow-up] I moved to Lisbon last spring with my dog."))
+	assert redis.added == [{"text": "I moved to Lisbon last spring with my dog.", "attempts": "0"}]
+
+	async def _down():
+		with patch.object(learning, "extract_and_store_facts", new=AsyncMock()) as inline:
+			await learning.enqueue_extraction("I have been vegetarian for ten years now.")
+			await asyncio.sleep(0)
+			return inline
+	with (
+		patch("app.services.redis_pool.get_redis", lambda decode_responses=True: _FakeStreamRedis(fail=True)),
+		patch("app.services.metrics.increment_counter"),
+	):
+		inline = asyncio.run(_down())
+	inline.assert_awaited_once()
+
+
+def _llm(chat):
+	return patch.dict(sys.modules, {"app.services.llm": types.SimpleNamespace(chat=chat)})
+
+
+def _entries(*texts, attempts="0"):
+	return [(f"{i}-0", {"text": t, "attempts": attempts}) for i, t in enumerate(texts, 1)]
+
+
+def test_batch_shares_one_prompt_and_acks():
+	redis = _FakeStreamRedis()
+	chat = AsyncMock(return_value="- Lives in Lisbon with a dog\nNONE\n- Has been vegetarian for ten years")
+	store = AsyncMock(return_value=2)
+	with _llm(chat), patch.object(learning, "store_memories", store):
+		asyncio.run(learning._process_batch(redis, _entries("I moved to Lisbon.", "I'm vegetarian.")))
+	chat.assert_awaited_once()
+	prompt = chat.await_args.args[0]
+	assert prompt.count("<message>\n") == 2 and "I moved to Lisbon." in prompt and "I'm vegetarian." in prompt
+	store.assert_awaited_once_with(["Lives in Lisbon with a dog", "Has been vegetarian for ten years"])
+	assert redis.acked == ["1-0", "2-0"] and redis.deleted == ["1-0", "2-0"]
+	assert redis.added == []
+
+
+def test_failed_batch_is_requeued_until_attempts_run_out():
+	redis = _FakeStreamRedis()
+	chat = AsyncMock(side_effect=RuntimeError("cloud down"))
+	with _llm(chat):
+		asyncio.run(learning._process_batch(redis, _entries("first message", attempts="0")))
+		asyncio.run(learning._process_batch(redis, _entries("second message", attempts=str(learning._MAX_ATTEMPTS - 1))))
+	assert redis.added == [{"text": "first message", "attempts": "1"}]
+	assert redis.acked == ["1-0", "1-0"]
+
+
+def test_empty_or_unparseable_reply_requeues_but_none_acks():
+	store = AsyncMock(return_value=0)
+	for reply, requeued in (("", True), ("  \n ", True), ("ok", True), ("NONE", False), ("No learnable facts.", False)):
+		redis = _FakeStreamRedis()
+		with _llm(AsyncMock(return_value=reply)), patch.object(learning, "store_memories", store):
+			asyncio.run(learning._process_batch(redis, _entries("I moved to Lisbon.")))
+		assert redis.added == ([{"text": "I moved to Lisbon.", "attempts": "1"}] if requeued else []), reply
+		assert redis.acked == ["1-0"]
+	store.assert_not_awaited()
+
+
+def test_store_memories_dedups_in_batch_and_searches_once():
+	vectors = {
+		"Lives in Lisbon with a dog": [1.0, 0.0, 0.0],
+		"Lives in Lisbon together with a dog": [0.99, 0.05, 0.0],
+		"Is allergic to peanuts": [0.0, 1.0, 0.0],
+		"Plays the cello every week": [0.0, 0.0, 1.0],
+	}
+	client = MagicMock()
+	client.query_batch_points = AsyncMock(return_value=[
+		types.SimpleNamespace(points=[]),
+		types.SimpleNamespace(points=[types.SimpleNamespace(score=0.97)]),	# already in the vault
+		types.SimpleNamespace(points=[types.SimpleNamespace(score=0.4)]),
+	])
+	client.upsert = AsyncMock()
+	with (
+		patch.object(memory, "get_qdrant", lambda: client),
+		patch.object(memory, "encode_many_async", AsyncMock(side_effect=lambda texts: [vectors[t] for t in texts])),
+		patch.object(memory, "_distill_memory_text", lambda t: t),
+		patch.object(memory, "models", types.SimpleNamespace(QueryRequest=dict, PointStruct=types.SimpleNamespace)),
+	):
+		stored = asyncio.run(memory.store_memories(list(vectors)))
+	assert stored == 2
+	client.query_batch_points.assert_awaited_once()
+	assert len(client.query_batch_points.await_args.kwargs["requests"]) == 3
+	points = client.upsert.await_args.kwargs["points"]
+	assert [p.payload["text"] for p in points] == ["Lives in Lisbon with a dog", "Plays the cello every week"]
+
+
+def test_loop_change_closes_the_replaced_qdrant_client():
+	closed = []
+
+	class _Client:
+		async def close(self):
+			closed.append(self)
+
+	async def _get():
+		client = memory.get_qdrant()
+		await asyncio.sleep(0)
+		return client
+
+	with (
+		patch.object(memory, "_build_qdrant", _Client),
+		patch.object(memory, "_qdrant", None),
+		patch.object(memory, "_qdrant_loop", None),
+	):
+		first = asyncio.run(_get())
+		second = asyncio.run(_get())		# new loop: the first client is replaced
+		assert memory.get_qdrant() is second	# no running loop: reuse
+	assert first is not second and closed == [first]
@@ -0,0 +1,112 @@
+"""
+Tests for the shared multi-head message classifier (services/message_classifier.py).
+
+The cloud chat call is replaced by an AsyncMock returning canned JSON (installed
+as app.services.llm, so the real LLM stack is not imported), letting each test
+assert how many round trips the router gates actually made.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.common.response_budget import ResponseBudget, budget_ctx
+from app.services import crews, intent_gate, intent_router, message_classifier, router
+from app.services.intent_router import StructuralIntent
+from app.services import routing_cache
+
+
+_TEXT = "move the dentist card to done"
+_REPLY = (
+	'```json\n{"system_action": true, "state_query": null, '
+	'"intents": ["PLANKA_MUTATION"], "crews": ["nobody", "health"]}\n```'
+)
+
+
+def _llm(chat_mock: AsyncMock):
+	return patch.dict(sys.modules, {"app.services.llm": types.SimpleNamespace(chat=chat_mock)})
+
+
+def _no_cache():
+	"""Each test counts real round trips — keep the routing decision cache out of it."""
+	return patch.object(routing_cache, "settings", types.SimpleNamespace(ROUTING_CACHE_TTL_S=0.0, ROUTING_CACHE_SIZE=0))
+
+
+def _run_gates(chat_mock: AsyncMock):
+	async def _main():
+		budget_ctx.set(ResponseBudget())
+		message_classifier.start_classification(_TEXT, history=[])
+		intent = StructuralIntent(verb="MOVE_CARD", entities={}, raw_text=_TEXT, confidence=0.9)
+		return await asyncio.gather(
+			router._validate_routing_intent(_TEXT, "RUN_SELF_AUDIT"),
+			router._classify_state_query(_TEXT, []),
+			crews.is_system_action_or_operational_query(_TEXT),
+			intent_router.validate_intent_with_reasoning(_TEXT, intent),
+			message_classifier.get_shared_classification(_TEXT),
+		)
+
+	with (
+		_llm(chat_mock),
+		_no_cache(),
+		patch.object(message_classifier, "_crew_manifest", lambda: ("- ID: health", {"health"})),
+		patch.object(crews.crew_registry, "reload_if_changed", new=AsyncMock(return_value=False)),
+		patch.object(intent_gate, "local_verdict", new=AsyncMock(return_value=None)),
+	):
+		return asyncio.run(_main())
+
+
+def test_all_gates_share_one_llm_call():
+	chat_mock = AsyncMock(return_value=_REPLY)
+	audit_ok, state_query, system_action, intent, shared = _run_gates(chat_mock)
+
+	chat_mock.assert_called_once()
+	assert audit_ok is False
+	assert state_query is None
+	assert system_action is True
+	assert intent.is_validated is True
+	assert shared.crews == ["health"]
+
+
+def test_failed_classification_uses_each_gates_error_fallback():
+	chat_mock = AsyncMock(side_effect=RuntimeError("cloud down"))
+	audit_ok, state_query, system_action, intent, shared = _run_gates(chat_mock)
+
+	chat_mock.assert_called_once()
+	assert shared.ok is False and shared.crews is None
+	assert audit_ok is True
+	assert state_query is None
+	assert system_action is False
+	assert intent.is_validated is True
+
+
+def test_without_budget_gates_keep_their_own_call():
+	chat_mock = AsyncMock(return_value="NO")
+	with _llm(chat_mock), _no_cache(), patch.object(intent_gate, "local_verdict", new=AsyncMock(return_value=None)):
+		assert asyncio.run(crews.is_system_action_or_operational_query(_TEXT)) is False
+	assert "multilingual intent classifier" in chat_mock.call_args[1]["system_override"]
+
+
+def test_unconsumed_classification_is_cancelled():
+	started = asyncio.Event()
+
+	async def _slow_chat(*args, **kwargs):
+		started.set()
+		await asyncio.sleep(10)
+
+	async def _main():
+		budget = ResponseBudget()
+		budget_ctx.set(budget)
+		message_classifier.start_classification(_TEXT, history=[])
+		await started.wait()
+		message_classifier.cancel_classification(budget)
+		await asyncio.sleep(0)
+		return budget.classification
+
+	with _llm(AsyncMock(side_effect=_slow_chat)), _no_cache(), patch.object(message_classifier, "_crew_manifest", lambda: ("", set())):
+		task = asyncio.run(_main())
+	assert task.cancelled()
+	message_classifier.cancel_classification(types.SimpleNamespace(classification=None))	# nothing started: no-op
@@ -0,0 +1,115 @@
+"""
+Tests for gauges, timers and the Prometheus text exposition in services/metrics.py,
+plus the scheduler job-duration listener.
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+import pytest
+
+from app.services import metrics
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry():
+	with (
+		patch.object(metrics, "_COUNTERS", metrics.defaultdict(int)),
+		patch.object(metrics, "_GAUGES", metrics.defaultdict(float)),
+		patch.object(metrics, "_HISTOGRAMS", {}),
+	):
+		yield
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+	for value in (0.1, 0.2, 0.7, 3.0):
+		metrics.observe_histogram("op_seconds", value, buckets=(0.1, 0.5, 1.0), op="x")
+	hist = metrics.get_histogram("op_seconds", op="x")
+	assert hist["buckets"] == {0.1: 1, 0.5: 2, 1.0: 3}
+	assert hist["count"] == 4 and hist["sum"] == pytest.approx(4.0)
+	assert metrics.histogram_quantile("op_seconds", 0.5, op="x") == pytest.approx(0.5)
+
+
+def test_gauges():
+	metrics.inc_gauge("streams", tier="local")
+	metrics.inc_gauge("streams", tier="local")
+	metrics.dec_gauge("streams", tier="local")
+	metrics.set_gauge("queue_depth", 7)
+	assert metrics.get_gauge("streams", tier="local") == 1
+	assert metrics.get_all_gauges() == {"streams{tier=local}": 1, "queue_depth": 7}
+
+
+def test_timed_context_manager_and_decorators():
+	with metrics.timed("block_seconds", step="a"):
+		pass
+
+	@metrics.timed("sync_seconds")
+	def _sync():
+		return 1
+
+	@metrics.timed("async_seconds")
+	async def _async():
+		return 2
+
+	assert _sync() == 1 and asyncio.run(_async()) == 2
+	with pytest.raises(ValueError):
+		with metrics.timed("block_seconds", step="a"):
+			raise ValueError
+	assert metrics.get_histogram("block_seconds", step="a")["count"] == 2
+	assert metrics.get_histogram("sync_seconds")["count"] == 1
+	assert metrics.get_histogram("async_seconds")["count"] == 1
+
+
+def test_render_prometheus():
+	metrics.increment_counter("requests_total", 2, path='a"b\\c')
+	metrics.set_gauge("queue-depth", 1.5)
+	metrics.observe_histogram("op_seconds", 0.3, buckets=(0.1, 0.5), op="x")
+	metrics.observe_histogram("op_seconds", 9.0, buckets=(0.1, 0.5), op="x")
+	assert metrics.render_prometheus().splitlines() == [
+		"# TYPE op_seconds histogram",
+		'op_seconds_bucket{op="x",le="0.1"} 0',
+		'op_seconds_bucket{op="x",le="0.5"} 1',
+		'op_seconds_bucket{op="x",le="+Inf"} 2',
+		'op_seconds_sum{op="x"} 9.3',
+		'op_seconds_count{op="x"} 2',
+		"# TYPE queue_depth gauge",
+		"queue_depth 1.5",
+		"# TYPE requests_total counter",
+		'requests_total{path="a\\"b\\\\c"} 2',
+	]
+
+
+@pytest.fixture
+def scheduler():
+	# Other test modules stub pytz / apscheduler at collection time; load the real ones.
+	with patch.dict(sys.modules):
+		for name in [
+			k for k in sys.modules
+			if k.split(".")[0] in ("pytz", "apscheduler") or k.startswith(("app.tasks", "app.common.scheduler_instance", "app.config"))
+		]:
+			del sys.modules[name]
+		yield importlib.import_module("app.tasks.scheduler")
+
+
+def test_scheduler_job_durations(scheduler):
+	from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
+
+	def _event(code):
+		return types.SimpleNamespace(code=code, job_id="poll_gmail")
+
+	scheduler._on_job_event(_event(EVENT_JOB_SUBMITTED))
+	assert metrics.get_gauge("scheduler_jobs_running") == 1
+	scheduler._on_job_event(_event(EVENT_JOB_EXECUTED))
+	scheduler._on_job_event(_event(EVENT_JOB_SUBMITTED))
+	scheduler._on_job_event(_event(EVENT_JOB_ERROR))
+	assert metrics.get_gauge("scheduler_jobs_running") == 0
+	assert metrics.get_histogram("scheduler_job_seconds", job="poll_gmail")["count"] == 2
+	assert metrics.get_counter("scheduler_job_runs_total", job="poll_gmail", result="ok") == 1
+	assert metrics.get_counter("scheduler_job_runs_total", job="poll_gmail", result="error") == 1
+	assert scheduler._job_started == {}
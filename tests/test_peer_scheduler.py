@@ -0,0 +1,120 @@
+"""
+Tests for the load-aware local peer scheduler in services/llm_peers.py:
+least-loaded dispatch, per-peer queueing and hedged first tokens.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import llm_peers
+from app.services.llm_peers import PeerState
+
+
+_SETTINGS = types.SimpleNamespace(
+	LLM_PEER_MAX_CONCURRENCY=2, LLM_LOCAL_URL="http://vps:8081", LLM_MODEL_LOCAL="local-model",
+)
+
+
+def _peers():
+	return [
+		PeerState(url="http://vps:8081", online=True, toks_per_sec=20.0, is_vps_local=True, hostname="VPS"),
+		PeerState(url="http://mac:11434", online=True, toks_per_sec=20.0, hostname="Mac"),
+		PeerState(url="http://slow:8081", online=True, toks_per_sec=5.0, hostname="Slow"),
+	]
+
+
+def _run(coro_fn, **settings):
+	cfg = types.SimpleNamespace(**{**vars(_SETTINGS), **settings})
+	with (
+		patch("app.config.settings", cfg),
+		patch.object(llm_peers, "_peers", _peers()),
+		patch.object(llm_peers, "_loads", {}),
+		patch.object(llm_peers, "_active", None),
+	):
+		return asyncio.run(coro_fn())
+
+
+def test_requests_spread_across_capable_peers_and_queue_when_full():
+	async def _main():
+		leases = [await llm_peers.acquire_peer() for _ in range(4)]
+		queued = asyncio.create_task(llm_peers.acquire_peer())
+		await asyncio.sleep(0)
+		status = llm_peers.get_peer_status()
+		leases[0].release()
+		fifth = await asyncio.wait_for(queued, 1.0)
+		return [lease.peer.hostname for lease in leases], fifth.peer.hostname, status
+
+	placed, fifth, status = _run(_main)
+	# Idle externals within the speed ratio win; the slow peer is never capable.
+	assert placed == ["Mac", "VPS", "Mac", "VPS"]
+	assert fifth == placed[0]
+	by_host = {c["hostname"]: c for c in status["candidates"]}
+	assert by_host["Mac"]["in_flight"] == 2 and by_host["Mac"]["utilisation"] == 1.0
+	assert sum(c["queue_depth"] for c in status["candidates"]) == 1
+	assert by_host["Slow"]["in_flight"] == 0
+
+
+def _stream(delays: dict[str, float]):
+	cancelled: list[str] = []
+
+	def _open(lease):
+		async def _gen():
+			try:
+				await asyncio.sleep(delays[lease.peer.hostname])
+			except asyncio.CancelledError:
+				cancelled.append(lease.peer.hostname)
+				raise
+			for token in ("a", "b", "c"):
+				yield f"{lease.peer.hostname}:{token}"
+		return _gen()
+
+	return _open, cancelled
+
+
+def test_late_first_token_is_hedged_on_another_peer():
+	open_stream, cancelled = _stream({"Mac": 10.0, "VPS": 0.01})
+
+	async def _main():
+		items = [item async for item in llm_peers.stream_from_peers(open_stream, first_token_timeout=0.4)]
+		return items, llm_peers.get_peer_status()
+
+	items, status = _run(_main)
+	assert items == ["VPS:a", "VPS:b", "VPS:c"]
+	assert cancelled == ["Mac"]
+	by_host = {c["hostname"]: c for c in status["candidates"]}
+	assert by_host["Mac"]["hedged"] == 1 and by_host["Mac"]["in_flight"] == 0
+	assert by_host["VPS"]["completed"] == 1 and by_host["VPS"]["ttft_ms"] is not None
+
+
+def test_hedge_budget_hedges_early_without_failing_a_slow_prompt_eval():
+	# Both peers are slower than the hedge budget but within the deadline: the
+	# request is hedged, yet neither peer is failed for a long prompt evaluation.
+	open_stream, cancelled = _stream({"Mac": 0.3, "VPS": 10.0})
+
+	async def _main():
+		return [item async for item in llm_peers.stream_from_peers(
+			open_stream, first_token_timeout=2.0, hedge_budget=0.05, timeout_exc=LookupError,
+		)]
+
+	assert _run(_main) == ["Mac:a", "Mac:b", "Mac:c"]
+	assert cancelled == ["VPS"]
+
+
+def test_no_first_token_anywhere_raises_timeout():
+	open_stream, cancelled = _stream({"Mac": 10.0, "VPS": 10.0})
+
+	async def _main():
+		return [item async for item in llm_peers.stream_from_peers(
+			open_stream, first_token_timeout=0.2, timeout_exc=LookupError,
+		)]
+
+	with pytest.raises(LookupError):
+		_run(_main)
+	assert sorted(cancelled) == ["Mac", "VPS"]
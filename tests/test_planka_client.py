@@ -0,0 +1,124 @@
+"""
+Tests for the shared Planka client (services/planka_common.py): token caching,
+transparent re-login on 401, and per-endpoint metrics.
+
+The pooled httpx client is replaced by an in-memory fake, so no server is required.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import metrics, planka_common
+
+
+_SETTINGS = types.SimpleNamespace(
+	PLANKA_BASE_URL="http://planka", PLANKA_ADMIN_EMAIL="admin@example.com",
+	PLANKA_ADMIN_PASSWORD="secret", PLANKA_POOL_SIZE=4,
+)
+
+
+def _jwt(exp: float) -> str:
+	payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=").decode()
+	return f"header.{payload}.signature"
+
+
+class _Response:
+	def __init__(self, status_code: int, body: dict) -> None:
+		self.status_code = status_code
+		self._body = body
+
+	def json(self) -> dict:
+		return self._body
+
+	def raise_for_status(self) -> None:
+		if self.status_code >= 400:
+			raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _FakePlanka:
+	"""Stands in for the pooled httpx client: counts logins, rejects tokens in `revoked`."""
+
+	def __init__(self) -> None:
+		self.logins = 0
+		self.revoked: set[str] = set()
+		self.seen_paths: list[str] = []
+
+	async def post(self, url: str, **kwargs) -> _Response:
+		assert url == "/api/access-tokens"
+		self.logins += 1
+		return _Response(200, {"item": _jwt(time.time() + 3600 + self.logins)})
+
+	async def request(self, method: str, url: str, headers: dict, **kwargs) -> _Response:
+		self.seen_paths.append(url)
+		token = headers.get("Authorization", "").removeprefix("Bearer ")
+		if token in self.revoked:
+			return _Response(401, {"message": "expired"})
+		return _Response(200, {"items": []})
+
+	async def aclose(self) -> None:
+		pass
+
+
+def _run(fake: _FakePlanka, coro_fn):
+	async def _main():
+		try:
+			return await coro_fn()
+		finally:
+			await planka_common.close_planka_client()
+
+	with patch.object(planka_common, "_build_http", lambda: fake), patch.object(planka_common, "settings", _SETTINGS):
+		planka_common.invalidate_planka_token()
+		return asyncio.run(_main())
+
+
+def test_token_is_reused_across_requests():
+	fake = _FakePlanka()
+
+	async def _calls():
+		async with planka_common.planka_client() as client:
+			await client.get("/api/projects")
+		await asyncio.gather(*(planka_common.planka_client().get(f"/api/boards/{i}") for i in range(5)))
+
+	_run(fake, _calls)
+	assert fake.logins == 1
+	assert len(fake.seen_paths) == 6
+
+
+def test_401_triggers_single_relogin_and_retry():
+	fake = _FakePlanka()
+
+	async def _calls():
+		client = planka_common.planka_client()
+		await client.get("/api/projects")
+		fake.revoked.add(await planka_common.get_planka_auth_token())
+		return await client.patch("/api/cards/123456789", json={"name": "x"})
+
+	before = metrics.get_counter("planka_retries_total", method="PATCH", endpoint="/api/cards/{id}", reason="auth")
+	resp = _run(fake, _calls)
+
+	assert resp.status_code == 200
+	assert fake.logins == 2
+	assert metrics.get_counter("planka_retries_total", method="PATCH", endpoint="/api/cards/{id}", reason="auth") == before + 1
+
+
+def test_metrics_are_labelled_by_templated_endpoint():
+	fake = _FakePlanka()
+
+	async def _calls():
+		client = planka_common.planka_client()
+		await client.get("/api/boards/111", params={"included": "lists"})
+		await client.get("/api/boards/222")
+
+	before = metrics.get_counter("planka_requests_total", method="GET", endpoint="/api/boards/{id}", status="200")
+	_run(fake, _calls)
+
+	assert metrics.get_counter("planka_requests_total", method="GET", endpoint="/api/boards/{id}", status="200") == before + 2
+	assert metrics.get_histogram("planka_request_seconds", method="GET", endpoint="/api/boards/{id}")["count"] >= 2
@@ -0,0 +1,109 @@
+"""
+Tests for the in-process Planka mirror (services/planka_mirror.py): incremental
+board refresh, write-through updates and the normalized card-name index.
+
+The Planka session is replaced by an in-memory fake serving a tiny workspace.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import planka_mirror as pm
+from app.services.planka_mirror import PlankaMirror
+
+
+_SETTINGS = types.SimpleNamespace(PLANKA_MIRROR_TTL_S=0.0, PLANKA_MIRROR_MAX_AGE_S=3600.0)
+
+
+class _Response:
+	def __init__(self, body: dict) -> None:
+		self._body = body
+
+	def json(self) -> dict:
+		return self._body
+
+	def raise_for_status(self) -> None:
+		pass
+
+
+class _FakeWorkspace:
+	"""Serves /api/projects and /api/boards/{id}; records which boards were fetched."""
+
+	def __init__(self) -> None:
+		self.board_stamps = {"b1": "t1", "b2": "t1"}
+		self.board_fetches: list[str] = []
+
+	async def __aenter__(self) -> "_FakeWorkspace":
+		return self
+
+	async def __aexit__(self, *exc) -> None:
+		return None
+
+	async def get(self, url: str, **kwargs) -> _Response:
+		if url == "/api/projects":
+			return _Response({
+				"items": [{"id": "p1", "name": "Home"}],
+				"included": {"boards": [
+					{"id": bid, "name": f"Board {bid}", "projectId": "p1", "updatedAt": stamp}
+					for bid, stamp in self.board_stamps.items()
+				]},
+			})
+		bid = url.rsplit("/", 1)[-1]
+		self.board_fetches.append(bid)
+		return _Response({
+			"item": {"id": bid},
+			"included": {
+				"lists": [{"id": f"{bid}-l", "boardId": bid, "name": "To Do", "position": 1}],
+				"cards": [{"id": f"{bid}-c", "boardId": bid, "listId": f"{bid}-l", "name": f"Call the dentist {bid}"}],
+				"tasks": [],
+			},
+		})
+
+
+def _run(fake: _FakeWorkspace, coro):
+	with patch.object(pm, "planka_client", lambda timeout=None: fake), patch.object(pm, "settings", _SETTINGS):
+		return asyncio.run(coro)
+
+
+def test_refresh_only_refetches_changed_or_dirty_boards():
+	fake = _FakeWorkspace()
+	mirror = PlankaMirror()
+
+	async def _steps():
+		await mirror.refresh()
+		first = sorted(fake.board_fetches)
+		fake.board_fetches.clear()
+		await mirror.refresh()
+		unchanged = list(fake.board_fetches)
+		fake.board_stamps["b2"] = "t2"
+		await mirror.refresh()
+		mirror.mark_dirty("b1")
+		await mirror.refresh()
+		return first, unchanged, list(fake.board_fetches)
+
+	first, unchanged, later = _run(fake, _steps())
+
+	assert first == ["b1", "b2"]
+	assert unchanged == []
+	assert later == ["b2", "b1"]
+
+
+def test_card_index_prefers_exact_match_and_follows_write_through():
+	fake = _FakeWorkspace()
+	mirror = PlankaMirror()
+	_run(fake, mirror.refresh())
+
+	mirror.apply("cards", {"id": "x", "boardId": "b1", "listId": "b1-l", "name": "  Call the   Dentist "})
+	assert mirror.find_card("call the dentist")["id"] == "x"
+	assert {c["id"] for c in mirror.find_cards("dentist")} == {"x", "b1-c", "b2-c"}
+	assert [c["id"] for c in mirror.find_cards("dentist", board_name="Board b2")] == ["b2-c"]
+
+	mirror.apply("cards", {**mirror.cards["x"], "name": "Book flights"})
+	assert mirror.find_card("call the dentist")["id"] != "x"
+	mirror.discard("lists", "b1-l")
+	assert {c["id"] for c in mirror.find_cards("dentist")} == {"b2-c"}
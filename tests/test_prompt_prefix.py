@@ -0,0 +1,60 @@
+"""
+Tests for prefix-stable prompt assembly (services/prompt_prefix.py) and
+llama.cpp slot pinning in services/llm_peers.py.
+"""
+
+import os
+import sys
+import types
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import prompt_prefix
+from app.services.llm_peers import PeerLease, PeerLoad, PeerState
+
+
+def test_assemble_keeps_prefix_and_counts_changes():
+	with patch.object(prompt_prefix, "_prefixes", {}), patch("app.services.metrics.increment_counter") as inc:
+		first = prompt_prefix.assemble("crew:t", "RULES", "time 10:00", "", "memories")
+		second = prompt_prefix.assemble("crew:t", "RULES", "time 10:01")
+		assert first.text == "RULES\n\ntime 10:00\n\nmemories"
+		assert second.text.startswith(first.static)
+		inc.assert_not_called()
+		prompt_prefix.assemble("crew:t", "RULES v2")
+		inc.assert_called_once_with("llm_prompt_prefix_changes_total", key="crew:t")
+	assert prompt_prefix.assemble("k", "only").text == "only"
+
+
+def test_record_prompt_timings_reports_hit_rate_and_saved_time():
+	with patch.object(prompt_prefix, "_stats", {}), patch.object(prompt_prefix, "_prefixes", {"chat": "x" * 10}):
+		prompt_prefix.record_prompt_timings("chat", {"cache_n": 300, "prompt_n": 100, "prompt_ms": 200.0})
+		prompt_prefix.record_prompt_timings("chat", {"cache_n": 0, "prompt_n": 400, "prompt_ms": 800.0})
+		prompt_prefix.record_prompt_timings("chat", {"cache_n": "bad"})
+		stats = prompt_prefix.get_prefix_cache_stats()["chat"]
+	assert stats["requests"] == 2
+	assert stats["prefix_hit_rate"] == 0.375
+	assert stats["saved_ms"] == 600.0
+	assert stats["prefix_chars"] == 10
+
+
+def _lease(load: PeerLoad, slots: int = 2) -> PeerLease:
+	return PeerLease(PeerState(url="http://vps:8081", slots=slots), load)
+
+
+def test_claim_slot_reuses_owner_and_steals_least_recent():
+	cfg = types.SimpleNamespace(LLM_MODEL_LOCAL="local-model")
+	with patch("app.config.settings", cfg):
+		load = PeerLoad()
+		a = _lease(load)
+		assert a.claim_slot("chat") == 0
+		b = _lease(load)
+		assert b.claim_slot("crew:x") == 1
+		assert _lease(load).claim_slot("crew:y") == -1	# both busy
+		a.release()
+		b.release()
+		assert _lease(load).claim_slot("crew:x") == 1
+		load.busy_slots.clear()
+		# New key takes the least recently used slot (0, last used by "chat").
+		assert _lease(load).claim_slot("crew:z") == 0
+		assert _lease(PeerLoad(), slots=0).claim_slot("chat") == -1
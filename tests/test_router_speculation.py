@@ -0,0 +1,91 @@
+"""
+Tests for speculative execution of the router's intercept-stage lookups
+(router._StageRunner) and the histogram quantiles used to report their latency.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import metrics
+from app.services.router import _StageRunner
+
+
+def _stages(speculative: bool):
+	"""Run three stages in precedence order; the second one answers."""
+	calls: list[str] = []
+	cancelled: list[str] = []
+
+	def _lookup(name, value):
+		async def _run():
+			calls.append(name)
+			try:
+				await asyncio.sleep(0.2 if name == "c" else 0.05)
+			except asyncio.CancelledError:
+				cancelled.append(name)
+				raise
+			return value
+		return _run
+
+	async def _main():
+		runner = _StageRunner(speculative)
+		for name, value in (("a", None), ("b", "answer"), ("c", "late")):
+			runner.start(name, _lookup(name, value))
+		start = time.perf_counter()
+		result = None
+		for name, value in (("a", None), ("b", "answer"), ("c", "late")):
+			result = await runner.take(name, _lookup(name, value))
+			if result is not None:
+				break
+		elapsed = time.perf_counter() - start
+		runner.cancel_all()
+		await asyncio.sleep(0)
+		return result, elapsed
+
+	result, elapsed = asyncio.run(_main())
+	return result, elapsed, calls, cancelled
+
+
+def test_speculative_stages_keep_serial_precedence():
+	serial = _stages(speculative=False)
+	speculative = _stages(speculative=True)
+
+	assert serial[0] == speculative[0] == "answer"
+	assert serial[2] == ["a", "b"]
+	# All lookups start at once; the unconsumed lower-precedence one is cancelled.
+	assert speculative[2] == ["a", "b", "c"]
+	assert speculative[3] == ["c"]
+	assert speculative[1] < serial[1]
+
+
+def test_stage_errors_surface_at_their_stage():
+	async def _boom():
+		raise RuntimeError("planka down")
+
+	async def _main():
+		runner = _StageRunner(True)
+		runner.start("state_query", _boom)
+		runner.start("crews", _boom)
+		await asyncio.sleep(0)
+		try:
+			await runner.take("state_query", _boom)
+		except RuntimeError as exc:
+			caught = str(exc)
+		runner.discard("crews")	# finished with an error nobody will read
+		return caught
+
+	assert asyncio.run(_main()) == "planka down"
+	assert metrics.get_histogram("router_stage_seconds", stage="state_query", mode="speculative")["count"] >= 1
+
+
+def test_histogram_quantile_interpolates_within_buckets():
+	for value in (0.01, 0.02, 0.03, 0.04, 2.0):
+		metrics.observe_histogram("test_quantile_seconds", value, buckets=(0.05, 1.0, 5.0))
+
+	assert metrics.histogram_quantile("test_quantile_seconds", 0.5) == 0.05 * 2.5 / 4
+	assert 1.0 < metrics.histogram_quantile("test_quantile_seconds", 0.95) <= 5.0
+	assert metrics.histogram_quantile("test_quantile_unseen", 0.5) is None
+	assert metrics.get_all_histograms()["test_quantile_seconds"]["p50"] > 0
@@ -0,0 +1,83 @@
+"""
+Tests for the routing decision cache (services/routing_cache.py) and its use by
+the semantic crew router.
+"""
+
+import asyncio
+import os
+import sys
+import types
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+from app.services import routing_cache, semantic_router
+from app.services.crews import crew_registry
+from app.services.planka_mirror import planka_mirror
+from app.services.routing_cache import RoutingCache, normalize_message
+
+
+_SETTINGS = types.SimpleNamespace(ROUTING_CACHE_TTL_S=300.0, ROUTING_CACHE_SIZE=16)
+
+
+def _cache():
+	return (
+		patch.object(routing_cache, "settings", _SETTINGS),
+		patch.object(routing_cache, "_cache", RoutingCache(16)),
+		patch.object(crew_registry, "_mtimes_changed", lambda: False),
+	)
+
+
+def test_near_identical_messages_share_an_entry():
+	assert normalize_message("  What should I eat  for dinner?? ") == normalize_message("what should i eat for dinner")
+	p1, p2, p3 = _cache()
+	with p1, p2, p3:
+		cache = routing_cache.get_routing_cache()
+		cache.put("crews", "Plan my workouts!", ("fitness",))
+		assert cache.get("crews", "plan my   workouts") == (True, ("fitness",))
+		assert cache.get("crews", "plan my workouts", True) == (False, None)	# other think mode
+		assert cache.get("state_query", "plan my workouts") == (False, None)
+
+
+def test_registry_reload_and_board_change_invalidate():
+	p1, p2, p3 = _cache()
+	with p1, p2, p3:
+		cache = routing_cache.get_routing_cache()
+		cache.put("crews", "plan my workouts", ("fitness",))
+		with patch.object(crew_registry, "version", crew_registry.version + 1):
+			assert cache.get("crews", "plan my workouts") == (False, None)
+
+		cache.put("crews", "plan my workouts", ("fitness",))
+		with patch.object(planka_mirror, "version", planka_mirror.version):
+			planka_mirror.apply("cards", {"id": "c1", "name": "Dentist", "boardId": "b1", "listId": "l1"})
+			assert cache.get("crews", "plan my workouts") == (False, None)
+			planka_mirror.discard("cards", "c1")
+
+		cache.put("crews", "plan my workouts", ("fitness",))
+		with patch.object(crew_registry, "_mtimes_changed", lambda: True):
+			# YAML edited but not reloaded yet: no hits, nothing stored.
+			assert cache.get("crews", "plan my workouts") == (False, None)
+			cache.put("crews", "plan my workouts", ("fitness",))
+		assert len(cache) == 0
+
+
+def test_route_semantic_reuses_decision_but_not_for_follow_ups():
+	inner = AsyncMock(return_value=["nutrition"])
+	p1, p2, p3 = _cache()
+
+	async def _main():
+		first = await semantic_router.route_semantic("What should I eat for dinner?", [], "telegram")
+		second = await semantic_router.route_semantic("what should i eat for  dinner", [], "dashboard")
+		await semantic_router.route_semantic("and also the one after that", [], "telegram")
+		await semantic_router.route_semantic("and also the one after that", [], "telegram")
+		return first, second
+
+	with (
+		p1, p2, p3,
+		patch.object(crew_registry, "reload_if_changed", new=AsyncMock(return_value=False)),
+		patch.object(semantic_router, "_route_semantic", inner),
+	):
+		first, second = asyncio.run(_main())
+
+	assert first == second == ["nutrition"]
+	assert inner.await_count == 3
@@ -1843,6 +1843,7 @@ def _install_backend_mocks():
 	mods["app.services.timezone"].get_user_timezone = lambda: "UTC"
 
 	mods["qdrant_client"].QdrantClient = type("QdrantClient", (), {})
+	mods["qdrant_client"].AsyncQdrantClient = type("AsyncQdrantClient", (), {})
 	mods["qdrant_client"].models = mods["qdrant_client.models"]
 	mods["qdrant_client.models"].VectorParams = lambda **kw: None
 	mods["qdrant_client.models"].Distance = types.SimpleNamespace(COSINE="cosine")
@@ -0,0 +1,162 @@
+"""
+Tests for streaming action parsing: StreamingTagParser (services/action_extractor.py)
+emits exactly the tags the full-reply parser finds, as their closing ']' arrives,
+and EarlyActionRunner (services/agent_actions.py) starts idempotent card actions
+whose results parse_and_execute_actions() reuses without changing the reply.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import types
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src/backend")))
+
+import pytest
+
+from app.services import action_extractor as ax
+
+_PIECES = [
+	"Sure, moving it. ", "[ACTION: MARK_DONE | CARD: Laundry]", "[ACTION: MOVE_CARD | CARD: Tax | LIST: Doing]",
+	"[", "]", "[ACT", "ION:", " | ", "[ACTION: LAUNCH | X: y]", "[PERSON_1]", "[action: route | crew: chef]",
+	"[ACTION: SET_CARD_DESC | CARD: [PERSON_2] | DESCRIPTION: call]",
+]
+
+
+def _feed_all(parser, text, sizes):
+	out, i = [], 0
+	while i < len(text):
+		n = next(sizes)
+		out.extend(parser.feed(text[i:i + n]))
+		i += n
+	return out
+
+
+def test_parser_matches_full_reply_parse_for_any_chunking():
+	rng = random.Random(7)
+	for _ in range(500):
+		text = "".join(rng.choice(_PIECES) for _ in range(rng.randint(1, 25)))
+		sizes = iter(lambda: rng.randint(1, 9), None)
+		got = _feed_all(ax.StreamingTagParser(), text, sizes)
+		assert [(a.raw_tag, a.params) for a in got] == [(a.raw_tag, a.params) for a in ax._parse_tags(text)]
+
+	# Over-long bodies are dropped, then parsing resumes; nothing past _MAX_SCAN.
+	text = "[ACTION: MARK_DONE | CARD: " + "z" * 2100 + "] [ACTION: MARK_DONE | CARD: q]"
+	assert [a.raw_tag for a in _feed_all(ax.StreamingTagParser(), text, iter(lambda: 64, None))] == ["[ACTION: MARK_DONE | CARD: q]"]
+	text = "a" * (ax._MAX_SCAN - 10) + "[ACTION: MARK_DONE | CARD: q]"
+	assert _feed_all(ax.StreamingTagParser(), text, iter(lambda: 500, None)) == []
+
+
+def test_parser_emits_when_tag_closes():
+	parser = ax.StreamingTagParser()
+	assert parser.feed("Done. [ACTION: MARK_") == []
+	assert parser.pending == "[ACTION: MARK_"
+	assert parser.feed("DONE | CARD: Laundry") == []
+	[action] = parser.feed("] and [maybe] more [ACT")
+	assert (action.action_type, action.params, action.raw_tag) == ("MARK_DONE", {"CARD": "Laundry"}, "[ACTION: MARK_DONE | CARD: Laundry]")
+	assert parser.pending == "[ACT"
+
+
+@pytest.fixture
+def agent_actions():
+	# Other test modules stub planka / app.models at collection time; the card
+	# executors are patched per test, the rest must only be importable.
+	stubs = {
+		"langchain_core": types.ModuleType("langchain_core"),
+		"langchain_core.tools": types.SimpleNamespace(tool=lambda f: f),
+		"app.services.planka": types.SimpleNamespace(
+			create_task=AsyncMock(), create_project=AsyncMock(), create_board=AsyncMock(), create_list=AsyncMock(),
+		),
+		"app.models.db": types.SimpleNamespace(store_pending_thought=AsyncMock()),
+	}
+	with patch.dict(sys.modules, stubs):
+		sys.modules.pop("app.services.agent_actions", None)
+		import app.services.agent_actions as module
+		yield module
+
+
+def test_runner_starts_safe_tags_and_final_pass_reuses_them(agent_actions):
+	calls: list = []
+
+	async def _move(card, dest, board=""):
+		calls.append(("move", card, dest))
+		await asyncio.sleep(0)
+		return f"Card '{card}' moved to '{dest}'."
+
+	async def _done(card):
+		calls.append(("done", card))
+		return f"⚠ Could not find card matching '{card}'. Check Planka board." if card == "Ghost" else f"Card '{card}' marked done."
+
+	async def _desc(card, desc):
+		calls.append(("desc", card, desc))
+		return f"Description of '{card}' updated."
+
+	reply = (
+		"On it.\n[ACTION: MOVE_CARD | CARD: Tax | LIST: Doing]\n"
+		"[ACTION: MARK_DONE | CARD: Ghost]\n"
+		"[ACTION: MARK_DONE | CARD: Tax]\n"				# second move of Tax: left to the final pass
+		"[ACTION: SET_CARD_DESC | CARD: [PERSON_1] | DESCRIPTION: x]\n"	# token: left to the final pass
+		"[ACTION: SET_CARD_DESC | CARD: Gym | DESCRIPTION: Mondays]"
+	)
+
+	async def _main():
+		runner = agent_actions.EarlyActionRunner()
+		for i in range(0, len(reply), 5):
+			runner.feed(reply[i:i + 5])
+		started = list(calls)
+		early = await runner.results()
+		early_calls = len(calls)
+		final = await agent_actions.parse_and_execute_actions(reply, early_results=dict(early))
+		return started, early, early_calls, final
+
+	with (
+		patch.object(agent_actions, "execute_move_card", _move),
+		patch.object(agent_actions, "execute_mark_done", _done),
+		patch.object(agent_actions, "execute_set_card_desc", _desc),
+	):
+		started, early, early_calls, (clean, cmds, pending) = asyncio.run(_main())
+
+	assert started == []	# tasks start on the loop, after feed() returns
+	# Tax is moved, then marked done: only its first tag started, and neither
+	# result is reused, so the final pass re-runs both in its own order.
+	assert early == {"[ACTION: SET_CARD_DESC | CARD: Gym | DESCRIPTION: Mondays]": "Description of 'Gym' updated."}
+	assert sorted(calls[:early_calls]) == [("desc", "Gym", "Mondays"), ("done", "Ghost"), ("move", "Tax", "Doing")]
+	assert calls[early_calls:] == [("move", "Tax", "Doing"), ("done", "Ghost"), ("done", "Tax")]
+	assert cmds == [
+		"Card 'Tax' moved to 'Doing'.",
+		"⚠ Could not find card matching 'Ghost'. Check Planka board.",
+		"Card 'Tax' marked done.",
+		"Description of 'Gym' updated.",
+	]
+	assert pending == [] and clean.startswith("On it.\n")
+
+
+def test_early_results_keep_clean_reply_identical(agent_actions):
+	reply = "Moved.\n[ACTION: MOVE_CARD | CARD: Tax | LIST: Doing]\n[ACTION: MARK_DONE | CARD: Gym]"
+	calls: list = []
+
+	async def _move(card, dest, board=""):
+		calls.append(card)
+		return f"Card '{card}' moved to '{dest}'."
+
+	async def _done(card):
+		calls.append(card)
+		return f"Card '{card}' marked done."
+
+	async def _main():
+		baseline = await agent_actions.parse_and_execute_actions(reply)
+		runner = agent_actions.EarlyActionRunner()
+		for ch in reply:
+			runner.feed(ch)
+		early = await runner.results()
+		n = len(calls)
+		streamed = await agent_actions.parse_and_execute_actions(reply, early_results=early)
+		return baseline, streamed, n
+
+	with patch.object(agent_actions, "execute_move_card", _move), patch.object(agent_actions, "execute_mark_done", _done):
+		baseline, streamed, n = asyncio.run(_main())
+
+	assert streamed == baseline
+	assert n == 4 and len(calls) == 4	# nothing ran twice